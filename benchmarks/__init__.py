@@ -0,0 +1,23 @@
+"""Performance benchmark suite.
+
+Usage:
+    python -m benchmarks                                  # run, compare with baseline.json
+    python -m benchmarks --out results/bench.json         # also keep the results
+    python -m benchmarks --update-baseline                # accept the current numbers
+    python -m benchmarks --only env_steps,q_learning --quick
+
+The exit status is 1 when any metric regresses beyond its tolerance, so
+the nightly job fails on slowdowns.
+"""
+from .suite import (
+    BENCHMARKS, Metric, run_suite, save_results, load_results, compare,
+)
+
+__all__ = [
+    'BENCHMARKS',
+    'Metric',
+    'run_suite',
+    'save_results',
+    'load_results',
+    'compare',
+]
@@ -0,0 +1,55 @@
+"""Run the benchmark suite and check it against the stored baseline."""
+import argparse
+import sys
+from pathlib import Path
+
+from .suite import BENCHMARKS, CALIBRATION, run_suite, save_results, load_results, compare
+
+# Committed reference numbers
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the performance benchmarks")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--quick", action="store_true", help="Small dungeons, one repeat (smoke test)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats, best kept (default: 3)")
+    parser.add_argument("--out", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=str(BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Allowed relative regression for every metric (default: per metric)")
+    parser.add_argument("--update-baseline", action="store_true", help="Overwrite the baseline with these results")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    results = run_suite(only, quick=args.quick, repeat=args.repeat)
+    if args.out:
+        save_results(args.out, results)
+        print(f"Saved results to {args.out}")
+
+    if args.update_baseline:
+        save_results(args.baseline, results)
+        print(f"Updated baseline {args.baseline}")
+        return 0
+    if not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    baseline = load_results(args.baseline)
+    regressions, report = compare(results, baseline, args.tolerance)
+    if CALIBRATION in baseline:
+        speed = results[CALIBRATION].value / baseline[CALIBRATION].value
+        print(f"\nMachine speed vs baseline: {speed:.2f}x (baseline timings scaled accordingly)")
+    print()
+    print("\n".join(report))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s):")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
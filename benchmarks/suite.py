@@ -0,0 +1,312 @@
+"""Performance benchmarks and regression checks against a stored baseline.
+
+Each benchmark produces named Metrics (throughput, time or memory) for a
+set of dungeons, from the shipped levels up to generated 201x201 mazes.
+Timings take the best of several repeats to damp scheduler noise; memory
+is measured with tracemalloc, so it is machine independent.
+
+Every run also times a fixed reference loop (CALIBRATION), between
+dungeons so it sees the same machine conditions as the benchmarks, and
+keeps the median. When comparing, baseline timings are scaled by how much faster or slower that
+loop ran, so a slower or busier machine doesn't read as a regression
+(and a faster one doesn't hide one).
+"""
+from __future__ import annotations
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Iterator
+import numpy as np
+
+from src.core.grid import Grid, load_grid_from_file, save_grid_to_file
+from src.core.generator import generate_maze
+from src.core.tiles import TILES
+from src.algorithms.q_learning import QLearning
+from src.env.dungeon_env import DungeonEnv
+from src.ui.array_renderer import ArrayRenderer
+
+# Shipped levels, benchmarked as-is
+LEVELS_DIR = Path(__file__).resolve().parent.parent / "assets" / "dungeons"
+
+# Generated maze sizes (odd sizes give a closed border)
+MAZE_SIZES = (51, 201)
+
+# Observation types DungeonEnv supports
+OBS_TYPES = ("position", "grid", "local")
+
+# Allowed relative slowdown for timings and growth for memory; file I/O
+# also depends on the disk and page cache, so it gets more slack
+TIME_TOLERANCE = 0.30
+IO_TOLERANCE = 0.50
+MEMORY_TOLERANCE = 0.10
+
+# Name of the machine-speed reference metric
+CALIBRATION = "calibration/reference_loop"
+
+
+@dataclass
+class Metric:
+    """One measured value."""
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    tolerance: float = TIME_TOLERANCE
+    timing: bool = True  # scaled by machine speed when comparing
+
+
+def dungeons(quick: bool = False) -> Iterator[tuple[str, Grid]]:
+    """Benchmark dungeons as (name, grid), smallest first.
+
+    Args:
+        quick: Only the first shipped level and the smallest maze
+    """
+    levels = sorted(LEVELS_DIR.glob("*.txt"))
+    for path in levels[:1] if quick else levels:
+        yield path.stem, load_grid_from_file(path)
+    for size in MAZE_SIZES[:1] if quick else MAZE_SIZES:
+        yield f"maze_{size}x{size}", generate_maze(size, size, seed=0)
+
+
+def best_rate(run: Callable[[], int], repeat: int, min_time: float = 0.1) -> float:
+    """Highest items/sec over several runs; run() returns the number of items done.
+
+    Each run calls run() until min_time has passed, so fast operations
+    aren't dominated by timer resolution.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        items = 0
+        started = time.perf_counter()
+        while True:
+            items += run()
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = max(best, items / elapsed)
+    return best
+
+
+def best_time(run: Callable[[], object], repeat: int, min_time: float = 0.1) -> float:
+    """Shortest mean wall time of run() in seconds over several runs.
+
+    Each run calls run() until min_time has passed, so fast operations
+    aren't dominated by timer resolution.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def calibrate(repeat: int) -> Metric:
+    """Speed of a fixed interpreter-bound reference loop (the machine's speed)."""
+    table = np.arange(64)
+
+    def run():
+        total = 0
+        for i in range(20_000):
+            total += int(table[i & 63]) + i % 7
+        return 20_000
+
+    return Metric(CALIBRATION, best_rate(run, repeat), "ops/s", True)
+
+
+def bench_env_steps(name: str, grid: Grid, repeat: int, n_steps: int = 20_000) -> Iterator[Metric]:
+    """DungeonEnv.step throughput with random actions, per observation type."""
+    actions = np.random.default_rng(0).integers(0, 4, n_steps)
+    for obs_type in OBS_TYPES:
+        env = DungeonEnv(grid=grid, obs_type=obs_type)
+
+        def run():
+            env.reset(seed=0)
+            for action in actions:
+                _, _, terminated, truncated, _ = env.step(int(action))
+                if terminated or truncated:
+                    env.reset()
+            return n_steps
+
+        yield Metric(f"env_steps/{obs_type}/{name}", best_rate(run, repeat), "steps/s", True)
+        env.close()
+
+
+def bench_q_learning(name: str, grid: Grid, repeat: int, n_episodes: int = 100) -> Iterator[Metric]:
+    """QLearning.train throughput from a fresh table (exploration-heavy episodes)."""
+    def run():
+        QLearning(grid, seed=0).train(n_episodes=n_episodes, max_steps=200, verbose=False)
+        return n_episodes
+
+    yield Metric(f"q_learning/{name}", best_rate(run, repeat), "episodes/s", True)
+
+
+def bench_grid_io(name: str, grid: Grid, repeat: int) -> Iterator[Metric]:
+    """Time to save the grid as text and load it back."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"{name}.txt"
+        yield Metric(f"grid_save/{name}", best_time(lambda: save_grid_to_file(grid, path), repeat) * 1e3,
+                     "ms", False, IO_TOLERANCE)
+        yield Metric(f"grid_load/{name}", best_time(lambda: load_grid_from_file(path), repeat) * 1e3,
+                     "ms", False, IO_TOLERANCE)
+
+
+def bench_render(name: str, grid: Grid, repeat: int, n_frames: int = 200) -> Iterator[Metric]:
+    """rgb_array frames/sec (ArrayRenderer), moving the agent over the open tiles."""
+    renderer = ArrayRenderer(grid)
+    ys, xs = np.nonzero(TILES.passable[grid.tiles])
+    cells = list(zip(xs.tolist(), ys.tolist()))[:n_frames]
+    out = np.empty(renderer.shape, dtype=np.uint8)
+
+    def run():
+        for i in range(n_frames):
+            x, y = cells[i % len(cells)]
+            renderer.render(x, y, hp=100 - i % 100, out=out)
+        return n_frames
+
+    yield Metric(f"render_rgb_array/{name}", best_rate(run, repeat), "frames/s", True)
+
+
+def bench_memory(name: str, grid: Grid, repeat: int) -> Iterator[Metric]:
+    """Bytes allocated per state by a learner and an environment on the grid."""
+    tracemalloc.start()
+    try:
+        ql = QLearning(grid, seed=0)
+        env = DungeonEnv(grid=grid)
+        env.reset(seed=0)
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del ql, env
+    yield Metric(f"memory_per_state/{name}", allocated / (grid.width * grid.height), "bytes", False,
+                 MEMORY_TOLERANCE, timing=False)
+
+
+BENCHMARKS = {
+    "env_steps": bench_env_steps,
+    "q_learning": bench_q_learning,
+    "grid_io": bench_grid_io,
+    "render": bench_render,
+    "memory": bench_memory,
+}
+
+
+def run_suite(
+    only: list[str] | None = None,
+    quick: bool = False,
+    repeat: int = 3,
+    log: Callable[[str], None] | None = print,
+) -> dict[str, Metric]:
+    """Run the benchmarks on every dungeon.
+
+    Args:
+        only: Benchmark names to run (default: all of BENCHMARKS)
+        quick: Small dungeons only, one repeat (smoke test)
+        repeat: Timing repeats (best is kept)
+        log: Called with one line per metric (None for silence)
+
+    Returns:
+        Metrics by name, including the CALIBRATION reference
+    """
+    unknown = set(only or ()) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+    repeat = 1 if quick else repeat
+
+    results = {}
+    speeds = []
+    for name, grid in dungeons(quick):
+        speeds.append(calibrate(max(repeat, 3)).value)
+        for bench, func in BENCHMARKS.items():
+            if only and bench not in only:
+                continue
+            for metric in func(name, grid, repeat):
+                results[metric.name] = metric
+                if log:
+                    log(f"{metric.name:<40} {metric.value:>14,.3f} {metric.unit}")
+    speeds.append(calibrate(max(repeat, 3)).value)
+    results[CALIBRATION] = Metric(CALIBRATION, float(np.median(speeds)), "ops/s", True)
+    return results
+
+
+def save_results(path: str | Path, results: dict[str, Metric]) -> None:
+    """Write metrics as JSON, with the machine they were measured on."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "metrics": {name: asdict(metric) for name, metric in sorted(results.items())},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str | Path) -> dict[str, Metric]:
+    """Read metrics written by save_results."""
+    with open(path) as f:
+        data = json.load(f)
+    return {name: Metric(**fields) for name, fields in data["metrics"].items()}
+
+
+def compare(
+    results: dict[str, Metric],
+    baseline: dict[str, Metric],
+    tolerance: float | None = None,
+) -> tuple[list[str], list[str]]:
+    """Check results against a baseline.
+
+    A metric regresses when it is worse than the baseline by more than its
+    tolerance (relative). Baseline timings are first scaled by the ratio
+    of the two CALIBRATION measurements, when both have one. Metrics
+    missing from the baseline are reported as new.
+
+    Args:
+        results: Fresh metrics
+        baseline: Stored metrics
+        tolerance: Override every metric's tolerance
+
+    Returns:
+        (regressions, report): regression messages and one line per metric
+    """
+    speed = 1.0
+    if CALIBRATION in results and CALIBRATION in baseline:
+        speed = results[CALIBRATION].value / baseline[CALIBRATION].value
+
+    regressions, report = [], []
+    for name, metric in results.items():
+        if name == CALIBRATION:
+            continue
+        base = baseline.get(name)
+        if base is None:
+            report.append(f"{name:<40} {metric.value:>14,.3f} {metric.unit:<10} (new)")
+            continue
+        limit = base.tolerance if tolerance is None else tolerance
+        expected = base.value
+        if metric.timing:
+            expected = expected * speed if metric.higher_is_better else expected / speed
+        change = (metric.value - expected) / expected if expected else 0.0
+        worse = -change if metric.higher_is_better else change
+        line = f"{name:<40} {metric.value:>14,.3f} {metric.unit:<10} {change:+7.1%} vs {expected:,.3f}"
+        if worse > limit:
+            regressions.append(f"{name}: {metric.value:,.3f} {metric.unit} is {worse:.0%} worse "
+                               f"than the baseline {expected:,.3f} (tolerance {limit:.0%})")
+            line += "  REGRESSION"
+        report.append(line)
+    return regressions, report
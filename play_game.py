@@ -5,13 +5,14 @@ sys.path.insert(0, '.')
 
 from src.core import load_grid_from_file, TileType
 from src.agents import Agent, Action
-from src.ui.renderer import Renderer, TILE_SIZE
+from src.ui.renderer import Renderer, TILE_SIZE, ZOOM_IN_KEYS, ZOOM_OUT_KEYS
+from src.data import TrajectoryRecorder
 
 
 class Game:
     """Main game class with keyboard controls."""
 
-    def __init__(self, dungeon_file: str):
+    def __init__(self, dungeon_file: str, record_dir: str | None = None):
         self.grid = load_grid_from_file(dungeon_file)
         self.renderer = Renderer(self.grid, "RL Dungeon - Play Mode")
 
@@ -31,10 +32,20 @@ class Game:
         self.font = pygame.font.Font(None, 28)
         self.small_font = pygame.font.Font(None, 22)
 
+        # Optional demonstration recording
+        self.recorder = None
+        if record_dir is not None:
+            self.recorder = TrajectoryRecorder(
+                record_dir, chunk_size=4096,
+                metadata={"dungeon": str(self.grid), "source": "human"},
+            )
+
     def reset(self):
         """Reset the game."""
         start = self.grid.start_pos
         self.agent.reset(start[0], start[1])
+        if self.recorder is not None:
+            self.recorder.end_episode()
         self.steps = 0
         self.done = False
         self.message = "Game Reset!"
@@ -45,9 +56,14 @@ class Game:
         if self.done:
             return
 
+        x, y = self.agent.x, self.agent.y
         reward, done, success = self.agent.move(action, self.grid)
         self.steps += 1
 
+        if self.recorder is not None:
+            self.recorder.append(x, y, action.value, reward, done, self.agent.hp,
+                                 self.agent.x, self.agent.y)
+
         # Set message based on result
         tile = self.grid.get_tile(self.agent.x, self.agent.y)
         if done:
@@ -67,8 +83,8 @@ class Game:
 
         self.message_timer = 90
 
-    def render_ui(self):
-        """Render the game UI."""
+    def render_ui(self) -> pygame.Rect:
+        """Render the game UI and return the panel rectangle."""
         screen = self.renderer.screen
 
         # UI background at bottom
@@ -101,9 +117,10 @@ class Game:
             self.message_timer -= 1
 
         # Controls hint
-        hint = "[Arrows: Move] [R: Reset] [ESC: Quit]"
+        hint = "[Arrows: Move] [+/-: Zoom] [R: Reset] [ESC: Quit]"
         hint_text = self.small_font.render(hint, True, (150, 150, 150))
         screen.blit(hint_text, (10, y_offset + 55))
+        return ui_rect
 
     def run(self):
         """Main game loop."""
@@ -113,6 +130,7 @@ class Game:
         self.renderer.screen = pygame.display.set_mode(
             (self.renderer.window_width, new_height)
         )
+        self.renderer.invalidate()
 
         running = True
         while running:
@@ -133,43 +151,52 @@ class Game:
                         self.handle_action(Action.LEFT)
                     elif event.key == pygame.K_RIGHT:
                         self.handle_action(Action.RIGHT)
+                    elif event.key in ZOOM_IN_KEYS:
+                        self.renderer.zoom(1)
+                    elif event.key in ZOOM_OUT_KEYS:
+                        self.renderer.zoom(-1)
 
-            # Render
-            self.renderer.screen.fill((0, 0, 0))
-            self.renderer.render_grid()
-
-            # Update renderer with agent position
+            # Render only the cells that changed, plus the UI panel
             self.renderer.set_agent(self.agent.x, self.agent.y,
                                    self.agent.hp, self.agent.max_hp)
-            self.renderer.render_agent()
-
-            # Render UI
-            self.render_ui()
+            dirty = self.renderer.render_dirty()
+            dirty.append(self.render_ui())
 
             # Update display
             self.renderer.render_fps()
-            pygame.display.flip()
+            pygame.display.update(dirty)
             self.renderer.tick(60)
 
+        if self.recorder is not None:
+            self.recorder.close()
         self.renderer.close()
 
 
 if __name__ == "__main__":
     dungeon_file = "assets/dungeons/level_02_trap.txt"
+    record_dir = None
 
-    if len(sys.argv) > 1:
-        dungeon_file = sys.argv[1]
+    args = sys.argv[1:]
+    if "--record" in args:
+        i = args.index("--record")
+        record_dir = args[i + 1]
+        del args[i:i + 2]
+    if args:
+        dungeon_file = args[0]
 
     print(f"Loading: {dungeon_file}")
     print()
     print("=== RL Dungeon ===")
     print("Arrow keys: Move")
     print("R: Reset")
+    print("+/-: Zoom")
     print("ESC: Quit")
     print()
     print("Try to reach the green GOAL!")
     print("Avoid red TRAPs, use pink HEAL spots.")
+    if record_dir:
+        print(f"Recording demonstrations to: {record_dir}")
     print()
 
-    game = Game(dungeon_file)
+    game = Game(dungeon_file, record_dir)
     game.run()
@@ -0,0 +1,52 @@
+"""Run a Q-Learning hyperparameter sweep on all CPUs.
+
+Example spec (sweep.json):
+
+    {
+        "dungeons": ["assets/dungeons"],
+        "seeds": [0, 1, 2],
+        "mode": "grid",
+        "params": {
+            "alpha": [0.05, 0.1, 0.3],
+            "gamma": [0.9, 0.99],
+            "epsilon_decay": [0.99, 0.995],
+            "max_steps": [100, 200]
+        },
+        "fixed": {"n_episodes": 500}
+    }
+
+Usage:
+    python run_sweep.py sweep.json --store results/sweep.jsonl
+    python run_sweep.py sweep.json --store results/sweep.jsonl --table-only
+
+Re-running the same command skips configurations already in the store.
+"""
+import argparse
+import sys
+sys.path.insert(0, '.')
+
+from src.experiments import SweepSpec, ResultStore, run_sweep, aggregate, format_table
+from src.experiments.sweep import DEFAULT_GROUP_BY
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Q-Learning hyperparameter sweep")
+    parser.add_argument("spec", help="Sweep spec (JSON)")
+    parser.add_argument("--store", default="results/sweep.jsonl", help="Append-only result store")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--group-by", default=",".join(DEFAULT_GROUP_BY),
+                        help="Comma-separated config fields for the aggregate table")
+    parser.add_argument("--table-only", action="store_true", help="Only print the aggregate table")
+    args = parser.parse_args()
+
+    spec = SweepSpec.load(args.spec)
+    store = ResultStore(args.store)
+    if not args.table_only:
+        run_sweep(spec, store, n_workers=args.workers)
+
+    print()
+    print(format_table(aggregate(store.records(), tuple(args.group_by.split(",")))))
+
+
+if __name__ == "__main__":
+    main()
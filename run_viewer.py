@@ -1,5 +1,13 @@
-"""Run the dungeon viewer."""
+"""Run the dungeon viewer.
+
+Usage:
+    python run_viewer.py [dungeon] [q_table.npy]
+
+With a saved Q-table (e.g. runs/<name>/q_table.npy from `python -m src.cli
+train`), the map shows the value heatmap and policy arrows.
+"""
 import sys
+import numpy as np
 sys.path.insert(0, '.')
 
 from src.core import load_grid_from_file
@@ -15,13 +23,17 @@ if __name__ == "__main__":
     print(f"Loading dungeon: {dungeon_file}")
     grid = load_grid_from_file(dungeon_file)
 
+    q_table = np.load(sys.argv[2]) if len(sys.argv) > 2 else None
+
     print("Dungeon loaded:")
     print(grid)
     print()
     print("Controls:")
     print("  Arrow keys: Move (when agent is implemented)")
     print("  R: Reset")
+    print("  +/-: Zoom")
+    print("  V: Toggle value overlay")
     print("  ESC: Quit")
     print()
 
-    run_viewer(grid)
+    run_viewer(grid, q_table)
@@ -1,9 +1,21 @@
-"""Agent module for RL Dungeon."""
-from .agent import Agent, Action, ACTION_DELTAS, random_action
+"""Agent module for RL Dungeon.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.agent': ('Agent', 'Action', 'ACTION_DELTAS', 'random_action'),
+    '.agent_batch': ('AgentBatch', 'ACTION_DX', 'ACTION_DY'),
+})
 
 __all__ = [
     'Agent',
     'Action',
     'ACTION_DELTAS',
     'random_action',
+    'AgentBatch',
+    'ACTION_DX',
+    'ACTION_DY',
 ]
@@ -1,7 +1,7 @@
 """Agent (Adventurer) for the dungeon."""
 from enum import IntEnum
 from ..core.grid import Grid
-from ..core.tiles import TileType, is_passable, get_reward
+from ..core.tiles import TILES
 
 
 class Action(IntEnum):
@@ -78,8 +78,7 @@ class Agent:
             return False
 
         # Check if tile is passable
-        tile = grid.get_tile(next_x, next_y)
-        return is_passable(tile)
+        return TILES.rows[grid.tile_id(next_x, next_y)][0]
 
     def move(self, action: Action, grid: Grid) -> tuple[float, bool, bool]:
         """Execute a move action.
@@ -96,28 +95,28 @@ class Agent:
         """
         step_reward = -0.1  # Small penalty for each step
 
-        if not self.can_move(action, grid):
+        next_x, next_y = self.get_next_position(action)
+        if grid.is_valid_position(next_x, next_y):
+            passable, tile_reward, hp_delta, lethal, terminal = TILES.rows[grid.tile_id(next_x, next_y)]
+        else:
+            passable = False
+
+        if not passable:
             # Wall bump
             self.total_reward += step_reward - 1
             return step_reward - 1, False, False
 
         # Execute move
-        self.x, self.y = self.get_next_position(action)
-
-        # Get tile at new position
-        tile = grid.get_tile(self.x, self.y)
-        tile_reward = get_reward(tile)
+        self.x, self.y = next_x, next_y
 
         # Apply tile effects
-        done = False
-        if tile == TileType.GOAL:
-            done = True
-        elif tile == TileType.TRAP:
-            self.hp -= 10
-            if self.hp <= 0:
-                done = True
-        elif tile == TileType.HEAL:
-            self.hp = min(self.hp + 10, self.max_hp)
+        if lethal:
+            self.hp = 0
+        elif hp_delta < 0:
+            self.hp += hp_delta
+        elif hp_delta > 0:
+            self.hp = min(self.hp + hp_delta, self.max_hp)
+        done = terminal or ((lethal or hp_delta < 0) and self.hp <= 0)
 
         total_step_reward = step_reward + tile_reward
         self.total_reward += total_step_reward
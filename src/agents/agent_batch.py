@@ -0,0 +1,140 @@
+"""Struct-of-arrays batch of agents stepped with vectorized NumPy ops."""
+from __future__ import annotations
+import numpy as np
+from ..core.grid import Grid
+from ..core.tiles import TileType, TILES
+from .agent import Action, ACTION_DELTAS
+
+
+# Per-action deltas indexed by action value
+ACTION_DX = np.array([ACTION_DELTAS[a][0] for a in Action], dtype=np.int64)
+ACTION_DY = np.array([ACTION_DELTAS[a][1] for a in Action], dtype=np.int64)
+
+
+class AgentBatch:
+    """N agents stored as parallel arrays.
+
+    step() applies a vector of actions with exactly Agent.move's reward and
+    HP semantics. Agents whose episode has ended (goal or death) are frozen:
+    they ignore further actions and receive zero reward until reset.
+    """
+
+    def __init__(self, n: int, x: int | np.ndarray = 0, y: int | np.ndarray = 0,
+                 hp: int = 100, max_hp: int = 100):
+        """Initialize the batch.
+
+        Args:
+            n: Number of agents
+            x: Starting x position(s)
+            y: Starting y position(s)
+            hp: Starting health points
+            max_hp: Maximum health points
+        """
+        self.n = n
+        self.x = np.empty(n, dtype=np.int64)
+        self.y = np.empty(n, dtype=np.int64)
+        self.hp = np.empty(n, dtype=np.int64)
+        self.max_hp = np.full(n, max_hp, dtype=np.int64)
+        self.total_reward = np.empty(n, dtype=np.float64)
+        self.alive = np.empty(n, dtype=bool)
+        self.done = np.empty(n, dtype=bool)
+        self.reset(x, y, hp)
+
+    @classmethod
+    def at_start(cls, grid: Grid, n: int, **kwargs) -> AgentBatch:
+        """Create n agents on the grid's start position."""
+        if grid.start_pos is None:
+            raise ValueError("Grid has no start position")
+        return cls(n, grid.start_pos[0], grid.start_pos[1], **kwargs)
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def positions(self) -> np.ndarray:
+        """Current positions as an (n, 2) array of (x, y)."""
+        return np.stack([self.x, self.y], axis=1)
+
+    def reset(self, x: int | np.ndarray, y: int | np.ndarray, hp: int | None = None,
+              mask: np.ndarray | None = None):
+        """Reset agents to new positions with full (or given) HP.
+
+        Args:
+            x: New x position(s)
+            y: New y position(s)
+            hp: HP to reset to (default: max_hp)
+            mask: Optional boolean mask selecting the agents to reset
+        """
+        sel = slice(None) if mask is None else mask
+        self.x[sel] = x
+        self.y[sel] = y
+        self.hp[sel] = self.max_hp[sel] if hp is None else hp
+        self.total_reward[sel] = 0.0
+        self.alive[sel] = self.hp[sel] > 0
+        self.done[sel] = False
+
+    def next_positions(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the positions each agent would move to."""
+        return self.x + ACTION_DX[actions], self.y + ACTION_DY[actions]
+
+    def step(
+        self,
+        actions: np.ndarray,
+        grid: Grid,
+        blocked: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply one action per agent.
+
+        Args:
+            actions: Integer array of shape (n,) with values 0-3
+            grid: The grid to move on
+            blocked: Optional boolean mask of agents whose move is refused
+                (treated like a wall bump, e.g. for collisions)
+
+        Returns:
+            Tuple of (reward, done, success) arrays of shape (n,)
+            - reward: The reward for this step
+            - done: True for agents whose episode ended on this step
+            - success: True if the move was successful
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        active = ~self.done
+        nx, ny = self.next_positions(actions)
+
+        in_bounds = (nx >= 0) & (nx < grid.width) & (ny >= 0) & (ny < grid.height)
+        ids = np.full(self.n, TileType.WALL.value, dtype=np.intp)
+        ids[in_bounds] = grid.tile_ids(nx[in_bounds], ny[in_bounds])
+
+        passable = TILES.passable[ids]
+        if blocked is not None:
+            passable &= ~blocked
+        moved = active & passable
+        bumped = active & ~passable
+
+        step_reward = -0.1
+        reward = np.zeros(self.n, dtype=np.float64)
+        reward[bumped] = step_reward - 1
+
+        # Execute moves
+        self.x[moved] = nx[moved]
+        self.y[moved] = ny[moved]
+        tile = ids[moved]
+        reward[moved] = step_reward + TILES.reward[tile]
+
+        # Apply tile effects
+        hp = self.hp[moved]
+        delta = TILES.hp_delta[tile]
+        lethal = TILES.lethal[tile]
+        hp = np.where(delta < 0, hp + delta, hp)
+        hp = np.where(delta > 0, np.minimum(hp + delta, self.max_hp[moved]), hp)
+        hp = np.where(lethal, 0, hp)
+        self.hp[moved] = hp
+
+        done = np.zeros(self.n, dtype=bool)
+        done[moved] = TILES.terminal[tile] | ((lethal | (delta < 0)) & (hp <= 0))
+
+        self.total_reward += reward
+        self.alive = self.hp > 0
+        self.done |= done
+
+        return reward, done, moved
@@ -1,6 +1,41 @@
-"""Reinforcement Learning algorithms."""
-from .q_learning import QLearning
+"""Reinforcement Learning algorithms.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.q_learning': ('QLearning',),
+    '.grid_model': ('DerivedArtifact', 'TransitionTable', 'DistanceField', 'UNREACHABLE'),
+    '.mcts': ('MCTS',),
+    '.dqn': ('MLP', 'DQN'),
+    '.hogwild': ('train_hogwild',),
+    '.actor_learner': ('ActorLearner',),
+    '.replay_buffer': ('Batch', 'ReplayBuffer', 'PrioritizedReplayBuffer', 'SumTree', 'tabular_replay'),
+    '.lfd': ('Demonstrations', 'MixedReplay', 'load_demonstrations', 'pretrain_from_demos',
+        'train_with_demos'),
+})
 
 __all__ = [
     'QLearning',
+    'DerivedArtifact',
+    'TransitionTable',
+    'DistanceField',
+    'UNREACHABLE',
+    'MCTS',
+    'MLP',
+    'DQN',
+    'train_hogwild',
+    'ActorLearner',
+    'Batch',
+    'ReplayBuffer',
+    'PrioritizedReplayBuffer',
+    'SumTree',
+    'tabular_replay',
+    'Demonstrations',
+    'MixedReplay',
+    'load_demonstrations',
+    'pretrain_from_demos',
+    'train_with_demos',
 ]
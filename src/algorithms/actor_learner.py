@@ -0,0 +1,391 @@
+"""Actor-learner pipeline: parallel rollout processes feeding one learner."""
+from __future__ import annotations
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection, wait
+from typing import Callable
+import numpy as np
+
+from ..env.dungeon_env import DungeonEnv
+from .dqn import DQN
+from .q_learning import QLearning
+
+
+class ActorLearner:
+    """Decouples simulation from learning (Ape-X style).
+
+    Actor processes roll out episodes with a snapshot of the learner's
+    parameters and stream transition batches over their own pipe; the
+    learner applies them and periodically publishes new parameters to a
+    shared-memory block. Each actor may have a bounded number of batches
+    in flight and blocks when it runs out of credits (backpressure). Dead
+    actors are restarted, and throughput and policy lag are counted.
+
+    Actors never hold a lock the learner needs: parameters are published
+    with a sequence counter (readers retry torn copies) and every actor
+    has a private channel, so a crashed or killed actor cannot stall the
+    pipeline.
+
+    Works with QLearning (batched TD updates on the Q-table) and DQN
+    (batches go into its replay buffer, followed by gradient steps).
+    """
+
+    def __init__(
+        self,
+        learner: QLearning | DQN,
+        n_actors: int = 4,
+        batch_size: int = 256,
+        queue_size: int = 16,
+        publish_every: int = 1,
+        max_steps: int = 200,
+        epsilon: float = 0.4,
+        epsilon_alpha: float = 7.0,
+        seed: int | None = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            learner: QLearning or DQN agent trained in this process
+            n_actors: Number of actor processes
+            batch_size: Transitions per message from an actor
+            queue_size: Batches an actor may have in flight before it blocks
+            publish_every: Applied batches between parameter publishes
+            max_steps: Maximum steps per actor episode (QLearning only;
+                DQN actors use the env's max_steps)
+            epsilon: Base exploration rate; actor i explores with
+                epsilon ** (1 + epsilon_alpha * i / (n_actors - 1))
+            epsilon_alpha: Spread of the per-actor exploration rates
+            seed: Seed for the per-actor RNG streams
+        """
+        self.learner = learner
+        self.n_actors = n_actors
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.publish_every = publish_every
+        self.max_steps = max_steps
+        spread = np.arange(n_actors) / max(n_actors - 1, 1)
+        self.epsilons = (epsilon ** (1.0 + epsilon_alpha * spread)).tolist()
+        self._seeds = np.random.SeedSequence(seed)
+
+        if isinstance(learner, DQN):
+            self.params = learner.q_net.params
+            env = learner.env
+            self._spec = ('dqn', dict(
+                grid=env.grid, max_steps=env.max_steps, obs_type=env.obs_type,
+                view_radius=getattr(env, 'view_radius', 2),
+            ), learner.q_net.sizes[1:-1])
+        else:
+            self.params = learner.q_table
+            self._spec = ('tabular', dict(grid=learner.grid, max_steps=max_steps), None)
+
+        self.actors: list[mp.Process] = []
+        self.version = 0
+
+    def run(
+        self,
+        n_transitions: int | None = 100_000,
+        duration: float | None = None,
+        verbose: bool = True,
+        callback: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """Run actors and learner until a transition or time budget is used.
+
+        Args:
+            n_transitions: Stop after applying this many transitions
+            duration: Stop after this many seconds
+            verbose: Print a summary when done
+            callback: Optional callback(stats) after every applied batch
+
+        Returns:
+            Training statistics as returned by QLearning.train (actor
+            episodes in arrival order) plus throughput counters
+        """
+        if n_transitions is None and duration is None:
+            raise ValueError("Give n_transitions and/or duration")
+
+        ctx = mp.get_context()
+        shm = shared_memory.SharedMemory(create=True, size=self.params.nbytes)
+        shared = np.ndarray(self.params.shape, dtype=self.params.dtype, buffer=shm.buf)
+        self._sequence = ctx.RawArray('q', 2)  # [sequence counter, version]
+        self._stop = ctx.Event()
+        self._channels: list[tuple[Connection, object]] = []
+        self._shm = shm
+        self._shared = shared
+        self._ctx = ctx
+        self.version = 0
+        self._publish()
+
+        stats = {
+            'episode_rewards': [], 'episode_steps': [], 'total_successes': 0,
+            'transitions': 0, 'batches': 0, 'restarts': 0, 'versions': 0,
+            'policy_lag_mean': 0.0, 'policy_lag_max': 0, 'backpressure_wait': 0.0,
+        }
+        lag_sum = 0
+        start = time.perf_counter()
+        try:
+            for i in range(self.n_actors):
+                self._spawn(i)
+            while True:
+                elapsed = time.perf_counter() - start
+                if (n_transitions is not None and stats['transitions'] >= n_transitions) or \
+                        (duration is not None and elapsed >= duration):
+                    break
+                self._restart_dead(stats)
+                message = self._receive(timeout=0.1)
+                if message is None:
+                    continue
+                actor_version, columns, episodes, waited = message
+
+                self._apply(columns)
+                n = columns['action'].size
+                lag = self.version - actor_version
+                lag_sum += lag
+                stats['transitions'] += n
+                stats['batches'] += 1
+                stats['policy_lag_max'] = max(stats['policy_lag_max'], lag)
+                stats['backpressure_wait'] += waited
+                for reward, steps, success in episodes:
+                    stats['episode_rewards'].append(reward)
+                    stats['episode_steps'].append(steps)
+                    stats['total_successes'] += success
+
+                if stats['batches'] % self.publish_every == 0:
+                    self._publish()
+                if callback:
+                    stats['policy_lag_mean'] = lag_sum / stats['batches']
+                    callback(stats)
+        finally:
+            self._shutdown()
+            del shared
+            self._shared = None
+            shm.close()
+            shm.unlink()
+
+        wall_time = time.perf_counter() - start
+        stats['versions'] = self.version
+        stats['policy_lag_mean'] = lag_sum / max(stats['batches'], 1)
+        stats['wall_time'] = wall_time
+        stats['transitions_per_sec'] = stats['transitions'] / wall_time if wall_time > 0 else 0.0
+
+        if verbose:
+            print(f"Actor-learner: {stats['transitions']} transitions in {wall_time:.1f}s "
+                  f"({stats['transitions_per_sec']:.0f}/s) | "
+                  f"Episodes: {len(stats['episode_rewards'])} | "
+                  f"Policy lag: {stats['policy_lag_mean']:.1f} | "
+                  f"Restarts: {stats['restarts']}")
+        return stats
+
+    # -- Learner side ------------------------------------------------------
+
+    def _apply(self, columns: dict[str, np.ndarray]) -> None:
+        learner = self.learner
+        if isinstance(learner, DQN):
+            learner.buffer.add_batch(columns['obs'], columns['action'], columns['reward'],
+                                     columns['next_obs'], columns['done'])
+            learner.total_steps += columns['action'].size
+            if len(learner.buffer) >= learner.learning_starts:
+                for _ in range(max(columns['action'].size // learner.train_freq, 1)):
+                    learner.train_step()
+        else:
+            learner.batch_update(columns['x'], columns['y'], columns['action'], columns['reward'],
+                                 columns['next_x'], columns['next_y'], columns['done'])
+
+    def _publish(self) -> None:
+        """Copy the learner's parameters to the actors' shared snapshot."""
+        sequence = self._sequence
+        sequence[0] += 1  # odd while writing
+        np.copyto(self._shared, self.params)
+        self.version += 1
+        sequence[1] = self.version
+        sequence[0] += 1
+
+    def _receive(self, timeout: float) -> tuple | None:
+        """Next batch from any actor, or None if none arrived in time."""
+        readers = {conn: i for i, (conn, _) in enumerate(self._channels) if conn is not None}
+        for conn in wait(list(readers), timeout):
+            i = readers[conn]
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                # The actor died; _restart_dead replaces it
+                conn.close()
+                self._channels[i] = (None, None)
+                continue
+            self._channels[i][1].release()
+            return message
+        return None
+
+    def _spawn(self, actor_id: int) -> None:
+        seed = int(self._seeds.spawn(1)[0].generate_state(1)[0])
+        reader, writer = self._ctx.Pipe(duplex=False)
+        credits = self._ctx.Semaphore(self.queue_size)
+        process = self._ctx.Process(
+            target=_actor_loop,
+            args=(self._spec, self._shm.name, self.params.shape, self.params.dtype.str,
+                  self._sequence, writer, credits, self._stop, seed,
+                  self.epsilons[actor_id], self.batch_size),
+            name=f'actor-{actor_id}',
+            daemon=True,
+        )
+        process.start()
+        # Only the actor may hold the write end, so its death shows up as EOF
+        writer.close()
+        if actor_id < len(self.actors):
+            self.actors[actor_id] = process
+            self._channels[actor_id] = (reader, credits)
+        else:
+            self.actors.append(process)
+            self._channels.append((reader, credits))
+
+    def _restart_dead(self, stats: dict) -> None:
+        for i, process in enumerate(self.actors):
+            if not process.is_alive():
+                process.join()
+                reader = self._channels[i][0]
+                if reader is not None:
+                    reader.close()
+                self._spawn(i)
+                stats['restarts'] += 1
+
+    def _shutdown(self) -> None:
+        self._stop.set()
+        deadline = time.perf_counter() + 5.0
+        # Drain so actors blocked mid-send can see the stop flag
+        while any(p.is_alive() for p in self.actors) and time.perf_counter() < deadline:
+            self._receive(timeout=0.05)
+        for process in self.actors:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for reader, _ in self._channels:
+            if reader is not None:
+                reader.close()
+        self.actors = []
+        self._channels = []
+
+
+# -- Actor side ----------------------------------------------------------------
+
+def _actor_loop(spec, shm_name, shape, dtype, sequence, writer, credits, stop,
+                seed, epsilon, batch_size) -> None:
+    kind, env_kwargs, hidden = spec
+    shm = shared_memory.SharedMemory(name=shm_name)
+    shared = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        env = DungeonEnv(**env_kwargs)
+        if kind == 'dqn':
+            agent = DQN(env, hidden=hidden, epsilon=epsilon, epsilon_min=epsilon,
+                        buffer_size=1, seed=seed)
+            params = agent.q_net.params
+        else:
+            agent = QLearning(env.grid, epsilon=epsilon, epsilon_min=epsilon, seed=seed)
+            params = agent.q_table
+
+        version = -1
+        waited = 0.0
+        batch = _Batch(kind, batch_size, env)
+        while not stop.is_set():
+            # Refresh the policy snapshot between episodes
+            if sequence[1] != version:
+                version = _read_snapshot(sequence, shared, params)
+
+            obs, _ = env.reset()
+            total_reward, steps = 0.0, 0
+            while True:
+                x, y = env.agent.x, env.agent.y
+                if kind == 'dqn':
+                    action = agent.select_action(obs)
+                    next_obs, reward, terminated, truncated, _ = env.step(action)
+                else:
+                    action = agent.select_action(x, y).value
+                    reward, terminated, truncated = env.advance(action)
+                    next_obs = None
+                total_reward += reward
+                steps += 1
+                batch.add(obs, x, y, action, reward, next_obs, env.agent.x, env.agent.y, terminated)
+                obs = next_obs
+                if batch.full:
+                    sent, blocked = _send(writer, credits, stop, (version, batch.columns(), batch.episodes, waited))
+                    if not sent:
+                        return
+                    waited = blocked
+                    batch = _Batch(kind, batch_size, env)
+                if terminated or truncated:
+                    break
+            success = terminated and env.agent.hp > 0 and (env.agent.x, env.agent.y) == env.grid.goal_pos
+            batch.episodes.append((total_reward, steps, bool(success)))
+    finally:
+        del shared
+        shm.close()
+        writer.close()
+
+
+def _read_snapshot(sequence, shared: np.ndarray, params: np.ndarray) -> int:
+    """Copy a consistent parameter snapshot; returns its version."""
+    while True:
+        before = sequence[0]
+        if before % 2 == 0:
+            version = sequence[1]
+            np.copyto(params, shared)
+            if sequence[0] == before:
+                return version
+        time.sleep(0)
+
+
+def _send(writer: Connection, credits, stop, message) -> tuple[bool, float]:
+    """Send once a credit is free; gives up when asked to stop.
+
+    Returns:
+        Whether the message was sent, and seconds spent blocked
+    """
+    start = time.perf_counter()
+    while not stop.is_set():
+        if credits.acquire(timeout=0.1):
+            writer.send(message)
+            return True, time.perf_counter() - start
+    return False, time.perf_counter() - start
+
+
+class _Batch:
+    """Preallocated columns for one actor message."""
+
+    def __init__(self, kind: str, size: int, env: DungeonEnv):
+        self.kind = kind
+        self.n = 0
+        self.size = size
+        self.episodes: list[tuple[float, int, bool]] = []
+        self.action = np.zeros(size, dtype=np.int64)
+        self.reward = np.zeros(size, dtype=np.float64)
+        self.done = np.zeros(size, dtype=bool)
+        if kind == 'dqn':
+            shape = (size,) + env.observation_space.shape
+            dtype = np.float32 if env.obs_type == 'position' else np.int16
+            self.obs = np.zeros(shape, dtype=dtype)
+            self.next_obs = np.zeros(shape, dtype=dtype)
+        else:
+            self.pos = np.zeros((4, size), dtype=np.int64)
+
+    @property
+    def full(self) -> bool:
+        return self.n == self.size
+
+    def add(self, obs, x, y, action, reward, next_obs, next_x, next_y, done) -> None:
+        i = self.n
+        if self.kind == 'dqn':
+            self.obs[i] = obs
+            self.next_obs[i] = next_obs
+        else:
+            self.pos[:, i] = (x, y, next_x, next_y)
+        self.action[i] = action
+        self.reward[i] = reward
+        self.done[i] = done
+        self.n = i + 1
+
+    def columns(self) -> dict[str, np.ndarray]:
+        columns = {'action': self.action, 'reward': self.reward, 'done': self.done}
+        if self.kind == 'dqn':
+            columns.update(obs=self.obs, next_obs=self.next_obs)
+        else:
+            columns.update(x=self.pos[0], y=self.pos[1], next_x=self.pos[2], next_y=self.pos[3])
+        return columns
@@ -0,0 +1,386 @@
+"""Deep Q-Network with a pure NumPy multilayer perceptron."""
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable
+import numpy as np
+
+from ..core.tiles import TILES
+from ..env.dungeon_env import DungeonEnv
+from .replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+
+
+class MLP:
+    """Fully connected ReLU network trained with Adam.
+
+    All weights live in one flat parameter vector (with per-layer views),
+    and gradients and Adam moments in matching flat vectors, so copying a
+    network or applying an optimizer step is a handful of in-place array
+    operations. Activation buffers are allocated once per batch size and
+    reused on every call.
+    """
+
+    def __init__(self, sizes: tuple[int, ...], seed: int | None = None):
+        """Initialize with He-scaled random weights.
+
+        Args:
+            sizes: Layer widths from input to output
+            seed: Initialization seed
+        """
+        self.sizes = tuple(sizes)
+        shapes = []
+        for n_in, n_out in zip(sizes[:-1], sizes[1:]):
+            shapes += [(n_in, n_out), (n_out,)]
+        n_params = sum(int(np.prod(s)) for s in shapes)
+
+        self.params = np.zeros(n_params, dtype=np.float32)
+        self.grads = np.zeros(n_params, dtype=np.float32)
+        self.weights = self._views(self.params, shapes)
+        self.grad_views = self._views(self.grads, shapes)
+
+        rng = np.random.default_rng(seed)
+        for w in self.weights[::2]:
+            w[:] = rng.normal(0.0, np.sqrt(2.0 / w.shape[0]), w.shape)
+
+        # Adam state
+        self._m = np.zeros_like(self.params)
+        self._v = np.zeros_like(self.params)
+        self._tmp = np.zeros_like(self.params)
+        self._t = 0
+
+        self._buffers: dict[int, tuple[list[np.ndarray], list[np.ndarray], list[np.ndarray]]] = {}
+
+    @staticmethod
+    def _views(flat: np.ndarray, shapes: list[tuple[int, ...]]) -> list[np.ndarray]:
+        views, offset = [], 0
+        for shape in shapes:
+            size = int(np.prod(shape))
+            views.append(flat[offset:offset + size].reshape(shape))
+            offset += size
+        return views
+
+    @property
+    def n_layers(self) -> int:
+        return len(self.sizes) - 1
+
+    def _batch_buffers(self, n: int):
+        buffers = self._buffers.get(n)
+        if buffers is None:
+            acts = [np.zeros((n, size), dtype=np.float32) for size in self.sizes[1:]]
+            deltas = [np.zeros((n, size), dtype=np.float32) for size in self.sizes[1:-1]]
+            masks = [np.zeros((n, size), dtype=bool) for size in self.sizes[1:-1]]
+            buffers = self._buffers[n] = (acts, deltas, masks)
+        return buffers
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """Compute outputs for a batch of inputs.
+
+        The returned array is an internal buffer that is overwritten by the
+        next call with the same batch size; copy it to keep it.
+        """
+        self._input = x
+        acts = self._batch_buffers(x.shape[0])[0]
+        h = x
+        for i in range(self.n_layers):
+            w, b = self.weights[2 * i], self.weights[2 * i + 1]
+            out = acts[i]
+            np.matmul(h, w, out=out)
+            out += b
+            if i < self.n_layers - 1:
+                np.maximum(out, 0.0, out=out)
+            h = out
+        return h
+
+    def backward(self, grad_out: np.ndarray) -> None:
+        """Backpropagate output gradients of the last forward() into grads."""
+        acts, deltas, masks = self._batch_buffers(grad_out.shape[0])
+        g = grad_out
+        for i in reversed(range(self.n_layers)):
+            h = acts[i - 1] if i > 0 else self._input
+            np.matmul(h.T, g, out=self.grad_views[2 * i])
+            np.sum(g, axis=0, out=self.grad_views[2 * i + 1])
+            if i > 0:
+                np.matmul(g, self.weights[2 * i].T, out=deltas[i - 1])
+                np.greater(acts[i - 1], 0.0, out=masks[i - 1])
+                deltas[i - 1] *= masks[i - 1]
+                g = deltas[i - 1]
+
+    def adam_step(self, lr: float, beta1: float = 0.9, beta2: float = 0.999, eps: float = 1e-8) -> None:
+        """Apply one Adam update from the current gradients."""
+        self._t += 1
+        m, v, tmp = self._m, self._v, self._tmp
+        m *= beta1
+        m += (1.0 - beta1) * self.grads
+        np.multiply(self.grads, self.grads, out=tmp)
+        v *= beta2
+        v += (1.0 - beta2) * tmp
+        step = lr * np.sqrt(1.0 - beta2 ** self._t) / (1.0 - beta1 ** self._t)
+        np.sqrt(v, out=tmp)
+        tmp += eps
+        np.divide(m, tmp, out=tmp)
+        tmp *= step
+        self.params -= tmp
+
+    def copy_from(self, other: MLP) -> None:
+        """Copy another network's parameters (e.g. into a target network)."""
+        np.copyto(self.params, other.params)
+
+
+class DQN:
+    """Deep Q-Network for DungeonEnv.
+
+    Uses experience replay, a periodically synced target network and
+    (by default) double-Q targets with a Huber loss. Tile-id observations
+    ("grid" and "local") are one-hot encoded per cell; "position"
+    observations are used as is. Unlike QLearning, the network size does
+    not grow with the dungeon when using "local" observations.
+    """
+
+    def __init__(
+        self,
+        env: DungeonEnv,
+        hidden: tuple[int, ...] = (128, 128),
+        lr: float = 1e-3,
+        gamma: float = 0.99,
+        epsilon: float = 1.0,
+        epsilon_min: float = 0.05,
+        epsilon_decay: float = 0.995,
+        buffer_size: int = 50_000,
+        batch_size: int = 64,
+        learning_starts: int = 1000,
+        train_freq: int = 1,
+        target_update: int = 500,
+        double: bool = True,
+        prioritized: bool = False,
+        seed: int | None = None,
+    ):
+        """Initialize the DQN agent.
+
+        Args:
+            env: Environment to train in
+            hidden: Hidden layer widths
+            lr: Adam learning rate
+            gamma: Discount factor
+            epsilon: Initial exploration rate
+            epsilon_min: Minimum epsilon value
+            epsilon_decay: Epsilon decay per episode
+            buffer_size: Replay buffer capacity
+            batch_size: Minibatch size
+            learning_starts: Transitions collected before training starts
+            train_freq: Environment steps per gradient step
+            target_update: Gradient steps between target network syncs
+            double: Use double-Q targets
+            prioritized: Use prioritized replay
+            seed: Seed for initialization, exploration and sampling
+        """
+        self.env = env
+        self.lr = lr
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        self.batch_size = batch_size
+        self.learning_starts = learning_starts
+        self.train_freq = train_freq
+        self.target_update = target_update
+        self.double = double
+        self.rng = np.random.default_rng(seed)
+        self.n_actions = env.action_space.n
+
+        obs_shape = env.observation_space.shape
+        self.one_hot = env.obs_type in ("grid", "local")
+        if self.one_hot:
+            # Class 0 is the agent marker (-1), the rest are tile ids
+            self.n_classes = len(TILES) + 1
+            self._eye = np.eye(self.n_classes, dtype=np.float32)
+            self._encoded: dict[int, np.ndarray] = {}
+            n_inputs = int(np.prod(obs_shape)) * self.n_classes
+            obs_dtype = np.int16
+        else:
+            n_inputs = int(np.prod(obs_shape))
+            obs_dtype = np.float32
+
+        sizes = (n_inputs, *hidden, self.n_actions)
+        self.q_net = MLP(sizes, seed=seed)
+        self.target_net = MLP(sizes)
+        self.target_net.copy_from(self.q_net)
+
+        buffer_cls = PrioritizedReplayBuffer if prioritized else ReplayBuffer
+        self.buffer = buffer_cls(buffer_size, obs_shape=obs_shape, obs_dtype=obs_dtype, seed=seed)
+        self._grad_out = np.zeros((batch_size, self.n_actions), dtype=np.float32)
+        self._rows = np.arange(batch_size)
+
+        self.n_updates = 0
+        self.total_steps = 0
+        self.episode_rewards: list[float] = []
+        self.episode_steps: list[int] = []
+
+    def encode(self, obs: np.ndarray) -> np.ndarray:
+        """Turn a batch of observations into network inputs."""
+        n = obs.shape[0]
+        if not self.one_hot:
+            return obs.reshape(n, -1).astype(np.float32, copy=False)
+        out = self._encoded.get(n)
+        cells = obs[0].size
+        if out is None:
+            out = self._encoded[n] = np.zeros((n, cells, self.n_classes), dtype=np.float32)
+        np.take(self._eye, obs.reshape(n, cells) + 1, axis=0, out=out)
+        return out.reshape(n, -1)
+
+    def q_values(self, obs: np.ndarray) -> np.ndarray:
+        """Q-values of a single observation."""
+        return self.q_net.forward(self.encode(obs[None])).copy()[0]
+
+    def select_action(self, obs: np.ndarray) -> int:
+        """Select an action using epsilon-greedy policy."""
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.n_actions))
+        return self.get_best_action(obs)
+
+    def get_best_action(self, obs: np.ndarray) -> int:
+        """Get the greedy action for an observation."""
+        return int(np.argmax(self.q_net.forward(self.encode(obs[None]))[0]))
+
+    def train_step(self) -> np.ndarray:
+        """One gradient step on a replayed minibatch.
+
+        Returns:
+            TD errors of the batch
+        """
+        batch = self.buffer.sample(self.batch_size)
+
+        # Next-state values (online net picks, target net evaluates)
+        next_inputs = self.encode(batch.next_obs)
+        if self.double:
+            next_actions = self.q_net.forward(next_inputs).argmax(axis=1)
+            next_q = self.target_net.forward(next_inputs)[self._rows, next_actions]
+        else:
+            next_q = self.target_net.forward(next_inputs).max(axis=1)
+        targets = batch.reward + self.gamma * next_q * ~batch.done
+
+        q = self.q_net.forward(self.encode(batch.obs))
+        td_errors = q[self._rows, batch.action] - targets
+
+        # Huber loss gradient, importance-weighted and averaged over the batch
+        grad = self._grad_out
+        grad.fill(0.0)
+        grad[self._rows, batch.action] = np.clip(td_errors, -1.0, 1.0) * batch.weights / self.batch_size
+        self.q_net.backward(grad)
+        self.q_net.adam_step(self.lr)
+
+        if isinstance(self.buffer, PrioritizedReplayBuffer):
+            self.buffer.update_priorities(batch.indices, td_errors)
+
+        self.n_updates += 1
+        if self.n_updates % self.target_update == 0:
+            self.target_net.copy_from(self.q_net)
+        return td_errors
+
+    def decay_epsilon(self):
+        """Decay epsilon after each episode."""
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+
+    def run_episode(self, train: bool = True) -> tuple[float, int, bool]:
+        """Run a single episode in the environment.
+
+        Args:
+            train: Explore, store transitions and update the network
+
+        Returns:
+            Tuple of (total_reward, steps, success)
+        """
+        env = self.env
+        obs, _ = env.reset()
+        total_reward = 0.0
+        steps = 0
+        while True:
+            action = self.select_action(obs) if train else self.get_best_action(obs)
+            next_obs, reward, terminated, truncated, _ = env.step(action)
+            total_reward += reward
+            steps += 1
+
+            if train:
+                self.buffer.add(obs, action, reward, next_obs, terminated)
+                self.total_steps += 1
+                if len(self.buffer) >= self.learning_starts and self.total_steps % self.train_freq == 0:
+                    self.train_step()
+
+            obs = next_obs
+            if terminated or truncated:
+                break
+
+        success = terminated and env.agent.hp > 0 and (env.agent.x, env.agent.y) == env.grid.goal_pos
+        return total_reward, steps, success
+
+    def train(
+        self,
+        n_episodes: int = 1000,
+        verbose: bool = True,
+        callback: Callable[[int, float, int, bool], None] | None = None,
+    ) -> dict:
+        """Train the agent for multiple episodes.
+
+        Args:
+            n_episodes: Number of episodes to train
+            verbose: Print progress
+            callback: Optional callback(episode, reward, steps, success)
+
+        Returns:
+            Training statistics
+        """
+        self.episode_rewards = []
+        self.episode_steps = []
+        successes = 0
+
+        for episode in range(n_episodes):
+            reward, steps, success = self.run_episode(train=True)
+            self.episode_rewards.append(reward)
+            self.episode_steps.append(steps)
+            if success:
+                successes += 1
+
+            self.decay_epsilon()
+
+            if callback:
+                callback(episode, reward, steps, success)
+
+            if verbose and (episode + 1) % 100 == 0:
+                print(f"Episode {episode + 1}/{n_episodes} | "
+                      f"Avg Reward: {np.mean(self.episode_rewards[-100:]):.1f} | "
+                      f"Avg Steps: {np.mean(self.episode_steps[-100:]):.1f} | "
+                      f"Epsilon: {self.epsilon:.3f} | "
+                      f"Updates: {self.n_updates}")
+
+        return {
+            'episode_rewards': self.episode_rewards,
+            'episode_steps': self.episode_steps,
+            'total_successes': successes,
+            'final_epsilon': self.epsilon,
+        }
+
+    def test(self, n_episodes: int = 100) -> dict:
+        """Test the trained agent (no exploration, no learning).
+
+        Returns:
+            Test statistics
+        """
+        results = [self.run_episode(train=False) for _ in range(n_episodes)]
+        rewards, steps, successes = zip(*results)
+        return {
+            'mean_reward': np.mean(rewards),
+            'std_reward': np.std(rewards),
+            'mean_steps': np.mean(steps),
+            'success_rate': sum(successes) / n_episodes,
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Save the network parameters to an .npz file."""
+        np.savez(path, params=self.q_net.params, sizes=np.array(self.q_net.sizes))
+
+    def load(self, path: str | Path) -> None:
+        """Load parameters written by save() into both networks."""
+        with np.load(path) as data:
+            if tuple(data['sizes']) != self.q_net.sizes:
+                raise ValueError(f"Saved network has layer sizes {tuple(data['sizes'])}, "
+                                 f"expected {self.q_net.sizes}")
+            np.copyto(self.q_net.params, data['params'])
+        self.target_net.copy_from(self.q_net)
@@ -0,0 +1,193 @@
+"""Derived dungeon data that is patched incrementally when the grid changes."""
+from __future__ import annotations
+import heapq
+from collections import deque
+import numpy as np
+from ..core.grid import Grid
+from ..core.tiles import TileType, TILES
+from ..agents.agent import Action, ACTION_DELTAS
+
+
+# Marker for cells the goal cannot be reached from
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class DerivedArtifact:
+    """Base class for data computed from a Grid.
+
+    The artifact subscribes to the grid's edit notifications and queues the
+    edited cells. Calling refresh() patches only the affected neighborhood
+    instead of rebuilding everything.
+    """
+
+    def __init__(self, grid: Grid):
+        """Build the artifact and start tracking edits.
+
+        Args:
+            grid: The grid the data is derived from
+        """
+        self.grid = grid
+        self._pending: set[tuple[int, int]] = set()
+        self._goal_moved = False
+        self.rebuild()
+        self.version = grid.version
+        grid.add_listener(self._on_edit)
+
+    def _on_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType) -> None:
+        """Queue an edited cell for the next refresh()."""
+        self._pending.add((x, y))
+        if TileType.GOAL in (old_tile, new_tile):
+            self._goal_moved = True
+
+    @property
+    def is_stale(self) -> bool:
+        """True if the grid changed since the last refresh()."""
+        return self.version != self.grid.version
+
+    def refresh(self) -> None:
+        """Bring the artifact up to date with the grid."""
+        if self._pending:
+            cells = self._pending
+            self._pending = set()
+            self.patch(cells)
+            self._goal_moved = False
+        self.version = self.grid.version
+
+    def detach(self) -> None:
+        """Stop tracking grid edits."""
+        self.grid.remove_listener(self._on_edit)
+
+    def rebuild(self) -> None:
+        """Recompute everything from scratch."""
+        raise NotImplementedError
+
+    def patch(self, cells: set[tuple[int, int]]) -> None:
+        """Update the data around the given edited cells."""
+        raise NotImplementedError
+
+
+class TransitionTable(DerivedArtifact):
+    """Deterministic (state, action) -> (next_state, reward, terminal) table.
+
+    Rewards follow Agent.move: -0.1 per step plus the tile reward, and -1.1
+    for bumping into a wall or the border. HP effects are not included.
+    """
+
+    def rebuild(self) -> None:
+        """Compute every row of the table."""
+        n_states = self.grid.width * self.grid.height
+        self.next_state = np.zeros((n_states, len(Action)), dtype=np.int64)
+        self.reward = np.zeros((n_states, len(Action)), dtype=np.float64)
+        self.terminal = np.zeros((n_states, len(Action)), dtype=bool)
+        for state in range(n_states):
+            self._compute_row(state)
+
+    def patch(self, cells: set[tuple[int, int]]) -> None:
+        """Recompute the rows whose moves lead into an edited cell."""
+        rows = set()
+        for x, y in cells:
+            for dx, dy in ACTION_DELTAS.values():
+                if self.grid.is_valid_position(x - dx, y - dy):
+                    rows.add((y - dy) * self.grid.width + (x - dx))
+        for state in rows:
+            self._compute_row(state)
+
+    def _compute_row(self, state: int) -> None:
+        x, y = state % self.grid.width, state // self.grid.width
+        for action, (dx, dy) in ACTION_DELTAS.items():
+            nx, ny = x + dx, y + dy
+            if not self.grid.is_valid_position(nx, ny) or not TILES.rows[self.grid.tile_id(nx, ny)][0]:
+                self.next_state[state, action] = state
+                self.reward[state, action] = -1.1
+                self.terminal[state, action] = False
+            else:
+                _, tile_reward, _, _, terminal = TILES.rows[self.grid.tile_id(nx, ny)]
+                self.next_state[state, action] = ny * self.grid.width + nx
+                self.reward[state, action] = -0.1 + tile_reward
+                self.terminal[state, action] = terminal
+
+
+class DistanceField(DerivedArtifact):
+    """Shortest-path distance (in steps) from every cell to the goal.
+
+    Cells that cannot reach the goal, including walls, hold UNREACHABLE.
+    """
+
+    def rebuild(self) -> None:
+        """Run a full breadth-first search from the goal."""
+        self.distances = np.full((self.grid.height, self.grid.width), UNREACHABLE, dtype=np.int32)
+        goal = self.grid.goal_pos
+        if goal is None:
+            return
+
+        self.distances[goal[1], goal[0]] = 0
+        queue = deque([goal])
+        while queue:
+            x, y = queue.popleft()
+            d = self.distances[y, x] + 1
+            for nx, ny in self._open_neighbors(x, y):
+                if self.distances[ny, nx] > d:
+                    self.distances[ny, nx] = d
+                    queue.append((nx, ny))
+
+    def patch(self, cells: set[tuple[int, int]]) -> None:
+        """Repair distances locally around the edited cells.
+
+        Cells whose shortest path ran through a newly blocked cell are
+        invalidated first, then distances are re-grown from the intact
+        boundary, which also propagates shortcuts through newly opened cells.
+        """
+        if self._goal_moved:
+            self.rebuild()
+            return
+
+        dist = self.distances
+        invalid = deque()
+        frontier = set()
+        for x, y in cells:
+            if not TILES.rows[self.grid.tile_id(x, y)][0]:
+                if dist[y, x] != UNREACHABLE:
+                    invalid.append((x, y, int(dist[y, x])))
+                    dist[y, x] = UNREACHABLE
+            else:
+                frontier.add((x, y))
+
+        # Invalidate cells that lost every neighbor one step closer to the goal
+        while invalid:
+            x, y, d = invalid.popleft()
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny, nx] == d + 1 and not self._has_support(nx, ny):
+                    invalid.append((nx, ny, d + 1))
+                    dist[ny, nx] = UNREACHABLE
+                    frontier.add((nx, ny))
+
+        # Re-grow distances from the intact neighbors of the affected cells
+        heap = []
+        for x, y in frontier:
+            best = dist[y, x]
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny, nx] != UNREACHABLE:
+                    best = min(best, dist[ny, nx] + 1)
+            if best != UNREACHABLE:
+                dist[y, x] = best
+                heapq.heappush(heap, (int(best), x, y))
+
+        while heap:
+            d, x, y = heapq.heappop(heap)
+            if d > dist[y, x]:
+                continue
+            for nx, ny in self._open_neighbors(x, y):
+                if dist[ny, nx] > d + 1:
+                    dist[ny, nx] = d + 1
+                    heapq.heappush(heap, (d + 1, nx, ny))
+
+    def _has_support(self, x: int, y: int) -> bool:
+        """Check whether a cell still has a neighbor one step closer to the goal."""
+        d = self.distances[y, x]
+        return any(self.distances[ny, nx] == d - 1 for nx, ny in self._open_neighbors(x, y))
+
+    def _open_neighbors(self, x: int, y: int):
+        for dx, dy in ACTION_DELTAS.values():
+            nx, ny = x + dx, y + dy
+            if self.grid.is_valid_position(nx, ny) and TILES.rows[self.grid.tile_id(nx, ny)][0]:
+                yield nx, ny
@@ -0,0 +1,132 @@
+"""Hogwild-style parallel Q-Learning over a shared-memory Q-table."""
+from __future__ import annotations
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from ..core.grid import Grid
+from .q_learning import QLearning
+
+
+def train_hogwild(
+    ql: QLearning,
+    n_episodes: int = 1000,
+    max_steps: int = 200,
+    n_workers: int = 4,
+    seed: int | None = None,
+    verbose: bool = True,
+) -> dict:
+    """Train a QLearning agent with several worker processes at once.
+
+    The Q-table is placed in shared memory and every worker runs its share
+    of the episodes against it, updating entries in place without locks
+    (Hogwild). Occasional lost updates from concurrent writes to the same
+    entry are tolerated, as in single-entry SGD. Each worker has its own
+    RNG stream and decays its own epsilon over its share of episodes, so
+    the exploration schedule spans the run as it would single-process.
+
+    Args:
+        ql: Learner whose hyperparameters and current Q-table seed the
+            run; its q_table and episode statistics are replaced with the
+            result
+        n_episodes: Total episodes across all workers
+        max_steps: Maximum steps per episode
+        n_workers: Number of worker processes
+        seed: Seed for the per-worker RNG streams
+        verbose: Print a summary when done
+
+    Returns:
+        Training statistics as returned by QLearning.train (episodes in
+        completion order), plus 'workers' with per-worker statistics and
+        'wall_time'
+    """
+    counts = [n_episodes // n_workers + (i < n_episodes % n_workers) for i in range(n_workers)]
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(n_workers)]
+    config = dict(
+        alpha=ql.alpha, gamma=ql.gamma, epsilon=ql.epsilon, epsilon_min=ql.epsilon_min,
+        epsilon_decay=ql.epsilon_decay ** n_workers,
+    )
+
+    shm = shared_memory.SharedMemory(create=True, size=ql.q_table.nbytes)
+    try:
+        shared = np.ndarray(ql.q_table.shape, dtype=ql.q_table.dtype, buffer=shm.buf)
+        shared[:] = ql.q_table
+        start = time.perf_counter()
+        with ProcessPoolExecutor(n_workers) as pool:
+            futures = [
+                pool.submit(_worker, shm.name, ql.q_table.shape, ql.q_table.dtype.str, ql.grid, config,
+                            counts[i], max_steps, seeds[i])
+                for i in range(n_workers) if counts[i]
+            ]
+            results = [f.result() for f in futures]
+        wall_time = time.perf_counter() - start
+        ql.q_table = shared.copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    # Merge episodes from all workers in the order they finished
+    finished = np.concatenate([r['finished'] for r in results])
+    order = np.argsort(finished, kind='stable')
+    rewards = np.concatenate([r['episode_rewards'] for r in results])[order]
+    steps = np.concatenate([r['episode_steps'] for r in results])[order]
+    ql.episode_rewards = rewards.tolist()
+    ql.episode_steps = steps.tolist()
+    ql.epsilon = max(r['final_epsilon'] for r in results)
+    successes = sum(r['total_successes'] for r in results)
+
+    if verbose:
+        print(f"Hogwild: {n_episodes} episodes on {n_workers} workers in {wall_time:.1f}s | "
+              f"Avg Reward (last 100): {np.mean(ql.episode_rewards[-100:]):.1f} | "
+              f"Successes: {successes}")
+
+    return {
+        'episode_rewards': ql.episode_rewards,
+        'episode_steps': ql.episode_steps,
+        'total_successes': successes,
+        'final_epsilon': ql.epsilon,
+        'wall_time': wall_time,
+        'workers': [
+            {key: r[key] for key in ('total_successes', 'final_epsilon', 'n_episodes')}
+            for r in results
+        ],
+    }
+
+
+def _worker(
+    shm_name: str,
+    shape: tuple[int, int],
+    dtype: str,
+    grid: Grid,
+    config: dict,
+    n_episodes: int,
+    max_steps: int,
+    seed: int,
+) -> dict:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ql = QLearning(grid, seed=seed, **config)
+    try:
+        ql.q_table = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        rewards = np.zeros(n_episodes)
+        steps = np.zeros(n_episodes, dtype=np.int64)
+        finished = np.zeros(n_episodes)
+        successes = 0
+        for episode in range(n_episodes):
+            rewards[episode], steps[episode], success = ql.run_episode(max_steps, train=True)
+            finished[episode] = time.time()
+            successes += success
+            ql.decay_epsilon()
+        return {
+            'episode_rewards': rewards,
+            'episode_steps': steps,
+            'finished': finished,
+            'total_successes': successes,
+            'final_epsilon': ql.epsilon,
+            'n_episodes': n_episodes,
+        }
+    finally:
+        # Drop the view before closing the mapping
+        ql.q_table = None
+        shm.close()
@@ -0,0 +1,200 @@
+"""Learning from demonstration: seed and mix Q-Learning with recorded play."""
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+import numpy as np
+
+from ..core.grid import Grid
+from ..data.trajectories import TrajectoryDataset
+from .q_learning import QLearning
+from .replay_buffer import ReplayBuffer, tabular_replay
+
+
+# Transition columns used for TD updates
+TD_COLUMNS = ('x', 'y', 'action', 'reward', 'next_x', 'next_y', 'done')
+
+
+@dataclass
+class Demonstrations:
+    """Demonstration transitions as parallel arrays."""
+    x: np.ndarray
+    y: np.ndarray
+    action: np.ndarray
+    reward: np.ndarray
+    next_x: np.ndarray
+    next_y: np.ndarray
+    done: np.ndarray
+
+    def __len__(self) -> int:
+        return self.action.size
+
+    def batch(self, indices: np.ndarray) -> tuple[np.ndarray, ...]:
+        """Columns for the given rows, in QLearning.batch_update order."""
+        return tuple(getattr(self, name)[indices] for name in TD_COLUMNS)
+
+
+def load_demonstrations(
+    directories: str | Path | list[str | Path],
+    grid: Grid | None = None,
+    successful_only: bool = True,
+) -> Demonstrations:
+    """Load recorded trajectories as demonstrations.
+
+    Args:
+        directories: One or more TrajectoryRecorder output directories
+        grid: If given, recordings whose metadata names a different
+            dungeon are rejected
+        successful_only: Keep only episodes that ended at the goal with
+            HP left
+
+    Returns:
+        The concatenated demonstration transitions
+    """
+    if isinstance(directories, (str, Path)):
+        directories = [directories]
+
+    parts = []
+    for directory in directories:
+        dataset = TrajectoryDataset(directory)
+        dungeon = dataset.metadata.get('dungeon')
+        if grid is not None and dungeon is not None and dungeon != str(grid):
+            raise ValueError(f"Demonstrations in {directory} were recorded on a different dungeon")
+        for episode in dataset.iter_episodes():
+            if successful_only and not (episode['done'][-1] and episode['hp'][-1] > 0):
+                continue
+            parts.append(episode)
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return Demonstrations(empty, empty, empty, empty.astype(np.float64), empty, empty, empty.astype(bool))
+    return Demonstrations(*(np.concatenate([p[name] for p in parts]) for name in TD_COLUMNS))
+
+
+def pretrain_from_demos(
+    ql: QLearning,
+    demos: Demonstrations,
+    n_passes: int = 100,
+    batch_size: int = 256,
+    seed: int | None = None,
+) -> list[float]:
+    """Seed the Q-table with offline TD updates over the demonstrations.
+
+    Every pass shuffles the demonstrations and replays them in minibatches,
+    so values propagate back from the goal over repeated passes.
+
+    Args:
+        ql: Learner whose Q-table is updated in place
+        demos: Demonstration transitions
+        n_passes: Number of passes over the data
+        batch_size: Transitions per batched update
+        seed: Shuffle seed
+
+    Returns:
+        Mean absolute TD error of each pass
+    """
+    rng = np.random.default_rng(seed)
+    history = []
+    for _ in range(n_passes):
+        order = rng.permutation(len(demos))
+        errors = [np.abs(ql.batch_update(*demos.batch(order[i:i + batch_size]))).sum()
+                  for i in range(0, len(demos), batch_size)]
+        history.append(float(np.sum(errors) / max(len(demos), 1)))
+    return history
+
+
+class MixedReplay:
+    """Replays demonstrations alongside recent online experience.
+
+    Pass it as the recorder to QLearning.train to collect online
+    transitions, and call replay() after each episode (train_with_demos
+    wires both up).
+    """
+
+    def __init__(
+        self,
+        demos: Demonstrations,
+        capacity: int = 50_000,
+        batch_size: int = 64,
+        demo_fraction: float = 0.25,
+        seed: int | None = None,
+    ):
+        """Initialize mixed replay.
+
+        Args:
+            demos: Demonstration transitions
+            capacity: Size of the online transition ring buffer
+            batch_size: Transitions per replay batch
+            demo_fraction: Share of each batch drawn from demonstrations
+            seed: Sampling seed
+        """
+        self.demos = demos
+        self.batch_size = batch_size
+        self.demo_fraction = demo_fraction
+        self.rng = np.random.default_rng(seed)
+        self.online = ReplayBuffer(capacity, obs_shape=(2,), seed=seed)
+
+    def append(self, x: int, y: int, action: int, reward: float, done: bool,
+               hp: int, next_x: int, next_y: int) -> None:
+        """Store one online transition (recorder interface)."""
+        self.online.add((x, y), action, reward, (next_x, next_y), done)
+
+    def end_episode(self) -> None:
+        """Recorder interface; nothing to do."""
+
+    def replay(self, ql: QLearning, n_batches: int = 1) -> None:
+        """Apply batched updates drawn from demos and online experience."""
+        for _ in range(n_batches):
+            n_demo = min(int(round(self.batch_size * self.demo_fraction)), len(self.demos))
+            n_online = min(self.batch_size - n_demo, len(self.online))
+            if n_demo:
+                ql.batch_update(*self.demos.batch(self.rng.integers(len(self.demos), size=n_demo)))
+            if n_online:
+                tabular_replay(ql, self.online, batch_size=n_online)
+
+
+def train_with_demos(
+    ql: QLearning,
+    demos: Demonstrations,
+    n_episodes: int = 1000,
+    max_steps: int = 200,
+    pretrain_passes: int = 100,
+    replay_batches: int = 4,
+    verbose: bool = True,
+    callback: Callable[[int, float, int, bool], None] | None = None,
+    **replay_kwargs,
+) -> dict:
+    """Pretrain on demonstrations, then train online with mixed replay.
+
+    Args:
+        ql: Learner to train
+        demos: Demonstration transitions
+        n_episodes: Online episodes
+        max_steps: Maximum steps per episode
+        pretrain_passes: Offline passes before online training (0 to skip)
+        replay_batches: Mixed replay batches after every episode
+        verbose: Print progress
+        callback: Optional callback(episode, reward, steps, success)
+        **replay_kwargs: Passed to MixedReplay
+
+    Returns:
+        Training statistics as returned by QLearning.train, plus
+        'first_success' (episode index of the first clear, or None)
+    """
+    if pretrain_passes:
+        pretrain_from_demos(ql, demos, n_passes=pretrain_passes)
+
+    mixed = MixedReplay(demos, **replay_kwargs)
+    first_success = None
+
+    def on_episode(episode: int, reward: float, steps: int, success: bool):
+        nonlocal first_success
+        if success and first_success is None:
+            first_success = episode
+        mixed.replay(ql, replay_batches)
+        if callback:
+            callback(episode, reward, steps, success)
+
+    stats = ql.train(n_episodes, max_steps, verbose=verbose, callback=on_episode, recorder=mixed)
+    stats['first_success'] = first_success
+    return stats
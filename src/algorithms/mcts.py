@@ -0,0 +1,361 @@
+"""Monte Carlo Tree Search (UCT) planner over DungeonEnv snapshots."""
+from __future__ import annotations
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from ..core.grid import Grid
+from ..env.dungeon_env import DungeonEnv, EnvState
+
+
+class MCTS:
+    """UCT planner that searches with cheap env state clones.
+
+    Unlike QLearning, the search state includes HP and step count, so it
+    can plan around traps on HP-dependent dungeons. Node statistics live
+    in preallocated NumPy arrays indexed by node id; children are stored
+    as an (n_nodes, 4) index table. Nodes cache the env state reached by
+    their action sequence, which assumes transitions are deterministic
+    given the state (true for DungeonEnv); the tree is discarded when the
+    grid is edited.
+
+    Root-parallel search keeps a worker pool alive between calls. Call
+    close() when done, or use the planner as a context manager.
+    """
+
+    def __init__(
+        self,
+        env: DungeonEnv,
+        c_uct: float = 1.4,
+        gamma: float = 0.99,
+        rollout_depth: int = 50,
+        max_nodes: int = 100_000,
+        seed: int | None = None,
+    ):
+        """Initialize the planner.
+
+        Args:
+            env: Environment used for simulation (its state is clobbered
+                during search and restored afterwards)
+            c_uct: Exploration constant (values are normalized to [0, 1])
+            gamma: Discount factor
+            rollout_depth: Maximum random rollout length from a new leaf
+            max_nodes: Node capacity; the tree is compacted when full
+            seed: Seed for rollouts and tie-breaking
+        """
+        self.env = env
+        self.c_uct = c_uct
+        self.gamma = gamma
+        self.rollout_depth = rollout_depth
+        self.max_nodes = max_nodes
+        self.rng = random.Random(seed)
+        self.n_actions = env.action_space.n
+
+        self.parent = np.full(max_nodes, -1, dtype=np.int32)
+        self.children = np.full((max_nodes, self.n_actions), -1, dtype=np.int32)
+        self.visits = np.zeros(max_nodes, dtype=np.int64)
+        self.value_sum = np.zeros(max_nodes, dtype=np.float64)
+        self.reward = np.zeros(max_nodes, dtype=np.float64)
+        self.terminal = np.zeros(max_nodes, dtype=bool)
+        self.states: list[EnvState | None] = [None] * max_nodes
+
+        self.n_nodes = 0
+        self.root = -1
+        self._q_min = math.inf
+        self._q_max = -math.inf
+        # Grid version the tree was built on
+        self._tree_version = env.grid.version
+
+    def __enter__(self) -> MCTS:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # -- Tree management ---------------------------------------------------
+
+    def reset(self, state: EnvState | None = None) -> None:
+        """Discard the tree and start from a new root state.
+
+        Args:
+            state: Root state (default: the env's current state)
+        """
+        self.children[:self.n_nodes] = -1
+        self.visits[:self.n_nodes] = 0
+        self.value_sum[:self.n_nodes] = 0.0
+        self.n_nodes = 0
+        self._q_min = math.inf
+        self._q_max = -math.inf
+        self._tree_version = self.env.grid.version
+        if state is None:
+            state = self.env.get_state(include_rng=False)
+        self.root = self._new_node(-1, state, 0.0, False)
+
+    def _new_node(self, parent: int, state: EnvState, reward: float, terminal: bool) -> int:
+        node = self.n_nodes
+        self.n_nodes += 1
+        self.parent[node] = parent
+        self.children[node] = -1
+        self.visits[node] = 0
+        self.value_sum[node] = 0.0
+        self.reward[node] = reward
+        self.terminal[node] = terminal
+        self.states[node] = state
+        return node
+
+    def advance(self, action: int, state: EnvState | None = None) -> None:
+        """Move the root to the child for an action, keeping its subtree.
+
+        Args:
+            action: Action taken in the real environment
+            state: State actually reached; if it differs from the tree's
+                prediction the tree is discarded
+        """
+        child = self.children[self.root, action] if self.root >= 0 else -1
+        if child < 0 or (state is not None and self._key(self.states[child]) != self._key(state)):
+            self.reset(state)
+            return
+        self.root = int(child)
+        self.parent[self.root] = -1
+
+    @staticmethod
+    def _key(state: EnvState) -> tuple:
+        return (state.x, state.y, state.hp, state.steps)
+
+    def _compact(self) -> None:
+        """Renumber the root's subtree into the front of the arrays."""
+        order = [self.root]
+        for node in order:
+            order.extend(int(c) for c in self.children[node] if c >= 0)
+        order = np.array(order, dtype=np.int32)
+
+        remap = np.full(self.n_nodes, -1, dtype=np.int32)
+        remap[order] = np.arange(order.size, dtype=np.int32)
+        n = order.size
+
+        children = self.children[order]
+        self.children[:n] = np.where(children >= 0, remap[np.maximum(children, 0)], -1)
+        self.parent[:n] = np.where(self.parent[order] >= 0, remap[np.maximum(self.parent[order], 0)], -1)
+        self.visits[:n] = self.visits[order]
+        self.value_sum[:n] = self.value_sum[order]
+        self.reward[:n] = self.reward[order]
+        self.terminal[:n] = self.terminal[order]
+        states = [self.states[i] for i in order]
+        self.states[:n] = states
+        self.states[n:self.n_nodes] = [None] * (self.n_nodes - n)
+        self.n_nodes = n
+        self.root = 0
+
+    # -- Search ------------------------------------------------------------
+
+    def search(self, n_simulations: int | None = 200, time_budget: float | None = None) -> int:
+        """Run simulations from the root and return the most visited action.
+
+        Args:
+            n_simulations: Simulation budget (None = unlimited)
+            time_budget: Wall-clock budget in seconds (None = unlimited)
+
+        Returns:
+            The chosen action
+        """
+        if n_simulations is None and time_budget is None:
+            raise ValueError("Give n_simulations and/or time_budget")
+        if self.root < 0 or self._tree_version != self.env.grid.version:
+            self.reset()
+
+        saved = self.env.get_state()
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        done = 0
+        while (n_simulations is None or done < n_simulations) and \
+                (deadline is None or time.perf_counter() < deadline):
+            if self.n_nodes + 1 >= self.max_nodes:
+                self._compact()
+                if self.n_nodes + 1 >= self.max_nodes:
+                    break
+            self._simulate()
+            done += 1
+        self.env.set_state(saved)
+
+        return self.best_action()
+
+    def best_action(self) -> int:
+        """Most visited root action (ties broken by value)."""
+        children = self.children[self.root]
+        visits = np.where(children >= 0, self.visits[children], -1)
+        values = np.where(children >= 0, self.value_sum[children] / np.maximum(self.visits[children], 1), -np.inf)
+        return int(np.lexsort((values, visits))[-1])
+
+    def root_statistics(self) -> tuple[np.ndarray, np.ndarray]:
+        """Visit counts and value sums of the root's children."""
+        children = self.children[self.root]
+        valid = children >= 0
+        visits = np.where(valid, self.visits[children], 0)
+        values = np.where(valid, self.value_sum[children], 0.0)
+        return visits, values
+
+    def _simulate(self) -> None:
+        env = self.env
+        node = self.root
+        path = [node]
+
+        # Selection
+        while not self.terminal[node] and (self.children[node] >= 0).all():
+            node = self._select_child(node)
+            path.append(node)
+
+        # Expansion
+        if not self.terminal[node]:
+            untried = np.flatnonzero(self.children[node] < 0)
+            action = int(untried[self.rng.randrange(untried.size)])
+            env.set_state(self.states[node])
+            reward, terminated, truncated = env.advance(action)
+            child = self._new_node(node, env.get_state(include_rng=False), reward, terminated or truncated)
+            self.children[node, action] = child
+            node = child
+            path.append(node)
+
+        # Rollout
+        value = 0.0 if self.terminal[node] else self._rollout()
+
+        # Backpropagation (each node's value includes the reward for entering it)
+        for node in reversed(path):
+            value = self.reward[node] + self.gamma * value
+            self.visits[node] += 1
+            self.value_sum[node] += value
+            if node != self.root:
+                q = self.value_sum[node] / self.visits[node]
+                self._q_min = min(self._q_min, q)
+                self._q_max = max(self._q_max, q)
+
+    def _select_child(self, node: int) -> int:
+        children = self.children[node]
+        visits = self.visits[children]
+        q = self.value_sum[children] / visits
+        span = self._q_max - self._q_min
+        if span > 0:
+            q = (q - self._q_min) / span
+        ucb = q + self.c_uct * np.sqrt(math.log(self.visits[node]) / visits)
+        return int(children[np.argmax(ucb)])
+
+    def _rollout(self) -> float:
+        env = self.env
+        value, discount = 0.0, 1.0
+        for _ in range(self.rollout_depth):
+            reward, terminated, truncated = env.advance(self.rng.randrange(self.n_actions))
+            value += discount * reward
+            discount *= self.gamma
+            if terminated or truncated:
+                break
+        return value
+
+    # -- Root parallelism --------------------------------------------------
+
+    def search_parallel(
+        self,
+        n_workers: int,
+        n_simulations: int | None = 200,
+        time_budget: float | None = None,
+    ) -> int:
+        """Root-parallel search: independent trees in worker processes.
+
+        Each worker searches from the current env state with its own seed;
+        root visit counts are summed to pick the action. The local tree is
+        not grown, so tree reuse does not apply in this mode.
+
+        Args:
+            n_workers: Number of worker processes
+            n_simulations: Per-worker simulation budget
+            time_budget: Per-worker wall-clock budget in seconds
+
+        Returns:
+            The chosen action
+        """
+        pool = self._get_pool(n_workers)
+        state = self.env.get_state(include_rng=False)
+        seeds = [self.rng.getrandbits(32) for _ in range(n_workers)]
+        visits = np.zeros(self.n_actions, dtype=np.int64)
+        values = np.zeros(self.n_actions, dtype=np.float64)
+        for v, s in pool.map(_root_search, [(state, seed, n_simulations, time_budget) for seed in seeds]):
+            visits += v
+            values += s
+        return int(np.lexsort((values / np.maximum(visits, 1), visits))[-1])
+
+    def _get_pool(self, n_workers: int) -> ProcessPoolExecutor:
+        # Workers hold a copy of the grid: rebuild the pool after an edit
+        pool = getattr(self, '_pool', None)
+        if pool is None or self._pool_workers != n_workers or self._pool_version != self.env.grid.version:
+            self.close()
+            config = dict(c_uct=self.c_uct, gamma=self.gamma,
+                          rollout_depth=self.rollout_depth, max_nodes=self.max_nodes)
+            pool = ProcessPoolExecutor(
+                n_workers, initializer=_init_worker,
+                initargs=(self.env.grid, self.env.max_steps, config),
+            )
+            self._pool, self._pool_workers, self._pool_version = pool, n_workers, self.env.grid.version
+        return pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if any."""
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown()
+            self._pool = None
+
+    # -- Episodes ----------------------------------------------------------
+
+    def run_episode(
+        self,
+        n_simulations: int | None = 200,
+        time_budget: float | None = None,
+        n_workers: int = 1,
+    ) -> tuple[float, int, bool]:
+        """Play one episode in the env, planning before every move.
+
+        With n_workers > 1 the worker pool stays up for the next episode;
+        close() shuts it down.
+
+        Returns:
+            Tuple of (total_reward, steps, success)
+        """
+        self.env.reset()
+        self.reset()
+        total_reward = 0.0
+        steps = 0
+        while True:
+            if n_workers > 1:
+                action = self.search_parallel(n_workers, n_simulations, time_budget)
+            else:
+                action = self.search(n_simulations, time_budget)
+            reward, terminated, truncated = self.env.advance(action)
+            total_reward += reward
+            steps += 1
+            if terminated or truncated:
+                break
+            self.advance(action, self.env.get_state(include_rng=False))
+
+        success = terminated and self.env.agent.hp > 0 and \
+            (self.env.agent.x, self.env.agent.y) == self.env.grid.goal_pos
+        return total_reward, steps, success
+
+
+# Per-process planner for root-parallel search
+_worker_planner: MCTS | None = None
+
+
+def _init_worker(grid: Grid, max_steps: int, config: dict) -> None:
+    global _worker_planner
+    env = DungeonEnv(grid=grid, max_steps=max_steps)
+    env.reset()
+    _worker_planner = MCTS(env, **config)
+
+
+def _root_search(args: tuple) -> tuple[np.ndarray, np.ndarray]:
+    state, seed, n_simulations, time_budget = args
+    planner = _worker_planner
+    planner.rng.seed(seed)
+    planner.env.set_state(state)
+    planner.reset(state)
+    planner.search(n_simulations, time_budget)
+    return planner.root_statistics()
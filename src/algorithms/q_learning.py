@@ -1,10 +1,13 @@
 """Q-Learning algorithm implementation."""
 import numpy as np
 import random
+from time import perf_counter
 from typing import Callable
 from ..core.grid import Grid
+from ..core.profiling import Profiler
 from ..core.tiles import TileType
 from ..agents.agent import Agent, Action, ACTION_DELTAS
+from ..data.trajectories import TrajectoryRecorder
 
 
 class QLearning:
@@ -18,6 +21,7 @@ class QLearning:
         epsilon: float = 1.0,    # Initial exploration rate
         epsilon_min: float = 0.01,
         epsilon_decay: float = 0.995,
+        seed: int | None = None,
     ):
         """Initialize Q-Learning.
 
@@ -28,6 +32,7 @@ class QLearning:
             epsilon: Exploration rate (probability of random action)
             epsilon_min: Minimum epsilon value
             epsilon_decay: Epsilon decay per episode
+            seed: Seed for exploration (None = nondeterministic)
         """
         self.grid = grid
         self.alpha = alpha
@@ -35,6 +40,7 @@ class QLearning:
         self.epsilon = epsilon
         self.epsilon_min = epsilon_min
         self.epsilon_decay = epsilon_decay
+        self.rng = random.Random(seed)
 
         # Initialize Q-table: (height * width) states × 4 actions
         self.n_states = grid.height * grid.width
@@ -45,6 +51,20 @@ class QLearning:
         self.episode_rewards: list[float] = []
         self.episode_steps: list[int] = []
 
+        # Optional hot-path instrumentation (see run_episode)
+        self.profiler: Profiler | None = None
+
+        # Keep Q-values as a warm start when the dungeon is edited
+        grid.add_listener(self._on_grid_edit)
+
+    def _on_grid_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType):
+        """Forget only the Q-values whose transitions touched the edited cell."""
+        self.q_table[self.state_to_index(x, y)] = 0.0
+        for action, (dx, dy) in ACTION_DELTAS.items():
+            px, py = x - dx, y - dy
+            if self.grid.is_valid_position(px, py):
+                self.q_table[self.state_to_index(px, py), action.value] = 0.0
+
     def state_to_index(self, x: int, y: int) -> int:
         """Convert (x, y) position to state index."""
         return y * self.grid.width + x
@@ -76,8 +96,8 @@ class QLearning:
 
     def select_action(self, x: int, y: int) -> Action:
         """Select action using epsilon-greedy policy."""
-        if random.random() < self.epsilon:
-            return Action(random.randint(0, 3))
+        if self.rng.random() < self.epsilon:
+            return Action(self.rng.randint(0, 3))
         else:
             return self.get_best_action(x, y)
 
@@ -105,6 +125,48 @@ class QLearning:
         # Q-Learning update
         self.q_table[state_idx, action.value] += self.alpha * (target - current_q)
 
+    def batch_update(
+        self,
+        x: np.ndarray, y: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_x: np.ndarray, next_y: np.ndarray,
+        dones: np.ndarray,
+        weights: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Apply the Q-Learning update to a batch of transitions at once.
+
+        TD errors are computed against the table before the update;
+        transitions that hit the same (state, action) are averaged so the
+        step size does not grow with duplicates.
+
+        Args:
+            x, y: States as position arrays
+            actions: Action values
+            rewards: Rewards
+            next_x, next_y: Next states as position arrays
+            dones: Episode-ended flags
+            weights: Optional per-transition weights (e.g. importance sampling)
+
+        Returns:
+            The TD errors of the batch
+        """
+        states = np.asarray(y) * self.grid.width + np.asarray(x)
+        next_states = np.asarray(next_y) * self.grid.width + np.asarray(next_x)
+        actions = np.asarray(actions, dtype=np.intp)
+
+        next_max_q = self.q_table[next_states].max(axis=1)
+        targets = rewards + self.gamma * next_max_q * ~np.asarray(dones, dtype=bool)
+        td_errors = targets - self.q_table[states, actions]
+
+        flat = states * self.n_actions + actions
+        deltas = td_errors if weights is None else td_errors * weights
+        pairs, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+        sums = np.bincount(inverse, weights=deltas, minlength=pairs.size)
+        self.q_table.reshape(-1)[pairs] += self.alpha * sums / counts
+
+        return td_errors
+
     def decay_epsilon(self):
         """Decay epsilon after each episode."""
         self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
@@ -113,14 +175,20 @@ class QLearning:
         self,
         max_steps: int = 200,
         train: bool = True,
-        callback: Callable[[Agent, Action, float], None] | None = None
+        callback: Callable[[Agent, Action, float], None] | None = None,
+        recorder: TrajectoryRecorder | None = None,
     ) -> tuple[float, int, bool]:
         """Run a single episode.
 
+        With a profiler attached, counts episodes, steps and wall bumps and
+        times the phases of sampled steps (select_action, move, callbacks,
+        update) under the "q_learning.step" section.
+
         Args:
             max_steps: Maximum steps per episode
             train: Whether to update Q values
             callback: Optional callback(agent, action, reward) for visualization
+            recorder: Optional recorder that receives every transition
 
         Returns:
             Tuple of (total_reward, steps, success)
@@ -135,8 +203,15 @@ class QLearning:
         total_reward = 0.0
         steps = 0
         success = False
+        profiler = self.profiler
+        timed = False
 
         for step in range(max_steps):
+            if profiler is not None:
+                timed = profiler.sample('q_learning.step')
+                if timed:
+                    t0 = perf_counter()
+
             # Current state
             x, y = agent.x, agent.y
 
@@ -145,26 +220,48 @@ class QLearning:
                 action = self.select_action(x, y)
             else:
                 action = self.get_best_action(x, y)
+            if timed:
+                t1 = perf_counter()
 
             # Execute action
-            reward, done, _ = agent.move(action, self.grid)
+            reward, done, moved = agent.move(action, self.grid)
             total_reward += reward
             steps += 1
+            if timed:
+                t2 = perf_counter()
+
+            if recorder is not None:
+                recorder.append(x, y, action.value, reward, done, agent.hp, agent.x, agent.y)
 
             # Callback for visualization
             if callback:
                 callback(agent, action, reward)
+            if timed:
+                t3 = perf_counter()
 
             # Update Q-table
             if train:
                 self.update(x, y, action, reward, agent.x, agent.y, done)
 
+            if profiler is not None:
+                if not moved:
+                    profiler.count('q_learning.wall_bumps')
+                if timed:
+                    profiler.record('q_learning.step', select_action=t1 - t0, move=t2 - t1,
+                                    callbacks=t3 - t2, update=perf_counter() - t3)
+
             if done:
                 # Check if success (reached goal)
                 if self.grid.get_tile(agent.x, agent.y) == TileType.GOAL:
                     success = True
                 break
 
+        if recorder is not None:
+            recorder.end_episode()
+        if profiler is not None:
+            profiler.count('q_learning.episodes')
+            profiler.count('q_learning.steps', steps)
+
         return total_reward, steps, success
 
     def train(
@@ -172,7 +269,8 @@ class QLearning:
         n_episodes: int = 1000,
         max_steps: int = 200,
         verbose: bool = True,
-        callback: Callable[[int, float, int, bool], None] | None = None
+        callback: Callable[[int, float, int, bool], None] | None = None,
+        recorder: TrajectoryRecorder | None = None,
     ) -> dict:
         """Train the agent for multiple episodes.
 
@@ -181,6 +279,7 @@ class QLearning:
             max_steps: Maximum steps per episode
             verbose: Print progress
             callback: Optional callback(episode, reward, steps, success)
+            recorder: Optional recorder that receives every transition
 
         Returns:
             Training statistics
@@ -190,7 +289,7 @@ class QLearning:
         successes = 0
 
         for episode in range(n_episodes):
-            reward, steps, success = self.run_episode(max_steps, train=True)
+            reward, steps, success = self.run_episode(max_steps, train=True, recorder=recorder)
 
             self.episode_rewards.append(reward)
             self.episode_steps.append(steps)
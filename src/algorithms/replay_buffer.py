@@ -0,0 +1,259 @@
+"""Uniform and prioritized experience replay buffers."""
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+
+from .q_learning import QLearning
+
+
+@dataclass
+class Batch:
+    """A sampled minibatch."""
+    obs: np.ndarray
+    action: np.ndarray
+    reward: np.ndarray
+    next_obs: np.ndarray
+    done: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of transitions stored as NumPy arrays.
+
+    Observations can be scalars (e.g. a tabular state index), positions
+    or full grids; set obs_shape/obs_dtype accordingly.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        obs_shape: tuple[int, ...] = (),
+        obs_dtype: np.dtype = np.int64,
+        seed: int | None = None,
+    ):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of transitions (oldest are overwritten)
+            obs_shape: Shape of one observation
+            obs_dtype: Observation dtype
+            seed: Sampling seed
+        """
+        self.capacity = capacity
+        self.obs = np.zeros((capacity,) + tuple(obs_shape), dtype=obs_dtype)
+        self.next_obs = np.zeros_like(self.obs)
+        self.action = np.zeros(capacity, dtype=np.int64)
+        self.reward = np.zeros(capacity, dtype=np.float64)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.rng = np.random.default_rng(seed)
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, obs, action: int, reward: float, next_obs, done: bool) -> int:
+        """Store one transition.
+
+        Returns:
+            The slot index it was written to
+        """
+        i = self._pos
+        self.obs[i] = obs
+        self.action[i] = action
+        self.reward[i] = reward
+        self.next_obs[i] = next_obs
+        self.done[i] = done
+        self._pos = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._on_insert(np.array([i]))
+        return i
+
+    def add_batch(self, obs, action, reward, next_obs, done) -> np.ndarray:
+        """Store a batch of transitions (e.g. one step of a vector env).
+
+        Returns:
+            The slot indices written to
+        """
+        n = len(action)
+        if n > self.capacity:
+            # Only the newest transitions would survive anyway
+            obs, action, reward, next_obs, done = (
+                np.asarray(a)[-self.capacity:] for a in (obs, action, reward, next_obs, done))
+            n = self.capacity
+        indices = (self._pos + np.arange(n)) % self.capacity
+        self.obs[indices] = obs
+        self.action[indices] = action
+        self.reward[indices] = reward
+        self.next_obs[indices] = next_obs
+        self.done[indices] = done
+        self._pos = (self._pos + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        self._on_insert(indices)
+        return indices
+
+    def _on_insert(self, indices: np.ndarray) -> None:
+        """Hook for subclasses that track per-slot data."""
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Draw slot indices uniformly (with replacement)."""
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty buffer")
+        return self.rng.integers(self._size, size=batch_size)
+
+    def sample(self, batch_size: int) -> Batch:
+        """Draw a uniform minibatch."""
+        indices = self.sample_indices(batch_size)
+        return self._gather(indices, np.ones(batch_size, dtype=np.float64))
+
+    def _gather(self, indices: np.ndarray, weights: np.ndarray) -> Batch:
+        return Batch(
+            obs=self.obs[indices],
+            action=self.action[indices],
+            reward=self.reward[indices],
+            next_obs=self.next_obs[indices],
+            done=self.done[indices],
+            indices=indices,
+            weights=weights,
+        )
+
+
+class SumTree:
+    """Array-backed binary sum tree over a fixed number of leaves.
+
+    Supports batched O(log n) priority updates and prefix-sum lookups.
+    """
+
+    def __init__(self, capacity: int):
+        """Initialize with all priorities zero.
+
+        Args:
+            capacity: Number of leaves
+        """
+        self.capacity = capacity
+        self.n_leaves = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.n_leaves.bit_length() - 1
+        self.tree = np.zeros(2 * self.n_leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        """Sum of all priorities."""
+        return float(self.tree[1])
+
+    def get(self, indices: np.ndarray) -> np.ndarray:
+        """Priorities of the given leaves."""
+        return self.tree[self.n_leaves + np.asarray(indices)]
+
+    def update(self, indices: np.ndarray, priorities: np.ndarray) -> None:
+        """Set leaf priorities and refresh their ancestors level by level."""
+        nodes = self.n_leaves + np.asarray(indices)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes >> 1)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index for each prefix-sum value in [0, total).
+
+        Never descends into an empty subtree, so rounding in a value near
+        total still lands on a leaf with nonzero priority.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(values.shape, dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            go_right = (values >= left) & (self.tree[2 * nodes + 1] > 0)
+            values -= np.where(go_right, left, 0.0)
+            nodes = 2 * nodes + go_right
+        return np.minimum(nodes - self.n_leaves, self.capacity - 1)
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Proportional prioritized replay (Schaul et al.) on a sum tree.
+
+    New transitions get the current maximum priority. Importance-sampling
+    weights are normalized by the largest weight in the batch.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        obs_shape: tuple[int, ...] = (),
+        obs_dtype: np.dtype = np.int64,
+        alpha: float = 0.6,
+        beta: float = 0.4,
+        eps: float = 1e-6,
+        seed: int | None = None,
+    ):
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of transitions
+            obs_shape: Shape of one observation
+            obs_dtype: Observation dtype
+            alpha: How strongly priorities skew sampling (0 = uniform)
+            beta: Importance-sampling correction strength (1 = full)
+            eps: Added to |TD error| so no transition starves
+            seed: Sampling seed
+        """
+        super().__init__(capacity, obs_shape, obs_dtype, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def _on_insert(self, indices: np.ndarray) -> None:
+        self.tree.update(indices, np.full(len(indices), self.max_priority))
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Draw slot indices proportionally to priority (stratified)."""
+        if self._size == 0:
+            raise ValueError("Cannot sample from an empty buffer")
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        return self.tree.find(values)
+
+    def sample(self, batch_size: int) -> Batch:
+        """Draw a prioritized minibatch with importance-sampling weights."""
+        indices = self.sample_indices(batch_size)
+        probs = self.tree.get(indices) / self.tree.total
+        weights = (self._size * probs) ** -self.beta
+        return self._gather(indices, weights / weights.max())
+
+    def update_priorities(self, indices: np.ndarray, td_errors: np.ndarray) -> None:
+        """Set priorities from TD errors of a sampled batch."""
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+
+
+def tabular_replay(
+    ql: QLearning,
+    buffer: ReplayBuffer,
+    batch_size: int = 64,
+    n_batches: int = 1,
+) -> None:
+    """Replay TD updates for a tabular learner.
+
+    Observations must be state indices (obs_shape ()) or (x, y) positions
+    (obs_shape (2,)). Prioritized buffers get IS-weighted updates and
+    refreshed priorities.
+    """
+    if len(buffer) == 0:
+        return
+    prioritized = isinstance(buffer, PrioritizedReplayBuffer)
+    width = ql.grid.width
+    for _ in range(n_batches):
+        batch = buffer.sample(batch_size)
+        if batch.obs.ndim == 1:
+            x, y = batch.obs % width, batch.obs // width
+            next_x, next_y = batch.next_obs % width, batch.next_obs // width
+        else:
+            x, y = batch.obs[:, 0], batch.obs[:, 1]
+            next_x, next_y = batch.next_obs[:, 0], batch.next_obs[:, 1]
+        td_errors = ql.batch_update(x, y, batch.action, batch.reward, next_x, next_y, batch.done,
+                                    weights=batch.weights if prioritized else None)
+        if prioritized:
+            buffer.update_priorities(batch.indices, td_errors)
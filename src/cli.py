@@ -0,0 +1,333 @@
+"""Headless command line interface for batch jobs.
+
+Usage:
+    python -m src.cli train assets/dungeons --out runs/nightly --workers 8
+    python -m src.cli train level.txt other_dir/ --episodes 2000 --plots
+    python -m src.cli train level.txt --profile --workers 1
+    python -m src.cli record assets/dungeons --runs runs/nightly --frame-skip 2
+    python -m src.cli balance --runs 2000 --strategy HybridPlayer --out balance.json
+
+Nothing here imports pygame, and matplotlib is only imported for the
+--plots training curve (with the non-interactive Agg backend), so it runs
+on servers without a display.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Iterator
+import numpy as np
+
+
+def find_dungeons(paths: list[str]) -> list[Path]:
+    """Expand files and directories (all *.txt inside) into dungeon files."""
+    dungeons = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            dungeons += sorted(path.glob('*.txt'))
+        elif path.exists():
+            dungeons.append(path)
+        else:
+            raise FileNotFoundError(f"No such dungeon file or directory: {path}")
+    return dungeons
+
+
+def train_dungeon(dungeon: Path, out_dir: Path, options: dict[str, Any]) -> dict[str, Any]:
+    """Train one dungeon and write its artifacts to out_dir/<dungeon name>/.
+
+    Writes q_table.npy, policy.txt, history.npz (per-episode rewards and
+    steps), metrics.json and, if requested, PNG plots. With the profile
+    option, training and testing run under cProfile with a phase Profiler
+    attached, and profile.txt (phase timings, counters and time per
+    subsystem) and profile.pstats are written too.
+
+    Returns:
+        The metrics written to metrics.json
+    """
+    from .core.grid import load_grid_from_file
+    from .core.profiling import Profiler, profile_call, subsystem_report
+    from .algorithms.q_learning import QLearning
+
+    start = time.perf_counter()
+    grid = load_grid_from_file(dungeon)
+    ql = QLearning(
+        grid,
+        alpha=options['alpha'],
+        gamma=options['gamma'],
+        epsilon_decay=options['epsilon_decay'],
+        seed=options['seed'],
+    )
+
+    def run():
+        stats = ql.train(options['episodes'], options['max_steps'], verbose=False)
+        return stats, ql.test(n_episodes=options['test_episodes'], max_steps=options['max_steps'])
+
+    if options['profile']:
+        ql.profiler = Profiler()
+        (stats, test), profile = profile_call(run)
+    else:
+        stats, test = run()
+    wall_time = time.perf_counter() - start
+
+    target = out_dir / dungeon.stem
+    target.mkdir(parents=True, exist_ok=True)
+    np.save(target / 'q_table.npy', ql.q_table)
+    with open(target / 'policy.txt', 'w') as f:
+        f.write('\n'.join(' '.join(row) for row in ql.get_policy_grid()) + '\n')
+    np.savez_compressed(
+        target / 'history.npz',
+        episode_rewards=np.array(stats['episode_rewards']),
+        episode_steps=np.array(stats['episode_steps']),
+    )
+
+    metrics = {
+        'dungeon': str(dungeon),
+        'width': grid.width,
+        'height': grid.height,
+        'options': options,
+        'train_successes': stats['total_successes'],
+        'final_epsilon': stats['final_epsilon'],
+        'final_reward': float(np.mean(stats['episode_rewards'][-100:])),
+        'success_rate': float(test['success_rate']),
+        'mean_reward': float(test['mean_reward']),
+        'mean_steps': float(test['mean_steps']),
+        'wall_time': wall_time,
+    }
+    with open(target / 'metrics.json', 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+    if options['plots']:
+        save_plots(target, stats, ql)
+    if options['profile']:
+        profile.dump_stats(target / 'profile.pstats')
+        with open(target / 'profile.txt', 'w') as f:
+            f.write(f"Training profile: {dungeon} ({options['episodes']} episodes, "
+                    f"{options['test_episodes']} test episodes)\n")
+            f.write("Phase timings are sampled and include cProfile overhead.\n\n")
+            f.write(ql.profiler.report() + "\n\n")
+            f.write(subsystem_report(profile) + "\n")
+    return metrics
+
+
+def save_plots(target: Path, stats: dict, ql) -> None:
+    """Write the training curve and value heatmap as PNG files."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from .ui.overlay import save_overlay_png
+
+    rewards = np.array(stats['episode_rewards'])
+    window = min(50, len(rewards))
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(rewards, alpha=0.3, color='blue', label='Episode Reward')
+    if window:
+        ax.plot(range(window - 1, len(rewards)), np.convolve(rewards, np.ones(window) / window, mode='valid'),
+                color='red', linewidth=2, label=f'{window}-Episode Average')
+    ax.set_xlabel('Episode')
+    ax.set_ylabel('Total Reward')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(target / 'training_progress.png', dpi=100)
+    plt.close(fig)
+
+    save_overlay_png(target / 'q_values.png', ql.grid, ql.q_table)
+
+
+def record_dungeon(dungeon: Path, runs_dir: Path, out_dir: Path, options: dict[str, Any]) -> dict[str, Any]:
+    """Record a greedy rollout of the Q-table `train` saved for a dungeon.
+
+    Writes out_dir/<dungeon name>/rollout.gif, or rollout/frame_*.png with
+    the png format.
+
+    Returns:
+        Episode reward, steps, success, frames written and output path
+    """
+    from .core.grid import load_grid_from_file
+    from .algorithms.q_learning import QLearning
+    from .ui.video import record_greedy_rollout
+
+    start = time.perf_counter()
+    grid = load_grid_from_file(dungeon)
+    ql = QLearning(grid)
+    q_table = np.load(runs_dir / dungeon.stem / 'q_table.npy')
+    if q_table.shape != ql.q_table.shape:
+        raise ValueError(f"Q-table shape {q_table.shape} does not match the dungeon {ql.q_table.shape}")
+    ql.q_table = q_table
+
+    path = out_dir / dungeon.stem / ('rollout.gif' if options['format'] == 'gif' else 'rollout')
+    result = record_greedy_rollout(ql, path, options['max_steps'], fps=options['fps'],
+                                   frame_skip=options['frame_skip'], tile_size=options['tile_size'])
+    return {'dungeon': str(dungeon), 'path': str(path), **result, 'wall_time': time.perf_counter() - start}
+
+
+def _map_dungeons(func: Callable, dungeons: list[Path], workers: int | None,
+                  *args) -> Iterator[tuple[Path, dict[str, Any] | None, Exception | None]]:
+    """Run func(dungeon, *args) on a process pool, yielding (dungeon, result, error) as they finish."""
+    n_workers = min(workers or os.cpu_count(), len(dungeons))
+    with ProcessPoolExecutor(n_workers) as pool:
+        futures = {pool.submit(func, d, *args): d for d in dungeons}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def cmd_train(args: argparse.Namespace) -> int:
+    """Train every dungeon on a worker pool and write a summary."""
+    dungeons = find_dungeons(args.paths)
+    if not dungeons:
+        print("No dungeons found", file=sys.stderr)
+        return 1
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    options = {
+        'episodes': args.episodes,
+        'max_steps': args.max_steps,
+        'alpha': args.alpha,
+        'gamma': args.gamma,
+        'epsilon_decay': args.epsilon_decay,
+        'seed': args.seed,
+        'test_episodes': args.test_episodes,
+        'plots': args.plots,
+        'profile': args.profile,
+    }
+
+    summary, failed = [], 0
+    for dungeon, metrics, error in _map_dungeons(train_dungeon, dungeons, args.workers, out_dir, options):
+        if error is not None:
+            failed += 1
+            summary.append({'dungeon': str(dungeon), 'error': repr(error)})
+            print(f"{dungeon}: FAILED ({error!r})", file=sys.stderr)
+            continue
+        summary.append(metrics)
+        if not args.quiet:
+            print(f"{dungeon}: Success Rate: {metrics['success_rate']:.0%} | "
+                  f"Mean Reward: {metrics['mean_reward']:.1f} | "
+                  f"{metrics['wall_time']:.1f}s")
+
+    summary.sort(key=lambda m: m['dungeon'])
+    with open(out_dir / 'summary.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+    if not args.quiet:
+        print(f"Wrote {len(summary) - failed} results to {out_dir}" + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+def cmd_record(args: argparse.Namespace) -> int:
+    """Record greedy rollouts of trained policies on a worker pool."""
+    dungeons = find_dungeons(args.paths)
+    if not dungeons:
+        print("No dungeons found", file=sys.stderr)
+        return 1
+
+    runs_dir = Path(args.runs)
+    out_dir = Path(args.out) if args.out else runs_dir
+    options = {
+        'format': args.format,
+        'max_steps': args.max_steps,
+        'fps': args.fps,
+        'frame_skip': args.frame_skip,
+        'tile_size': args.tile_size,
+    }
+
+    failed = 0
+    for dungeon, result, error in _map_dungeons(record_dungeon, dungeons, args.workers, runs_dir, out_dir, options):
+        if error is not None:
+            failed += 1
+            print(f"{dungeon}: FAILED ({error!r})", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{dungeon}: {'GOAL' if result['success'] else 'no goal'} in {result['steps']} steps | "
+                  f"Reward: {result['reward']:.1f} | {result['frames']} frames -> {result['path']}")
+    if not args.quiet:
+        print(f"Recorded {len(dungeons) - failed} rollouts to {out_dir}" + (f", {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+def cmd_balance(args: argparse.Namespace) -> int:
+    """Run seeded balance playthroughs per strategy and report their statistics."""
+    from .sim.balance import format_summary, run_balance, summarize
+    from .sim.config import DUNGEON_ORDER
+    from .sim.strategies import STRATEGIES
+
+    strategies = list(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    dungeons = DUNGEON_ORDER[:args.dungeons] if args.dungeons else DUNGEON_ORDER
+    summaries = {}
+    for name in strategies:
+        start = time.perf_counter()
+        results = run_balance(name, args.runs, seed=args.seed, workers=args.workers, dungeons=dungeons,
+                              max_turns=args.max_turns)
+        summaries[name] = summarize(results)
+        if not args.quiet:
+            print(format_summary(name, summaries[name], len(dungeons), time.perf_counter() - start))
+            print()
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'runs': args.runs, 'seed': args.seed, 'dungeons': list(dungeons),
+                       'max_turns': args.max_turns, 'strategies': summaries}, f, indent=2)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser with one subparser per command."""
+    parser = argparse.ArgumentParser(prog='python -m src.cli', description="RL Dungeon batch tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    train = commands.add_parser('train', help="Train Q-Learning on many dungeons in parallel")
+    train.add_argument('paths', nargs='+', help="Dungeon files or directories of *.txt dungeons")
+    train.add_argument('--out', default='runs', help="Output directory (one subdirectory per dungeon)")
+    train.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    train.add_argument('--episodes', type=int, default=500)
+    train.add_argument('--max-steps', type=int, default=200)
+    train.add_argument('--alpha', type=float, default=0.1)
+    train.add_argument('--gamma', type=float, default=0.99)
+    train.add_argument('--epsilon-decay', type=float, default=0.995)
+    train.add_argument('--seed', type=int, default=None)
+    train.add_argument('--test-episodes', type=int, default=100)
+    train.add_argument('--plots', action='store_true', help="Also write PNG plots (imports matplotlib)")
+    train.add_argument('--profile', action='store_true',
+                       help="Also write profile.txt (phase timings, time per subsystem) and profile.pstats")
+    train.add_argument('--quiet', action='store_true')
+    train.set_defaults(func=cmd_train)
+
+    record = commands.add_parser('record', help="Record greedy rollouts of trained policies as GIF/PNG")
+    record.add_argument('paths', nargs='+', help="Dungeon files or directories of *.txt dungeons")
+    record.add_argument('--runs', default='runs', help="Output directory of `train` (q_table.npy per dungeon)")
+    record.add_argument('--out', default=None, help="Output directory (default: the runs directory)")
+    record.add_argument('--format', choices=('gif', 'png'), default='gif', help="Animated GIF or PNG frames")
+    record.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    record.add_argument('--max-steps', type=int, default=200)
+    record.add_argument('--fps', type=float, default=10)
+    record.add_argument('--frame-skip', type=int, default=1, help="Keep every k-th frame")
+    record.add_argument('--tile-size', type=int, default=None, help="Tile size in pixels (default: fit 960px)")
+    record.add_argument('--quiet', action='store_true')
+    record.set_defaults(func=cmd_record)
+
+    balance = commands.add_parser('balance', help="Monte Carlo balance runs of the game economy")
+    balance.add_argument('--runs', type=int, default=100, help="Playthroughs per strategy")
+    balance.add_argument('--strategy', default='all',
+                         choices=('all', 'StraightForward', 'BalancedPlayer', 'FarmHeavy', 'HybridPlayer'))
+    balance.add_argument('--workers', type=int, default=None, help="Worker processes (default: all CPUs)")
+    balance.add_argument('--seed', type=int, default=0, help="Seed of the first run (run i uses seed + i)")
+    balance.add_argument('--dungeons', type=int, default=None, help="Play only the first N dungeons")
+    balance.add_argument('--max-turns', type=int, default=500)
+    balance.add_argument('--out', default=None, help="Also write the summaries as JSON")
+    balance.add_argument('--quiet', action='store_true')
+    balance.set_defaults(func=cmd_balance)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse arguments and run the chosen command."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
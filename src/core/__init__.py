@@ -1,9 +1,28 @@
-"""Core data structures for RL Dungeon."""
-from .tiles import TileType, tile_to_char, char_to_tile, is_passable, get_reward
-from .grid import Grid, create_empty_grid, create_bordered_grid, load_grid_from_string, load_grid_from_file, save_grid_to_file
+"""Core data structures for RL Dungeon.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from .lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.tiles': ('TileType', 'CustomTile', 'TileProperties', 'TileRegistry', 'TILES', 'register_tile',
+        'register_browser_tiles', 'tile_to_char', 'char_to_tile', 'is_passable', 'get_reward'),
+    '.grid': ('Grid', 'create_empty_grid', 'create_bordered_grid', 'load_grid_from_string',
+        'load_grid_from_file', 'save_grid_to_file'),
+    '.chunked_grid': ('ChunkedGrid', 'CHUNK_SIZE', 'chunked_from_grid'),
+    '.generator': ('generate_maze', 'generate_rooms'),
+    '.profiling': ('Profiler', 'profile_call', 'subsystem_report'),
+})
 
 __all__ = [
     'TileType',
+    'CustomTile',
+    'TileProperties',
+    'TileRegistry',
+    'TILES',
+    'register_tile',
+    'register_browser_tiles',
     'tile_to_char',
     'char_to_tile',
     'is_passable',
@@ -14,4 +33,12 @@ __all__ = [
     'load_grid_from_string',
     'load_grid_from_file',
     'save_grid_to_file',
+    'ChunkedGrid',
+    'CHUNK_SIZE',
+    'chunked_from_grid',
+    'generate_maze',
+    'generate_rooms',
+    'Profiler',
+    'profile_call',
+    'subsystem_report',
 ]
@@ -0,0 +1,133 @@
+"""Sparse chunked grid for very large dungeons."""
+from __future__ import annotations
+import numpy as np
+from .tiles import TileType
+from .grid import Grid
+
+
+# Default side length of a chunk in tiles
+CHUNK_SIZE = 64
+
+
+class ChunkedGrid(Grid):
+    """A grid that stores tiles in fixed-size chunks allocated on demand.
+
+    Cells outside any allocated chunk read as WALL, so memory follows the
+    carved area rather than the bounding box. The interface matches Grid,
+    so Agent, DungeonEnv and QLearning work against it unchanged.
+    """
+
+    def __init__(self, width: int, height: int, chunk_size: int = CHUNK_SIZE):
+        """Initialize an all-wall grid with no chunks allocated.
+
+        Args:
+            width: Number of columns
+            height: Number of rows
+            chunk_size: Side length of a chunk in tiles
+        """
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self._chunks: dict[tuple[int, int], np.ndarray] = {}
+        self._init_tracking()
+
+    def _read(self, x: int, y: int) -> int:
+        chunk = self._chunks.get((x // self.chunk_size, y // self.chunk_size))
+        if chunk is None:
+            return TileType.WALL.value
+        return chunk[y % self.chunk_size, x % self.chunk_size]
+
+    def _write(self, x: int, y: int, tile_id: int) -> None:
+        key = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            if tile_id == TileType.WALL.value:
+                return
+            chunk = self._new_chunk()
+            self._chunks[key] = chunk
+        chunk[y % self.chunk_size, x % self.chunk_size] = tile_id
+
+    def _new_chunk(self) -> np.ndarray:
+        return np.full((self.chunk_size, self.chunk_size), TileType.WALL.value, dtype=np.uint8)
+
+    def tile_ids(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Get tile ids for arrays of in-bounds positions, one lookup per chunk."""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        ids = np.full(xs.shape, TileType.WALL.value, dtype=np.uint8)
+        cx, cy = xs // self.chunk_size, ys // self.chunk_size
+        keys = cy * (self.width // self.chunk_size + 1) + cx
+        for key in np.unique(keys):
+            mask = keys == key
+            chunk = self._chunks.get((int(cx[mask][0]), int(cy[mask][0])))
+            if chunk is not None:
+                ids[mask] = chunk[ys[mask] % self.chunk_size, xs[mask] % self.chunk_size]
+        return ids
+
+    @property
+    def tiles(self) -> np.ndarray:
+        """Dense copy of the tile ids (expensive for large grids)."""
+        dense = np.full((self.height, self.width), TileType.WALL.value, dtype=np.uint8)
+        for x0, y0, block in self.iter_chunks():
+            dense[y0:y0 + block.shape[0], x0:x0 + block.shape[1]] = block
+        return dense
+
+    def iter_chunks(self):
+        """Iterate over allocated chunks.
+
+        Yields:
+            (x0, y0, tiles) where tiles is a view of the chunk clipped to
+            the grid bounds. Writing through the view bypasses change
+            tracking, like writing to Grid.tiles directly.
+        """
+        for (cx, cy), chunk in self._chunks.items():
+            x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+            yield x0, y0, chunk[:self.height - y0, :self.width - x0]
+
+    @property
+    def n_chunks(self) -> int:
+        """Number of allocated chunks."""
+        return len(self._chunks)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by tile storage in bytes."""
+        return sum(chunk.nbytes for chunk in self._chunks.values())
+
+    def compact(self) -> int:
+        """Free chunks that contain only walls.
+
+        Returns:
+            Number of chunks freed
+        """
+        empty = [key for key, chunk in self._chunks.items()
+                 if np.all(chunk == TileType.WALL.value)]
+        for key in empty:
+            del self._chunks[key]
+        return len(empty)
+
+    def __repr__(self) -> str:
+        return f"ChunkedGrid({self.width}x{self.height}, {self.n_chunks} chunks)"
+
+
+def chunked_from_grid(grid: Grid, chunk_size: int = CHUNK_SIZE) -> ChunkedGrid:
+    """Copy a dense grid into a ChunkedGrid."""
+    chunked = ChunkedGrid(grid.width, grid.height, chunk_size)
+    for x0, y0, block in grid.iter_chunks():
+        # Split the source block along destination chunk boundaries
+        rows = range(-(y0 % chunk_size), block.shape[0], chunk_size)
+        cols = range(-(x0 % chunk_size), block.shape[1], chunk_size)
+        for by in (max(0, r) for r in rows):
+            for bx in (max(0, c) for c in cols):
+                part = block[by:(by + y0) // chunk_size * chunk_size + chunk_size - y0,
+                             bx:(bx + x0) // chunk_size * chunk_size + chunk_size - x0]
+                if np.all(part == TileType.WALL.value):
+                    continue
+                x, y = x0 + bx, y0 + by
+                key = (x // chunk_size, y // chunk_size)
+                chunk = chunked._chunks.setdefault(key, chunked._new_chunk())
+                chunk[y % chunk_size:y % chunk_size + part.shape[0],
+                      x % chunk_size:x % chunk_size + part.shape[1]] = part
+    chunked._start_pos = grid.start_pos
+    chunked._goal_pos = grid.goal_pos
+    return chunked
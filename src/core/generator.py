@@ -0,0 +1,95 @@
+"""Procedural dungeon generation for stress tests and benchmarks."""
+from __future__ import annotations
+import random
+from .tiles import TileType
+from .grid import Grid
+from .chunked_grid import ChunkedGrid
+
+
+def generate_maze(width: int, height: int, seed: int | None = None, grid: Grid | None = None) -> Grid:
+    """Carve a perfect maze with a recursive backtracker.
+
+    Start is placed at (1, 1) and the goal in the far corner.
+
+    Args:
+        width: Number of columns (odd sizes give a closed border)
+        height: Number of rows
+        seed: Random seed
+        grid: Optional all-wall grid to carve into (e.g. a ChunkedGrid)
+
+    Returns:
+        The carved grid
+    """
+    rng = random.Random(seed)
+    if grid is None:
+        grid = Grid(width, height)
+        grid.tiles[:] = TileType.WALL.value
+
+    grid.set_tile(1, 1, TileType.EMPTY)
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        options = [(dx, dy) for dx, dy in ((0, -2), (0, 2), (-2, 0), (2, 0))
+                   if 0 < x + dx < width - 1 and 0 < y + dy < height - 1
+                   and grid.get_tile(x + dx, y + dy) == TileType.WALL]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = rng.choice(options)
+        grid.set_tile(x + dx // 2, y + dy // 2, TileType.EMPTY)
+        grid.set_tile(x + dx, y + dy, TileType.EMPTY)
+        stack.append((x + dx, y + dy))
+
+    grid.set_tile(1, 1, TileType.START)
+    grid.set_tile(width - 2 - (width % 2 == 0), height - 2 - (height % 2 == 0), TileType.GOAL)
+    grid.clear_dirty()
+    return grid
+
+
+def generate_rooms(
+    width: int,
+    height: int,
+    n_rooms: int = 20,
+    room_size: tuple[int, int] = (4, 12),
+    seed: int | None = None,
+) -> ChunkedGrid:
+    """Scatter rooms joined by L-shaped corridors on a sparse grid.
+
+    Only the rooms and corridors are allocated, so very large worlds stay
+    cheap. Start is in the first room and the goal in the last one.
+
+    Args:
+        width: Number of columns
+        height: Number of rows
+        n_rooms: Number of rooms to place
+        room_size: (min, max) room side length
+        seed: Random seed
+
+    Returns:
+        A ChunkedGrid with the carved dungeon
+    """
+    rng = random.Random(seed)
+    grid = ChunkedGrid(width, height)
+
+    centers = []
+    for _ in range(n_rooms):
+        w = rng.randint(*room_size)
+        h = rng.randint(*room_size)
+        x0 = rng.randint(1, max(1, width - w - 1))
+        y0 = rng.randint(1, max(1, height - h - 1))
+        for y in range(y0, min(y0 + h, height - 1)):
+            for x in range(x0, min(x0 + w, width - 1)):
+                grid.set_tile(x, y, TileType.EMPTY)
+        centers.append((min(x0 + w // 2, width - 2), min(y0 + h // 2, height - 2)))
+
+    # Connect consecutive rooms: horizontal leg, then vertical leg
+    for (ax, ay), (bx, by) in zip(centers, centers[1:]):
+        for x in range(min(ax, bx), max(ax, bx) + 1):
+            grid.set_tile(x, ay, TileType.EMPTY)
+        for y in range(min(ay, by), max(ay, by) + 1):
+            grid.set_tile(bx, y, TileType.EMPTY)
+
+    grid.set_tile(*centers[0], TileType.START)
+    grid.set_tile(*centers[-1], TileType.GOAL)
+    grid.clear_dirty()
+    return grid
@@ -1,8 +1,11 @@
 """Grid world data structure for the dungeon."""
 from __future__ import annotations
+import weakref
+from contextlib import contextmanager
 import numpy as np
 from pathlib import Path
-from .tiles import TileType, tile_to_char, char_to_tile, TILE_PROPERTIES
+from typing import Callable, Iterator
+from .tiles import TileType, CustomTile, TILES
 
 
 class Grid:
@@ -17,12 +20,30 @@ class Grid:
         """
         self.width = width
         self.height = height
-        # Initialize with empty tiles
-        self.tiles = np.full((height, width), TileType.EMPTY, dtype=object)
+        # Initialize with empty tiles (stored as tile ids)
+        self.tiles = np.full((height, width), TileType.EMPTY.value, dtype=np.uint8)
+        self._init_tracking()
+
+    def _init_tracking(self) -> None:
+        """Reset special positions and change tracking."""
         self._start_pos: tuple[int, int] | None = None
         self._goal_pos: tuple[int, int] | None = None
 
-    def get_tile(self, x: int, y: int) -> TileType:
+        # Change tracking: bumped on every effective tile edit
+        self.version = 0
+        self._dirty: tuple[int, int, int, int] | None = None
+        self._listeners: list[Callable[[], Callable | None]] = []
+        self._tracking = True
+
+    def _read(self, x: int, y: int) -> int:
+        """Read a tile id from storage (no bounds check)."""
+        return self.tiles[y, x]
+
+    def _write(self, x: int, y: int, tile_id: int) -> None:
+        """Write a tile id to storage (no bounds check, no tracking)."""
+        self.tiles[y, x] = tile_id
+
+    def get_tile(self, x: int, y: int) -> TileType | CustomTile:
         """Get the tile at position (x, y).
 
         Args:
@@ -34,9 +55,22 @@ class Grid:
         """
         if not self.is_valid_position(x, y):
             raise IndexError(f"Position ({x}, {y}) is out of bounds")
-        return self.tiles[y, x]
+        return TILES.tile(self._read(x, y))
+
+    def tile_id(self, x: int, y: int) -> int:
+        """Get the registry id of the tile at position (x, y).
 
-    def set_tile(self, x: int, y: int, tile: TileType) -> None:
+        Cheaper than get_tile() for code that reads TILES tables directly.
+        """
+        if not self.is_valid_position(x, y):
+            raise IndexError(f"Position ({x}, {y}) is out of bounds")
+        return self._read(x, y)
+
+    def tile_ids(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Get tile ids for arrays of in-bounds positions in one call."""
+        return self.tiles[ys, xs]
+
+    def set_tile(self, x: int, y: int, tile: TileType | CustomTile) -> None:
         """Set the tile at position (x, y).
 
         Args:
@@ -48,7 +82,10 @@ class Grid:
             raise IndexError(f"Position ({x}, {y}) is out of bounds")
 
         # Track special positions
-        old_tile = self.tiles[y, x]
+        old_id = self._read(x, y)
+        if old_id == tile.value:
+            return
+        old_tile = TILES.tile(old_id)
         if old_tile == TileType.START:
             self._start_pos = None
         if old_tile == TileType.GOAL:
@@ -58,21 +95,96 @@ class Grid:
             # Remove old start if exists
             if self._start_pos:
                 ox, oy = self._start_pos
-                self.tiles[oy, ox] = TileType.EMPTY
+                self._write(ox, oy, TileType.EMPTY.value)
+                self._record_edit(ox, oy, TileType.START, TileType.EMPTY)
             self._start_pos = (x, y)
         if tile == TileType.GOAL:
             # Remove old goal if exists
             if self._goal_pos:
                 ox, oy = self._goal_pos
-                self.tiles[oy, ox] = TileType.EMPTY
+                self._write(ox, oy, TileType.EMPTY.value)
+                self._record_edit(ox, oy, TileType.GOAL, TileType.EMPTY)
             self._goal_pos = (x, y)
 
-        self.tiles[y, x] = tile
+        self._write(x, y, tile.value)
+        self._record_edit(x, y, old_tile, tile)
+
+    def _record_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType) -> None:
+        """Bump the version, grow the dirty region and notify listeners."""
+        if not self._tracking:
+            return
+        self.version += 1
+        if self._dirty is None:
+            self._dirty = (x, y, x, y)
+        else:
+            x0, y0, x1, y1 = self._dirty
+            self._dirty = (min(x0, x), min(y0, y), max(x1, x), max(y1, y))
+
+        alive = []
+        for ref in self._listeners:
+            listener = ref()
+            if listener is not None:
+                listener(x, y, old_tile, new_tile)
+                alive.append(ref)
+        if len(alive) != len(self._listeners):
+            self._listeners = alive
+
+    @contextmanager
+    def untracked(self) -> Iterator[Grid]:
+        """Apply set_tile() edits without bumping the version or notifying listeners.
+
+        For scratch edits that are undone before the block ends (such as
+        tiles used up during one episode); anything left changed is
+        invisible to caches that follow the grid's edits.
+        """
+        tracking = self._tracking
+        self._tracking = False
+        try:
+            yield self
+        finally:
+            self._tracking = tracking
+
+    @property
+    def dirty_region(self) -> tuple[int, int, int, int] | None:
+        """Bounding box (x0, y0, x1, y1) of edits since the last clear_dirty()."""
+        return self._dirty
+
+    def clear_dirty(self) -> tuple[int, int, int, int] | None:
+        """Reset the dirty region and return what it was."""
+        region = self._dirty
+        self._dirty = None
+        return region
+
+    def add_listener(self, listener: Callable[[int, int, TileType, TileType], None]) -> None:
+        """Register a callback(x, y, old_tile, new_tile) fired on every tile edit.
+
+        Bound methods are held weakly so that registering a derived artifact
+        does not keep it alive after its owner is gone.
+        """
+        if hasattr(listener, '__self__'):
+            ref = weakref.WeakMethod(listener)
+        else:
+            ref = lambda: listener  # noqa: E731
+        self._listeners.append(ref)
+
+    def remove_listener(self, listener: Callable[[int, int, TileType, TileType], None]) -> None:
+        """Unregister a callback previously passed to add_listener()."""
+        self._listeners = [ref for ref in self._listeners
+                           if ref() is not None and ref() != listener]
 
     def is_valid_position(self, x: int, y: int) -> bool:
         """Check if a position is within the grid bounds."""
         return 0 <= x < self.width and 0 <= y < self.height
 
+    def iter_chunks(self):
+        """Iterate over stored blocks of tiles for bulk operations.
+
+        Yields:
+            (x0, y0, tiles) where tiles is a 2D array view whose top-left
+            cell is at (x0, y0). A dense grid is a single block.
+        """
+        yield 0, 0, self.tiles
+
     @property
     def start_pos(self) -> tuple[int, int] | None:
         """Get the start position."""
@@ -85,13 +197,14 @@ class Grid:
 
     def __str__(self) -> str:
         """Convert grid to string representation."""
-        lines = []
-        for y in range(self.height):
-            row = ""
-            for x in range(self.width):
-                row += tile_to_char(self.tiles[y, x])
-            lines.append(row)
-        return "\n".join(lines)
+        chars = TILES.char_codes[self.tiles]
+        return "\n".join(row.tobytes().decode('ascii') for row in chars)
+
+    def __getstate__(self) -> dict:
+        # Listeners are process-local (and weakly referenced); don't pickle them
+        state = self.__dict__.copy()
+        state['_listeners'] = []
+        return state
 
     def __repr__(self) -> str:
         return f"Grid({self.width}x{self.height})"
@@ -135,13 +248,20 @@ def load_grid_from_string(text: str) -> Grid:
     grid = Grid(width, height)
 
     for y, line in enumerate(lines):
-        for x, char in enumerate(line):
-            if char != ' ':  # Skip spaces (treated as empty)
-                try:
-                    tile = char_to_tile(char)
-                    grid.set_tile(x, y, tile)
-                except ValueError:
-                    pass  # Unknown character, keep as EMPTY
+        ids = TILES.decode(line)
+        # Unknown characters and spaces stay EMPTY
+        grid.tiles[y, :len(ids)] = np.where(ids < 0, TileType.EMPTY.value, ids)
+
+    # Only one start and goal are kept: the last one in reading order wins
+    for tile in (TileType.START, TileType.GOAL):
+        ys, xs = np.nonzero(grid.tiles == tile.value)
+        if len(xs) == 0:
+            continue
+        grid.tiles[ys[:-1], xs[:-1]] = TileType.EMPTY.value
+        if tile == TileType.START:
+            grid._start_pos = (int(xs[-1]), int(ys[-1]))
+        else:
+            grid._goal_pos = (int(xs[-1]), int(ys[-1]))
 
     return grid
 
@@ -0,0 +1,52 @@
+"""Lazy package exports.
+
+Package __init__ modules map their public names to the submodules that
+define them and import a submodule only when one of its names is first
+used. Importing a package is then nearly free, and a process that only
+needs Grid and QLearning never loads gymnasium, pygame or
+multiprocessing.
+"""
+from __future__ import annotations
+import importlib
+import sys
+from typing import Any, Callable
+
+
+def lazy_exports(
+    package: str,
+    modules: dict[str, tuple[str, ...]],
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Module-level __getattr__ and __dir__ for a package's public names.
+
+    Usage in a package __init__:
+
+        __getattr__, __dir__ = lazy_exports(__name__, {
+            '.grid': ('Grid', 'load_grid_from_file'),
+        })
+
+    Args:
+        package: The package's __name__
+        modules: Relative submodule name -> names it exports
+
+    Returns:
+        (__getattr__, __dir__) to assign in the package namespace
+    """
+    exports = {name: module for module, names in modules.items() for name in names}
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        loaded = importlib.import_module(module, package)
+        # Bind all of the submodule's names, so later lookups skip
+        # __getattr__ and a name shared with its submodule (env.replay)
+        # refers to the function, not the module
+        for export in modules[module]:
+            namespace[export] = getattr(loaded, export)
+        return namespace[name]
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
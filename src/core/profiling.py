@@ -0,0 +1,165 @@
+"""Lightweight instrumentation for the training hot paths.
+
+QLearning and DungeonEnv accept a Profiler in their `profiler` attribute
+(None by default, which costs one attribute check per step). With a
+profiler attached they count steps, wall bumps, resets and episodes, and
+time the phases of every sample_every-th step with perf_counter, so the
+timing overhead stays a small fraction of the run. Phase totals are
+estimated from the samples.
+
+For a whole-program view, profile_call runs a function under cProfile
+and subsystem_report groups the result by package (src.algorithms,
+src.env, numpy, ...).
+"""
+from __future__ import annotations
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    import pstats
+
+# Time one in this many calls of each instrumented section
+SAMPLE_EVERY = 16
+
+
+class Profiler:
+    """Sampled per-phase timers and event counters.
+
+    Instrumented code calls sample(section) once per pass through a
+    section (e.g. one training step); when it returns True the code times
+    its phases and hands them to record(). Counters are exact.
+    """
+
+    def __init__(self, sample_every: int = SAMPLE_EVERY):
+        """Create an empty profiler.
+
+        Args:
+            sample_every: Time one in this many passes of each section
+                (1 times every pass)
+        """
+        self.sample_every = sample_every
+        self.counters: dict[str, int] = defaultdict(int)
+        self._passes: dict[str, int] = defaultdict(int)
+        self._sampled: dict[str, int] = defaultdict(int)
+        self._times: dict[tuple[str, str], float] = defaultdict(float)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add to an event counter."""
+        self.counters[name] += n
+
+    def sample(self, section: str) -> bool:
+        """Register a pass through a section; True if this pass should be timed."""
+        passes = self._passes[section] + 1
+        self._passes[section] = passes
+        if passes % self.sample_every:
+            return False
+        self._sampled[section] += 1
+        return True
+
+    def record(self, section: str, **phases: float) -> None:
+        """Add the measured durations (seconds) of a timed pass's phases."""
+        for phase, seconds in phases.items():
+            self._times[section, phase] += seconds
+
+    def reset(self) -> None:
+        """Clear all counters and timings."""
+        self.counters.clear()
+        self._passes.clear()
+        self._sampled.clear()
+        self._times.clear()
+
+    def summary(self) -> dict[str, Any]:
+        """Counters and per-phase timing estimates.
+
+        Returns:
+            Dict with 'counters' (name -> count) and 'phases', a list of
+            dicts with section, phase, samples, mean_us (per pass),
+            total_s (estimated over all passes) and share (of the estimated
+            total of all phases), slowest first
+        """
+        phases = []
+        for (section, phase), seconds in self._times.items():
+            samples = self._sampled[section]
+            mean = seconds / samples
+            phases.append({
+                'section': section,
+                'phase': phase,
+                'samples': samples,
+                'mean_us': mean * 1e6,
+                'total_s': mean * self._passes[section],
+            })
+        total = sum(p['total_s'] for p in phases)
+        for p in phases:
+            p['share'] = p['total_s'] / total if total else 0.0
+        phases.sort(key=lambda p: p['total_s'], reverse=True)
+        return {'counters': dict(sorted(self.counters.items())), 'phases': phases}
+
+    def report(self) -> str:
+        """Human-readable summary table."""
+        summary = self.summary()
+        lines = [f"{'Phase':<32} {'Mean (us)':>10} {'Total (s)':>10} {'Share':>7} {'Samples':>8}"]
+        for p in summary['phases']:
+            lines.append(f"{p['section'] + '/' + p['phase']:<32} {p['mean_us']:>10.2f} {p['total_s']:>10.4f} "
+                         f"{p['share']:>7.1%} {p['samples']:>8}")
+        lines.append("")
+        lines.append(f"{'Counter':<32} {'Count':>10}")
+        for name, value in summary['counters'].items():
+            lines.append(f"{name:<32} {value:>10}")
+        return "\n".join(lines)
+
+
+def subsystem(filename: str) -> str:
+    """Subsystem a profiled function belongs to, from its source file."""
+    if filename == '~' or filename.startswith('<'):
+        return 'builtins'
+    parts = Path(filename).parts
+    if 'site-packages' in parts or 'dist-packages' in parts:
+        index = max(i for i, part in enumerate(parts) if part in ('site-packages', 'dist-packages'))
+        return parts[index + 1].split('.')[0] if index + 1 < len(parts) else 'site-packages'
+    if 'src' in parts:
+        index = len(parts) - 1 - parts[::-1].index('src')
+        package = parts[index + 1:-1]
+        return 'src.' + package[0] if package else 'src'
+    return 'stdlib'
+
+
+def subsystem_report(stats: pstats.Stats, top: int = 20) -> str:
+    """Self time per subsystem, then the slowest functions.
+
+    Self (tottime) rather than cumulative time is summed, so the
+    subsystem rows add up to the profiled total.
+    """
+    per_subsystem: dict[str, list[float]] = defaultdict(lambda: [0.0, 0])
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        group = subsystem(filename)
+        per_subsystem[group][0] += tottime
+        per_subsystem[group][1] += ncalls
+        rows.append((tottime, cumtime, ncalls, group, f"{Path(filename).name}:{line}({name})"))
+
+    total = sum(t for t, _ in per_subsystem.values()) or 1.0
+    lines = [f"{'Subsystem':<20} {'Self (s)':>10} {'Share':>7} {'Calls':>12}"]
+    for group, (tottime, ncalls) in sorted(per_subsystem.items(), key=lambda item: -item[1][0]):
+        lines.append(f"{group:<20} {tottime:>10.4f} {tottime / total:>7.1%} {ncalls:>12}")
+
+    lines.append("")
+    lines.append(f"{'Self (s)':>10} {'Cum (s)':>10} {'Calls':>10}  {'Subsystem':<16} Function")
+    for tottime, cumtime, ncalls, group, where in sorted(rows, reverse=True)[:top]:
+        lines.append(f"{tottime:>10.4f} {cumtime:>10.4f} {ncalls:>10}  {group:<16} {where}")
+    return "\n".join(lines)
+
+
+def profile_call(func: Callable, *args, **kwargs) -> tuple[Any, pstats.Stats]:
+    """Run func under cProfile.
+
+    Returns:
+        (func's return value, the collected stats)
+    """
+    import cProfile
+    import io
+    import pstats
+
+    profile = cProfile.Profile()
+    result = profile.runcall(func, *args, **kwargs)
+    return result, pstats.Stats(profile, stream=io.StringIO())
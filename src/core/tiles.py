@@ -1,6 +1,8 @@
 """Tile system for the dungeon grid world."""
+from __future__ import annotations
 from enum import Enum
 from dataclasses import dataclass
+import numpy as np
 
 
 class TileType(Enum):
@@ -13,6 +15,17 @@ class TileType(Enum):
     HEAL = 5
 
 
+@dataclass(frozen=True)
+class CustomTile:
+    """A tile kind registered at runtime.
+
+    Mirrors the TileType interface (value, name) so both can be used
+    interchangeably with Grid.
+    """
+    value: int
+    name: str
+
+
 @dataclass
 class TileProperties:
     """Properties for each tile type."""
@@ -20,37 +33,190 @@ class TileProperties:
     reward: float
     char: str
     name: str
+    hp_delta: int = 0
+    lethal: bool = False
+    terminal: bool = False
+    color: tuple[int, int, int] = (128, 128, 128)
+
+
+# Maximum number of tile kinds (ids are stored as uint8 in grids)
+MAX_TILES = 256
+
+
+class TileRegistry:
+    """Registry of tile kinds compiled into dense lookup tables.
+
+    Every tile kind has an integer id (its value). Properties are compiled
+    into NumPy arrays indexed by id for vectorized code, and into plain
+    per-id tuples for scalar hot paths such as Agent.move.
+    """
+
+    def __init__(self):
+        self.properties: dict[TileType | CustomTile, TileProperties] = {}
+        self._tiles: list[TileType | CustomTile] = []
+        self._by_char: dict[str, TileType | CustomTile] = {}
+        self._by_name: dict[str, TileType | CustomTile] = {}
+        self._compile()
+
+    def _add(self, tile: TileType | CustomTile, props: TileProperties) -> None:
+        if tile.value != len(self._tiles):
+            raise ValueError(f"Tile id {tile.value} is not the next free id")
+        if props.char in self._by_char:
+            raise ValueError(f"Tile character already registered: {props.char!r}")
+        if len(props.char) != 1 or ord(props.char) >= 128:
+            raise ValueError(f"Tile character must be a single ASCII character: {props.char!r}")
+        if len(self._tiles) >= MAX_TILES:
+            raise ValueError(f"Cannot register more than {MAX_TILES} tile kinds")
+
+        self._tiles.append(tile)
+        self.properties[tile] = props
+        self._by_char[props.char] = tile
+        self._by_name[tile.name] = tile
+        self._compile()
+
+    def register(
+        self,
+        name: str,
+        char: str,
+        passable: bool = True,
+        reward: float = 0.0,
+        hp_delta: int = 0,
+        lethal: bool = False,
+        terminal: bool = False,
+        color: tuple[int, int, int] = (128, 128, 128),
+        display_name: str | None = None,
+    ) -> CustomTile:
+        """Register a new tile kind.
+
+        Args:
+            name: Unique identifier (e.g. 'PIT')
+            char: Single ASCII character used in dungeon files
+            passable: Whether agents can enter the tile
+            reward: Reward for stepping on the tile
+            hp_delta: HP change when entering (negative = damage)
+            lethal: Entering kills the agent outright
+            terminal: Entering ends the episode
+            color: RGB render color
+            display_name: Human-readable name (defaults to name)
+
+        Returns:
+            The new tile, usable anywhere a TileType is
+        """
+        if name in self._by_name:
+            raise ValueError(f"Tile already registered: {name}")
+        tile = CustomTile(len(self._tiles), name)
+        self._add(tile, TileProperties(
+            passable=passable, reward=reward, char=char, name=display_name or name.title(),
+            hp_delta=hp_delta, lethal=lethal, terminal=terminal, color=color,
+        ))
+        return tile
+
+    def _compile(self) -> None:
+        """Rebuild the lookup tables from the registered properties."""
+        props = [self.properties[tile] for tile in self._tiles]
+        self.passable = np.array([p.passable for p in props], dtype=bool)
+        self.reward = np.array([p.reward for p in props], dtype=np.float64)
+        self.hp_delta = np.array([p.hp_delta for p in props], dtype=np.int32)
+        self.lethal = np.array([p.lethal for p in props], dtype=bool)
+        self.terminal = np.array([p.terminal for p in props], dtype=bool)
+        self.color = np.array([p.color for p in props], dtype=np.uint8).reshape(-1, 3)
+        self.char_codes = np.array([ord(p.char) for p in props], dtype=np.uint8)
+
+        # ASCII code -> tile id, -1 for unknown characters
+        self.char_table = np.full(128, -1, dtype=np.int16)
+        self.char_table[self.char_codes] = np.arange(len(props))
+
+        # (passable, reward, hp_delta, lethal, terminal) per id
+        self.rows = [(p.passable, float(p.reward), p.hp_delta, p.lethal, p.terminal) for p in props]
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+    def tile(self, tile_id: int) -> TileType | CustomTile:
+        """Get the tile kind for an id."""
+        return self._tiles[tile_id]
+
+    def get(self, name: str) -> TileType | CustomTile:
+        """Get a tile kind by its identifier."""
+        return self._by_name[name]
+
+    def from_char(self, char: str) -> TileType | CustomTile:
+        """Get the tile kind for a character."""
+        try:
+            return self._by_char[char]
+        except KeyError:
+            raise ValueError(f"Unknown tile character: {char}") from None
+
+    def decode(self, text: str) -> np.ndarray:
+        """Translate a string into tile ids in one pass (-1 for unknown)."""
+        codes = np.frombuffer(text.encode('ascii', 'replace'), dtype=np.uint8)
+        return self.char_table[codes]
+
+
+# Global tile registry with the built-in tiles
+TILES = TileRegistry()
+for _tile, _props in (
+    (TileType.EMPTY, TileProperties(passable=True, reward=0, char='.', name='Empty', color=(240, 240, 240))),
+    (TileType.WALL, TileProperties(passable=False, reward=-1, char='#', name='Wall', color=(40, 40, 40))),
+    (TileType.START, TileProperties(passable=True, reward=0, char='S', name='Start', color=(100, 150, 255))),
+    (TileType.GOAL, TileProperties(passable=True, reward=100, char='G', name='Goal', terminal=True,
+                                   color=(100, 255, 100))),
+    (TileType.TRAP, TileProperties(passable=True, reward=-10, char='T', name='Trap', hp_delta=-10,
+                                   color=(255, 100, 100))),
+    (TileType.HEAL, TileProperties(passable=True, reward=5, char='H', name='Heal', hp_delta=10,
+                                   color=(255, 180, 200))),
+):
+    TILES._add(_tile, _props)
+
+# Tile properties lookup (live view of the registry)
+TILE_PROPERTIES: dict[TileType | CustomTile, TileProperties] = TILES.properties
+
+
+def register_tile(name: str, char: str, **properties) -> CustomTile:
+    """Register a new tile kind in the global registry.
+
+    See TileRegistry.register for the accepted properties.
+    """
+    return TILES.register(name, char, **properties)
+
 
+def register_browser_tiles() -> dict[str, CustomTile]:
+    """Register the extra tiles of the browser game (pit, gold, monster).
 
-# Tile properties lookup
-TILE_PROPERTIES: dict[TileType, TileProperties] = {
-    TileType.EMPTY: TileProperties(passable=True, reward=0, char='.', name='Empty'),
-    TileType.WALL: TileProperties(passable=False, reward=-1, char='#', name='Wall'),
-    TileType.START: TileProperties(passable=True, reward=0, char='S', name='Start'),
-    TileType.GOAL: TileProperties(passable=True, reward=100, char='G', name='Goal'),
-    TileType.TRAP: TileProperties(passable=True, reward=-10, char='T', name='Trap'),
-    TileType.HEAL: TileProperties(passable=True, reward=5, char='H', name='Heal'),
-}
+    BROWSER_HEAL ('h') is the browser's heal tile: it restores HP like
+    HEAL but pays no reward. Returns the existing kinds if they are
+    already registered.
+    """
+    specs = {
+        'PIT': dict(char='P', reward=-100, lethal=True, terminal=True, color=(24, 24, 27)),
+        'GOLD': dict(char='$', reward=10, color=(251, 191, 36)),
+        'MONSTER': dict(char='M', reward=5, hp_delta=-30, color=(147, 51, 234)),
+        'BROWSER_HEAL': dict(char='h', reward=0, hp_delta=10, display_name='Heal', color=(244, 114, 182)),
+    }
+    tiles = {}
+    for name, spec in specs.items():
+        try:
+            tiles[name] = TILES.get(name)
+        except KeyError:
+            tiles[name] = TILES.register(name, **spec)
+    return tiles
 
 
-def tile_to_char(tile: TileType) -> str:
+def tile_to_char(tile: TileType | CustomTile) -> str:
     """Convert tile type to character representation."""
-    return TILE_PROPERTIES[tile].char
+    return chr(TILES.char_codes[tile.value])
 
 
-def char_to_tile(char: str) -> TileType:
+def char_to_tile(char: str) -> TileType | CustomTile:
     """Convert character to tile type."""
-    for tile_type, props in TILE_PROPERTIES.items():
-        if props.char == char:
-            return tile_type
-    raise ValueError(f"Unknown tile character: {char}")
+    return TILES.from_char(char)
 
 
-def is_passable(tile: TileType) -> bool:
+def is_passable(tile: TileType | CustomTile) -> bool:
     """Check if a tile is passable."""
-    return TILE_PROPERTIES[tile].passable
+    return TILES.rows[tile.value][0]
 
 
-def get_reward(tile: TileType) -> float:
+def get_reward(tile: TileType | CustomTile) -> float:
     """Get the reward for stepping on a tile."""
-    return TILE_PROPERTIES[tile].reward
+    return TILES.rows[tile.value][1]
@@ -0,0 +1,17 @@
+"""Trajectory recording and datasets.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.trajectories': ('TrajectoryRecorder', 'TrajectoryDataset', 'TRANSITION_DTYPE', 'COLUMNS'),
+})
+
+__all__ = [
+    'TrajectoryRecorder',
+    'TrajectoryDataset',
+    'TRANSITION_DTYPE',
+    'COLUMNS',
+]
@@ -0,0 +1,260 @@
+"""Columnar trajectory recording to compressed .npz shards."""
+from __future__ import annotations
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+import numpy as np
+
+
+# Column layout of a transition row (one shard column per field)
+TRANSITION_DTYPE = np.dtype([
+    ('episode', np.int32),
+    ('step', np.int32),
+    ('x', np.int32),
+    ('y', np.int32),
+    ('action', np.int8),
+    ('reward', np.float64),
+    ('done', np.bool_),
+    ('hp', np.int32),
+    ('next_x', np.int32),
+    ('next_y', np.int32),
+])
+COLUMNS = TRANSITION_DTYPE.names
+
+
+class TrajectoryRecorder:
+    """Records transitions into columnar chunks written by a background thread.
+
+    Each chunk is a set of preallocated per-column Python lists, so the hot
+    path is a handful of slot stores with no per-row allocation. Each full
+    chunk is handed to a writer thread that converts the columns to NumPy
+    and saves them as a compressed .npz shard, then returns the buffers to
+    the pool. If the writer falls behind, append() blocks once all buffers
+    are in flight (bounded memory).
+    """
+
+    # Columns filled by append(); 'step' is derived when writing
+    _RECORDED = ('episode', 'x', 'y', 'action', 'reward', 'done', 'hp', 'next_x', 'next_y')
+
+    def __init__(
+        self,
+        directory: str | Path,
+        chunk_size: int = 65536,
+        n_buffers: int = 3,
+        metadata: dict[str, Any] | None = None,
+        prefix: str | None = None,
+    ):
+        """Initialize the recorder.
+
+        Args:
+            directory: Output directory for shards (created if missing)
+            chunk_size: Transitions per shard
+            n_buffers: Number of preallocated chunk buffers
+            metadata: JSON-serializable info stored in meta.json
+                (e.g. the dungeon text)
+            prefix: Shard file prefix (default: timestamp and pid, so
+                several sessions can share a directory)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self.prefix = prefix or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        if metadata is not None:
+            with open(self.directory / 'meta.json', 'w') as f:
+                json.dump(metadata, f)
+
+        self._free: queue.Queue = queue.Queue()
+        for _ in range(n_buffers - 1):
+            self._free.put(self._new_buffer())
+        self._bind(self._new_buffer())
+        self._n = 0
+        self._shard = 0
+        self.episode = 0
+        self.n_transitions = 0
+        self._episode_has_steps = False
+
+        # Writer-side state for deriving the step column across shards
+        self._last_episode = -1
+        self._last_step = 0
+
+        self._pending: queue.Queue = queue.Queue()
+        self._error: BaseException | None = None
+        self._writer = threading.Thread(target=self._write_loop, name='trajectory-writer', daemon=True)
+        self._writer.start()
+
+    def _new_buffer(self) -> list[list]:
+        return [[0] * self.chunk_size for _ in self._RECORDED]
+
+    def _bind(self, buffer: list[list]) -> None:
+        self._buffer = buffer
+        (self._episode_col, self._x, self._y, self._action, self._reward,
+         self._done, self._hp, self._next_x, self._next_y) = buffer
+
+    def append(self, x: int, y: int, action: int, reward: float, done: bool,
+               hp: int, next_x: int, next_y: int) -> None:
+        """Record one transition of the current episode."""
+        n = self._n
+        self._episode_col[n] = self.episode
+        self._x[n] = x
+        self._y[n] = y
+        self._action[n] = action
+        self._reward[n] = reward
+        self._done[n] = done
+        self._hp[n] = hp
+        self._next_x[n] = next_x
+        self._next_y[n] = next_y
+        n += 1
+        self._n = n
+        if n == self.chunk_size:
+            self._submit()
+        self._episode_has_steps = True
+
+    def end_episode(self) -> None:
+        """Mark the end of the current episode."""
+        if self._episode_has_steps:
+            self.episode += 1
+            self._episode_has_steps = False
+
+    def _submit(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Trajectory writer failed") from self._error
+        self._pending.put((self._shard, self._buffer, self._n))
+        self.n_transitions += self._n
+        self._shard += 1
+        self._bind(self._free.get())
+        self._n = 0
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._pending.task_done()
+                return
+            shard, buffer, n = item
+            try:
+                columns = {
+                    name: np.array(col[:n], dtype=TRANSITION_DTYPE[name])
+                    for name, col in zip(self._RECORDED, buffer)
+                }
+                columns['step'] = self._steps(columns['episode'])
+                path = self.directory / f"{self.prefix}-{shard:06d}.npz"
+                np.savez_compressed(path, **{name: columns[name] for name in COLUMNS})
+            except BaseException as e:  # surfaced on the next submit/close
+                self._error = e
+            finally:
+                self._free.put(buffer)
+                self._pending.task_done()
+
+    def _steps(self, episodes: np.ndarray) -> np.ndarray:
+        """Step index within the episode for every row of a chunk."""
+        n = episodes.size
+        index = np.arange(n, dtype=np.int32)
+        new = np.ones(n, dtype=bool)
+        new[1:] = episodes[1:] != episodes[:-1]
+        starts = np.maximum.accumulate(np.where(new, index, 0))
+        steps = index - starts
+        # The first episode may continue from the previous shard
+        if n and episodes[0] == self._last_episode:
+            steps[starts == 0] += self._last_step
+        if n:
+            self._last_episode = int(episodes[-1])
+            self._last_step = int(steps[-1]) + 1
+        return steps
+
+    def flush(self) -> None:
+        """Write the partial chunk and wait until all shards are on disk."""
+        if self._n:
+            self._submit()
+        self._pending.join()
+        if self._error is not None:
+            raise RuntimeError("Trajectory writer failed") from self._error
+
+    def close(self) -> None:
+        """Flush and stop the writer thread."""
+        self.end_episode()
+        self.flush()
+        self._pending.put(None)
+        self._writer.join()
+
+    def __enter__(self) -> TrajectoryRecorder:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TrajectoryDataset:
+    """Lazily streams shards written by TrajectoryRecorder."""
+
+    def __init__(self, directory: str | Path):
+        """Open a shard directory.
+
+        Args:
+            directory: Directory containing .npz shards
+        """
+        self.directory = Path(directory)
+        self.shards = sorted(self.directory.glob('*.npz'))
+        meta_path = self.directory / 'meta.json'
+        self.metadata: dict[str, Any] = {}
+        if meta_path.exists():
+            with open(meta_path) as f:
+                self.metadata = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    def __iter__(self) -> Iterator[dict[str, np.ndarray]]:
+        """Yield one dict of columns per shard, loading shards on demand."""
+        for path in self.shards:
+            with np.load(path) as shard:
+                yield {name: shard[name] for name in shard.files}
+
+    def iter_columns(self, *names: str) -> Iterator[tuple[np.ndarray, ...]]:
+        """Yield only the requested columns of each shard."""
+        for path in self.shards:
+            with np.load(path) as shard:
+                yield tuple(shard[name] for name in names)
+
+    def iter_episodes(self) -> Iterator[dict[str, np.ndarray]]:
+        """Yield one dict of columns per episode.
+
+        Episodes that span shard boundaries are stitched back together.
+        """
+        carry: list[dict[str, np.ndarray]] = []
+        carry_key = None
+        for path in self.shards:
+            prefix = path.stem.rsplit('-', 1)[0]
+            with np.load(path) as shard:
+                columns = {name: shard[name] for name in shard.files}
+            episodes = columns['episode']
+            if episodes.size == 0:
+                continue
+            starts = np.flatnonzero(np.diff(episodes)) + 1
+            bounds = np.concatenate([[0], starts, [episodes.size]])
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                key = (prefix, int(episodes[lo]))
+                part = {name: col[lo:hi] for name, col in columns.items()}
+                if carry and key != carry_key:
+                    yield _concat(carry)
+                    carry = []
+                carry.append(part)
+                carry_key = key
+        if carry:
+            yield _concat(carry)
+
+    def load(self) -> dict[str, np.ndarray]:
+        """Load every shard into one dict of concatenated columns."""
+        parts = list(self)
+        if not parts:
+            return {name: np.empty(0, dtype=TRANSITION_DTYPE[name]) for name in COLUMNS}
+        return _concat(parts)
+
+
+def _concat(parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
@@ -1,4 +1,25 @@
-"""Gymnasium environment for RL Dungeon."""
-from .dungeon_env import DungeonEnv, register_envs
+"""Gymnasium environment for RL Dungeon.
 
-__all__ = ["DungeonEnv", "register_envs"]
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.dungeon_env': ('DungeonEnv', 'EnvState', 'register_envs'),
+    '.multi_agent_env': ('MultiAgentDungeonEnv',),
+    '.replay': ('Recording', 'ReplayResult', 'replay', 'replay_actions'),
+    '.wrappers': ('RecordTrajectories',),
+})
+
+__all__ = [
+    "DungeonEnv",
+    "EnvState",
+    "MultiAgentDungeonEnv",
+    "Recording",
+    "RecordTrajectories",
+    "ReplayResult",
+    "register_envs",
+    "replay",
+    "replay_actions",
+]
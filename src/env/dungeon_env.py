@@ -2,20 +2,61 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
+from dataclasses import dataclass
+from time import perf_counter
 from typing import Optional, Any
 
 from ..core.grid import Grid, load_grid_from_file
-from ..core.tiles import TileType
+from ..core.profiling import Profiler
+from ..core.tiles import TILES, TileType, tile_to_char
 from ..agents.agent import Agent, Action
 
 
+@dataclass(frozen=True, slots=True)
+class EnvState:
+    """Immutable snapshot of a DungeonEnv episode.
+
+    Snapshots share nothing mutable with the environment, so they can be
+    kept, compared, hashed and restored any number of times without
+    copying. The RNG state is the bit generator's state dict frozen into
+    nested (key, value) tuples.
+    """
+    x: int
+    y: int
+    hp: int
+    max_hp: int
+    total_reward: float
+    steps: int
+    rng_state: Optional[tuple] = None
+
+
+def _freeze(value: Any) -> Any:
+    """Bit generator state as nested tuples (dicts become sorted (key, value) pairs)."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in sorted(value.items()))
+    if isinstance(value, np.ndarray):
+        return ('__array__', str(value.dtype), tuple(value.tolist()))
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze()."""
+    if isinstance(value, tuple):
+        if value and value[0] == '__array__':
+            return np.array(value[2], dtype=value[1])
+        return {key: _thaw(item) for key, item in value}
+    return value
+
+
 class DungeonEnv(gym.Env):
     """Dungeon environment following Gymnasium interface.
 
     Observation:
-        Type: Box(2,) or Box(width, height) depending on obs_type
+        Type: Box(2,), Box(height, width) or Box(2r+1, 2r+1) depending on obs_type
         - "position": [x, y] normalized to [0, 1]
         - "grid": 2D array with tile types
+        - "local": tile types in a square window centered on the agent
+          (cells outside the dungeon read as walls)
 
     Actions:
         Type: Discrete(4)
@@ -40,7 +81,8 @@ class DungeonEnv(gym.Env):
         grid: Optional[Grid] = None,
         max_steps: int = 200,
         render_mode: Optional[str] = None,
-        obs_type: str = "position"
+        obs_type: str = "position",
+        view_radius: int = 2,
     ):
         """Initialize the environment.
 
@@ -49,7 +91,9 @@ class DungeonEnv(gym.Env):
             grid: Grid object directly (mutually exclusive with dungeon_file)
             max_steps: Maximum steps before truncation
             render_mode: "human", "rgb_array", or "ansi"
-            obs_type: "position" for (x, y) or "grid" for full grid observation
+            obs_type: "position" for (x, y), "grid" for full grid observation
+                or "local" for a window around the agent
+            view_radius: Half-width of the "local" observation window
         """
         super().__init__()
 
@@ -77,13 +121,31 @@ class DungeonEnv(gym.Env):
         elif obs_type == "grid":
             # Full grid observation (tile type values)
             self.observation_space = spaces.Box(
-                low=0, high=len(TileType) - 1,
+                low=0, high=len(TILES) - 1,
                 shape=(self.grid.height, self.grid.width),
                 dtype=np.int32
             )
+        elif obs_type == "local":
+            # Window of tile type values centered on the agent (-1 marks the agent)
+            size = 2 * view_radius + 1
+            self.observation_space = spaces.Box(
+                low=-1, high=len(TILES) - 1,
+                shape=(size, size),
+                dtype=np.int32
+            )
+            self.view_radius = view_radius
         else:
             raise ValueError(f"Unknown obs_type: {obs_type}")
 
+        # Tile ids as int32 (with a wall border as wide as the view radius
+        # for "local"), kept in sync with grid edits, so observations are a
+        # slice and a copy even on a ChunkedGrid
+        self._ids: Optional[np.ndarray] = None
+        if obs_type != "position":
+            self._pad = view_radius if obs_type == "local" else 0
+            self._ids = self._padded_ids(self._pad)
+            self.grid.add_listener(self._on_grid_edit)
+
         # Find start position
         self.start_pos = self.grid.start_pos
         if self.start_pos is None:
@@ -96,6 +158,21 @@ class DungeonEnv(gym.Env):
         # Renderer (lazy init)
         self._renderer = None
 
+        # Optional hot-path instrumentation: counts steps, wall bumps and
+        # resets, and times sampled step() phases (move, get_obs, get_info)
+        self.profiler: Optional[Profiler] = None
+
+    def _padded_ids(self, pad: int) -> np.ndarray:
+        """Tile ids of the grid surrounded by pad cells of wall."""
+        ids = np.full((self.grid.height + 2 * pad, self.grid.width + 2 * pad), TileType.WALL.value, dtype=np.int32)
+        for x0, y0, block in self.grid.iter_chunks():
+            ids[pad + y0:pad + y0 + block.shape[0], pad + x0:pad + x0 + block.shape[1]] = block
+        return ids
+
+    def _on_grid_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType):
+        """Keep the cached tile ids in sync with the grid."""
+        self._ids[y + self._pad, x + self._pad] = new_tile.value
+
     def _get_obs(self) -> np.ndarray:
         """Get current observation."""
         if self.obs_type == "position":
@@ -103,15 +180,22 @@ class DungeonEnv(gym.Env):
                 self.agent.x / (self.grid.width - 1),
                 self.agent.y / (self.grid.height - 1)
             ], dtype=np.float32)
+        elif self.obs_type == "local":
+            return self._get_local_obs()
         else:  # grid
-            obs = np.zeros((self.grid.height, self.grid.width), dtype=np.int32)
-            for y in range(self.grid.height):
-                for x in range(self.grid.width):
-                    obs[y, x] = self.grid.get_tile(x, y).value
+            obs = self._ids.copy()
             # Mark agent position (special value)
             obs[self.agent.y, self.agent.x] = -1
             return obs
 
+    def _get_local_obs(self) -> np.ndarray:
+        """Tile ids around the agent, with walls beyond the dungeon edge."""
+        r = self.view_radius
+        # The padding shifts grid cell (x, y) to (x + r, y + r)
+        obs = self._ids[self.agent.y:self.agent.y + 2 * r + 1, self.agent.x:self.agent.x + 2 * r + 1].copy()
+        obs[r, r] = -1
+        return obs
+
     def _get_info(self) -> dict[str, Any]:
         """Get additional info."""
         return {
@@ -136,6 +220,8 @@ class DungeonEnv(gym.Env):
             observation, info
         """
         super().reset(seed=seed)
+        if self.profiler is not None:
+            self.profiler.count('env.resets')
 
         # Create or reset agent
         if self.agent is None:
@@ -156,23 +242,81 @@ class DungeonEnv(gym.Env):
         Returns:
             observation, reward, terminated, truncated, info
         """
-        # Convert int to Action enum
-        action_enum = Action(action)
+        profiler = self.profiler
+        if profiler is None or not profiler.sample('env.step'):
+            reward, terminated, truncated = self.advance(action)
+            return self._get_obs(), reward, terminated, truncated, self._get_info()
+
+        t0 = perf_counter()
+        reward, terminated, truncated = self.advance(action)
+        t1 = perf_counter()
+        obs = self._get_obs()
+        t2 = perf_counter()
+        info = self._get_info()
+        profiler.record('env.step', move=t1 - t0, get_obs=t2 - t1, get_info=perf_counter() - t2)
+        return obs, reward, terminated, truncated, info
+
+    def advance(self, action: int) -> tuple[float, bool, bool]:
+        """Apply an action without building an observation or info dict.
 
-        # Execute action
-        reward, terminated, _ = self.agent.move(action_enum, self.grid)
+        This is the fast path used for replays and planning rollouts.
+
+        Returns:
+            reward, terminated, truncated
+        """
+        reward, terminated, moved = self.agent.move(Action(action), self.grid)
         self.steps += 1
+        if self.profiler is not None:
+            self.profiler.count('env.steps')
+            if not moved:
+                self.profiler.count('env.wall_bumps')
 
         # Check truncation (max steps)
         truncated = self.steps >= self.max_steps
 
-        return self._get_obs(), reward, terminated, truncated, self._get_info()
+        return reward, terminated, truncated
+
+    def get_state(self, include_rng: bool = True) -> EnvState:
+        """Capture the current episode state.
+
+        Args:
+            include_rng: Also capture the environment RNG (skip it for
+                cheaper snapshots when nothing random happens)
+
+        Returns:
+            An immutable EnvState
+        """
+        if self.agent is None:
+            raise RuntimeError("Call reset() before get_state()")
+        return EnvState(
+            x=self.agent.x,
+            y=self.agent.y,
+            hp=self.agent.hp,
+            max_hp=self.agent.max_hp,
+            total_reward=self.agent.total_reward,
+            steps=self.steps,
+            rng_state=_freeze(self.np_random.bit_generator.state) if include_rng else None,
+        )
+
+    def set_state(self, state: EnvState) -> None:
+        """Restore a state captured with get_state()."""
+        if self.agent is None:
+            self.agent = Agent(state.x, state.y, state.hp, state.max_hp)
+        else:
+            self.agent.x, self.agent.y = state.x, state.y
+            self.agent.hp, self.agent.max_hp = state.hp, state.max_hp
+        self.agent.total_reward = state.total_reward
+        self.steps = state.steps
+        if state.rng_state is not None:
+            self.np_random.bit_generator.state = _thaw(state.rng_state)
 
     def render(self):
         """Render the environment."""
         if self.render_mode == "ansi":
             return self._render_ansi()
-        elif self.render_mode in ("human", "rgb_array"):
+        elif self.render_mode == "rgb_array":
+            return self._render_rgb_array()
+        elif self.render_mode == "human":
             return self._render_pygame()
         return None
 
@@ -185,41 +329,40 @@ class DungeonEnv(gym.Env):
                 if (x, y) == (self.agent.x, self.agent.y):
                     row += "@"  # Agent
                 else:
-                    tile = self.grid.get_tile(x, y)
-                    from ..core.tiles import tile_to_char
-                    row += tile_to_char(tile)
+                    row += tile_to_char(self.grid.get_tile(x, y))
             lines.append(row)
         return "\n".join(lines)
 
+    def _render_rgb_array(self) -> np.ndarray:
+        """Render an (H, W, 3) uint8 frame with NumPy (no pygame or display)."""
+        if self._renderer is None:
+            from ..ui.array_renderer import ArrayRenderer
+            self._renderer = ArrayRenderer(self.grid)
+        return self._renderer.render(self.agent.x, self.agent.y, self.agent.hp, self.agent.max_hp)
+
     def _render_pygame(self):
-        """Render using Pygame."""
+        """Render to a Pygame window."""
         if self._renderer is None:
             from ..ui.renderer import Renderer
             self._renderer = Renderer(self.grid, "RL Dungeon - Gym Env")
 
-        self._renderer.render_grid()
+        # The renderer's camera follows the agent on maps larger than the window
         self._renderer.set_agent(
             self.agent.x, self.agent.y,
             self.agent.hp, self.agent.max_hp
         )
-        self._renderer.render_agent()
-
-        if self.render_mode == "human":
-            import pygame
-            pygame.display.flip()
-            self._renderer.tick(self.metadata["render_fps"])
-            return None
-        else:  # rgb_array
-            import pygame
-            return np.transpose(
-                pygame.surfarray.array3d(self._renderer.screen),
-                axes=(1, 0, 2)
-            )
+        dirty = self._renderer.render_dirty()
+
+        import pygame
+        pygame.event.pump()
+        pygame.display.update(dirty)
+        self._renderer.tick(self.metadata["render_fps"])
 
     def close(self):
         """Clean up resources."""
         if self._renderer is not None:
-            self._renderer.close()
+            if self.render_mode == "human":
+                self._renderer.close()
             self._renderer = None
 
 
@@ -0,0 +1,284 @@
+"""Multi-agent shared-dungeon environment (PettingZoo-style parallel API)."""
+from __future__ import annotations
+import numpy as np
+from typing import Optional, Any
+from gymnasium import spaces
+
+from ..core.grid import Grid, load_grid_from_file
+from ..core.tiles import TILES, TileType
+from ..agents.agent_batch import AgentBatch
+
+
+class MultiAgentDungeonEnv:
+    """N adventurers moving simultaneously through the same dungeon.
+
+    Follows the PettingZoo ParallelEnv interface (dicts keyed by agent name)
+    without depending on PettingZoo. The array methods reset_arrays() and
+    step_arrays() skip the dict layer so per-step cost is a handful of
+    NumPy ops regardless of the number of agents.
+
+    Collisions:
+        Agents occupy their cell; finished agents leave the board. A move
+        is refused (wall bump, -1.1) when the target cell is held by an
+        agent that stays put, when two agents try to swap cells, or when
+        several agents target the same cell and the agent loses the random
+        per-step priority draw.
+    """
+
+    metadata = {"render_modes": ["ansi", "rgb_array"], "name": "dungeon_multi_v0"}
+
+    def __init__(
+        self,
+        dungeon_file: Optional[str] = None,
+        grid: Optional[Grid] = None,
+        n_agents: int = 4,
+        max_steps: int = 200,
+        render_mode: Optional[str] = None,
+        obs_type: str = "position",
+        collisions: bool = True,
+    ):
+        """Initialize the environment.
+
+        Args:
+            dungeon_file: Path to dungeon file (mutually exclusive with grid)
+            grid: Grid object directly (mutually exclusive with dungeon_file)
+            n_agents: Number of adventurers
+            max_steps: Maximum steps before truncation
+            render_mode: "ansi", "rgb_array" or None
+            obs_type: "position" for (x, y) or "grid" for full grid observation
+            collisions: Resolve conflicts between agents (False lets them overlap)
+        """
+        if dungeon_file is not None:
+            self.grid = load_grid_from_file(dungeon_file)
+        elif grid is not None:
+            self.grid = grid
+        else:
+            raise ValueError("Either dungeon_file or grid must be provided")
+
+        if self.grid.start_pos is None:
+            raise ValueError("Dungeon has no start position!")
+        if obs_type not in ("position", "grid"):
+            raise ValueError(f"Unknown obs_type: {obs_type}")
+
+        self.n_agents = n_agents
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.obs_type = obs_type
+        self.collisions = collisions
+
+        self.possible_agents = [f"adventurer_{i}" for i in range(n_agents)]
+        self.agents: list[str] = []
+        self._index = {name: i for i, name in enumerate(self.possible_agents)}
+
+        self._action_space = spaces.Discrete(4)
+        if obs_type == "position":
+            self._observation_space = spaces.Box(low=0.0, high=1.0, shape=(2,), dtype=np.float32)
+        else:
+            # Tile ids, -1 for self and -2 for other agents
+            self._observation_space = spaces.Box(
+                low=-2, high=len(TILES) - 1,
+                shape=(self.grid.height, self.grid.width), dtype=np.int32
+            )
+
+        self.batch = AgentBatch.at_start(self.grid, n_agents)
+        self.steps = 0
+        self.np_random = np.random.default_rng()
+        self._renderer = None
+
+        # Tile ids as int32, kept in sync with grid edits (a ChunkedGrid
+        # would otherwise build a dense copy for every observation)
+        self._ids: Optional[np.ndarray] = None
+        if obs_type == "grid":
+            self._ids = np.full((self.grid.height, self.grid.width), TileType.WALL.value, dtype=np.int32)
+            for x0, y0, block in self.grid.iter_chunks():
+                self._ids[y0:y0 + block.shape[0], x0:x0 + block.shape[1]] = block
+            self.grid.add_listener(self._on_grid_edit)
+
+    def _on_grid_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType):
+        """Keep the cached tile ids in sync with the grid."""
+        self._ids[y, x] = new_tile.value
+
+    def observation_space(self, agent: str) -> spaces.Space:
+        """Observation space of an agent."""
+        return self._observation_space
+
+    def action_space(self, agent: str) -> spaces.Space:
+        """Action space of an agent."""
+        return self._action_space
+
+    # -- Array API ---------------------------------------------------------
+
+    def reset_arrays(self, seed: Optional[int] = None) -> np.ndarray:
+        """Reset all agents to the start and return stacked observations."""
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+        self.batch.reset(*self.grid.start_pos)
+        self.steps = 0
+        return self._get_obs()
+
+    def step_arrays(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Step every agent with one action each.
+
+        Args:
+            actions: Integer array of shape (n_agents,); ignored for
+                agents whose episode already ended
+
+        Returns:
+            observations, rewards, terminated, truncated (arrays of length n_agents)
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        blocked = self._resolve_collisions(actions) if self.collisions else None
+        reward, _, _ = self.batch.step(actions, self.grid, blocked=blocked)
+        self.steps += 1
+
+        terminated = self.batch.done.copy()
+        truncated = np.full(self.n_agents, self.steps >= self.max_steps)
+        return self._get_obs(), reward, terminated, truncated
+
+    def _resolve_collisions(self, actions: np.ndarray) -> np.ndarray:
+        """Compute which agents' moves are refused because of other agents."""
+        batch, width = self.batch, self.grid.width
+        active = ~batch.done
+        nx, ny = batch.next_positions(actions)
+        in_bounds = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < self.grid.height)
+
+        # Only moves into passable cells can collide; bumps stay put anyway
+        moving = active.copy()
+        moving[in_bounds] &= TILES.passable[self.grid.tile_ids(nx[in_bounds], ny[in_bounds])]
+        moving &= in_bounds
+
+        cell = batch.y * width + batch.x
+        target = ny * width + nx
+        n_cells = self.grid.width * self.grid.height
+        priority = self.np_random.permutation(self.n_agents)
+        blocked = np.zeros(self.n_agents, dtype=bool)
+
+        while True:
+            movers = np.flatnonzero(moving & ~blocked)
+            if movers.size == 0:
+                break
+            staying = active & ~(moving & ~blocked)
+            lost = np.zeros(movers.size, dtype=bool)
+
+            # Several movers targeting one cell: lowest priority value wins
+            order = np.lexsort((priority[movers], target[movers]))
+            sorted_target = target[movers][order]
+            first = np.ones(order.size, dtype=bool)
+            first[1:] = sorted_target[1:] != sorted_target[:-1]
+            lost[order[~first]] = True
+
+            # Target held by an agent that is not leaving
+            lost |= np.isin(target[movers], cell[staying])
+
+            # Head-on swaps
+            keys = cell[movers] * n_cells + target[movers]
+            lost |= np.isin(target[movers] * n_cells + cell[movers], keys)
+
+            if not lost.any():
+                break
+            blocked[movers[lost]] = True
+
+        return blocked
+
+    def _get_obs(self) -> np.ndarray:
+        """Stacked observations for all agents."""
+        batch = self.batch
+        if self.obs_type == "position":
+            return np.stack([
+                batch.x / (self.grid.width - 1),
+                batch.y / (self.grid.height - 1),
+            ], axis=1).astype(np.float32)
+
+        base = self._ids.copy()
+        on_board = ~batch.done
+        base[batch.y[on_board], batch.x[on_board]] = -2
+        obs = np.broadcast_to(base, (self.n_agents,) + base.shape).copy()
+        idx = np.arange(self.n_agents)
+        obs[idx, batch.y, batch.x] = -1
+        return obs
+
+    # -- Parallel (dict) API -----------------------------------------------
+
+    def reset(
+        self,
+        seed: Optional[int] = None,
+        options: Optional[dict] = None
+    ) -> tuple[dict[str, np.ndarray], dict[str, dict]]:
+        """Reset the environment.
+
+        Returns:
+            observations, infos (dicts keyed by agent name)
+        """
+        obs = self.reset_arrays(seed)
+        self.agents = list(self.possible_agents)
+        return (
+            {name: obs[i] for i, name in enumerate(self.agents)},
+            {name: self._get_info(i) for i, name in enumerate(self.agents)},
+        )
+
+    def step(self, actions: dict[str, int]) -> tuple[dict, dict, dict, dict, dict]:
+        """Execute one step for the live agents.
+
+        Args:
+            actions: Action per live agent name
+
+        Returns:
+            observations, rewards, terminations, truncations, infos
+        """
+        action_array = np.zeros(self.n_agents, dtype=np.int64)
+        for name, action in actions.items():
+            action_array[self._index[name]] = action
+
+        obs, reward, terminated, truncated = self.step_arrays(action_array)
+
+        live = self.agents
+        result = (
+            {name: obs[self._index[name]] for name in live},
+            {name: float(reward[self._index[name]]) for name in live},
+            {name: bool(terminated[self._index[name]]) for name in live},
+            {name: bool(truncated[self._index[name]]) for name in live},
+            {name: self._get_info(self._index[name]) for name in live},
+        )
+        self.agents = [name for name in live
+                       if not (terminated[self._index[name]] or truncated[self._index[name]])]
+        return result
+
+    def _get_info(self, i: int) -> dict[str, Any]:
+        """Get additional info for one agent."""
+        return {
+            "position": (int(self.batch.x[i]), int(self.batch.y[i])),
+            "hp": int(self.batch.hp[i]),
+            "total_reward": float(self.batch.total_reward[i]),
+            "steps": self.steps,
+        }
+
+    def render(self):
+        """Render the environment."""
+        if self.render_mode == "ansi":
+            return self._render_ansi()
+        if self.render_mode == "rgb_array":
+            return self._render_rgb_array()
+        return None
+
+    def _render_rgb_array(self) -> np.ndarray:
+        """Render an (H, W, 3) uint8 frame with every agent still on the board."""
+        if self._renderer is None:
+            from ..ui.array_renderer import ArrayRenderer
+            self._renderer = ArrayRenderer(self.grid)
+        b = self.batch
+        on_board = ~b.done
+        return self._renderer.render_agents(b.x[on_board], b.y[on_board], b.hp[on_board], b.max_hp[on_board])
+
+    def _render_ansi(self) -> str:
+        """Render as ASCII string; agents are drawn as '@'."""
+        rows = [list(row) for row in str(self.grid).split("\n")]
+        on_board = ~self.batch.done
+        for x, y in zip(self.batch.x[on_board], self.batch.y[on_board]):
+            rows[y][x] = "@"
+        return "\n".join("".join(row) for row in rows)
+
+    def close(self):
+        """Clean up resources."""
+        self._renderer = None
@@ -0,0 +1,94 @@
+"""Deterministic replay of recorded action sequences."""
+from __future__ import annotations
+import json
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Optional, Sequence
+import numpy as np
+
+from ..core.grid import load_grid_from_string
+from .dungeon_env import DungeonEnv, EnvState
+
+
+@dataclass
+class Recording:
+    """Everything needed to reproduce an episode: dungeon, seed and inputs."""
+    dungeon: str
+    actions: list[int]
+    seed: Optional[int] = None
+    max_steps: int = 200
+    metadata: dict = field(default_factory=dict)
+
+    def save(self, path: str | Path) -> None:
+        """Write the recording as JSON."""
+        with open(path, 'w') as f:
+            json.dump(asdict(self), f)
+
+    @classmethod
+    def load(cls, path: str | Path) -> Recording:
+        """Read a recording written by save()."""
+        with open(path, 'r') as f:
+            return cls(**json.load(f))
+
+    def make_env(self) -> DungeonEnv:
+        """Create a fresh environment for this recording's dungeon."""
+        return DungeonEnv(grid=load_grid_from_string(self.dungeon), max_steps=self.max_steps)
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of a replay."""
+    rewards: np.ndarray
+    total_reward: float
+    steps: int
+    terminated: bool
+    truncated: bool
+    final_state: EnvState
+
+
+def replay_actions(
+    env: DungeonEnv,
+    actions: Sequence[int],
+    seed: Optional[int] = None,
+    state: Optional[EnvState] = None,
+    stop_on_done: bool = True,
+) -> ReplayResult:
+    """Re-simulate an action sequence at full speed, without rendering.
+
+    Args:
+        env: Environment to run in
+        actions: Actions to apply in order
+        seed: Seed for the initial reset (ignored if state is given)
+        state: Optional snapshot to start from instead of a reset
+        stop_on_done: Stop at termination/truncation even if actions remain
+
+    Returns:
+        The per-step rewards and final outcome
+    """
+    if state is not None:
+        env.set_state(state)
+    else:
+        env.reset(seed=seed)
+
+    rewards = np.zeros(len(actions), dtype=np.float64)
+    terminated = truncated = False
+    n = 0
+    for action in actions:
+        rewards[n], terminated, truncated = env.advance(action)
+        n += 1
+        if stop_on_done and (terminated or truncated):
+            break
+
+    return ReplayResult(
+        rewards=rewards[:n],
+        total_reward=float(rewards[:n].sum()),
+        steps=n,
+        terminated=terminated,
+        truncated=truncated,
+        final_state=env.get_state(),
+    )
+
+
+def replay(recording: Recording) -> ReplayResult:
+    """Replay a recording in a fresh environment."""
+    return replay_actions(recording.make_env(), recording.actions, seed=recording.seed)
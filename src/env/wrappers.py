@@ -0,0 +1,34 @@
+"""Gymnasium wrappers for DungeonEnv."""
+import gymnasium as gym
+
+from ..data.trajectories import TrajectoryRecorder
+
+
+class RecordTrajectories(gym.Wrapper):
+    """Append every transition of a DungeonEnv to a TrajectoryRecorder."""
+
+    def __init__(self, env: gym.Env, recorder: TrajectoryRecorder):
+        """Wrap an environment.
+
+        Args:
+            env: A DungeonEnv (or wrapper around one) whose info has
+                "position" and "hp"
+            recorder: Destination for the transitions
+        """
+        super().__init__(env)
+        self.recorder = recorder
+        self._position = None
+
+    def reset(self, **kwargs):
+        self.recorder.end_episode()
+        obs, info = self.env.reset(**kwargs)
+        self._position = info["position"]
+        return obs, info
+
+    def step(self, action):
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        x, y = self._position
+        next_x, next_y = info["position"]
+        self.recorder.append(x, y, int(action), reward, terminated, info["hp"], next_x, next_y)
+        self._position = info["position"]
+        return obs, reward, terminated, truncated, info
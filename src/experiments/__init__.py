@@ -0,0 +1,21 @@
+"""Experiment orchestration: hyperparameter sweeps and result stores.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.sweep': ('SweepSpec', 'ResultStore', 'run_config', 'run_sweep', 'aggregate', 'format_table',
+        'config_key'),
+})
+
+__all__ = [
+    'SweepSpec',
+    'ResultStore',
+    'run_config',
+    'run_sweep',
+    'aggregate',
+    'format_table',
+    'config_key',
+]
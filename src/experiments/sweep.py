@@ -0,0 +1,306 @@
+"""Parallel hyperparameter sweeps with a resumable, append-only result store."""
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+import numpy as np
+
+from ..core.grid import load_grid_from_file
+from ..algorithms.q_learning import QLearning
+
+
+# QLearning hyperparameters a sweep may vary (everything else is a run setting)
+AGENT_PARAMS = ('alpha', 'gamma', 'epsilon', 'epsilon_min', 'epsilon_decay')
+
+# Settings used when neither the spec's params nor fixed values give one
+DEFAULTS = {'n_episodes': 500, 'max_steps': 200}
+
+# Columns that identify a configuration in aggregate tables
+DEFAULT_GROUP_BY = ('alpha', 'gamma', 'epsilon_decay', 'max_steps')
+
+
+@dataclass
+class SweepSpec:
+    """What to run: dungeons x seeds x hyperparameter configurations.
+
+    params maps a name to a list of values (grid search takes the cartesian
+    product; random search picks one) or, for random search only, to a
+    range {"low": a, "high": b, "log": bool, "int": bool}.
+    """
+    dungeons: list[str]
+    params: dict[str, Any]
+    seeds: list[int] = field(default_factory=lambda: [0])
+    mode: str = "grid"
+    n_samples: int = 20
+    sample_seed: int = 0
+    fixed: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> SweepSpec:
+        """Read a spec from JSON; dungeon entries may be directories."""
+        with open(path) as f:
+            data = json.load(f)
+        dungeons = []
+        for entry in data.pop('dungeons'):
+            entry = Path(entry)
+            dungeons += sorted(str(p) for p in entry.glob('*.txt')) if entry.is_dir() else [str(entry)]
+        return cls(dungeons=dungeons, **data)
+
+    def param_sets(self) -> list[dict[str, Any]]:
+        """Hyperparameter combinations, before crossing with dungeons and seeds."""
+        if self.mode == "grid":
+            names = list(self.params)
+            for name in names:
+                if not isinstance(self.params[name], list):
+                    raise ValueError(f"Grid search needs a list of values for {name!r}")
+            return [dict(zip(names, values)) for values in itertools.product(*(self.params[n] for n in names))]
+        if self.mode == "random":
+            rng = random.Random(self.sample_seed)
+            return [{name: _sample(rng, space) for name, space in self.params.items()}
+                    for _ in range(self.n_samples)]
+        raise ValueError(f"Unknown sweep mode: {self.mode}")
+
+    def configs(self) -> Iterator[dict[str, Any]]:
+        """Every run configuration of the sweep."""
+        for params in self.param_sets():
+            for dungeon in self.dungeons:
+                for seed in self.seeds:
+                    yield {**DEFAULTS, **self.fixed, **params, 'dungeon': dungeon, 'seed': seed}
+
+
+def _sample(rng: random.Random, space: Any) -> Any:
+    if isinstance(space, list):
+        return rng.choice(space)
+    low, high = space['low'], space['high']
+    if space.get('log'):
+        value = math.exp(rng.uniform(math.log(low), math.log(high)))
+    else:
+        value = rng.uniform(low, high)
+    return int(round(value)) if space.get('int') else value
+
+
+def config_key(config: dict[str, Any]) -> str:
+    """Stable identifier of a run configuration."""
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ResultStore:
+    """Append-only JSON Lines file of finished runs.
+
+    Each record is written as one line and flushed, so a crash loses at
+    most the run in progress; a partial last line is ignored on reload and
+    cut off before the next append.
+    """
+
+    def __init__(self, path: str | Path):
+        """Open (or create) a store.
+
+        Args:
+            path: JSON Lines file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def records(self) -> list[dict[str, Any]]:
+        """All complete records in the store."""
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+    def completed(self) -> set[str]:
+        """Keys of configurations that already have a result."""
+        return {record['key'] for record in self.records()}
+
+    def append(self, record: dict[str, Any]) -> None:
+        """Add one record."""
+        self._truncate_partial_line()
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate_partial_line(self) -> None:
+        """Drop an unterminated last line, so the next record starts on its own line."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            # Scan back to the end of the last complete line
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            f.truncate(end)
+
+
+def run_config(config: dict[str, Any], window: int = 20, threshold: float = 0.9) -> dict[str, Any]:
+    """Train one configuration and summarize it.
+
+    Args:
+        config: Run configuration (dungeon, seed, n_episodes, max_steps and
+            QLearning hyperparameters)
+        window: Episodes in the moving success window
+        threshold: Moving success rate that counts as converged
+
+    Returns:
+        The config plus its key and summary metrics
+    """
+    start = time.perf_counter()
+    grid = load_grid_from_file(config['dungeon'])
+    agent_params = {name: config[name] for name in AGENT_PARAMS if name in config}
+    ql = QLearning(grid, seed=config['seed'], **agent_params)
+
+    successes = np.zeros(config['n_episodes'], dtype=bool)
+
+    def on_episode(episode, reward, steps, success):
+        successes[episode] = success
+
+    stats = ql.train(config['n_episodes'], config['max_steps'], verbose=False, callback=on_episode)
+    test = ql.test(n_episodes=1, max_steps=config['max_steps'])
+
+    converged = None
+    if successes.size >= window:
+        moving = np.convolve(successes, np.ones(window), mode='valid') / window
+        hits = np.flatnonzero(moving >= threshold)
+        if hits.size:
+            converged = int(hits[0] + window)
+
+    return {
+        'key': config_key(config),
+        'config': config,
+        'success_rate': float(test['success_rate']),
+        'train_success_rate': stats['total_successes'] / max(config['n_episodes'], 1),
+        'episodes_to_converge': converged,
+        'final_reward': float(np.mean(stats['episode_rewards'][-window:])),
+        'wall_time': time.perf_counter() - start,
+    }
+
+
+def run_sweep(
+    spec: SweepSpec,
+    store: ResultStore,
+    n_workers: int | None = None,
+    verbose: bool = True,
+) -> list[dict[str, Any]]:
+    """Run every configuration not already in the store.
+
+    Runs execute on a process pool; results are appended by this process
+    as they finish, so an interrupted sweep resumes where it stopped. A run
+    that raises is reported on stderr and left out of the store (the next
+    call retries it); the other runs carry on.
+
+    Args:
+        spec: Sweep specification
+        store: Result store (also used to skip finished runs)
+        n_workers: Worker processes (default: all CPUs)
+        verbose: Print progress
+
+    Returns:
+        Records of the runs that finished in this call
+    """
+    done = store.completed()
+    pending = [c for c in spec.configs() if config_key(c) not in done]
+    if verbose:
+        print(f"Sweep: {len(pending)} runs to do, {len(done)} already in {store.path}")
+    if not pending:
+        return []
+
+    records = []
+    with ProcessPoolExecutor(n_workers or os.cpu_count()) as pool:
+        futures = {pool.submit(run_config, config): config for config in pending}
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as e:
+                config = futures[future]
+                print(f"[{i}/{len(pending)}] {Path(config['dungeon']).name} seed={config['seed']}: "
+                      f"FAILED ({e!r})", file=sys.stderr)
+                continue
+            store.append(record)
+            records.append(record)
+            if verbose:
+                print(f"[{i}/{len(pending)}] {Path(record['config']['dungeon']).name} "
+                      f"seed={record['config']['seed']} | "
+                      f"Success: {record['success_rate']:.0%} | "
+                      f"Converged: {record['episodes_to_converge']} | "
+                      f"{record['wall_time']:.1f}s")
+    return records
+
+
+def aggregate(
+    records: list[dict[str, Any]],
+    group_by: tuple[str, ...] = DEFAULT_GROUP_BY,
+) -> list[dict[str, Any]]:
+    """Summarize runs per configuration, across seeds (and dungeons unless grouped).
+
+    Returns:
+        One row per group with mean success rate, median episodes to
+        converge (over converged runs), converged fraction and mean wall
+        time, sorted best first
+    """
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for record in records:
+        key = tuple(record['config'].get(name) for name in group_by)
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for key, runs in groups.items():
+        converge = [r['episodes_to_converge'] for r in runs if r['episodes_to_converge'] is not None]
+        rows.append({
+            **dict(zip(group_by, key)),
+            'runs': len(runs),
+            'success_rate': float(np.mean([r['success_rate'] for r in runs])),
+            'converged': len(converge) / len(runs),
+            'episodes_to_converge': float(np.median(converge)) if converge else None,
+            'wall_time': float(np.mean([r['wall_time'] for r in runs])),
+        })
+    rows.sort(key=lambda r: (-r['success_rate'], -r['converged'],
+                             r['episodes_to_converge'] if r['episodes_to_converge'] is not None else math.inf))
+    return rows
+
+
+def format_table(rows: list[dict[str, Any]]) -> str:
+    """Render aggregate rows as a fixed-width text table."""
+    if not rows:
+        return "(no results)"
+    columns = list(rows[0])
+
+    def cell(value):
+        if value is None:
+            return '-'
+        if isinstance(value, float):
+            return f"{value:.4g}"
+        return str(value)
+
+    cells = [[cell(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ['  '.join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines.append('  '.join('-' * w for w in widths))
+    lines += ['  '.join(v.rjust(w) for v, w in zip(r, widths)) for r in cells]
+    return '\n'.join(lines)
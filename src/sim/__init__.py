@@ -0,0 +1,37 @@
+"""Headless balance simulator for the browser game's economy.
+
+Names are imported from their submodules on first use (see
+src.core.lazy), so importing the package costs almost nothing.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.config': ('DUNGEON_CONFIG', 'DUNGEON_ORDER', 'CHAPTERS', 'load_dungeon', 'operating_cost'),
+    '.run_state': ('RunState',),
+    '.simulator': ('GameSimulator', 'GameState', 'Decision', 'find_path', 'estimate_manual_cost'),
+    '.strategies': ('Strategy', 'StraightForward', 'BalancedPlayer', 'FarmHeavy', 'HybridPlayer', 'STRATEGIES'),
+    '.balance': ('run_balance', 'summarize', 'format_summary'),
+})
+
+__all__ = [
+    'DUNGEON_CONFIG',
+    'DUNGEON_ORDER',
+    'CHAPTERS',
+    'load_dungeon',
+    'operating_cost',
+    'RunState',
+    'GameSimulator',
+    'GameState',
+    'Decision',
+    'find_path',
+    'estimate_manual_cost',
+    'Strategy',
+    'StraightForward',
+    'BalancedPlayer',
+    'FarmHeavy',
+    'HybridPlayer',
+    'STRATEGIES',
+    'run_balance',
+    'summarize',
+    'format_summary',
+]
@@ -0,0 +1,154 @@
+"""Monte Carlo balance runs: many seeded playthroughs on a process pool.
+
+Run i of a batch uses seed base_seed + i, so results do not depend on
+the number of workers and any run can be replayed alone with
+GameSimulator(strategy, seed). summarize() reduces a batch to clear
+rates, mean/median/percentile statistics, chapter progression, the most
+frequent bottlenecks and a gold curve.
+"""
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+import numpy as np
+
+from .config import DUNGEON_ORDER
+from .simulator import GameSimulator
+from .strategies import STRATEGIES
+
+
+# Per-run statistics summarized by summarize()
+METRICS = ('cleared', 'total_turns', 'total_steps', 'final_gold', 'training_cost', 'farming_income',
+           'manual_attempts', 'manual_clears', 'manual_failures', 'food_used')
+PERCENTILES = (10, 50, 90)
+GOLD_CHECKPOINTS = (10, 50, 100, 200, 300, 500)
+
+
+def play(strategy: str, seed: int, dungeons: tuple[str, ...] = DUNGEON_ORDER,
+         max_turns: int = 500) -> dict[str, Any]:
+    """One seeded playthrough (a top-level function, so workers can run it)."""
+    return GameSimulator(STRATEGIES[strategy](), seed, dungeons).run_playthrough(max_turns)
+
+
+def _play(job: tuple[str, int, tuple[str, ...], int]) -> dict[str, Any]:
+    return play(*job)
+
+
+def run_balance(
+    strategy: str,
+    runs: int,
+    seed: int = 0,
+    workers: int | None = None,
+    dungeons: tuple[str, ...] = DUNGEON_ORDER,
+    max_turns: int = 500,
+    progress: Callable[[int, int], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Play runs seeded playthroughs of a strategy.
+
+    Args:
+        strategy: Name in STRATEGIES
+        runs: Number of playthroughs
+        seed: Seed of the first run (run i uses seed + i)
+        workers: Worker processes (default: all CPUs; 1 runs in-process)
+        dungeons: Dungeons of each run in unlock order
+        max_turns: Turn limit per playthrough
+        progress: Optional callback(done, runs)
+
+    Returns:
+        Per-run statistics, in seed order
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy} (choose from {', '.join(STRATEGIES)})")
+    jobs = [(strategy, seed + i, tuple(dungeons), max_turns) for i in range(runs)]
+    workers = min(workers or os.cpu_count(), max(runs, 1))
+
+    if workers == 1:
+        return _collect(map(_play, jobs), runs, progress)
+    # Chunks amortize the inter-process overhead of short playthroughs
+    chunksize = max(1, runs // (workers * 8))
+    with ProcessPoolExecutor(workers) as pool:
+        return _collect(pool.map(_play, jobs, chunksize=chunksize), runs, progress)
+
+
+def _collect(stream, runs: int, progress: Callable[[int, int], None] | None) -> list[dict[str, Any]]:
+    results = []
+    for result in stream:
+        results.append(result)
+        if progress:
+            progress(len(results), runs)
+    return results
+
+
+def summarize(results: list[dict[str, Any]], percentiles: tuple[int, ...] = PERCENTILES) -> dict[str, Any]:
+    """Aggregate statistics of a batch of playthroughs.
+
+    Returns:
+        Dict with runs, clear_rate, per-metric mean and percentiles
+        ('p50' is the median), chapter progression (runs that reached
+        each chapter and the median turn of its first clear), the five
+        most frequent bottlenecks and the median gold at each checkpoint
+        turn
+    """
+    runs = len(results)
+    summary: dict[str, Any] = {
+        'runs': runs,
+        'clear_rate': sum(r['cleared'] == r['total_dungeons'] for r in results) / runs if runs else 0.0,
+        'metrics': {},
+    }
+    for metric in METRICS:
+        values = np.array([r[metric] for r in results], dtype=float)
+        row = {'mean': float(values.mean()) if runs else 0.0}
+        for p in percentiles:
+            row[f'p{p}'] = float(np.percentile(values, p)) if runs else 0.0
+        summary['metrics'][metric] = row
+
+    chapters: dict[int, list[int]] = {}
+    for r in results:
+        for chapter, turn in r['chapter_turns'].items():
+            chapters.setdefault(int(chapter), []).append(turn)
+    summary['chapters'] = {chapter: {'reached': len(turns), 'median_turn': float(np.median(turns))}
+                           for chapter, turns in sorted(chapters.items())}
+
+    counts: dict[tuple[str, str], int] = {}
+    for r in results:
+        for b in r['bottlenecks']:
+            counts[b['dungeon'], b['reason']] = counts.get((b['dungeon'], b['reason']), 0) + 1
+    top = sorted(counts.items(), key=lambda item: -item[1])[:5]
+    summary['bottlenecks'] = [{'dungeon': d, 'reason': reason, 'runs': n} for (d, reason), n in top]
+
+    gold_curve = {}
+    for checkpoint in GOLD_CHECKPOINTS:
+        golds = [next((gold for turn, gold in r['gold_history'] if turn >= checkpoint), None) for r in results]
+        golds = [g for g in golds if g is not None]
+        if golds:
+            gold_curve[checkpoint] = float(np.median(golds))
+    summary['gold_curve'] = gold_curve
+    return summary
+
+
+def format_summary(strategy: str, summary: dict[str, Any], total_dungeons: int, elapsed: float) -> str:
+    """Human-readable report of one strategy's summary."""
+    runs = summary['runs']
+    metrics = summary['metrics']
+    names = [name for name in metrics['cleared'] if name.startswith('p')]
+    lines = [
+        f"{strategy} ({runs} runs, {elapsed:.1f}s)",
+        f"  Clear rate: {summary['clear_rate']:.1%} (all {total_dungeons} dungeons)",
+        f"  {'Metric':<18} {'Mean':>10} " + ' '.join(f"{name:>10}" for name in names),
+    ]
+    for metric, row in metrics.items():
+        if metric.startswith(('manual', 'food')) and not metrics['manual_attempts']['mean']:
+            continue
+        lines.append(f"  {metric:<18} {row['mean']:>10.1f} " + ' '.join(f"{row[n]:>10.1f}" for n in names))
+
+    if summary['chapters']:
+        lines.append("  Chapter progression (turn of first clear):")
+        for chapter, data in summary['chapters'].items():
+            lines.append(f"    Ch.{chapter}: turn {data['median_turn']:.0f} median ({data['reached']}/{runs} reached)")
+    if summary['bottlenecks']:
+        lines.append("  Top bottlenecks:")
+        for b in summary['bottlenecks']:
+            lines.append(f"    {b['dungeon']}: {b['reason']} ({b['runs']}/{runs} runs)")
+    if summary['gold_curve']:
+        lines.append("  Gold curve (median): " + " -> ".join(f"t{t}={g:.0f}G" for t, g in summary['gold_curve'].items()))
+    return "\n".join(lines)
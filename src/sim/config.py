@@ -0,0 +1,216 @@
+"""Game balance constants shared with the browser game.
+
+Mirrors web/js/game/game-config.js and the economy constants of
+web/js/game/run-state.js, so balance runs in Python follow the same rules
+as the game. The dungeons themselves are read from the browser game's
+source (web/js/game/grid.js), so there is only one copy of each level.
+"""
+from __future__ import annotations
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from ..core.grid import Grid, load_grid_from_string
+from ..core.tiles import TileType, register_browser_tiles, tile_to_char
+
+
+# Browser game source with the built-in dungeons (the DUNGEONS object)
+GRID_JS = Path(__file__).resolve().parents[2] / 'web' / 'js' / 'game' / 'grid.js'
+
+
+@dataclass(frozen=True)
+class DungeonConfig:
+    """Entry cost and clear rewards of a dungeon."""
+    cost: int
+    first_reward: int
+    repeat_reward: int
+    use_hp_state: bool = False
+    slippery: bool = False
+    max_steps: int | None = None
+
+
+@dataclass(frozen=True)
+class CharacterStats:
+    """Base strength and per-level upgrades of a character (serpa)."""
+    base_str: int
+    str_per_level: int
+    secondary: str | None
+    cost: int
+    hp_per_level: int = 0
+
+
+@dataclass(frozen=True)
+class Chapter:
+    """A chapter: its dungeons and the characters who join for free."""
+    number: int
+    name: str
+    dungeons: tuple[str, ...]
+    story_serpas: tuple[str, ...]
+
+
+# Character -> the algorithm it uses in the browser game. The Python
+# simulator trains every character with tabular QLearning; the character
+# still sets the operating cost, HP and agility.
+CHARACTERS = {
+    'qkun': 'Q-Learning',
+    'scout': 'Local Q',
+    'sarsa': 'SARSA',
+    'monte': 'Monte Carlo',
+    'tracer': 'SARSA(λ)',
+    'dyna': 'Dyna-Q',
+    'gradi': 'REINFORCE',
+    'critic': 'Actor-Critic',
+    'qvkun': 'QV-Learning',
+    'acla': 'ACLA',
+    'ensemble': 'Ensemble',
+    'exsa': 'Expected SARSA',
+    'doubleq': 'Double Q',
+    'treeback': 'Tree Backup',
+    'sweeper': 'Pri. Sweep',
+}
+
+# Dungeons in unlock order
+DUNGEON_CONFIG = {
+    # Ch.1: 첫 발걸음 (tutorial — generous rewards to kickstart economy)
+    'level_01_easy': DungeonConfig(0, 100, 10),
+    'level_02_trap': DungeonConfig(5, 150, 15),
+    'level_03_maze': DungeonConfig(10, 200, 20),
+    # Ch.2: 위험한 길
+    'level_04_pit': DungeonConfig(10, 250, 25),
+    'level_05_gold': DungeonConfig(15, 300, 30),
+    'level_06_risk': DungeonConfig(20, 350, 35),
+    'level_07_gauntlet': DungeonConfig(25, 500, 50),
+    # Ch.3: 넓은 세계
+    'level_08_deadly': DungeonConfig(30, 600, 60),
+    'level_09_treasure': DungeonConfig(40, 800, 80),
+    'level_10_final': DungeonConfig(50, 1000, 100),
+    'level_11_hp_test': DungeonConfig(0, 400, 40, use_hp_state=True),
+    'level_12_hp_gauntlet': DungeonConfig(0, 600, 60, use_hp_state=True),
+    # Ch.4: 직감과 비평
+    'level_13_cliff': DungeonConfig(0, 400, 40),
+    'level_14_long_hall': DungeonConfig(0, 500, 50),
+    'level_15_multi_room': DungeonConfig(0, 400, 40),
+    'level_16_open_field': DungeonConfig(0, 400, 40),
+    'level_17_two_paths': DungeonConfig(0, 500, 50),
+    # Ch.5: 합의의 힘
+    'level_18_dead_end': DungeonConfig(0, 500, 50),
+    'level_19_bridge': DungeonConfig(0, 500, 50),
+    'level_20_sacrifice': DungeonConfig(0, 600, 60),
+    'level_21_desert': DungeonConfig(0, 600, 60),
+    'level_22_arena': DungeonConfig(0, 700, 70, use_hp_state=True),
+    'level_23_mirage': DungeonConfig(0, 600, 60),
+    'level_24_paper_maze': DungeonConfig(0, 400, 40),
+    'level_25_paper_hard': DungeonConfig(0, 500, 50),
+    # Ch.6: 불확실한 바닥
+    'level_26_frozen_lake': DungeonConfig(0, 600, 60, slippery=True),
+    'level_27_ice_maze': DungeonConfig(0, 700, 70, slippery=True),
+    'level_28_frozen_cliff': DungeonConfig(0, 800, 80, slippery=True),
+    # Ch.7: 심연
+    'level_29_big_maze': DungeonConfig(0, 1500, 150, max_steps=1000),
+    'level_30_generated_cave': DungeonConfig(0, 2000, 200, max_steps=2000),
+    'level_31_generated_rooms': DungeonConfig(0, 2000, 200, max_steps=2000),
+}
+DUNGEON_ORDER = tuple(DUNGEON_CONFIG)
+
+# Operating cost per episode (base cost, scaled by sqrt(level) in operating_cost)
+BASE_OP_COST = {
+    'qkun': 3, 'sarsa': 3, 'monte': 3,
+    'gradi': 2,
+    'tracer': 5, 'dyna': 6,
+    'critic': 5, 'qvkun': 5, 'acla': 5, 'exsa': 5, 'doubleq': 5,
+    'ensemble': 8, 'treeback': 7, 'sweeper': 7,
+}
+DEFAULT_OP_COST = 10
+
+# Training limits and the convergence check (success rate over a window)
+MAX_EPISODES = 10000
+CONVERGENCE_WINDOW = 20
+CONVERGENCE_THRESHOLD = 0.95
+DEFAULT_MAX_STEPS = 200
+
+STARTING_GOLD = 800
+HIDDEN_CHARACTERS = ('scout',)
+HIRE_COSTS = {
+    'sarsa': 150, 'monte': 250, 'gradi': 200,
+    'tracer': 600, 'dyna': 600,
+    'critic': 1000, 'qvkun': 1000, 'acla': 1000, 'exsa': 1000, 'doubleq': 1000,
+    'ensemble': 2000, 'treeback': 2000, 'sweeper': 2000,
+}
+
+# Characters reach level 3 at most; secondary stats: hp (max HP) or agility
+# (faster epsilon decay)
+MAX_CHARACTER_LEVEL = 3
+CHARACTER_STATS = {
+    'qkun': CharacterStats(100, 30, None, 100),
+    'gradi': CharacterStats(80, 20, None, 80),
+    'sarsa': CharacterStats(80, 20, 'hp', 150, hp_per_level=10),
+    'monte': CharacterStats(100, 40, 'hp', 150, hp_per_level=5),
+    'tracer': CharacterStats(80, 20, 'hp', 150, hp_per_level=5),
+    'dyna': CharacterStats(60, 10, 'agility', 200),
+    'critic': CharacterStats(70, 15, 'agility', 200),
+    'acla': CharacterStats(70, 15, 'agility', 200),
+    'treeback': CharacterStats(80, 25, 'agility', 250),
+    'sweeper': CharacterStats(70, 15, 'agility', 250),
+    'exsa': CharacterStats(80, 20, 'hp', 200, hp_per_level=10),
+    'doubleq': CharacterStats(80, 20, 'hp', 200, hp_per_level=10),
+    'qvkun': CharacterStats(70, 15, 'hp', 200, hp_per_level=5),
+    'ensemble': CharacterStats(100, 30, 'hp', 300, hp_per_level=5),
+}
+
+CHAPTERS = (
+    Chapter(1, '첫 발걸음', DUNGEON_ORDER[0:3], ('qkun',)),
+    Chapter(2, '위험한 길', DUNGEON_ORDER[3:7], ('sarsa',)),
+    Chapter(3, '넓은 세계', DUNGEON_ORDER[7:12], ('monte', 'tracer', 'dyna')),
+    Chapter(4, '직감과 비평', DUNGEON_ORDER[12:17], ('gradi', 'critic')),
+    Chapter(5, '합의의 힘', DUNGEON_ORDER[17:25], ('qvkun', 'acla', 'ensemble')),
+    Chapter(6, '불확실한 바닥', DUNGEON_ORDER[25:28], ('exsa', 'doubleq')),
+    Chapter(7, '심연', DUNGEON_ORDER[28:31], ('treeback', 'sweeper')),
+)
+
+
+def dungeon_level(dungeon_id: str) -> int:
+    """Level number of a dungeon id (level_07_gauntlet -> 7; 1 if none)."""
+    match = re.search(r'level_(\d+)', dungeon_id)
+    return int(match.group(1)) if match else 1
+
+
+def operating_cost(char_name: str, dungeon_id: str) -> int:
+    """Gold per training episode; sqrt scaling keeps late levels affordable."""
+    base = BASE_OP_COST.get(char_name, DEFAULT_OP_COST)
+    return math.ceil(base * math.sqrt(dungeon_level(dungeon_id)))
+
+
+def exclusive_runs(level: int) -> int:
+    """Farming runs at triple reward that a kept map grants."""
+    if level <= 5:
+        return 4
+    if level <= 20:
+        return 8
+    return 13
+
+
+def browser_dungeons(path: str | Path = GRID_JS) -> dict[str, str]:
+    """Dungeon id -> layout text, from the browser game's DUNGEONS object."""
+    return dict(_read_dungeons(Path(path).resolve()))
+
+
+@lru_cache(maxsize=None)
+def _read_dungeons(path: Path) -> tuple[tuple[str, str], ...]:
+    # Read once per process; balance workers load the same levels in every run
+    text = path.read_text(encoding='utf-8')
+    return tuple(re.findall(r'^\s*(\w+):\s*`([^`]*)`', text, re.MULTILINE))
+
+
+def load_dungeon(dungeon_id: str, path: str | Path = GRID_JS) -> Grid:
+    """Load a built-in browser dungeon with the browser's tiles.
+
+    Registers the pit, gold and monster tiles, and maps heal tiles to
+    BROWSER_HEAL, which pays no reward, as in the game.
+    """
+    heal = register_browser_tiles()['BROWSER_HEAL']
+    layout = browser_dungeons(path).get(dungeon_id)
+    if layout is None:
+        raise KeyError(f"Unknown dungeon: {dungeon_id}")
+    return load_grid_from_string(layout.replace(tile_to_char(TileType.HEAL), tile_to_char(heal)))
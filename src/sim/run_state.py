@@ -0,0 +1,228 @@
+"""Per-run economy state of the game.
+
+A port of the parts of web/js/game/run-state.js the balance simulator
+uses: gold and food, hiring, character upgrades, answer paths, farming
+and map ownership. Persistence, hints, treasure and items stay in the
+browser game.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+
+from .config import (
+    CHAPTERS, CHARACTER_STATS, DUNGEON_CONFIG, DUNGEON_ORDER, HIDDEN_CHARACTERS, HIRE_COSTS,
+    MAX_CHARACTER_LEVEL, STARTING_GOLD, dungeon_level, exclusive_runs,
+)
+
+
+@dataclass
+class AnswerPath:
+    """Shortest known clear of a dungeon, replayed by farmers."""
+    actions: list[int]
+    steps: int
+    character: str
+
+
+@dataclass
+class MapStatus:
+    """Ownership of a cleared dungeon's map: 'exclusive' (kept) or 'normal'."""
+    status: str
+    exclusive_runs_left: int = 0
+
+
+class RunState:
+    """Gold, characters, cleared dungeons and farming of one run."""
+
+    def __init__(self, dungeons: tuple[str, ...] = DUNGEON_ORDER):
+        """Start a fresh run with the starting gold and the first dungeon unlocked.
+
+        Args:
+            dungeons: Dungeons of the run in unlock order (clearing all of
+                them ends the game)
+        """
+        self.dungeons = tuple(dungeons)
+        self.gold = STARTING_GOLD
+        self.food = 0
+        self.total_steps = 0
+        self.total_farming_steps = 0
+        self.serpa_clears: dict[str, int] = {}
+        self.hired: set[str] = set()
+        self.cleared: set[str] = set()
+        self.unlocked: set[str] = {self.dungeons[0]}
+        self.answer_paths: dict[str, AnswerPath] = {}
+        self.character_levels: dict[str, int] = {}
+        self.farming: dict[str, str] = {}  # character -> dungeon
+        self.map_status: dict[str, MapStatus] = {}
+
+    # Chapters and characters
+
+    def current_chapter(self) -> int:
+        """Highest chapter with an unlocked dungeon."""
+        return max((c.number for c in CHAPTERS if self.unlocked.intersection(c.dungeons)), default=1)
+
+    def is_character_free(self, name: str) -> bool:
+        """Characters join for free once their story chapter is reached."""
+        chapter = self.current_chapter()
+        return any(c.number <= chapter and name in c.story_serpas for c in CHAPTERS)
+
+    def is_character_available(self, name: str) -> bool:
+        return self.is_character_free(name) or name in self.hired
+
+    def is_character_locked(self, name: str) -> bool:
+        """Not available yet, but can be hired."""
+        return not self.is_character_available(name) and name not in HIDDEN_CHARACTERS
+
+    def hire_cost(self, name: str) -> int:
+        return HIRE_COSTS.get(name, 0)
+
+    def hire(self, name: str) -> bool:
+        """Hire a locked character; False if unaffordable or not hireable."""
+        cost = self.hire_cost(name)
+        if self.gold < cost or not self.is_character_locked(name):
+            return False
+        self.gold -= cost
+        self.hired.add(name)
+        return True
+
+    def buy_food(self, amount: int) -> bool:
+        """Buy food for manual play (1 gold each)."""
+        if self.gold < amount:
+            return False
+        self.gold -= amount
+        self.food += amount
+        return True
+
+    # Character stats and upgrades
+
+    def character_level(self, name: str) -> int:
+        return self.character_levels.get(name, 1)
+
+    def can_upgrade(self, name: str) -> bool:
+        stats = CHARACTER_STATS.get(name)
+        return (stats is not None and self.is_character_available(name)
+                and self.character_level(name) < MAX_CHARACTER_LEVEL and self.gold >= stats.cost)
+
+    def upgrade(self, name: str) -> bool:
+        """Raise a character's level by one; False if not possible."""
+        if not self.can_upgrade(name):
+            return False
+        self.gold -= CHARACTER_STATS[name].cost
+        self.character_levels[name] = self.character_level(name) + 1
+        return True
+
+    def strength(self, name: str) -> int:
+        """Longest answer path (in steps) the character can farm."""
+        stats = CHARACTER_STATS.get(name)
+        if stats is None:
+            return 100
+        return stats.base_str + stats.str_per_level * (self.character_level(name) - 1)
+
+    def max_hp(self, name: str) -> int:
+        stats = CHARACTER_STATS.get(name)
+        if stats is None or stats.secondary != 'hp':
+            return 100
+        return 100 + stats.hp_per_level * (self.character_level(name) - 1)
+
+    def agility_multiplier(self, name: str) -> float:
+        """Exponent on the per-episode epsilon decay (agile characters explore less)."""
+        stats = CHARACTER_STATS.get(name)
+        if stats is None or stats.secondary != 'agility':
+            return 1.0
+        return 1.0 + 0.5 * (self.character_level(name) - 1)
+
+    # Clears and answer paths
+
+    def record_answer_path(self, dungeon_id: str, actions: list[int], steps: int, character: str) -> bool:
+        """Keep the path if it is the dungeon's shortest so far."""
+        existing = self.answer_paths.get(dungeon_id)
+        if existing is not None and steps >= existing.steps:
+            return False
+        self.answer_paths[dungeon_id] = AnswerPath(list(actions), steps, character)
+        return True
+
+    def record_clear(self, dungeon_id: str) -> bool:
+        """Pay the clear reward; a first clear also unlocks the next dungeon.
+
+        Returns:
+            True for a first clear
+        """
+        config = DUNGEON_CONFIG[dungeon_id]
+        if dungeon_id in self.cleared:
+            self.gold += config.repeat_reward
+            return False
+        self.cleared.add(dungeon_id)
+        self.gold += config.first_reward
+        index = self.dungeons.index(dungeon_id)
+        if index + 1 < len(self.dungeons):
+            self.unlocked.add(self.dungeons[index + 1])
+        return True
+
+    def record_serpa_clear(self, name: str) -> None:
+        self.serpa_clears[name] = self.serpa_clears.get(name, 0) + 1
+
+    def cleared_count(self) -> int:
+        return sum(1 for d in self.dungeons if d in self.cleared)
+
+    def all_cleared(self) -> bool:
+        return self.cleared_count() == len(self.dungeons)
+
+    # Farming
+
+    def can_farm(self, name: str, dungeon_id: str) -> bool:
+        """A character can farm a dungeon whose answer path fits its strength."""
+        path = self.answer_paths.get(dungeon_id)
+        return (path is not None and path.steps <= self.strength(name)
+                and self.is_character_available(name))
+
+    def is_farming(self, name: str) -> bool:
+        return name in self.farming
+
+    def assign_farming(self, name: str, dungeon_id: str) -> bool:
+        if not self.can_farm(name, dungeon_id):
+            return False
+        self.farming[name] = dungeon_id
+        return True
+
+    def remove_farming(self, name: str) -> bool:
+        return self.farming.pop(name, None) is not None
+
+    def execute_farming(self, name: str) -> int:
+        """One farming run by a character; kept maps pay triple while they last.
+
+        Returns:
+            Gold earned
+        """
+        dungeon_id = self.farming.get(name)
+        if dungeon_id is None:
+            return 0
+        reward = DUNGEON_CONFIG[dungeon_id].repeat_reward
+        status = self.map_status.get(dungeon_id)
+        if status is not None and status.status == 'exclusive' and status.exclusive_runs_left > 0:
+            reward *= 3
+            status.exclusive_runs_left -= 1
+            if status.exclusive_runs_left <= 0:
+                status.status = 'normal'
+        self.gold += reward
+
+        path = self.answer_paths.get(dungeon_id)
+        if path is not None:
+            self.total_farming_steps += path.steps
+            self.total_steps += path.steps
+        return reward
+
+    # Maps
+
+    def map_sale_price(self, dungeon_id: str) -> int:
+        """A tenth of what the exclusive runs would earn."""
+        exclusive_reward = 3 * DUNGEON_CONFIG[dungeon_id].repeat_reward
+        return exclusive_reward * exclusive_runs(dungeon_level(dungeon_id)) // 10
+
+    def sell_map(self, dungeon_id: str) -> int:
+        """Sell a newly cleared dungeon's map; returns the gold earned."""
+        price = self.map_sale_price(dungeon_id)
+        self.map_status[dungeon_id] = MapStatus('normal')
+        self.gold += price
+        return price
+
+    def keep_map(self, dungeon_id: str) -> None:
+        """Keep the map for exclusive (triple reward) farming runs."""
+        self.map_status[dungeon_id] = MapStatus('exclusive', exclusive_runs(dungeon_level(dungeon_id)))
@@ -0,0 +1,579 @@
+"""Headless game loop for balance testing.
+
+GameSimulator re-implements the browser game's rules (sim/simulator.js)
+on top of Grid, Agent and QLearning: a strategy picks one action per turn
+(train, farm, hire, upgrade, sell or keep a map, assign farmers, buy food,
+play manually) and the simulator applies it to a RunState. Training pays
+the character's operating cost per episode and stops when the gold runs
+out, after MAX_EPISODES, or when the success rate over the last
+CONVERGENCE_WINDOW episodes reaches CONVERGENCE_THRESHOLD.
+
+All randomness (exploration and manual play rolls) comes from the
+simulator's seed, so a playthrough is reproducible. Every character
+trains with tabular QLearning, whose state also includes the agent's HP
+bucket on dungeons with use_hp_state (as the game's QLearning does);
+slippery floors only affect the manual play estimate, as the Python
+Agent moves deterministically.
+"""
+from __future__ import annotations
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+import numpy as np
+
+from ..agents.agent import ACTION_DELTAS, Action, Agent
+from ..algorithms.q_learning import QLearning
+from ..core.grid import Grid
+from ..core.tiles import TILES, TileType, register_browser_tiles
+from ..data.trajectories import TrajectoryRecorder
+from .config import (
+    CHAPTERS, CHARACTERS, CONVERGENCE_THRESHOLD, CONVERGENCE_WINDOW, DEFAULT_MAX_STEPS,
+    DUNGEON_CONFIG, DUNGEON_ORDER, MAX_EPISODES, load_dungeon, operating_cost,
+)
+from .run_state import AnswerPath, MapStatus, RunState
+
+
+# Human imperfection: extra steps (exploration, backtracking) in manual play
+HUMAN_STEP_MULTIPLIER = 1.3
+MANUAL_MAX_HP = 100
+
+# HP buckets of the HP-aware state: 0-19, 20-39, 40-59, 60-79, 80+
+HP_LEVELS = 5
+HP_PER_LEVEL = 100 // HP_LEVELS
+
+
+class HpQLearning(QLearning):
+    """QLearning over (position, HP bucket) states, the game's useHpState.
+
+    The Q-table stacks one (height * width) block per HP bucket, so the
+    agent can learn to avoid damage only while its HP is low.
+    """
+
+    def __init__(self, grid: Grid, **kwargs):
+        super().__init__(grid, **kwargs)
+        self.q_table = np.zeros((self.n_states * HP_LEVELS, self.n_actions))
+
+    def _on_grid_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType):
+        """Forget the values whose transitions touched the edited cell, in every bucket."""
+        levels = self.q_table.reshape(HP_LEVELS, self.n_states, self.n_actions)
+        levels[:, self.state_to_index(x, y)] = 0.0
+        for action, (dx, dy) in ACTION_DELTAS.items():
+            px, py = x - dx, y - dy
+            if self.grid.is_valid_position(px, py):
+                levels[:, self.state_to_index(px, py), action.value] = 0.0
+
+    def hp_state_index(self, x: int, y: int, hp: int) -> int:
+        """Row of the Q-table for a position and HP."""
+        return min(HP_LEVELS - 1, hp // HP_PER_LEVEL) * self.n_states + self.state_to_index(x, y)
+
+    def get_best_action(self, x: int, y: int, hp: int = 100) -> Action:
+        """Greedy action at a position with the given HP."""
+        return Action(int(np.argmax(self.q_table[self.hp_state_index(x, y, hp)])))
+
+    def run_episode(
+        self,
+        max_steps: int = 200,
+        train: bool = True,
+        callback: Callable[[Agent, Action, float], None] | None = None,
+        recorder: TrajectoryRecorder | None = None,
+    ) -> tuple[float, int, bool]:
+        """QLearning.run_episode() with the HP bucket in the state (no profiling)."""
+        start = self.grid.start_pos
+        if start is None:
+            raise ValueError("Grid has no start position")
+        agent = Agent(start[0], start[1])
+        total_reward = 0.0
+        steps = 0
+        success = False
+        q = self.q_table
+
+        for _ in range(max_steps):
+            x, y = agent.x, agent.y
+            state = self.hp_state_index(x, y, agent.hp)
+            if train and self.rng.random() < self.epsilon:
+                action = Action(self.rng.randint(0, 3))
+            else:
+                action = Action(int(np.argmax(q[state])))
+
+            reward, done, _ = agent.move(action, self.grid)
+            total_reward += reward
+            steps += 1
+            if recorder is not None:
+                recorder.append(x, y, action.value, reward, done, agent.hp, agent.x, agent.y)
+            if callback:
+                callback(agent, action, reward)
+
+            if train:
+                target = reward
+                if not done:
+                    target += self.gamma * q[self.hp_state_index(agent.x, agent.y, agent.hp)].max()
+                q[state, action.value] += self.alpha * (target - q[state, action.value])
+
+            if done:
+                success = self.grid.get_tile(agent.x, agent.y) == TileType.GOAL
+                break
+
+        if recorder is not None:
+            recorder.end_episode()
+        return total_reward, steps, success
+
+
+@dataclass(frozen=True)
+class Decision:
+    """One turn's action chosen by a strategy.
+
+    kind is one of train, farm, hire, upgrade, map_sell, map_keep,
+    assign_farm, remove_farm, buy_food or manual; dungeon, char and amount
+    are set as the kind needs.
+    """
+    kind: str
+    dungeon: str | None = None
+    char: str | None = None
+    amount: int | None = None
+
+
+@dataclass(frozen=True)
+class ManualCost:
+    """Estimated cost and odds of clearing a dungeon by hand."""
+    steps: int
+    human_steps: int
+    gold_cost: int
+    final_hp: int
+    success_rate: float
+
+
+def find_path(grid: Grid, max_hp: int) -> tuple[list[tuple[int, int]], int] | None:
+    """Shortest path from start to goal that avoids pits and survives.
+
+    A breadth-first search over (x, y, hp bucket of 10) states.
+
+    Returns:
+        (positions from start to goal, HP left at the goal), or None if
+        there is no safe path
+    """
+    start = grid.start_pos
+    if start is None:
+        return None
+    goal = TileType.GOAL.value
+    rows = TILES.rows
+
+    first = (start[0], start[1], max_hp)
+    parents: dict[tuple[int, int, int], tuple[int, int, int] | None] = {first: None}
+    visited = {(start[0], start[1], max_hp // 10)}
+    queue = deque([first])
+    while queue:
+        x, y, hp = node = queue.popleft()
+        for dx, dy in ACTION_DELTAS.values():
+            nx, ny = x + dx, y + dy
+            if not grid.is_valid_position(nx, ny):
+                continue
+            tile = grid.tile_id(nx, ny)
+            passable, _, hp_delta, lethal, _ = rows[tile]
+            if not passable or lethal:
+                continue
+            new_hp = min(hp + hp_delta, max_hp) if hp_delta > 0 else hp + hp_delta
+            if new_hp <= 0 or (nx, ny, new_hp // 10) in visited:
+                continue
+            visited.add((nx, ny, new_hp // 10))
+            child = (nx, ny, new_hp)
+            parents[child] = node
+            if tile == goal:
+                path = []
+                while child is not None:
+                    path.append(child[:2])
+                    child = parents[child]
+                return path[::-1], new_hp
+            queue.append(child)
+    return None
+
+
+def manual_success_rate(steps: int, hp_lost: int, slippery: bool) -> float:
+    """Odds that a player clears a path by hand.
+
+    Starts at 95%, loses 0.2% per step beyond 20 and 3% per 10 HP lost;
+    slippery floors keep only 40% of that.
+    """
+    rate = 0.95
+    if steps > 20:
+        rate -= (steps - 20) * 0.002
+    rate -= hp_lost / 10 * 0.03
+    if slippery:
+        rate *= 0.4
+    return max(0.05, min(rate, 0.95))
+
+
+def estimate_manual_cost(grid: Grid, max_hp: int = MANUAL_MAX_HP, slippery: bool = False) -> ManualCost | None:
+    """Food (1 gold per step) and success odds of manual play; None if no safe path."""
+    found = find_path(grid, max_hp)
+    if found is None:
+        return None
+    path, final_hp = found
+    steps = len(path) - 1
+    human_steps = math.ceil(steps * HUMAN_STEP_MULTIPLIER)
+    return ManualCost(steps, human_steps, human_steps, final_hp,
+                      manual_success_rate(steps, max_hp - final_hp, slippery))
+
+
+@dataclass
+class GameState:
+    """What a strategy sees at the start of a turn.
+
+    Collections are copies; the query methods read the live run state.
+    """
+    gold: int
+    food: int
+    turn: int
+    cleared: frozenset[str]
+    unlocked: frozenset[str]
+    available_chars: list[str]
+    hireable_chars: list[str]
+    answer_paths: dict[str, AnswerPath]
+    farming: dict[str, str]
+    map_status: dict[str, MapStatus]
+    character_levels: dict[str, int]
+    manual_failures: dict[str, int]
+    dungeon_order: tuple[str, ...]
+    next_uncleared: str | None
+    pending_map_choice: str | None
+    chapter: int
+    _sim: GameSimulator = field(repr=False)
+
+    @property
+    def cleared_count(self) -> int:
+        return len(self.cleared)
+
+    @staticmethod
+    def operating_cost(char_name: str, dungeon_id: str) -> int:
+        return operating_cost(char_name, dungeon_id)
+
+    def cheapest_char(self, dungeon_id: str) -> str | None:
+        """Cheapest available character that is not farming (first one on ties)."""
+        idle = [c for c in self.available_chars if c not in self.farming]
+        return min(idle, key=lambda c: operating_cost(c, dungeon_id), default=None)
+
+    def strength(self, name: str) -> int:
+        return self._sim.run_state.strength(name)
+
+    def can_upgrade(self, name: str) -> bool:
+        return self._sim.run_state.can_upgrade(name)
+
+    def can_farm(self, name: str, dungeon_id: str) -> bool:
+        return self._sim.run_state.can_farm(name, dungeon_id)
+
+    def is_farming(self, name: str) -> bool:
+        return name in self.farming
+
+    def hire_cost(self, name: str) -> int:
+        return self._sim.run_state.hire_cost(name)
+
+    def manual_cost(self, dungeon_id: str) -> ManualCost | None:
+        return self._sim.manual_cost(dungeon_id)
+
+
+class GameSimulator:
+    """One playthrough of the game, driven by a strategy."""
+
+    def __init__(self, strategy, seed: int | None = None, dungeons: tuple[str, ...] = DUNGEON_ORDER):
+        """Start a new run.
+
+        Args:
+            strategy: Object with decide(GameState) -> Decision | None
+                (see src.sim.strategies)
+            seed: Seed for training and manual play (None = nondeterministic)
+            dungeons: Dungeons of the run in unlock order (a prefix of
+                DUNGEON_ORDER gives a shorter game)
+        """
+        self.strategy = strategy
+        self.rng = random.Random(seed)
+        self.run_state = RunState(dungeons)
+        self.log: list[dict[str, Any]] = []
+        self.turn = 0
+        self.manual_failures: dict[str, int] = {}
+        self.pending_map_choice: str | None = None
+        self._grids: dict[str, Grid] = {}
+        self._manual_costs: dict[str, ManualCost | None] = {}
+        # Gold and monsters are used up within an episode; pits stay
+        tiles = register_browser_tiles()
+        self._consumable = {tiles['GOLD'].value, tiles['MONSTER'].value}
+
+    def grid(self, dungeon_id: str) -> Grid:
+        """The dungeon's grid (loaded once per simulator)."""
+        if dungeon_id not in self._grids:
+            self._grids[dungeon_id] = load_dungeon(dungeon_id)
+        return self._grids[dungeon_id]
+
+    def manual_cost(self, dungeon_id: str) -> ManualCost | None:
+        """Manual play estimate for a dungeon (cached; the grid never changes)."""
+        if dungeon_id not in self._manual_costs:
+            self._manual_costs[dungeon_id] = estimate_manual_cost(
+                self.grid(dungeon_id), MANUAL_MAX_HP, DUNGEON_CONFIG[dungeon_id].slippery)
+        return self._manual_costs[dungeon_id]
+
+    def run_playthrough(self, max_turns: int = 500) -> dict[str, Any]:
+        """Play until every dungeon is cleared, the strategy stops or max_turns.
+
+        Returns:
+            The run's statistics (see stats)
+        """
+        while self.turn < max_turns:
+            if self.execute_turn() is None or self.run_state.all_cleared():
+                break
+        return self.stats()
+
+    def execute_turn(self) -> dict[str, Any] | None:
+        """Ask the strategy for a decision and apply it.
+
+        Returns:
+            The turn's log entry, or None if the strategy is done
+        """
+        decision = self.strategy.decide(self.state())
+        if decision is None:
+            return None
+
+        run = self.run_state
+        self.turn += 1
+        entry: dict[str, Any] = {'turn': self.turn, 'type': decision.kind, 'gold_before': run.gold}
+        kind = decision.kind
+        if kind == 'train':
+            entry.update(dungeon=decision.dungeon, char=decision.char,
+                         **self.train_dungeon(decision.dungeon, decision.char))
+        elif kind == 'farm':
+            farms = {name: run.execute_farming(name) for name in list(run.farming)}
+            entry.update(income=sum(farms.values()), farms=farms)
+        elif kind == 'hire':
+            entry.update(char=decision.char, success=run.hire(decision.char))
+        elif kind == 'upgrade':
+            entry.update(char=decision.char, success=run.upgrade(decision.char))
+        elif kind == 'map_sell':
+            entry.update(dungeon=decision.dungeon, earned=run.sell_map(decision.dungeon))
+            self.pending_map_choice = None
+        elif kind == 'map_keep':
+            run.keep_map(decision.dungeon)
+            entry.update(dungeon=decision.dungeon)
+            self.pending_map_choice = None
+        elif kind == 'assign_farm':
+            run.assign_farming(decision.char, decision.dungeon)
+            entry.update(char=decision.char, dungeon=decision.dungeon)
+        elif kind == 'remove_farm':
+            run.remove_farming(decision.char)
+            entry.update(char=decision.char)
+        elif kind == 'buy_food':
+            amount = decision.amount or 50
+            entry.update(amount=amount, success=run.buy_food(amount))
+        elif kind == 'manual':
+            result = self.manual_play_dungeon(decision.dungeon)
+            entry.update(dungeon=decision.dungeon, **result)
+            if result.get('reason') == 'player_failed':
+                self.manual_failures[decision.dungeon] = self.manual_failures.get(decision.dungeon, 0) + 1
+        else:
+            raise ValueError(f"Unknown decision: {kind}")
+
+        entry['gold_after'] = run.gold
+        self.log.append(entry)
+        return entry
+
+    def train_dungeon(self, dungeon_id: str, char_name: str) -> dict[str, Any]:
+        """Train a character on a dungeon until it converges or the gold runs out.
+
+        Returns:
+            Dict with converged, episodes, gold_spent and first_clear
+        """
+        run = self.run_state
+        grid = self.grid(dungeon_id)
+        max_steps = DUNGEON_CONFIG[dungeon_id].max_steps or DEFAULT_MAX_STEPS
+        cost = operating_cost(char_name, dungeon_id)
+        learner = HpQLearning if DUNGEON_CONFIG[dungeon_id].use_hp_state else QLearning
+        ql = learner(grid, alpha=0.1, gamma=0.99, epsilon=1.0, epsilon_min=0.01,
+                     epsilon_decay=0.995 ** run.agility_multiplier(char_name),
+                     seed=self.rng.getrandbits(32))
+
+        recent: deque[bool] = deque(maxlen=CONVERGENCE_WINDOW)
+        episodes = gold_spent = 0
+        converged = False
+        while episodes < MAX_EPISODES and run.gold >= cost:
+            _, steps, success = self._run_episode(ql, grid, max_steps)
+            ql.decay_epsilon()
+            run.total_steps += steps
+            run.gold -= cost
+            gold_spent += cost
+            episodes += 1
+            recent.append(success)
+            if len(recent) == CONVERGENCE_WINDOW and sum(recent) / CONVERGENCE_WINDOW >= CONVERGENCE_THRESHOLD:
+                converged = True
+                break
+
+        first_clear = False
+        if converged:
+            actions = self._greedy_path(ql, grid, run.max_hp(char_name), max_steps)
+            if actions is not None:
+                run.record_answer_path(dungeon_id, actions, len(actions), char_name)
+            run.record_serpa_clear(char_name)
+            first_clear = self._record_clear(dungeon_id)
+        return {'converged': converged, 'episodes': episodes, 'gold_spent': gold_spent, 'first_clear': first_clear}
+
+    def manual_play_dungeon(self, dungeon_id: str) -> dict[str, Any]:
+        """Play a dungeon by hand along the shortest safe path.
+
+        Food for the (longer) human path is used up whether or not the
+        attempt succeeds.
+
+        Returns:
+            Dict with success and, on failure, a reason (no_safe_path,
+            not_enough_food or player_failed)
+        """
+        run = self.run_state
+        grid = self.grid(dungeon_id)
+        found = find_path(grid, MANUAL_MAX_HP)
+        if found is None:
+            return {'success': False, 'reason': 'no_safe_path', 'food_used': 0}
+        path, final_hp = found
+        steps = len(path) - 1
+        rate = manual_success_rate(steps, MANUAL_MAX_HP - final_hp, DUNGEON_CONFIG[dungeon_id].slippery)
+        food = math.ceil(steps * HUMAN_STEP_MULTIPLIER)
+        if run.food < food:
+            return {'success': False, 'reason': 'not_enough_food', 'food_used': 0}
+
+        run.food -= food
+        run.total_steps += food
+        if self.rng.random() > rate:
+            return {'success': False, 'reason': 'player_failed', 'food_used': food}
+
+        deltas = {delta: action.value for action, delta in ACTION_DELTAS.items()}
+        actions = [deltas[x1 - x0, y1 - y0] for (x0, y0), (x1, y1) in zip(path, path[1:])]
+        run.record_answer_path(dungeon_id, actions, steps, 'player')
+        first_clear = self._record_clear(dungeon_id)
+        return {'success': True, 'steps': steps, 'food_used': food, 'first_clear': first_clear}
+
+    def _record_clear(self, dungeon_id: str) -> bool:
+        first_clear = self.run_state.record_clear(dungeon_id)
+        if first_clear:
+            # The strategy sells or keeps the map on its next turn
+            self.pending_map_choice = dungeon_id
+        return first_clear
+
+    def _run_episode(self, ql: QLearning, grid: Grid, max_steps: int) -> tuple[float, int, bool]:
+        """One training episode in which gold and monsters are used up, as in the game.
+
+        Consumed tiles are edited without tracking (QLearning's grid
+        listener would otherwise forget the values around them) and
+        restored when the episode ends.
+        """
+        consumable = self._consumable
+        consumed = []
+
+        def consume(agent, action, reward):
+            tile = grid.tile_id(agent.x, agent.y)
+            if tile in consumable:
+                consumed.append((agent.x, agent.y, tile))
+                grid.set_tile(agent.x, agent.y, TileType.EMPTY)
+
+        with grid.untracked():
+            try:
+                return ql.run_episode(max_steps, callback=consume)
+            finally:
+                for x, y, tile in consumed:
+                    grid.set_tile(x, y, TILES.tile(tile))
+
+    @staticmethod
+    def _greedy_path(ql: QLearning, grid: Grid, max_hp: int, max_steps: int) -> list[int] | None:
+        """Actions of a greedy run that reaches the goal alive, else None."""
+        agent = Agent(*grid.start_pos, hp=max_hp, max_hp=max_hp)
+        actions = []
+        for _ in range(max_steps):
+            if isinstance(ql, HpQLearning):
+                action = ql.get_best_action(agent.x, agent.y, agent.hp)
+            else:
+                action = ql.get_best_action(agent.x, agent.y)
+            _, done, _ = agent.move(action, grid)
+            actions.append(action.value)
+            if done:
+                return actions if agent.is_alive and grid.get_tile(agent.x, agent.y) == TileType.GOAL else None
+        return None
+
+    def state(self) -> GameState:
+        """Snapshot for the strategy's next decision."""
+        run = self.run_state
+        return GameState(
+            gold=run.gold,
+            food=run.food,
+            turn=self.turn,
+            cleared=frozenset(run.cleared),
+            unlocked=frozenset(run.unlocked),
+            available_chars=[c for c in CHARACTERS if run.is_character_available(c)],
+            hireable_chars=[c for c in CHARACTERS if run.is_character_locked(c)],
+            answer_paths=dict(run.answer_paths),
+            farming=dict(run.farming),
+            map_status=dict(run.map_status),
+            character_levels=dict(run.character_levels),
+            manual_failures=dict(self.manual_failures),
+            dungeon_order=run.dungeons,
+            next_uncleared=next((d for d in run.dungeons if d in run.unlocked and d not in run.cleared), None),
+            pending_map_choice=self.pending_map_choice,
+            chapter=run.current_chapter(),
+            _sim=self,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Statistics of the playthrough so far (plain data, picklable)."""
+        run = self.run_state
+        train = [e for e in self.log if e['type'] == 'train']
+        manual = [e for e in self.log if e['type'] == 'manual']
+
+        dungeon_costs: dict[str, dict[str, Any]] = {}
+        for e in train:
+            costs = dungeon_costs.setdefault(e['dungeon'], {'gold_spent': 0, 'episodes': 0, 'attempts': 0,
+                                                            'converged': False})
+            costs['gold_spent'] += e['gold_spent']
+            costs['episodes'] += e['episodes']
+            costs['attempts'] += 1
+            costs['converged'] |= e['converged']
+
+        cleared_order = sorted(({'turn': e['turn'], 'dungeon': e['dungeon'], 'method': e['type']}
+                                for e in train + manual if e.get('first_clear')), key=lambda c: c['turn'])
+        # Turn of the first clear in each chapter
+        chapter_turns: dict[int, int] = {}
+        for clear in cleared_order:
+            for chapter in CHAPTERS:
+                if clear['dungeon'] in chapter.dungeons:
+                    chapter_turns.setdefault(chapter.number, clear['turn'])
+
+        return {
+            'cleared': run.cleared_count(),
+            'total_dungeons': len(run.dungeons),
+            'total_turns': self.turn,
+            'total_steps': run.total_steps,
+            'final_gold': run.gold,
+            'gold_history': [(e['turn'], e['gold_after']) for e in self.log],
+            'cleared_order': cleared_order,
+            'farming_income': sum(e['income'] for e in self.log if e['type'] == 'farm'),
+            'training_cost': sum(e['gold_spent'] for e in train),
+            'dungeon_costs': dungeon_costs,
+            'chapter_turns': chapter_turns,
+            'manual_clears': sum(1 for e in manual if e.get('first_clear')),
+            'manual_attempts': len(manual),
+            'manual_failures': sum(1 for e in manual if not e['success']),
+            'food_used': sum(e['food_used'] for e in manual),
+            'bottlenecks': find_bottlenecks(dungeon_costs),
+        }
+
+
+def find_bottlenecks(dungeon_costs: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
+    """Dungeons that never converged, took several attempts or cost over 3x the average."""
+    bottlenecks = []
+    for dungeon, costs in dungeon_costs.items():
+        if not costs['converged']:
+            bottlenecks.append({'dungeon': dungeon, 'reason': 'never_converged', 'gold_spent': costs['gold_spent']})
+        elif costs['attempts'] > 1:
+            bottlenecks.append({'dungeon': dungeon, 'reason': 'multiple_attempts', 'attempts': costs['attempts'],
+                                'gold_spent': costs['gold_spent']})
+
+    converged = [c['gold_spent'] for c in dungeon_costs.values() if c['converged']]
+    if converged:
+        average = sum(converged) / len(converged)
+        for dungeon, costs in dungeon_costs.items():
+            if costs['converged'] and costs['gold_spent'] > average * 3:
+                bottlenecks.append({'dungeon': dungeon, 'reason': 'high_cost', 'gold_spent': costs['gold_spent'],
+                                    'avg_cost': round(average)})
+    return bottlenecks
@@ -0,0 +1,241 @@
+"""Player strategies for the balance simulator.
+
+Ports of sim/strategies.js. A strategy's decide(state) looks at a
+GameState and returns the turn's Decision, or None when it has nothing
+left to do. Strategies keep no state of their own (the simulator tracks
+failed manual attempts in state.manual_failures), so one instance can
+play any number of runs.
+"""
+from __future__ import annotations
+
+from .config import DUNGEON_CONFIG
+from .simulator import Decision, GameState
+
+
+# Training budget: gold for this many episodes (some dungeons need 100+)
+BUDGET_EPISODES = 150
+# HybridPlayer gives up playing a dungeon by hand after this many failures
+MAX_MANUAL_ATTEMPTS = 3
+
+
+def training_budget(char_name: str, dungeon_id: str, state: GameState) -> int:
+    """Gold to save up before a full training run."""
+    return state.operating_cost(char_name, dungeon_id) * BUDGET_EPISODES
+
+
+def best_farm_dungeon(char_name: str, state: GameState) -> str | None:
+    """Unassigned farmable dungeon with the highest reward per run."""
+    best, best_reward = None, 0
+    taken = set(state.farming.values())
+    for dungeon in state.dungeon_order:
+        if dungeon not in state.cleared or dungeon in taken or not state.can_farm(char_name, dungeon):
+            continue
+        reward = DUNGEON_CONFIG[dungeon].repeat_reward
+        status = state.map_status.get(dungeon)
+        if status is not None and status.status == 'exclusive' and status.exclusive_runs_left > 0:
+            reward *= 3
+        if reward > best_reward:
+            best, best_reward = dungeon, reward
+    return best
+
+
+def assign_idle_farmer(state: GameState, trainer: str | None) -> Decision | None:
+    """Send the first idle character (other than the trainer) farming."""
+    for name in state.available_chars:
+        if name == trainer or state.is_farming(name):
+            continue
+        dungeon = best_farm_dungeon(name, state)
+        if dungeon is not None:
+            return Decision('assign_farm', dungeon=dungeon, char=name)
+    return None
+
+
+def farming_exclusive_map(state: GameState) -> bool:
+    """True if a farmer is on a kept map with triple-reward runs left."""
+    for dungeon in state.farming.values():
+        status = state.map_status.get(dungeon)
+        if status is not None and status.status == 'exclusive' and status.exclusive_runs_left > 0:
+            return True
+    return False
+
+
+def farm_or_train(state: GameState, target: str, char_name: str | None, budget: int) -> Decision | None:
+    """Farm until the budget is met, then free the trainer and train."""
+    farmers = list(state.farming)
+
+    if char_name is None:
+        # Everyone is farming: pull one off once the budget is met
+        if not farmers:
+            return None
+        if state.gold >= budget:
+            return Decision('remove_farm', char=farmers[0])
+        return Decision('farm')
+
+    if state.gold < budget:
+        if not state.is_farming(char_name):
+            dungeon = best_farm_dungeon(char_name, state)
+            if dungeon is not None:
+                return Decision('assign_farm', dungeon=dungeon, char=char_name)
+        if farmers:
+            return Decision('farm')
+        # Nothing to farm: train with what we have
+        if state.gold >= state.operating_cost(char_name, target):
+            if state.is_farming(char_name):
+                return Decision('remove_farm', char=char_name)
+            return Decision('train', dungeon=target, char=char_name)
+        return None
+
+    if state.is_farming(char_name):
+        return Decision('remove_farm', char=char_name)
+    return Decision('train', dungeon=target, char=char_name)
+
+
+def upgrade_any(state: GameState) -> Decision | None:
+    """Upgrade the first character that can be upgraded."""
+    for name in state.available_chars:
+        if state.can_upgrade(name):
+            return Decision('upgrade', char=name)
+    return None
+
+
+class Strategy:
+    """Base class: a named decision policy."""
+
+    name = 'Strategy'
+
+    def decide(self, state: GameState) -> Decision | None:
+        raise NotImplementedError
+
+
+class StraightForward(Strategy):
+    """Rush dungeons, sell maps, farm only while saving up."""
+
+    name = 'StraightForward'
+
+    def decide(self, state: GameState) -> Decision | None:
+        if state.pending_map_choice:
+            return Decision('map_sell', dungeon=state.pending_map_choice)
+        target = state.next_uncleared
+        if target is None:
+            return None
+
+        char_name = state.cheapest_char(target)
+        budget = training_budget(char_name or 'qkun', target, state)
+        if state.gold < budget:
+            assign = assign_idle_farmer(state, char_name)
+            if assign is not None:
+                return assign
+        return farm_or_train(state, target, char_name, budget)
+
+
+class BalancedPlayer(Strategy):
+    """Keep maps, farm exclusive runs and upgrade characters with surplus gold."""
+
+    name = 'BalancedPlayer'
+
+    def decide(self, state: GameState) -> Decision | None:
+        if state.pending_map_choice:
+            return Decision('map_keep', dungeon=state.pending_map_choice)
+        target = state.next_uncleared
+
+        char_name = state.cheapest_char(target) if target else None
+        assign = assign_idle_farmer(state, char_name)
+        if assign is not None:
+            return assign
+        if farming_exclusive_map(state):
+            return Decision('farm')
+        if target is None:
+            return Decision('farm') if state.farming else None
+
+        budget = training_budget(char_name or 'qkun', target, state)
+        if state.gold > budget * 1.5:
+            upgrade = upgrade_any(state)
+            if upgrade is not None:
+                return upgrade
+        return farm_or_train(state, target, char_name, budget)
+
+
+class FarmHeavy(Strategy):
+    """Maximize farming income; train only with twice the usual budget."""
+
+    name = 'FarmHeavy'
+
+    def decide(self, state: GameState) -> Decision | None:
+        if state.pending_map_choice:
+            return Decision('map_keep', dungeon=state.pending_map_choice)
+        target = state.next_uncleared
+        farmers = list(state.farming)
+
+        if target is None:
+            return assign_idle_farmer(state, None) or (Decision('farm') if farmers else None)
+
+        char_name = state.cheapest_char(target)
+        budget_char = char_name or (state.available_chars[0] if state.available_chars else 'qkun')
+        budget = training_budget(budget_char, target, state) * 2
+
+        if state.gold >= budget:
+            if char_name is None:
+                if not farmers:
+                    return None
+                # Free the farmer that is cheapest to train with
+                cheapest = min(farmers, key=lambda name: state.operating_cost(name, target))
+                return Decision('remove_farm', char=cheapest)
+            if state.is_farming(char_name):
+                return Decision('remove_farm', char=char_name)
+            return Decision('train', dungeon=target, char=char_name)
+
+        assign = assign_idle_farmer(state, None)
+        if assign is not None:
+            return assign
+        if farmers:
+            return Decision('farm')
+        if char_name is not None and state.gold >= state.operating_cost(char_name, target):
+            return Decision('train', dungeon=target, char=char_name)
+        return None
+
+
+class HybridPlayer(Strategy):
+    """Clear cheap dungeons by hand and let the AI train the hard ones.
+
+    Manual play is tried when a safe path exists, its food costs under 70%
+    of the training budget, the odds are above 30% and it has failed fewer
+    than MAX_MANUAL_ATTEMPTS times.
+    """
+
+    name = 'HybridPlayer'
+
+    def decide(self, state: GameState) -> Decision | None:
+        if state.pending_map_choice:
+            return Decision('map_keep', dungeon=state.pending_map_choice)
+        target = state.next_uncleared
+
+        char_name = state.cheapest_char(target) if target else None
+        assign = assign_idle_farmer(state, char_name)
+        if assign is not None:
+            return assign
+        if target is None:
+            return Decision('farm') if state.farming else None
+
+        manual = state.manual_cost(target)
+        budget = training_budget(char_name or 'qkun', target, state)
+        if (manual is not None and manual.gold_cost < budget * 0.7
+                and state.manual_failures.get(target, 0) < MAX_MANUAL_ATTEMPTS and manual.success_rate > 0.3):
+            if state.food >= manual.human_steps:
+                return Decision('manual', dungeon=target)
+            needed = manual.human_steps - state.food
+            # Keep a reserve for falling back to training
+            if state.gold >= needed + budget * 0.3:
+                return Decision('buy_food', amount=needed)
+
+        if state.gold > budget * 1.5:
+            upgrade = upgrade_any(state)
+            if upgrade is not None:
+                return upgrade
+        if farming_exclusive_map(state):
+            return Decision('farm')
+        return farm_or_train(state, target, char_name, budget)
+
+
+STRATEGIES: dict[str, type[Strategy]] = {
+    cls.name: cls for cls in (StraightForward, BalancedPlayer, FarmHeavy, HybridPlayer)
+}
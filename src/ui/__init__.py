@@ -1,9 +1,40 @@
-"""UI components for RL Dungeon."""
-from .renderer import Renderer, run_viewer, TILE_SIZE, COLORS
+"""UI components for RL Dungeon.
+
+Names are imported from their submodules on first use (see
+src.core.lazy): the pygame renderer is only loaded when Renderer,
+run_viewer or COLORS is used, so the NumPy rendering helpers work on
+machines without pygame or a display.
+"""
+from ..core.lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    '.renderer': ('Renderer', 'run_viewer', 'COLORS'),
+    '.atlas': ('TILE_SIZE', 'ZOOM_LEVELS', 'tile_atlas', 'render_tiles'),
+    '.camera': ('Camera',),
+    '.array_renderer': ('ArrayRenderer', 'render_frame'),
+    '.video': ('GifWriter', 'PngSequenceWriter', 'VideoRecorder', 'write_png', 'record_greedy_rollout'),
+    '.overlay': ('PolicyOverlay', 'value_colors', 'render_overlay', 'save_overlay_png'),
+})
+
 
 __all__ = [
     'Renderer',
     'run_viewer',
     'TILE_SIZE',
     'COLORS',
+    'Camera',
+    'ZOOM_LEVELS',
+    'tile_atlas',
+    'render_tiles',
+    'ArrayRenderer',
+    'render_frame',
+    'GifWriter',
+    'PngSequenceWriter',
+    'VideoRecorder',
+    'write_png',
+    'record_greedy_rollout',
+    'PolicyOverlay',
+    'value_colors',
+    'render_overlay',
+    'save_overlay_png',
 ]
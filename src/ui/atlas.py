@@ -0,0 +1,79 @@
+"""Pre-rendered tile images (mipmapped) for drawing the map with NumPy."""
+import numpy as np
+
+from ..core.grid import Grid
+from ..core.tiles import TILES
+
+# Tile size in pixels at full zoom
+TILE_SIZE = 48
+
+# Tile sizes the views can zoom between; each divides TILE_SIZE
+ZOOM_LEVELS = (48, 24, 16, 12, 8, 6, 4, 3, 2, 1)
+
+# Tile border color
+GRID_LINE_COLOR = (200, 200, 200)
+
+_atlases: dict[int, np.ndarray] = {}
+_atlas_colors: np.ndarray | None = None
+
+
+def tile_atlas(tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Images of every registered tile at one zoom level.
+
+    Full-size tiles are the tile color with a 1px grid line; smaller sizes
+    are box-filtered from them (mipmaps), so grid lines fade out instead of
+    aliasing when zoomed out. Rebuilt when tiles are registered.
+
+    Args:
+        tile_size: Tile size in pixels (must divide TILE_SIZE)
+
+    Returns:
+        (n_tiles, tile_size, tile_size, 3) uint8 array, row-major pixels
+    """
+    global _atlas_colors
+    if _atlas_colors is not TILES.color:
+        _atlases.clear()
+        _atlas_colors = TILES.color
+
+    atlas = _atlases.get(tile_size)
+    if atlas is None:
+        if tile_size < 1 or TILE_SIZE % tile_size:
+            raise ValueError(f"Tile size must divide {TILE_SIZE}: {tile_size}")
+        n = len(TILES.color)
+        base = np.empty((n, TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)
+        base[:] = TILES.color[:, None, None]
+        base[:, [0, -1], :] = GRID_LINE_COLOR
+        base[:, :, [0, -1]] = GRID_LINE_COLOR
+
+        factor = TILE_SIZE // tile_size
+        if factor == 1:
+            atlas = base
+        else:
+            blocks = base.reshape(n, tile_size, factor, tile_size, factor, 3)
+            atlas = np.round(blocks.mean(axis=(2, 4))).astype(np.uint8)
+        _atlases[tile_size] = atlas
+    return atlas
+
+
+def render_tiles(ids: np.ndarray, tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Pixels of a block of tiles.
+
+    Args:
+        ids: (h, w) tile ids
+        tile_size: Tile size in pixels
+
+    Returns:
+        (h * tile_size, w * tile_size, 3) uint8 image
+    """
+    h, w = ids.shape
+    tiles = tile_atlas(tile_size)[ids]
+    return tiles.transpose(0, 2, 1, 3, 4).reshape(h * tile_size, w * tile_size, 3)
+
+
+def draw_tiles(grid: Grid, xs: np.ndarray, ys: np.ndarray, tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Pixels of the tiles at (xs, ys) as they look on the map.
+
+    This is the default draw function of Camera.render; overlays provide
+    their own with the same signature.
+    """
+    return render_tiles(grid.tile_ids(xs, ys), tile_size)
@@ -0,0 +1,199 @@
+"""Scrolling, zoomable viewport onto the dungeon map."""
+import math
+import numpy as np
+
+from ..core.grid import Grid
+from .atlas import ZOOM_LEVELS, draw_tiles
+
+
+class Camera:
+    """A view_width x view_height pixel window onto a map of tiles.
+
+    The camera tracks a center point in tile coordinates and a zoom level
+    (tile size in pixels). Only tiles inside the window are ever read or
+    drawn, so the cost of a frame depends on the window size, not on the
+    size of the map. Maps smaller than the window are centered in it.
+    """
+
+    def __init__(
+        self,
+        map_width: int,
+        map_height: int,
+        view_width: int,
+        view_height: int,
+        tile_size: int = ZOOM_LEVELS[0],
+    ):
+        """Create a camera centered on the map.
+
+        Args:
+            map_width: Map width in tiles
+            map_height: Map height in tiles
+            view_width: Window width in pixels
+            view_height: Window height in pixels
+            tile_size: Initial tile size, one of ZOOM_LEVELS
+        """
+        self.map_width = map_width
+        self.map_height = map_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.level = ZOOM_LEVELS.index(tile_size)
+        self.center_x = map_width / 2
+        self.center_y = map_height / 2
+
+        # Bumped whenever the visible pixels move (scroll, zoom or resize)
+        self.version = 0
+        self._origin = self._compute_origin()
+
+    @classmethod
+    def for_grid(cls, grid: Grid, view_width: int, view_height: int, min_tile_size: int = 12) -> 'Camera':
+        """Camera zoomed out just enough to show the whole grid, if possible.
+
+        Args:
+            grid: Map to view
+            view_width: Window width in pixels
+            view_height: Window height in pixels
+            min_tile_size: Don't zoom out further than this to fit the map;
+                larger maps scroll instead
+        """
+        camera = cls(grid.width, grid.height, view_width, view_height)
+        camera.fit(min_tile_size)
+        return camera
+
+    @property
+    def tile_size(self) -> int:
+        """Current tile size in pixels."""
+        return ZOOM_LEVELS[self.level]
+
+    @property
+    def origin(self) -> tuple[int, int]:
+        """Map pixel shown at the top-left of the window (negative when centered)."""
+        return self._origin
+
+    def _compute_origin(self) -> tuple[int, int]:
+        def axis(center, n_tiles, view):
+            size = n_tiles * self.tile_size
+            if size <= view:
+                return (size - view) // 2
+            return min(max(round(center * self.tile_size - view / 2), 0), size - view)
+
+        return (axis(self.center_x, self.map_width, self.view_width),
+                axis(self.center_y, self.map_height, self.view_height))
+
+    def _moved(self) -> None:
+        origin = self._compute_origin()
+        if origin != self._origin:
+            self._origin = origin
+            self.version += 1
+
+    def look_at(self, x: float, y: float) -> None:
+        """Center the view on a tile (clamped at the map edges)."""
+        self.center_x = min(max(x + 0.5, 0), self.map_width)
+        self.center_y = min(max(y + 0.5, 0), self.map_height)
+        self._moved()
+
+    def follow(self, x: int, y: int, margin: int = 3) -> None:
+        """Scroll just enough to keep a tile at least margin tiles inside the view.
+
+        Args:
+            x: Tile x to keep in view (e.g. the agent)
+            y: Tile y to keep in view
+            margin: Distance from the window edge, in tiles, that triggers scrolling
+        """
+        ts = self.tile_size
+        for axis, pos, view in ((0, x, self.view_width), (1, y, self.view_height)):
+            keep = min(margin * ts, (view - ts) // 2)
+            lo = self._origin[axis] + keep
+            hi = self._origin[axis] + view - keep - ts
+            pixel = pos * ts
+            shift = min(pixel - lo, 0) + max(pixel - hi, 0)
+            if shift:
+                if axis == 0:
+                    self.center_x = (self._origin[0] + shift + view / 2) / ts
+                else:
+                    self.center_y = (self._origin[1] + shift + view / 2) / ts
+        self._moved()
+
+    def zoom(self, steps: int) -> None:
+        """Zoom in (positive) or out (negative) by whole levels, keeping the center."""
+        self.level = min(max(self.level - steps, 0), len(ZOOM_LEVELS) - 1)
+        self._moved()
+
+    def zoom_in(self) -> None:
+        """Show bigger tiles."""
+        self.zoom(1)
+
+    def zoom_out(self) -> None:
+        """Show more of the map."""
+        self.zoom(-1)
+
+    def fit(self, min_tile_size: int = 1) -> None:
+        """Use the largest tile size at which the whole map fits in the window."""
+        for level, size in enumerate(ZOOM_LEVELS):
+            fits = self.map_width * size <= self.view_width and self.map_height * size <= self.view_height
+            if fits or size <= min_tile_size:
+                break
+        self.level = level
+        self.center_x = self.map_width / 2
+        self.center_y = self.map_height / 2
+        self._moved()
+
+    def resize(self, view_width: int, view_height: int) -> None:
+        """Change the window size."""
+        self.view_width = view_width
+        self.view_height = view_height
+        self.version += 1
+        self._origin = self._compute_origin()
+
+    def visible_tiles(self) -> tuple[int, int, int, int]:
+        """Tile range (x0, y0, x1, y1), end-exclusive, that overlaps the window."""
+        ts = self.tile_size
+        ox, oy = self._origin
+        return (
+            max(ox // ts, 0),
+            max(oy // ts, 0),
+            min(math.ceil((ox + self.view_width) / ts), self.map_width),
+            min(math.ceil((oy + self.view_height) / ts), self.map_height),
+        )
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """Whether any part of a tile is inside the window."""
+        x0, y0, x1, y1 = self.visible_tiles()
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def tile_to_screen(self, x: int, y: int) -> tuple[int, int]:
+        """Window pixel of a tile's top-left corner."""
+        return x * self.tile_size - self._origin[0], y * self.tile_size - self._origin[1]
+
+    def screen_to_tile(self, sx: int, sy: int) -> tuple[int, int]:
+        """Tile under a window pixel (may be outside the map)."""
+        return (sx + self._origin[0]) // self.tile_size, (sy + self._origin[1]) // self.tile_size
+
+    def render(self, grid: Grid, out: np.ndarray | None = None, draw=draw_tiles) -> np.ndarray:
+        """Draw the visible part of the map.
+
+        Args:
+            grid: Map to draw (must match the camera's map size)
+            out: Optional (view_height, view_width, 3) uint8 array to draw into
+            draw: draw(grid, xs, ys, tile_size) -> pixels of a block of
+                tiles (default: the tiles themselves; see PolicyOverlay)
+
+        Returns:
+            (view_height, view_width, 3) uint8 image, black outside the map
+        """
+        if out is None:
+            out = np.empty((self.view_height, self.view_width, 3), dtype=np.uint8)
+        out[:] = 0
+        x0, y0, x1, y1 = self.visible_tiles()
+        if x0 >= x1 or y0 >= y1:
+            return out
+
+        xs, ys = np.meshgrid(np.arange(x0, x1), np.arange(y0, y1))
+        pixels = draw(grid, xs, ys, self.tile_size)
+
+        # Crop the partially visible border tiles to the window
+        sx, sy = self.tile_to_screen(x0, y0)
+        h = min(pixels.shape[0], self.view_height - sy) - max(-sy, 0)
+        w = min(pixels.shape[1], self.view_width - sx) - max(-sx, 0)
+        out[max(sy, 0):max(sy, 0) + h, max(sx, 0):max(sx, 0) + w] = \
+            pixels[max(-sy, 0):max(-sy, 0) + h, max(-sx, 0):max(-sx, 0) + w]
+        return out
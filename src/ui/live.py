@@ -0,0 +1,359 @@
+"""Live training view: the learner runs in its own process and the UI samples it.
+
+The learner publishes Q-table snapshots, together with the trace of one
+recent episode, to shared memory at most publish_hz times per second.
+Publishing never waits for the UI: snapshots are written under a
+sequence counter (readers retry torn copies, as in ActorLearner), and
+the only per-episode cost to the learner is a clock read. The pygame
+view reads the newest snapshot at its own frame rate.
+"""
+from __future__ import annotations
+import multiprocessing as mp
+import time
+from dataclasses import dataclass
+import numpy as np
+
+from ..core.grid import Grid
+from ..agents.agent import Agent
+from ..algorithms.q_learning import QLearning
+
+# Scalar fields published with every snapshot
+STAT_FIELDS = ('episode', 'n_episodes', 'epsilon', 'reward', 'steps', 'successes', 'recent_success',
+               'max_hp', 'done', 'trace_length')
+
+# Episodes in the moving success rate
+RECENT_EPISODES = 100
+
+# Height of the stats panel under the map
+PANEL_HEIGHT = 60
+
+
+@dataclass
+class Snapshot:
+    """A consistent copy of the learner's state."""
+    version: int
+    q_table: np.ndarray
+    trace: np.ndarray  # (k, 3) x, y, hp of the last traced episode
+    episode: int
+    n_episodes: int
+    epsilon: float
+    reward: float
+    steps: int
+    successes: int
+    recent_success: float
+    max_hp: int
+    done: bool
+
+
+class SnapshotBoard:
+    """Single-slot snapshot exchange in shared memory (seqlock).
+
+    The writer bumps the sequence counter to odd, copies, and bumps it to
+    even again; readers copy and retry if the counter moved. Writers never
+    block and there is no lock a crashed process could leave held.
+    """
+
+    def __init__(self, n_states: int, max_steps: int, ctx=None):
+        """Allocate the shared buffers.
+
+        Args:
+            n_states: Rows of the Q-table
+            max_steps: Longest episode a trace must hold
+            ctx: Multiprocessing context (default: the default context)
+        """
+        ctx = ctx or mp.get_context()
+        self.n_states = n_states
+        self.max_steps = max_steps
+        self.sequence = ctx.RawArray('q', 2)  # [sequence counter, version]
+        self._q = ctx.RawArray('d', n_states * 4)
+        self._trace = ctx.RawArray('i', (max_steps + 1) * 3)
+        self._stats = ctx.RawArray('d', len(STAT_FIELDS))
+
+    def _views(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return (np.frombuffer(self._q, dtype=np.float64).reshape(self.n_states, 4),
+                np.frombuffer(self._trace, dtype=np.int32).reshape(-1, 3),
+                np.frombuffer(self._stats, dtype=np.float64))
+
+    def publish(self, q_table: np.ndarray, trace: np.ndarray, stats: dict) -> None:
+        """Replace the snapshot (learner side)."""
+        q, shared_trace, shared_stats = self._views()
+        sequence = self.sequence
+        sequence[0] += 1  # odd while writing
+        np.copyto(q, q_table)
+        shared_trace[:len(trace)] = trace
+        shared_stats[:] = [stats.get(name, 0) for name in STAT_FIELDS[:-1]] + [len(trace)]
+        sequence[1] += 1
+        sequence[0] += 1
+
+    def read(self, since: int = 0) -> Snapshot | None:
+        """The current snapshot if its version is newer than since (UI side)."""
+        if self.sequence[1] <= since:
+            return None
+        q, shared_trace, shared_stats = self._views()
+        sequence = self.sequence
+        while True:
+            before = sequence[0]
+            if before % 2 == 0:
+                version = sequence[1]
+                q_table = q.copy()
+                stats = dict(zip(STAT_FIELDS, shared_stats.tolist()))
+                trace = shared_trace[:int(stats['trace_length'])].copy()
+                if sequence[0] == before:
+                    break
+            time.sleep(0)
+        return Snapshot(
+            version=int(version), q_table=q_table, trace=trace,
+            episode=int(stats['episode']), n_episodes=int(stats['n_episodes']),
+            epsilon=stats['epsilon'], reward=stats['reward'], steps=int(stats['steps']),
+            successes=int(stats['successes']), recent_success=stats['recent_success'],
+            max_hp=int(stats['max_hp']), done=bool(stats['done']),
+        )
+
+
+class LiveTrainer:
+    """Trains a QLearning agent in a background process that publishes snapshots."""
+
+    def __init__(
+        self,
+        ql: QLearning,
+        n_episodes: int = 1000,
+        max_steps: int = 200,
+        publish_hz: float = 10.0,
+        seed: int | None = None,
+    ):
+        """Prepare the run.
+
+        Args:
+            ql: Learner whose hyperparameters and Q-table seed the run; the
+                result is copied back by join()
+            n_episodes: Episodes to train
+            max_steps: Maximum steps per episode
+            publish_hz: Maximum snapshots per second
+            seed: Seed for the learner's RNG
+        """
+        self.ql = ql
+        self.n_episodes = n_episodes
+        self.max_steps = max_steps
+        self.publish_hz = publish_hz
+        self.seed = seed
+        self._ctx = mp.get_context()
+        self.board = SnapshotBoard(ql.q_table.shape[0], max_steps, self._ctx)
+        self._process = None
+        self._version = 0
+
+    def start(self) -> None:
+        """Start training in the background."""
+        config = dict(alpha=self.ql.alpha, gamma=self.ql.gamma, epsilon=self.ql.epsilon,
+                      epsilon_min=self.ql.epsilon_min, epsilon_decay=self.ql.epsilon_decay)
+        self._stop = self._ctx.Event()
+        self._conn, child_conn = self._ctx.Pipe(duplex=False)
+        self._process = self._ctx.Process(
+            target=_learn,
+            args=(self.board, self.ql.grid, config, self.ql.q_table, self.n_episodes, self.max_steps,
+                  self.publish_hz, self.seed, self._stop, child_conn),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+
+    def poll(self) -> Snapshot | None:
+        """The newest snapshot, if one was published since the last poll."""
+        snapshot = self.board.read(self._version)
+        if snapshot is not None:
+            self._version = snapshot.version
+        return snapshot
+
+    @property
+    def running(self) -> bool:
+        """Whether the learner process is still alive."""
+        return self._process is not None and self._process.is_alive()
+
+    def stop(self) -> None:
+        """Ask the learner to finish after its current episode."""
+        if self._process is not None:
+            self._stop.set()
+
+    def join(self) -> dict:
+        """Wait for the learner and copy its results into ql.
+
+        Returns:
+            Training statistics as returned by QLearning.train, plus
+            'snapshots' (number published) and 'wall_time'
+        """
+        try:
+            result = self._conn.recv()
+        except EOFError:
+            raise RuntimeError("Learner process exited without a result") from None
+        finally:
+            self._process.join()
+            self._conn.close()
+            self._process = None
+
+        ql = self.ql
+        ql.q_table = result.pop('q_table')
+        ql.epsilon = result['final_epsilon']
+        ql.episode_rewards = result['episode_rewards']
+        ql.episode_steps = result['episode_steps']
+        return result
+
+
+def _learn(board: SnapshotBoard, grid: Grid, config: dict, q_table: np.ndarray, n_episodes: int,
+           max_steps: int, publish_hz: float, seed: int | None, stop, conn) -> None:
+    ql = QLearning(grid, seed=seed, **config)
+    ql.q_table[:] = q_table
+    start = Agent(*grid.start_pos)  # how run_episode's agents begin
+
+    trace = np.zeros((max_steps + 1, 3), dtype=np.int32)
+    length = 0
+
+    def on_step(agent, action, reward):
+        nonlocal length
+        trace[length] = agent.x, agent.y, agent.hp
+        length += 1
+
+    rewards, steps = [], []
+    recent = np.zeros(RECENT_EPISODES, dtype=bool)
+    successes = published = 0
+    period = 1.0 / publish_hz if publish_hz > 0 else float('inf')
+    next_publish = 0.0
+    started = time.perf_counter()
+
+    def publish(episode, done):
+        nonlocal published
+        stats = {'episode': episode, 'n_episodes': n_episodes, 'epsilon': ql.epsilon,
+                 'successes': successes, 'max_hp': start.max_hp, 'done': done}
+        if rewards:
+            stats.update(reward=rewards[-1], steps=steps[-1],
+                         recent_success=recent[:min(len(rewards), RECENT_EPISODES)].mean())
+        board.publish(ql.q_table, trace[:length], stats)
+        published += 1
+
+    for episode in range(n_episodes):
+        if stop.is_set():
+            break
+        # Trace only the episodes that will be published
+        traced = time.perf_counter() >= next_publish
+        if traced:
+            trace[0] = start.x, start.y, start.hp
+            length = 1
+        reward, n_steps, success = ql.run_episode(max_steps, train=True, callback=on_step if traced else None)
+        rewards.append(reward)
+        steps.append(n_steps)
+        recent[episode % RECENT_EPISODES] = success
+        successes += success
+        ql.decay_epsilon()
+        if traced:
+            publish(episode + 1, False)
+            next_publish = time.perf_counter() + period
+
+    publish(len(rewards), True)
+    conn.send({
+        'q_table': ql.q_table,
+        'episode_rewards': rewards,
+        'episode_steps': steps,
+        'total_successes': successes,
+        'final_epsilon': ql.epsilon,
+        'snapshots': published,
+        'wall_time': time.perf_counter() - started,
+    })
+    conn.close()
+
+
+class LiveView:
+    """Pygame window showing the latest snapshot.
+
+    Draws the value heatmap, greedy policy arrows, the traced episode
+    replayed one step per frame, and a stats panel. The overlay (a
+    PolicyOverlay) is only redrawn when a new snapshot arrives or the
+    camera moves.
+    """
+
+    def __init__(self, grid: Grid, title: str = "RL Dungeon - Live Training"):
+        """Open the window.
+
+        Args:
+            grid: The dungeon being trained on
+            title: Window title
+        """
+        import pygame
+        from .renderer import Renderer
+
+        self.grid = grid
+        self.renderer = Renderer(grid, title, follow_agent=False)
+        self.renderer.screen = pygame.display.set_mode(
+            (self.renderer.window_width, self.renderer.window_height + PANEL_HEIGHT))
+        self.font = pygame.font.Font(None, 24)
+        self.snapshot: Snapshot | None = None
+        self._frame = 0
+
+    def update(self, snapshot: Snapshot | None) -> None:
+        """Show a new snapshot (None keeps the current one)."""
+        if snapshot is not None:
+            self.snapshot = snapshot
+            self._frame = 0
+            self.renderer.set_values(snapshot.q_table)
+
+    def draw(self) -> None:
+        """Draw one frame."""
+        import pygame
+
+        renderer = self.renderer
+        screen = renderer.screen
+        snapshot = self.snapshot
+        renderer.render_grid()
+        if snapshot is not None and len(snapshot.trace):
+            x, y, hp = snapshot.trace[min(self._frame, len(snapshot.trace) - 1)]
+            renderer.set_agent(int(x), int(y), int(hp), snapshot.max_hp)
+            renderer.render_agent()
+            self._frame += 1
+
+        panel = pygame.Rect(0, renderer.window_height, renderer.window_width, PANEL_HEIGHT)
+        pygame.draw.rect(screen, (30, 30, 40), panel)
+        if snapshot is None:
+            text = "Waiting for the first snapshot..."
+        else:
+            text = (f"Episode {snapshot.episode}/{snapshot.n_episodes} | Eps {snapshot.epsilon:.3f} | "
+                    f"Reward {snapshot.reward:.1f} | Success {snapshot.recent_success:.0%}"
+                    + (" | DONE" if snapshot.done else ""))
+        screen.blit(self.font.render(text, True, (255, 255, 255)), (10, renderer.window_height + 10))
+        hint = self.font.render("[+/-: Zoom] [V: Values] [ESC: Stop]", True, (150, 150, 150))
+        screen.blit(hint, (10, renderer.window_height + 34))
+        renderer.render_fps()
+        pygame.display.flip()
+
+    def close(self) -> None:
+        """Close the window."""
+        self.renderer.close()
+
+
+def run_live(
+    ql: QLearning,
+    n_episodes: int = 1000,
+    max_steps: int = 200,
+    publish_hz: float = 10.0,
+    fps: int = 30,
+    seed: int | None = None,
+) -> dict:
+    """Train with a live view until training ends and the window is closed.
+
+    Closing the window (or ESC) early stops training after the current
+    episode. The learned Q-table is copied back into ql.
+
+    Returns:
+        Training statistics (see LiveTrainer.join)
+    """
+    trainer = LiveTrainer(ql, n_episodes, max_steps, publish_hz, seed)
+    trainer.start()
+    view = LiveView(ql.grid)
+    try:
+        running = True
+        while running:
+            running, _ = view.renderer.handle_events()
+            view.update(trainer.poll())
+            view.draw()
+            view.renderer.tick(fps)
+    finally:
+        trainer.stop()
+        stats = trainer.join()
+        view.close()
+    return stats
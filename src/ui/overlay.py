@@ -0,0 +1,190 @@
+"""Q-value heatmap and greedy-policy arrows, drawn with NumPy.
+
+Values are mapped to colors through a 256-entry lookup table, and every
+zoom level gets pre-rendered tiles: one per table entry (the heat color
+inside the usual grid line) and one arrow mask per action. Drawing a
+block of tiles is then a gather from those tables plus one masked
+assignment for the arrows, with no per-tile Python. PolicyOverlay plugs
+into Camera.render and the pygame Renderer; render_overlay and
+save_overlay_png export the whole map without pygame.
+"""
+from __future__ import annotations
+from pathlib import Path
+import numpy as np
+
+from ..core.grid import Grid
+from ..core.tiles import TILES
+from .atlas import TILE_SIZE, GRID_LINE_COLOR, tile_atlas
+from .video import write_png
+
+# Red-yellow-green color stops (low values red, high values green)
+COLORMAP_STOPS = ((165, 0, 38), (244, 109, 67), (255, 255, 191), (102, 189, 99), (0, 104, 55))
+
+# Entries in the color lookup table
+LUT_SIZE = 256
+
+# Policy arrow color
+ARROW_COLOR = (0, 0, 0)
+
+# Smallest tile size that still gets arrows
+MIN_ARROW_SIZE = 8
+
+
+def _build_lut() -> np.ndarray:
+    stops = np.array(COLORMAP_STOPS, dtype=np.float64)
+    t = np.linspace(0.0, 1.0, LUT_SIZE)
+    at = np.linspace(0.0, 1.0, len(stops))
+    return np.round(np.stack([np.interp(t, at, stops[:, c]) for c in range(3)], axis=-1)).astype(np.uint8)
+
+
+COLORMAP = _build_lut()
+
+_heat_tiles: dict[int, np.ndarray] = {}
+_arrow_sprites: dict[int, np.ndarray] = {}
+
+
+def value_levels(values: np.ndarray, vmin: float | None = None, vmax: float | None = None) -> np.ndarray:
+    """Colormap indices of values, scaled from vmin (0) to vmax (LUT_SIZE - 1).
+
+    vmin and vmax default to the range of values; a constant range maps
+    to the middle of the table.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not values.size:
+        return np.zeros(values.shape, dtype=np.uint8)
+    low = float(values.min()) if vmin is None else vmin
+    high = float(values.max()) if vmax is None else vmax
+    if high <= low:
+        return np.full(values.shape, LUT_SIZE // 2, dtype=np.uint8)
+    t = np.clip((values - low) / (high - low), 0.0, 1.0)
+    return np.round(t * (LUT_SIZE - 1)).astype(np.uint8)
+
+
+def value_colors(values: np.ndarray, vmin: float | None = None, vmax: float | None = None) -> np.ndarray:
+    """Map values to the red-yellow-green colormap.
+
+    Returns:
+        values.shape + (3,) uint8 colors
+    """
+    return COLORMAP[value_levels(values, vmin, vmax)]
+
+
+def heat_tiles(tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Tile images for every colormap entry, with the atlas's grid line.
+
+    Smaller sizes are box-filtered the same way as tile_atlas, so heatmap
+    tiles blend with the map at every zoom level.
+
+    Returns:
+        (LUT_SIZE, tile_size, tile_size, 3) uint8 array
+    """
+    tiles = _heat_tiles.get(tile_size)
+    if tiles is None:
+        tile_atlas(tile_size)  # validates the size
+        inside = np.zeros((TILE_SIZE, TILE_SIZE), dtype=np.float64)
+        inside[1:-1, 1:-1] = 1.0
+        factor = TILE_SIZE // tile_size
+        weight = inside.reshape(tile_size, factor, tile_size, factor).mean(axis=(1, 3))[..., None]
+        colors = COLORMAP[:, None, None].astype(np.float64)
+        tiles = np.round(weight * colors + (1.0 - weight) * np.array(GRID_LINE_COLOR)).astype(np.uint8)
+        _heat_tiles[tile_size] = tiles
+    return tiles
+
+
+def arrow_sprites(tile_size: int = TILE_SIZE) -> np.ndarray:
+    """Arrow masks for each action (UP, DOWN, LEFT, RIGHT).
+
+    Returns:
+        (4, tile_size, tile_size) bool array
+    """
+    sprites = _arrow_sprites.get(tile_size)
+    if sprites is None:
+        # Pixel centers in [-1, 1], v pointing down
+        coords = (np.arange(tile_size) + 0.5) / tile_size * 2 - 1
+        v, u = np.meshgrid(coords, coords, indexing='ij')
+        head = (v >= -0.6) & (v <= -0.1) & (np.abs(u) <= 0.7 * (v + 0.6))
+        shaft = (v > -0.1) & (v <= 0.55) & (np.abs(u) <= max(0.12, 1.0 / tile_size))
+        up = head | shaft
+        left = up.T
+        sprites = np.stack([up, up[::-1], left, left[:, ::-1]])
+        _arrow_sprites[tile_size] = sprites
+    return sprites
+
+
+class PolicyOverlay:
+    """Draws a Q-table as a value heatmap with greedy-policy arrows.
+
+    Passable tiles are colored by their best Q-value, normalized over all
+    passable tiles so colors don't shift as the view scrolls. Arrows show
+    the greedy action on passable, non-terminal tiles that have been
+    learned. Walls and other impassable tiles keep their normal look.
+
+    Instances are draw functions for Camera.render: overlay(grid, xs, ys,
+    tile_size) returns the pixels of that block of tiles.
+    """
+
+    def __init__(
+        self,
+        grid: Grid,
+        q_table: np.ndarray,
+        arrows: bool = True,
+        vmin: float | None = None,
+        vmax: float | None = None,
+    ):
+        """Precompute colors and actions for every tile.
+
+        Args:
+            grid: The dungeon the Q-table was learned on
+            q_table: (width * height, 4) Q-values
+            arrows: Draw policy arrows
+            vmin: Value shown as full red (default: lowest passable value)
+            vmax: Value shown as full green (default: highest passable value)
+        """
+        q = np.asarray(q_table).reshape(grid.height, grid.width, 4)
+        xs, ys = np.meshgrid(np.arange(grid.width), np.arange(grid.height))
+        passable = TILES.passable[grid.tile_ids(xs, ys)]
+        values = q.max(axis=2)
+        if vmin is None and vmax is None and passable.any():
+            vmin, vmax = float(values[passable].min()), float(values[passable].max())
+
+        self.arrows = arrows
+        self.levels = value_levels(values, vmin, vmax)
+        self.best = q.argmax(axis=2).astype(np.uint8)
+        self.learned = q.any(axis=2)
+
+    def __call__(self, grid: Grid, xs: np.ndarray, ys: np.ndarray, tile_size: int = TILE_SIZE) -> np.ndarray:
+        """Pixels of the tiles at (xs, ys) with the overlay applied.
+
+        Returns:
+            (h * tile_size, w * tile_size, 3) uint8 image
+        """
+        h, w = xs.shape
+        ids = grid.tile_ids(xs, ys)
+        tiles = tile_atlas(tile_size)[ids]
+        heat = TILES.passable[ids]
+        tiles[heat] = heat_tiles(tile_size)[self.levels[ys[heat], xs[heat]]]
+
+        if self.arrows and tile_size >= MIN_ARROW_SIZE:
+            show = heat & ~TILES.terminal[ids] & self.learned[ys, xs]
+            masks = arrow_sprites(tile_size)[self.best[ys[show], xs[show]]]
+            stamped = tiles[show]
+            stamped[masks] = ARROW_COLOR
+            tiles[show] = stamped
+
+        return tiles.transpose(0, 2, 1, 3, 4).reshape(h * tile_size, w * tile_size, 3)
+
+
+def render_overlay(grid: Grid, q_table: np.ndarray, tile_size: int = 16, arrows: bool = True) -> np.ndarray:
+    """Draw the whole map with the value heatmap and policy arrows.
+
+    Returns:
+        (height * tile_size, width * tile_size, 3) uint8 image
+    """
+    xs, ys = np.meshgrid(np.arange(grid.width), np.arange(grid.height))
+    return PolicyOverlay(grid, q_table, arrows)(grid, xs, ys, tile_size)
+
+
+def save_overlay_png(path: str | Path, grid: Grid, q_table: np.ndarray, tile_size: int = 16,
+                     arrows: bool = True) -> None:
+    """Write the value heatmap and policy arrows to a PNG file (no pygame needed)."""
+    write_png(path, render_overlay(grid, q_table, tile_size, arrows))
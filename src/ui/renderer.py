@@ -1,12 +1,16 @@
 """Pygame renderer for the dungeon grid."""
+import numpy as np
 import pygame
 from ..core.grid import Grid
 from ..core.tiles import TileType
+from .atlas import TILE_SIZE, draw_tiles
+from .camera import Camera
+from .overlay import PolicyOverlay
 
-# Tile size in pixels
-TILE_SIZE = 48
+# Largest window the renderer opens; bigger maps scroll
+MAX_VIEW_SIZE = (960, 720)
 
-# Colors (RGB)
+# Colors (RGB) of the built-in tiles; the renderer reads TILES.color
 COLORS = {
     TileType.EMPTY: (240, 240, 240),   # Light gray
     TileType.WALL: (40, 40, 40),        # Dark gray
@@ -16,27 +20,56 @@ COLORS = {
     TileType.HEAL: (255, 180, 200),     # Pink
 }
 
+# Keys that zoom the view
+ZOOM_IN_KEYS = (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS)
+ZOOM_OUT_KEYS = (pygame.K_MINUS, pygame.K_KP_MINUS)
+
+# Key that toggles the value overlay
+OVERLAY_KEY = pygame.K_v
+
 # Agent color
 AGENT_COLOR = (255, 220, 50)  # Yellow
 AGENT_OUTLINE = (200, 150, 0)  # Dark yellow
 
 
 class Renderer:
-    """Pygame-based renderer for the dungeon."""
+    """Pygame-based renderer for the dungeon.
+
+    The window shows the map through a Camera, which culls tiles outside
+    the view, zooms and follows the agent, so large dungeons scroll in a
+    window of at most MAX_VIEW_SIZE. The visible part of the map is drawn
+    to an offscreen background surface, rebuilt only when the camera moves.
+    Tile edits made through the grid are patched into it cell by cell, so
+    a frame costs one blit (render_grid) or, with render_dirty, only the
+    cells the agent left and entered.
+
+    An overlay (e.g. PolicyOverlay, see set_values) replaces the tile
+    images in the background, so it costs nothing per frame either.
+    """
 
-    def __init__(self, grid: Grid, title: str = "RL Dungeon"):
+    def __init__(
+        self,
+        grid: Grid,
+        title: str = "RL Dungeon",
+        view_size: tuple[int, int] = MAX_VIEW_SIZE,
+        follow_agent: bool = True,
+    ):
         """Initialize the renderer.
 
         Args:
             grid: The grid to render
             title: Window title
+            view_size: Maximum window size in pixels
+            follow_agent: Scroll to keep the agent in view
         """
         self.grid = grid
         self.title = title
+        self.follow_agent = follow_agent
 
-        # Calculate window size
-        self.window_width = grid.width * TILE_SIZE
-        self.window_height = grid.height * TILE_SIZE
+        # Window fits the map at full zoom, up to view_size
+        self.window_width = min(grid.width * TILE_SIZE, view_size[0])
+        self.window_height = min(grid.height * TILE_SIZE, view_size[1])
+        self.camera = Camera.for_grid(grid, self.window_width, self.window_height)
 
         # Initialize Pygame
         pygame.init()
@@ -51,51 +84,166 @@ class Renderer:
         self.agent_hp: int = 100
         self.agent_max_hp: int = 100
 
+        # Cached static layer, patched from grid edit notifications
+        self._background: pygame.Surface | None = None
+        self._background_version = -1
+        self._pending: set[tuple[int, int]] = set()
+        self._drawn_agent: tuple[int, int] | None = None
+        self._dirty_cells: set[tuple[int, int]] = set()
+        self._full_redraw = True
+        grid.add_listener(self._on_grid_edit)
+
+        # Draw function that replaces the plain tiles (None: plain tiles)
+        self.overlay = None
+        self.show_overlay = True
+
     def set_agent(self, x: int, y: int, hp: int = 100, max_hp: int = 100):
         """Set the agent position and stats."""
         self.agent_pos = (x, y)
         self.agent_hp = hp
         self.agent_max_hp = max_hp
+        if self.follow_agent:
+            self.camera.follow(x, y)
+
+    def _on_grid_edit(self, x: int, y: int, old_tile: TileType, new_tile: TileType):
+        """Queue an edited cell for repainting."""
+        self._pending.add((x, y))
+
+    def invalidate(self):
+        """Force a full redraw on the next render_dirty() (e.g. after set_mode)."""
+        self._full_redraw = True
+
+    def set_overlay(self, overlay):
+        """Draw the map with overlay(grid, xs, ys, tile_size) instead of the plain tiles.
+
+        Args:
+            overlay: Draw function (see Camera.render), or None to remove it
+        """
+        self.overlay = overlay
+        self._background_version = -1
+
+    def set_values(self, q_table: np.ndarray | None):
+        """Show a Q-table as a value heatmap with policy arrows (None to remove)."""
+        self.set_overlay(None if q_table is None else PolicyOverlay(self.grid, q_table))
+
+    def toggle_overlay(self):
+        """Switch between the overlay and the plain map."""
+        self.show_overlay = not self.show_overlay
+        self._background_version = -1
+
+    def _draw(self):
+        return self.overlay if self.overlay is not None and self.show_overlay else draw_tiles
+
+    @property
+    def background(self) -> pygame.Surface:
+        """The visible part of the dungeon, up to date with the grid and camera."""
+        if self._background_version != self.camera.version:
+            self._build_background()
+            self._pending.clear()
+        elif self._pending:
+            for x, y in self._pending:
+                if self.camera.is_visible(x, y):
+                    self._draw_tile(x, y)
+                    self._dirty_cells.add((x, y))
+            self._pending.clear()
+        return self._background
+
+    def _build_background(self):
+        """Draw the visible tiles at once from the tile atlas."""
+        size = (self.camera.view_width, self.camera.view_height)
+        if self._background is None or self._background.get_size() != size:
+            self._background = pygame.Surface(size)
+        pixels = self.camera.render(self.grid, draw=self._draw())
+        pygame.surfarray.blit_array(self._background, pixels.transpose(1, 0, 2))
+        self._background_version = self.camera.version
+        self._full_redraw = True
+
+    def _draw_tile(self, x: int, y: int):
+        tile = self._draw()(self.grid, np.array([[x]]), np.array([[y]]), self.camera.tile_size)
+        self._background.blit(pygame.surfarray.make_surface(tile.transpose(1, 0, 2)),
+                              self.camera.tile_to_screen(x, y))
+
+    def _tile_rect(self, x: int, y: int) -> pygame.Rect:
+        """Screen rectangle of a tile, clipped to the view."""
+        size = self.camera.tile_size
+        rect = pygame.Rect(*self.camera.tile_to_screen(x, y), size, size)
+        return rect.clip(pygame.Rect(0, 0, self.camera.view_width, self.camera.view_height))
+
+    def zoom(self, steps: int):
+        """Zoom in (positive) or out (negative), keeping the agent in view."""
+        self.camera.zoom(steps)
+        if self.follow_agent and self.agent_pos is not None:
+            self.camera.follow(*self.agent_pos)
 
     def render_grid(self):
         """Render the grid tiles."""
-        for y in range(self.grid.height):
-            for x in range(self.grid.width):
-                tile = self.grid.get_tile(x, y)
-                color = COLORS.get(tile, (128, 128, 128))
+        self.screen.blit(self.background, (0, 0))
+        # The caller owns this frame; render_dirty() must start over
+        self._full_redraw = True
 
-                rect = pygame.Rect(
-                    x * TILE_SIZE,
-                    y * TILE_SIZE,
-                    TILE_SIZE,
-                    TILE_SIZE
-                )
+    def render_dirty(self) -> list[pygame.Rect]:
+        """Redraw only what changed since the last call.
 
-                # Fill tile
-                pygame.draw.rect(self.screen, color, rect)
+        Restores the background under the cells the agent left and entered
+        (and any edited tiles), then draws the agent.
 
-                # Draw grid lines
-                pygame.draw.rect(self.screen, (200, 200, 200), rect, 1)
+        Returns:
+            Screen rectangles to pass to pygame.display.update()
+        """
+        background = self.background
+        if self._full_redraw:
+            self.screen.blit(background, (0, 0))
+            self._dirty_cells.clear()
+            self.render_agent()
+            self._drawn_agent = self.agent_pos
+            self._full_redraw = False
+            return [background.get_rect()]
+
+        cells = self._dirty_cells
+        if self._drawn_agent != self.agent_pos:
+            for cell in (self._drawn_agent, self.agent_pos):
+                if cell is not None:
+                    cells.add(cell)
+        if self.agent_pos is not None:
+            # HP may change without moving
+            cells.add(self.agent_pos)
+
+        rects = []
+        for x, y in cells:
+            rect = self._tile_rect(x, y)
+            if rect:
+                self.screen.blit(background, rect, rect)
+                rects.append(rect)
+        cells.clear()
+        self.render_agent()
+        self._drawn_agent = self.agent_pos
+        return rects
 
     def render_agent(self):
         """Render the agent as a circle."""
-        if self.agent_pos is None:
+        if self.agent_pos is None or not self.camera.is_visible(*self.agent_pos):
             return
 
-        x, y = self.agent_pos
-        center_x = x * TILE_SIZE + TILE_SIZE // 2
-        center_y = y * TILE_SIZE + TILE_SIZE // 2
-        radius = TILE_SIZE // 3
+        size = self.camera.tile_size
+        left, top = self.camera.tile_to_screen(*self.agent_pos)
+        self.screen.set_clip(self._tile_rect(*self.agent_pos))
+        center_x = left + size // 2
+        center_y = top + size // 2
+        radius = max(size // 3, 1)
 
         # Draw agent circle
         pygame.draw.circle(self.screen, AGENT_COLOR, (center_x, center_y), radius)
+        if size < 12:
+            # No room for an outline or HP bar at this zoom
+            self.screen.set_clip(None)
+            return
         pygame.draw.circle(self.screen, AGENT_OUTLINE, (center_x, center_y), radius, 2)
 
         # Draw HP bar
-        bar_width = TILE_SIZE - 8
-        bar_height = 6
-        bar_x = x * TILE_SIZE + 4
-        bar_y = y * TILE_SIZE + 4
+        bar_width = size - size // 6
+        bar_height = max(size // 8, 2)
+        bar_x = left + size // 12
+        bar_y = top + size // 12
 
         # Background (red)
         pygame.draw.rect(self.screen, (200, 50, 50),
@@ -109,6 +257,7 @@ class Renderer:
         # Border
         pygame.draw.rect(self.screen, (0, 0, 0),
                         (bar_x, bar_y, bar_width, bar_height), 1)
+        self.screen.set_clip(None)
 
     def render_fps(self):
         """Render FPS in window title."""
@@ -116,12 +265,10 @@ class Renderer:
         pygame.display.set_caption(f"{self.title} - FPS: {fps}")
 
     def render(self):
-        """Render the complete scene."""
-        self.screen.fill((0, 0, 0))
-        self.render_grid()
-        self.render_agent()
+        """Render the scene, updating only the changed parts of the display."""
+        rects = self.render_dirty()
         self.render_fps()
-        pygame.display.flip()
+        pygame.display.update(rects)
 
     def handle_events(self) -> tuple[bool, int | None]:
         """Handle Pygame events.
@@ -130,6 +277,8 @@ class Renderer:
             Tuple of (running, action)
             - running: False if window closed
             - action: 0=UP, 1=DOWN, 2=LEFT, 3=RIGHT, None=no action
+
+        +/- zoom the view in and out; V toggles the overlay.
         """
         action = None
         running = True
@@ -150,6 +299,12 @@ class Renderer:
                     running = False
                 elif event.key == pygame.K_r:
                     action = -1  # Reset signal
+                elif event.key in ZOOM_IN_KEYS:
+                    self.zoom(1)
+                elif event.key in ZOOM_OUT_KEYS:
+                    self.zoom(-1)
+                elif event.key == OVERLAY_KEY:
+                    self.toggle_overlay()
 
         return running, action
 
@@ -162,13 +317,15 @@ class Renderer:
         pygame.quit()
 
 
-def run_viewer(grid: Grid):
+def run_viewer(grid: Grid, q_table: np.ndarray | None = None):
     """Run a simple grid viewer.
 
     Args:
         grid: The grid to display
+        q_table: Optional Q-values to show as a heatmap with policy arrows
     """
     renderer = Renderer(grid)
+    renderer.set_values(q_table)
 
     # Place agent at start position
     if grid.start_pos:
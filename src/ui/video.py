@@ -0,0 +1,321 @@
+"""Streaming episode recording to animated GIF or PNG sequences.
+
+Frames are written as they arrive, so memory use does not grow with
+episode length. Both formats are encoded with the standard library only
+(zlib for PNG, a small LZW encoder for GIF); GIF frames after the first
+store only the rectangle that changed, which for a moving agent is a
+couple of tiles.
+"""
+from __future__ import annotations
+import struct
+import zlib
+from pathlib import Path
+from typing import Any
+import numpy as np
+
+from .array_renderer import ArrayRenderer
+
+
+def write_png(path: str | Path, image: np.ndarray, level: int = 6) -> None:
+    """Write an (H, W, 3) uint8 image as an RGB PNG.
+
+    Args:
+        path: Output file
+        image: Image to write
+        level: zlib compression level
+    """
+    height, width, _ = image.shape
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # filter byte 0 per row
+    rows[:, 1:] = image.reshape(height, width * 3)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        f.write(chunk(b'IEND', b''))
+
+
+def _lzw_encode(data: bytes, min_code_size: int) -> bytes:
+    """GIF-flavoured variable-width LZW."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table: dict[int, int] = {}
+    out = bytearray()
+    bits = n_bits = 0
+
+    def emit(code: int, reset: bool = False):
+        nonlocal bits, n_bits, code_size
+        bits |= code << n_bits
+        n_bits += code_size
+        while n_bits >= 8:
+            out.append(bits & 0xFF)
+            bits >>= 8
+            n_bits -= 8
+        if reset:
+            code_size = min_code_size + 1
+        elif next_code > (1 << code_size) - 1 and code_size < 12:
+            code_size += 1
+
+    emit(clear)
+    prefix = data[0]
+    for c in data[1:]:
+        key = (prefix << 8) | c
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+        else:
+            table.clear()
+            next_code = end + 1
+            emit(clear, reset=True)
+        prefix = c
+    emit(prefix)
+    emit(end)
+    if n_bits:
+        out.append(bits & 0xFF)
+    return bytes(out)
+
+
+def _palettize(pixels: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Indices and palette (at most 256 colors) of an (h, w, 3) image."""
+    packed = (pixels[..., 0].astype(np.uint32) << 16) | (pixels[..., 1].astype(np.uint32) << 8) | pixels[..., 2]
+    colors, indices = np.unique(packed.ravel(), return_inverse=True)
+    if len(colors) > 256:
+        # Too many colors: fall back to a fixed 3-3-2 bit palette
+        indices = (pixels[..., 0] & 0xE0) | ((pixels[..., 1] >> 3) & 0x1C) | (pixels[..., 2] >> 6)
+        levels = np.arange(256)
+        palette = np.stack([levels & 0xE0, (levels & 0x1C) << 3, (levels & 0x03) << 6], axis=1)
+        return indices.astype(np.uint8).ravel(), palette.astype(np.uint8)
+    palette = np.stack([colors >> 16, (colors >> 8) & 0xFF, colors & 0xFF], axis=1).astype(np.uint8)
+    return indices.astype(np.uint8), palette
+
+
+class GifWriter:
+    """Animated GIF written one frame at a time.
+
+    Each frame after the first stores only the bounding box of the pixels
+    that changed. A frame identical to the previous one extends its display
+    time instead of being stored, which is why one frame is held back
+    until the next one (or close()) arrives.
+    """
+
+    def __init__(self, path: str | Path, fps: float = 10, loop: int = 0):
+        """Open a GIF for writing.
+
+        Args:
+            path: Output file
+            fps: Frames per second
+            loop: Times to loop (0 = forever)
+        """
+        self.path = Path(path)
+        self.delay = max(int(round(100 / fps)), 1)  # centiseconds
+        self.loop = loop
+        self.n_frames = 0
+        self._file = None
+        self._previous: np.ndarray | None = None
+        self._held: tuple[tuple[int, int], np.ndarray] | None = None
+        self._held_delay = 0
+
+    def write(self, frame: np.ndarray, delay: int | None = None) -> None:
+        """Add an (H, W, 3) uint8 frame.
+
+        Args:
+            frame: Frame to add (same size as the first frame)
+            delay: Display time in centiseconds (default: from fps)
+        """
+        delay = self.delay if delay is None else delay
+        if self._file is None:
+            self._open(frame.shape[1], frame.shape[0])
+            self._held = ((0, 0), frame.copy())
+            self._held_delay = delay
+            self._previous = frame.copy()
+            return
+
+        changed = np.any(frame != self._previous, axis=2)
+        if not changed.any():
+            self._held_delay += delay
+            return
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+        self._flush()
+        self._held = ((int(left), int(top)), frame[top:bottom, left:right].copy())
+        self._held_delay = delay
+        self._previous[top:bottom, left:right] = frame[top:bottom, left:right]
+
+    def _open(self, width: int, height: int) -> None:
+        self._file = open(self.path, 'wb')
+        self._file.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0, 0, 0))
+        self._file.write(b'\x21\xFF\x0BNETSCAPE2.0\x03\x01' + struct.pack('<H', self.loop) + b'\x00')
+
+    def _flush(self) -> None:
+        """Encode the held-back frame."""
+        if self._held is None:
+            return
+        (left, top), pixels = self._held
+        indices, palette = _palettize(pixels)
+        bits = max(int(np.ceil(np.log2(len(palette)))), 1)
+        table = np.zeros((1 << bits, 3), dtype=np.uint8)
+        table[:len(palette)] = palette
+        min_code_size = max(bits, 2)
+
+        f = self._file
+        # Graphic control: leave the frame in place, no transparency
+        f.write(b'\x21\xF9\x04\x04' + struct.pack('<H', min(self._held_delay, 0xFFFF)) + b'\x00\x00')
+        f.write(b'\x2C' + struct.pack('<HHHHB', left, top, pixels.shape[1], pixels.shape[0], 0x80 | (bits - 1)))
+        f.write(table.tobytes())
+        f.write(bytes([min_code_size]))
+        data = _lzw_encode(indices.tobytes(), min_code_size)
+        for i in range(0, len(data), 255):
+            block = data[i:i + 255]
+            f.write(bytes([len(block)]) + block)
+        f.write(b'\x00')
+        self._held = None
+        self.n_frames += 1
+
+    def close(self) -> None:
+        """Write the last frame and the trailer."""
+        if self._file is None:
+            return
+        self._flush()
+        self._file.write(b'\x3B')
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> GifWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class PngSequenceWriter:
+    """Numbered PNG files (frame_00000.png, ...) in a directory."""
+
+    def __init__(self, directory: str | Path, prefix: str = 'frame', level: int = 6):
+        """Create the output directory.
+
+        Args:
+            directory: Output directory
+            prefix: File name prefix
+            level: zlib compression level
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.level = level
+        self.n_frames = 0
+
+    def write(self, frame: np.ndarray, delay: int | None = None) -> None:
+        """Write the next frame (delay is ignored)."""
+        write_png(self.directory / f"{self.prefix}_{self.n_frames:05d}.png", frame, self.level)
+        self.n_frames += 1
+
+    def close(self) -> None:
+        """Nothing to finalize; for symmetry with GifWriter."""
+
+    def __enter__(self) -> PngSequenceWriter:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class VideoRecorder:
+    """Streams frames to a GIF (path ending in .gif) or a PNG sequence (directory).
+
+    With frame_skip=k only every k-th frame is kept, each shown k times as
+    long, so playback speed is unchanged. The final frame is always kept
+    so the end of the episode is visible.
+    """
+
+    def __init__(self, path: str | Path, fps: float = 10, frame_skip: int = 1):
+        """Open the output.
+
+        Args:
+            path: .gif file or output directory for PNG frames
+            fps: Playback frames per second (before skipping)
+            frame_skip: Keep every k-th frame
+        """
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be at least 1: {frame_skip}")
+        self.path = Path(path)
+        self.frame_skip = frame_skip
+        if self.path.suffix.lower() == '.gif':
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.writer = GifWriter(self.path, fps)
+        else:
+            self.writer = PngSequenceWriter(self.path)
+        self.delay = max(int(round(100 * frame_skip / fps)), 1)
+        self.n_captured = 0
+        self._last: np.ndarray | None = None
+
+    def capture(self, frame: np.ndarray) -> None:
+        """Offer a frame; it is written unless skipped."""
+        if self.n_captured % self.frame_skip == 0:
+            self.writer.write(frame, self.delay)
+            self._last = None
+        else:
+            self._last = frame
+        self.n_captured += 1
+
+    def close(self) -> None:
+        """Write the final frame if it was skipped and finish the output."""
+        if self._last is not None:
+            self.writer.write(self._last, self.delay)
+            self._last = None
+        self.writer.close()
+
+    @property
+    def n_frames(self) -> int:
+        """Frames written so far."""
+        return self.writer.n_frames
+
+    def __enter__(self) -> VideoRecorder:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def record_greedy_rollout(
+    ql,
+    path: str | Path,
+    max_steps: int = 200,
+    fps: float = 10,
+    frame_skip: int = 1,
+    tile_size: int | None = None,
+) -> dict[str, Any]:
+    """Record one greedy episode of a tabular agent.
+
+    Args:
+        ql: Agent with run_episode(max_steps, train, callback) (e.g. QLearning)
+        path: .gif file or PNG frame directory
+        max_steps: Maximum episode length
+        fps: Playback frames per second
+        frame_skip: Keep every k-th frame
+        tile_size: Tile size in pixels (default: fit ArrayRenderer's frame bound)
+
+    Returns:
+        Episode reward, steps, success and frames written
+    """
+    renderer = ArrayRenderer(ql.grid, tile_size)
+    frame = np.empty(renderer.shape, dtype=np.uint8)
+    with VideoRecorder(path, fps, frame_skip) as recorder:
+        recorder.capture(renderer.render(*ql.grid.start_pos, out=frame))
+
+        def on_step(agent, action, reward):
+            recorder.capture(renderer.render(agent.x, agent.y, agent.hp, agent.max_hp, out=frame))
+
+        reward, steps, success = ql.run_episode(max_steps, train=False, callback=on_step)
+    return {'reward': reward, 'steps': steps, 'success': success, 'frames': recorder.n_frames}
@@ -0,0 +1,56 @@
+"""Test the actor-learner pipeline."""
+import sys
+sys.path.insert(0, '.')
+
+import time
+
+from src.core import generate_maze
+from src.env import DungeonEnv
+from src.algorithms import QLearning, DQN, ActorLearner
+
+
+class TestActorLearner:
+    """Actors stream transitions to a central learner."""
+
+    def test_tabular_learner_converges(self):
+        """Batches from actors train the learner's Q-table."""
+        ql = QLearning(generate_maze(11, 11, seed=0))
+        pipeline = ActorLearner(ql, n_actors=2, epsilon=0.9, epsilon_alpha=2.0, seed=0)
+        stats = pipeline.run(n_transitions=50_000, verbose=False)
+
+        assert stats['transitions'] >= 50_000
+        assert stats['versions'] == stats['batches'] + 1
+        assert stats['transitions_per_sec'] > 0
+        assert len(stats['episode_rewards']) == len(stats['episode_steps']) > 0
+        assert ql.test(n_episodes=1)['success_rate'] == 1.0
+
+    def test_dead_actor_is_restarted(self):
+        """An actor that dies is replaced and the run continues."""
+        ql = QLearning(generate_maze(11, 11, seed=0))
+        pipeline = ActorLearner(ql, n_actors=2, batch_size=64, seed=0)
+        killed = []
+
+        def kill_once(stats):
+            if not killed:
+                pipeline.actors[0].kill()
+                killed.append(True)
+
+        stats = pipeline.run(n_transitions=5000, verbose=False, callback=kill_once)
+        assert stats['restarts'] >= 1
+        assert stats['transitions'] >= 5000
+
+    def test_backpressure_and_lag(self):
+        """A slow learner blocks actors and sees stale policies."""
+        ql = QLearning(generate_maze(11, 11, seed=0))
+        pipeline = ActorLearner(ql, n_actors=2, batch_size=32, queue_size=1, seed=0)
+        stats = pipeline.run(n_transitions=640, verbose=False, callback=lambda stats: time.sleep(0.02))
+        assert stats['backpressure_wait'] > 0
+        assert stats['policy_lag_max'] >= 1
+
+    def test_dqn_learner(self):
+        """DQN learners get batches in their replay buffer and train on them."""
+        env = DungeonEnv(grid=generate_maze(11, 11, seed=0), obs_type="local", max_steps=100)
+        dqn = DQN(env, learning_starts=128, seed=0)
+        stats = ActorLearner(dqn, n_actors=2, batch_size=64, seed=0).run(n_transitions=512, verbose=False)
+        assert len(dqn.buffer) == stats['transitions']
+        assert dqn.n_updates > 0
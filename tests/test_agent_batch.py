@@ -0,0 +1,59 @@
+"""Test vectorized AgentBatch against the scalar Agent."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file, chunked_from_grid
+from src.agents import Agent, Action, AgentBatch
+
+
+@pytest.mark.parametrize("dungeon", [
+    "assets/dungeons/level_02_trap.txt",
+    "assets/dungeons/level_03_maze.txt",
+])
+def test_batch_matches_agent_move(dungeon):
+    """Test rewards, HP and termination against Agent.move step by step."""
+    grid = load_grid_from_file(dungeon)
+    n = 64
+    rng = np.random.default_rng(0)
+    batch = AgentBatch.at_start(grid, n)
+    agents = [Agent(*grid.start_pos) for _ in range(n)]
+    finished = [False] * n
+
+    for _ in range(150):
+        actions = rng.integers(0, 4, size=n)
+        reward, done, success = batch.step(actions, grid)
+        for i, agent in enumerate(agents):
+            if finished[i]:
+                assert reward[i] == 0.0 and not done[i]
+                continue
+            r, d, s = agent.move(Action(int(actions[i])), grid)
+            assert reward[i] == r
+            assert done[i] == d
+            assert success[i] == s
+            finished[i] = d
+            assert (batch.x[i], batch.y[i], batch.hp[i]) == (agent.x, agent.y, agent.hp)
+            assert batch.total_reward[i] == agent.total_reward
+
+    assert batch.done.tolist() == finished
+
+
+def test_blocked_mask_acts_as_wall_bump():
+    """Test that refused moves get the wall bump penalty."""
+    grid = load_grid_from_file("assets/dungeons/level_01_easy.txt")
+    batch = AgentBatch.at_start(grid, 2)
+    reward, _, success = batch.step(np.array([1, 1]), grid, blocked=np.array([False, True]))
+
+    assert success.tolist() == [True, False]
+    assert reward[1] == pytest.approx(-1.1)
+    assert batch.positions.tolist() == [[1, 2], [1, 1]]
+
+
+def test_batch_on_chunked_grid():
+    """Test that the batch reads tiles from a ChunkedGrid."""
+    grid = chunked_from_grid(load_grid_from_file("assets/dungeons/level_01_easy.txt"), chunk_size=2)
+    batch = AgentBatch.at_start(grid, 3)
+    _, _, success = batch.step(np.array([0, 1, 3]), grid)
+    assert success.tolist() == [False, True, True]
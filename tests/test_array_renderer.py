@@ -0,0 +1,136 @@
+"""Test the NumPy rgb_array renderer."""
+import os
+import subprocess
+import sys
+import time
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file, create_bordered_grid, TileType, TILES
+from src.env import DungeonEnv, MultiAgentDungeonEnv
+from src.ui.array_renderer import ArrayRenderer, AGENT_COLOR, HP_BAR_FULL, HP_BAR_EMPTY
+from src.ui.atlas import TILE_SIZE, tile_atlas
+
+
+@pytest.fixture
+def grid():
+    """The easy level."""
+    return load_grid_from_file("assets/dungeons/level_01_easy.txt")
+
+
+class TestArrayRenderer:
+    """Test suite for ArrayRenderer."""
+
+    def test_background(self, grid):
+        """Without an agent, every tile is its atlas image."""
+        renderer = ArrayRenderer(grid)
+        frame = renderer.render()
+        assert frame.shape == (grid.height * TILE_SIZE, grid.width * TILE_SIZE, 3)
+        assert frame.dtype == np.uint8
+        atlas = tile_atlas(TILE_SIZE)
+        for y in range(grid.height):
+            for x in range(grid.width):
+                tile = frame[y * TILE_SIZE:(y + 1) * TILE_SIZE, x * TILE_SIZE:(x + 1) * TILE_SIZE]
+                np.testing.assert_array_equal(tile, atlas[grid.tile_id(x, y)])
+
+    def test_agent_and_hp_bar(self, grid):
+        """The agent is drawn in its tile with an HP bar filled to its HP."""
+        renderer = ArrayRenderer(grid)
+        x, y = grid.start_pos
+        frame = renderer.render(x, y, hp=50, max_hp=100)
+        top, left = y * TILE_SIZE, x * TILE_SIZE
+        assert tuple(frame[top + TILE_SIZE // 2, left + TILE_SIZE // 2]) == AGENT_COLOR
+        bar_row = top + TILE_SIZE // 12 + 2
+        assert tuple(frame[bar_row, left + 8]) == HP_BAR_FULL
+        assert tuple(frame[bar_row, left + TILE_SIZE - 10]) == HP_BAR_EMPTY
+
+        # Other tiles are untouched
+        np.testing.assert_array_equal(frame[:, left + TILE_SIZE:], renderer.background[:, left + TILE_SIZE:])
+
+    def test_grid_edits(self, grid):
+        """Tile edits show up in the next frame."""
+        renderer = ArrayRenderer(grid)
+        renderer.render()
+        grid.set_tile(2, 2, TileType.TRAP)
+        frame = renderer.render()
+        assert tuple(frame[2 * TILE_SIZE + 24, 2 * TILE_SIZE + 24]) == tuple(TILES.color[TileType.TRAP.value])
+
+    def test_batch(self, grid):
+        """render_batch gives the same frames as rendering one agent at a time."""
+        renderer = ArrayRenderer(grid)
+        xs, ys, hps = np.array([1, 2, 3]), np.array([1, 2, 1]), np.array([100, 40, 0])
+        frames = renderer.render_batch(xs, ys, hps)
+        assert frames.shape == (3, *renderer.shape)
+        for i in range(3):
+            np.testing.assert_array_equal(frames[i], renderer.render(xs[i], ys[i], hps[i]))
+
+    def test_many_agents_one_frame(self, grid):
+        """render_agents draws every agent on one frame."""
+        renderer = ArrayRenderer(grid)
+        frame = renderer.render_agents(np.array([1, 3]), np.array([1, 3]), np.array([100, 100]))
+        for x, y in ((1, 1), (3, 3)):
+            assert tuple(frame[y * TILE_SIZE + 24, x * TILE_SIZE + 24]) == AGENT_COLOR
+
+    def test_tile_size_fits_large_maps(self):
+        """Large maps get a smaller tile size automatically."""
+        renderer = ArrayRenderer(create_bordered_grid(200, 200))
+        assert renderer.tile_size == 4
+        assert renderer.render(5, 5).shape == (800, 800, 3)
+
+    def test_throughput(self, grid):
+        """Frames are cheap enough for video capture."""
+        renderer = ArrayRenderer(grid)
+        out = np.empty(renderer.shape, dtype=np.uint8)
+        start = time.perf_counter()
+        for i in range(1000):
+            renderer.render(1 + i % 3, 1, out=out)
+        assert time.perf_counter() - start < 1.0
+
+
+class TestEnvRendering:
+    """Test suite for rgb_array rendering in the environments."""
+
+    def test_dungeon_env(self):
+        """DungeonEnv rgb_array frames come from ArrayRenderer."""
+        env = DungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt", render_mode="rgb_array")
+        env.reset(seed=0)
+        frame = env.render()
+        assert frame.shape == (5 * TILE_SIZE, 5 * TILE_SIZE, 3) and frame.dtype == np.uint8
+        np.testing.assert_array_equal(frame, ArrayRenderer(env.grid).render(*env.start_pos))
+        env.close()
+
+    def test_multi_agent_env(self):
+        """MultiAgentDungeonEnv renders all agents on the board."""
+        env = MultiAgentDungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt", n_agents=2,
+                                   render_mode="rgb_array", collisions=False)
+        env.reset(seed=0)
+        frame = env.render()
+        x, y = env.grid.start_pos
+        assert tuple(frame[y * TILE_SIZE + 24, x * TILE_SIZE + 24]) == AGENT_COLOR
+
+    def test_no_pygame(self):
+        """rgb_array rendering does not import pygame."""
+        code = (
+            "import sys; sys.path.insert(0, '.');"
+            "from src.env import DungeonEnv;"
+            "env = DungeonEnv(dungeon_file='assets/dungeons/level_01_easy.txt', render_mode='rgb_array');"
+            "env.reset(seed=0); env.render();"
+            "assert 'pygame' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_matches_pygame_renderer(self, grid):
+        """Tiles match the pygame renderer pixel for pixel."""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import pygame
+        from src.ui.renderer import Renderer
+
+        renderer = Renderer(grid)
+        try:
+            renderer.render_dirty()
+            screen = pygame.surfarray.array3d(renderer.screen).transpose(1, 0, 2)
+        finally:
+            renderer.close()
+        np.testing.assert_array_equal(screen, ArrayRenderer(grid).render())
@@ -0,0 +1,80 @@
+"""Test the benchmark suite's bookkeeping and regression checks."""
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+from benchmarks import Metric, run_suite, save_results, load_results, compare
+from benchmarks.__main__ import main
+from benchmarks.suite import CALIBRATION
+
+
+def rate(name, value, tolerance=0.3):
+    """A higher-is-better timing metric."""
+    return Metric(name, value, "items/s", True, tolerance)
+
+
+class TestCompare:
+    """Test suite for compare()."""
+
+    def test_tolerance(self):
+        """Only changes beyond the tolerance in the bad direction regress."""
+        baseline = {
+            'fast': rate('fast', 100.0),
+            'slow': rate('slow', 100.0),
+            'time': Metric('time', 10.0, 'ms', False, 0.3),
+        }
+        results = {
+            'fast': rate('fast', 75.0),
+            'slow': rate('slow', 60.0),
+            'time': Metric('time', 14.0, 'ms', False, 0.3),
+            'extra': rate('extra', 1.0),
+        }
+        regressions, report = compare(results, baseline)
+        assert [message.split(':')[0] for message in regressions] == ['slow', 'time']
+        assert any('(new)' in line for line in report)
+
+        regressions, _ = compare(results, baseline, tolerance=0.5)
+        assert not regressions
+
+    def test_calibration_scales_timings(self):
+        """A machine half as fast halves the expected rates, but not memory."""
+        baseline = {
+            CALIBRATION: rate(CALIBRATION, 1000.0),
+            'steps': rate('steps', 100.0),
+            'memory': Metric('memory', 50.0, 'bytes', False, 0.1, timing=False),
+        }
+        results = {
+            CALIBRATION: rate(CALIBRATION, 500.0),
+            'steps': rate('steps', 55.0),
+            'memory': Metric('memory', 60.0, 'bytes', False, 0.1, timing=False),
+        }
+        regressions, _ = compare(results, baseline)
+        assert [message.split(':')[0] for message in regressions] == ['memory']
+
+
+def test_run_and_roundtrip(tmp_path):
+    """A quick run measures every dungeon and survives a save/load."""
+    results = run_suite(['grid_io', 'memory'], quick=True, log=None)
+    assert 'grid_load/level_01_easy' in results and 'memory_per_state/maze_51x51' in results
+    assert all(metric.value > 0 for metric in results.values())
+    save_results(tmp_path / "bench.json", results)
+    assert load_results(tmp_path / "bench.json") == results
+
+    with pytest.raises(ValueError):
+        run_suite(['nope'], log=None)
+
+
+def test_cli_fails_on_regression(tmp_path, capsys):
+    """The command exits 1 when the baseline is much better."""
+    baseline = tmp_path / "baseline.json"
+    assert main(['--only', 'memory', '--quick', '--baseline', str(baseline), '--update-baseline']) == 0
+    assert main(['--only', 'memory', '--quick', '--baseline', str(baseline)]) == 0
+
+    results = load_results(baseline)
+    for metric in results.values():
+        if not metric.timing:
+            metric.value /= 2
+    save_results(baseline, results)
+    assert main(['--only', 'memory', '--quick', '--baseline', str(baseline)]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
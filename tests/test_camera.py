@@ -0,0 +1,151 @@
+"""Test the camera viewport and mipmapped tile atlas."""
+import os
+import sys
+sys.path.insert(0, '.')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pytest
+
+from src.core import create_bordered_grid, TileType, TILES
+from src.core.generator import generate_rooms
+from src.ui.atlas import TILE_SIZE, ZOOM_LEVELS, GRID_LINE_COLOR, tile_atlas, render_tiles
+from src.ui.camera import Camera
+
+
+class TestAtlas:
+    """Test suite for the tile atlas."""
+
+    def test_full_size_tiles(self):
+        """Full-size tiles are the tile color inside a grid line."""
+        atlas = tile_atlas(TILE_SIZE)
+        assert atlas.shape == (len(TILES.color), TILE_SIZE, TILE_SIZE, 3)
+        wall = TileType.WALL.value
+        assert tuple(atlas[wall, TILE_SIZE // 2, TILE_SIZE // 2]) == tuple(TILES.color[wall])
+        assert tuple(atlas[wall, 0, 5]) == GRID_LINE_COLOR
+
+    def test_mipmaps_are_averages(self):
+        """Each zoom level averages the full-size tile, so mean color is kept."""
+        full = tile_atlas(TILE_SIZE).reshape(len(TILES.color), -1, 3).mean(axis=1)
+        for size in ZOOM_LEVELS:
+            mip = tile_atlas(size).reshape(len(TILES.color), -1, 3).mean(axis=1)
+            np.testing.assert_allclose(mip, full, atol=1)
+        assert tile_atlas(1).shape[1:] == (1, 1, 3)
+
+    def test_invalid_size(self):
+        """Sizes that don't divide the full tile size are rejected."""
+        with pytest.raises(ValueError):
+            tile_atlas(5)
+
+    def test_render_tiles(self):
+        """Blocks of ids render tile by tile."""
+        ids = np.array([[0, 1], [2, 3]])
+        pixels = render_tiles(ids, 8)
+        assert pixels.shape == (16, 16, 3)
+        np.testing.assert_array_equal(pixels[8:, :8], tile_atlas(8)[2])
+
+
+class TestCamera:
+    """Test suite for Camera."""
+
+    def test_small_map_is_centered(self):
+        """A map smaller than the window is centered and fully visible."""
+        camera = Camera(5, 5, 400, 300)
+        assert camera.origin == ((240 - 400) // 2, (240 - 300) // 2)
+        assert camera.visible_tiles() == (0, 0, 5, 5)
+        frame = camera.render(create_bordered_grid(5, 5))
+        assert frame.shape == (300, 400, 3)
+        assert not frame[0, 0].any()
+
+    def test_culling(self):
+        """Only tiles overlapping the window are visible."""
+        camera = Camera(100, 100, 480, 240)
+        camera.look_at(0, 0)
+        assert camera.origin == (0, 0)
+        assert camera.visible_tiles() == (0, 0, 10, 5)
+        assert camera.is_visible(9, 4)
+        assert not camera.is_visible(10, 4)
+
+    def test_clamped_at_edges(self):
+        """The view never scrolls past the map."""
+        camera = Camera(100, 100, 480, 240)
+        camera.look_at(99, 99)
+        assert camera.origin == (100 * TILE_SIZE - 480, 100 * TILE_SIZE - 240)
+
+    def test_follow_scrolls_only_near_edge(self):
+        """Follow leaves the view alone until the tile nears the edge."""
+        camera = Camera(100, 100, 480, 480)
+        camera.look_at(0, 0)
+        version = camera.version
+        camera.follow(3, 3, margin=2)
+        assert camera.version == version
+        camera.follow(9, 3, margin=2)
+        assert camera.version > version
+        sx, _ = camera.tile_to_screen(9, 3)
+        assert sx + TILE_SIZE <= 480 - 2 * TILE_SIZE
+
+    def test_zoom_keeps_center(self):
+        """Zooming changes the tile size around the same map point."""
+        camera = Camera(100, 100, 480, 480)
+        camera.look_at(50, 50)
+        camera.zoom_out()
+        assert camera.tile_size == ZOOM_LEVELS[1]
+        assert camera.screen_to_tile(240, 240) == (50, 50)
+        camera.zoom(-100)
+        assert camera.tile_size == ZOOM_LEVELS[-1]
+        camera.zoom(100)
+        assert camera.tile_size == ZOOM_LEVELS[0]
+
+    def test_fit(self):
+        """fit() picks the largest tile size that shows the whole map."""
+        camera = Camera(100, 100, 480, 480)
+        camera.fit()
+        assert camera.tile_size == 4
+        assert camera.visible_tiles() == (0, 0, 100, 100)
+        camera.fit(min_tile_size=12)
+        assert camera.tile_size == 12
+
+    def test_render_matches_atlas(self):
+        """Rendered pixels come from the atlas at the current zoom."""
+        grid = create_bordered_grid(20, 20)
+        camera = Camera(20, 20, 100, 70, tile_size=8)
+        camera.look_at(10, 10)
+        frame = camera.render(grid)
+        sx, sy = camera.tile_to_screen(10, 10)
+        np.testing.assert_array_equal(frame[sy:sy + 8, sx:sx + 8], tile_atlas(8)[grid.tile_id(10, 10)])
+
+    def test_cost_depends_on_view(self):
+        """Rendering a huge map only reads the tiles in view."""
+        grid = generate_rooms(4000, 4000, seed=0)
+        read = []
+        tile_ids = grid.tile_ids
+        grid.tile_ids = lambda xs, ys: read.append(xs.size) or tile_ids(xs, ys)
+
+        camera = Camera(grid.width, grid.height, 480, 480)
+        camera.look_at(*grid.start_pos)
+        frame = camera.render(grid)
+        assert frame.shape == (480, 480, 3)
+        assert len(read) == 1 and read[0] <= 11 * 11
+
+
+class TestRendererCamera:
+    """Test suite for the renderer on maps larger than the window."""
+
+    def test_large_map_window(self):
+        """The window is capped and follows the agent."""
+        from src.ui.renderer import Renderer, MAX_VIEW_SIZE
+        grid = create_bordered_grid(200, 200)
+        renderer = Renderer(grid)
+        try:
+            assert (renderer.window_width, renderer.window_height) == MAX_VIEW_SIZE
+            renderer.set_agent(150, 150)
+            renderer.render()
+            assert renderer.camera.is_visible(150, 150)
+
+            version = renderer.camera.version
+            renderer.set_agent(149, 150)
+            rects = renderer.render_dirty()
+            assert renderer.camera.version == version
+            assert len(rects) == 2
+        finally:
+            renderer.close()
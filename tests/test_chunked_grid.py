@@ -0,0 +1,79 @@
+"""Test the sparse chunked grid."""
+import sys
+sys.path.insert(0, '.')
+
+from src.core import (
+    TileType, ChunkedGrid, chunked_from_grid, load_grid_from_file,
+    generate_maze, generate_rooms,
+)
+from src.agents import Agent, Action
+from src.algorithms import QLearning, DistanceField, UNREACHABLE
+from src.env import DungeonEnv
+
+
+def test_unallocated_cells_read_as_wall():
+    """Test that chunks are only allocated when something is carved."""
+    grid = ChunkedGrid(1000, 1000, chunk_size=32)
+    assert grid.get_tile(500, 500) == TileType.WALL
+    assert grid.n_chunks == 0
+
+    grid.set_tile(500, 500, TileType.WALL)
+    assert grid.n_chunks == 0
+
+    grid.set_tile(500, 500, TileType.EMPTY)
+    assert grid.n_chunks == 1
+    assert grid.get_tile(500, 500) == TileType.EMPTY
+    assert grid.get_tile(501, 500) == TileType.WALL
+
+
+def test_compact_frees_wall_chunks():
+    """Test that chunks filled back with walls can be released."""
+    grid = ChunkedGrid(100, 100, chunk_size=16)
+    grid.set_tile(5, 5, TileType.EMPTY)
+    grid.set_tile(50, 50, TileType.EMPTY)
+    grid.set_tile(5, 5, TileType.WALL)
+    assert grid.compact() == 1
+    assert grid.n_chunks == 1
+
+
+def test_chunked_matches_dense():
+    """Test that a converted grid reads the same as the original."""
+    dense = load_grid_from_file("assets/dungeons/level_03_maze.txt")
+    chunked = chunked_from_grid(dense, chunk_size=4)
+
+    assert str(chunked) == str(dense)
+    assert chunked.start_pos == dense.start_pos
+    assert chunked.goal_pos == dense.goal_pos
+    assert sum(block.size for _, _, block in chunked.iter_chunks()) <= dense.width * dense.height
+
+
+def test_memory_follows_carved_area():
+    """Test that a sparse world allocates a fraction of its bounding box."""
+    grid = generate_rooms(2000, 2000, n_rooms=10, seed=1)
+    assert grid.start_pos is not None and grid.goal_pos is not None
+    assert grid.n_chunks < (2000 // 64) ** 2 // 4
+
+
+def test_existing_components_work_unchanged():
+    """Test Agent, QLearning and DungeonEnv against a ChunkedGrid."""
+    grid = chunked_from_grid(load_grid_from_file("assets/dungeons/level_01_easy.txt"), chunk_size=2)
+
+    agent = Agent(*grid.start_pos)
+    _, _, success = agent.move(Action.UP, grid)
+    assert not success
+
+    ql = QLearning(grid)
+    ql.train(n_episodes=200, verbose=False)
+    assert ql.test(n_episodes=1)['success_rate'] == 1.0
+
+    env = DungeonEnv(grid=grid, obs_type="grid")
+    obs, _ = env.reset()
+    assert obs.shape == (grid.height, grid.width)
+
+
+def test_generate_maze_is_solvable():
+    """Test that generated mazes have a path from start to goal."""
+    for grid in (generate_maze(21, 15, seed=3), generate_maze(20, 16, seed=4)):
+        field = DistanceField(grid)
+        sx, sy = grid.start_pos
+        assert field.distances[sy, sx] != UNREACHABLE
@@ -0,0 +1,67 @@
+"""Test the headless batch CLI."""
+import sys
+sys.path.insert(0, '.')
+
+import json
+import subprocess
+
+import numpy as np
+
+from src.cli import main, find_dungeons
+
+
+EASY = "assets/dungeons/level_01_easy.txt"
+
+
+def test_find_dungeons_expands_directories():
+    """Directories expand to their dungeon files."""
+    dungeons = find_dungeons(["assets/dungeons", EASY])
+    assert len(dungeons) >= 4
+    assert str(dungeons[-1]) == EASY
+
+
+def test_train_writes_artifacts(tmp_path):
+    """Training writes Q-tables, policies and metrics per dungeon."""
+    code = main(["train", EASY, "--out", str(tmp_path), "--episodes", "50",
+                 "--test-episodes", "1", "--seed", "0", "--workers", "1", "--quiet"])
+    assert code == 0
+
+    target = tmp_path / "level_01_easy"
+    assert np.load(target / "q_table.npy").shape == (25, 4)
+    assert "G" in (target / "policy.txt").read_text()
+    metrics = json.loads((target / "metrics.json").read_text())
+    assert metrics["success_rate"] == 1.0
+    summary = json.loads((tmp_path / "summary.json").read_text())
+    assert [m["dungeon"] for m in summary] == [EASY]
+
+
+def test_headless_imports(tmp_path):
+    """A training run without --plots never imports pygame or matplotlib."""
+    script = (
+        "import sys; sys.path.insert(0, '.'); from src.cli import main; "
+        f"main(['train', '{EASY}', '--out', r'{tmp_path}', '--episodes', '5', "
+        "'--test-episodes', '1', '--workers', '1', '--quiet']); "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('pygame', 'matplotlib')))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_record_rollouts(tmp_path):
+    """record turns the Q-tables written by train into rollout GIFs."""
+    main(["train", EASY, "--out", str(tmp_path), "--episodes", "50",
+          "--test-episodes", "1", "--seed", "0", "--workers", "1", "--quiet"])
+    code = main(["record", EASY, "--runs", str(tmp_path), "--workers", "1", "--tile-size", "16", "--quiet"])
+    assert code == 0
+    gif = tmp_path / "level_01_easy" / "rollout.gif"
+    assert gif.read_bytes()[:6] == b"GIF89a"
+
+    code = main(["record", EASY, "--runs", str(tmp_path), "--out", str(tmp_path / "png"),
+                 "--format", "png", "--workers", "1", "--quiet"])
+    assert code == 0
+    assert len(list((tmp_path / "png" / "level_01_easy" / "rollout").glob("frame_*.png"))) >= 2
+
+
+def test_record_without_training_fails(tmp_path):
+    """A dungeon without a saved Q-table is reported as a failure."""
+    assert main(["record", EASY, "--runs", str(tmp_path), "--workers", "1", "--quiet"]) == 1
@@ -0,0 +1,81 @@
+"""Test the NumPy DQN."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.env import DungeonEnv
+from src.algorithms import MLP, DQN
+
+
+EASY = "assets/dungeons/level_01_easy.txt"
+
+
+class TestMLP:
+    """Network forward/backward passes and optimizer."""
+
+    def test_backward_matches_reference(self):
+        """Gradients match a straightforward float64 backprop."""
+        net = MLP((5, 7, 6, 3), seed=0)
+        x = np.random.default_rng(1).normal(size=(4, 5)).astype(np.float32)
+        g = np.random.default_rng(2).normal(size=(4, 3)).astype(np.float32)
+        net.forward(x)
+        net.backward(g)
+
+        w1, b1, w2, b2, w3, b3 = (w.astype(np.float64) for w in net.weights)
+        h1 = np.maximum(x @ w1 + b1, 0)
+        h2 = np.maximum(h1 @ w2 + b2, 0)
+        d2 = (g @ w3.T) * (h2 > 0)
+        d1 = (d2 @ w2.T) * (h1 > 0)
+        expected = np.concatenate([
+            (x.T @ d1).ravel(), d1.sum(0), (h1.T @ d2).ravel(), d2.sum(0), (h2.T @ g).ravel(), g.sum(0),
+        ])
+        np.testing.assert_allclose(net.grads, expected, atol=1e-5)
+
+    def test_adam_fits_regression(self):
+        """A few hundred Adam steps fit a linear target."""
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(64, 3)).astype(np.float32)
+        y = x @ np.array([[1.0], [-2.0], [0.5]], dtype=np.float32)
+        net = MLP((3, 32, 1), seed=0)
+        for _ in range(500):
+            err = net.forward(x) - y
+            net.backward(err / len(x))
+            net.adam_step(1e-2)
+        assert np.mean((net.forward(x) - y) ** 2) < 0.01
+
+    def test_forward_reuses_buffers(self):
+        """Repeated forward passes with one batch size allocate nothing new."""
+        net = MLP((4, 8, 2), seed=0)
+        x = np.ones((16, 4), dtype=np.float32)
+        assert net.forward(x) is net.forward(x)
+
+
+class TestDQN:
+    """DQN training on DungeonEnv."""
+
+    @pytest.mark.parametrize("obs_type", ["position", "local", "grid"])
+    def test_learns_easy_dungeon(self, obs_type):
+        """The greedy policy reaches the goal after a short training run."""
+        env = DungeonEnv(dungeon_file=EASY, obs_type=obs_type, max_steps=100)
+        dqn = DQN(env, learning_starts=200, epsilon_decay=0.97, target_update=200, seed=0)
+        dqn.train(n_episodes=150, verbose=False)
+        assert dqn.test(n_episodes=1)['success_rate'] == 1.0
+
+    def test_prioritized(self):
+        """Training with prioritized replay updates priorities."""
+        env = DungeonEnv(dungeon_file=EASY, obs_type="local", max_steps=100)
+        dqn = DQN(env, learning_starts=100, prioritized=True, seed=0)
+        dqn.train(n_episodes=30, verbose=False)
+        assert dqn.n_updates > 0
+        assert dqn.buffer.max_priority > 0
+
+    def test_save_load(self, tmp_path):
+        """Saved parameters restore the same Q-values."""
+        env = DungeonEnv(dungeon_file=EASY, obs_type="local")
+        a, b = DQN(env, seed=0), DQN(env, seed=1)
+        obs, _ = env.reset()
+        a.save(tmp_path / "dqn.npz")
+        b.load(tmp_path / "dqn.npz")
+        np.testing.assert_array_equal(a.q_values(obs), b.q_values(obs))
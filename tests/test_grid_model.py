@@ -0,0 +1,106 @@
+"""Test incremental updates of data derived from a Grid."""
+import sys
+sys.path.insert(0, '.')
+
+import random
+import numpy as np
+
+from src.core import TileType, chunked_from_grid, load_grid_from_file, create_bordered_grid
+from src.algorithms import QLearning, TransitionTable, DistanceField
+
+
+def test_set_tile_tracks_version_and_dirty_region():
+    """Test that edits bump the version and grow the dirty region."""
+    grid = create_bordered_grid(6, 6)
+    grid.clear_dirty()
+    version = grid.version
+
+    grid.set_tile(2, 2, TileType.TRAP)
+    grid.set_tile(4, 3, TileType.WALL)
+    assert grid.version == version + 2
+    assert grid.dirty_region == (2, 2, 4, 3)
+
+    # Setting the same tile again is not an edit
+    grid.set_tile(4, 3, TileType.WALL)
+    assert grid.version == version + 2
+
+    assert grid.clear_dirty() == (2, 2, 4, 3)
+    assert grid.dirty_region is None
+
+
+def test_untracked_edits():
+    """Test that untracked edits skip the version, dirty region and listeners."""
+    for grid in (create_bordered_grid(6, 6), chunked_from_grid(create_bordered_grid(6, 6), chunk_size=4)):
+        grid.clear_dirty()
+        version = grid.version
+        edits = []
+        grid.add_listener(lambda x, y, old, new: edits.append((x, y)))
+
+        with grid.untracked():
+            grid.set_tile(2, 2, TileType.TRAP)
+            assert grid.get_tile(2, 2) == TileType.TRAP
+            grid.set_tile(2, 2, TileType.EMPTY)
+        assert grid.version == version and grid.dirty_region is None and not edits
+
+        grid.set_tile(3, 3, TileType.TRAP)
+        assert grid.version == version + 1 and edits == [(3, 3)]
+
+
+def test_listener_sees_displaced_start():
+    """Test that moving the start notifies about the old start cell too."""
+    grid = create_bordered_grid(5, 5)
+    edits = []
+    grid.add_listener(lambda x, y, old, new: edits.append((x, y, old, new)))
+
+    grid.set_tile(1, 1, TileType.START)
+    grid.set_tile(3, 3, TileType.START)
+
+    assert (1, 1, TileType.START, TileType.EMPTY) in edits
+    assert grid.get_tile(1, 1) == TileType.EMPTY
+
+
+def test_transition_table_patch_matches_rebuild():
+    """Test that patched transition rows equal a full rebuild."""
+    grid = load_grid_from_file("assets/dungeons/level_03_maze.txt")
+    table = TransitionTable(grid)
+
+    grid.set_tile(2, 1, TileType.EMPTY)
+    grid.set_tile(4, 3, TileType.TRAP)
+    assert table.is_stale
+    table.refresh()
+    assert not table.is_stale
+
+    fresh = TransitionTable(grid)
+    np.testing.assert_array_equal(table.next_state, fresh.next_state)
+    np.testing.assert_array_equal(table.reward, fresh.reward)
+    np.testing.assert_array_equal(table.terminal, fresh.terminal)
+
+
+def test_distance_field_repair_matches_rebuild():
+    """Test local distance repair against a full BFS under random edits."""
+    grid = load_grid_from_file("assets/dungeons/level_03_maze.txt")
+    field = DistanceField(grid)
+    rng = random.Random(0)
+
+    for _ in range(50):
+        x, y = rng.randrange(1, grid.width - 1), rng.randrange(1, grid.height - 1)
+        if grid.get_tile(x, y) in (TileType.START, TileType.GOAL):
+            continue
+        tile = TileType.WALL if grid.get_tile(x, y) != TileType.WALL else TileType.EMPTY
+        grid.set_tile(x, y, tile)
+        field.refresh()
+        np.testing.assert_array_equal(field.distances, DistanceField(grid).distances)
+
+
+def test_q_table_warm_start_after_edit():
+    """Test that an edit only resets Q-values around the edited cell."""
+    grid = load_grid_from_file("assets/dungeons/level_03_maze.txt")
+    ql = QLearning(grid)
+    ql.q_table[:] = 1.0
+
+    grid.set_tile(2, 3, TileType.TRAP)
+
+    assert np.all(ql.q_table[ql.state_to_index(2, 3)] == 0.0)
+    assert ql.q_table[ql.state_to_index(1, 3), 3] == 0.0   # RIGHT into the edit
+    assert ql.q_table[ql.state_to_index(1, 3), 0] == 1.0   # unrelated action
+    assert ql.q_table[ql.state_to_index(8, 7)].sum() == 4.0
@@ -7,6 +7,7 @@ import pytest
 from gymnasium.utils.env_checker import check_env
 
 from src.env import DungeonEnv
+from src.core import TileType, chunked_from_grid, load_grid_from_file
 
 
 class TestDungeonEnv:
@@ -69,6 +70,41 @@ class TestDungeonEnv:
         assert env_grid_obs.observation_space.shape[0] == env_grid_obs.grid.height
         assert env_grid_obs.observation_space.shape[1] == env_grid_obs.grid.width
 
+    def test_observation_local(self):
+        """Test local window observation, padded with walls at the edge."""
+        env = DungeonEnv(
+            dungeon_file="assets/dungeons/level_01_easy.txt",
+            obs_type="local",
+            view_radius=2
+        )
+        obs, _ = env.reset()
+        assert obs.shape == env.observation_space.shape == (5, 5)
+        assert env.observation_space.contains(obs)
+        # Agent in the center; start (1, 1) sees one row/column beyond the border
+        assert obs[2, 2] == -1
+        assert (obs[0, :] == TileType.WALL.value).all()
+        assert (obs[:, 0] == TileType.WALL.value).all()
+        assert obs[2, 3] == TileType.EMPTY.value
+
+    def test_local_observation_follows_edits(self):
+        """The local window sees tiles edited after the env was created."""
+        env = DungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt", obs_type="local", view_radius=2)
+        env.reset()
+        env.grid.set_tile(2, 1, TileType.WALL)
+        obs, *_ = env.step(0)  # bump into the top wall, stay at (1, 1)
+        assert obs[2, 3] == TileType.WALL.value and obs[2, 2] == -1
+
+    def test_grid_observation_on_chunked_grid(self):
+        """Grid observations match the dense grid and follow edits."""
+        dense = load_grid_from_file("assets/dungeons/level_02_trap.txt")
+        env = DungeonEnv(grid=chunked_from_grid(dense, chunk_size=4), obs_type="grid")
+        obs, _ = env.reset()
+        expected = dense.tiles.astype(np.int32)
+        expected[dense.start_pos[1], dense.start_pos[0]] = -1
+        np.testing.assert_array_equal(obs, expected)
+        env.grid.set_tile(3, 1, TileType.WALL)
+        assert env.step(0)[0][1, 3] == TileType.WALL.value
+
     def test_reset_seed(self, env):
         """Test that reset accepts seed."""
         obs1, _ = env.reset(seed=42)
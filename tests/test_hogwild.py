@@ -0,0 +1,34 @@
+"""Test Hogwild parallel Q-Learning."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file, generate_maze
+from src.algorithms import QLearning, train_hogwild
+
+
+MAZE = "assets/dungeons/level_03_maze.txt"
+
+
+def test_workers_share_one_table():
+    """All workers' updates land in the learner's Q-table."""
+    grid = generate_maze(11, 11, seed=0)
+    ql = QLearning(grid, epsilon_decay=0.98)
+    stats = train_hogwild(ql, n_episodes=300, max_steps=200, n_workers=2, seed=0, verbose=False)
+
+    assert len(stats['episode_rewards']) == len(stats['episode_steps']) == 300
+    assert [w['n_episodes'] for w in stats['workers']] == [150, 150]
+    assert stats['total_successes'] == sum(w['total_successes'] for w in stats['workers'])
+    assert np.abs(ql.q_table).sum() > 0
+    assert ql.test(n_episodes=1)['success_rate'] == 1.0
+
+
+def test_epsilon_schedule_spans_run():
+    """Each worker decays epsilon over its own share of episodes."""
+    grid = load_grid_from_file(MAZE)
+    ql = QLearning(grid, epsilon_decay=0.99)
+    stats = train_hogwild(ql, n_episodes=100, max_steps=50, n_workers=2, seed=0, verbose=False)
+    assert stats['final_epsilon'] == ql.epsilon
+    assert ql.epsilon == pytest.approx(0.99 ** 100)
@@ -0,0 +1,62 @@
+"""Test that packages load their submodules lazily."""
+import json
+import subprocess
+import sys
+sys.path.insert(0, '.')
+
+import pytest
+
+import src.core
+import src.env
+
+
+HEAVY = ('pygame', 'matplotlib', 'gymnasium', 'multiprocessing')
+
+
+def loaded_after(code):
+    """Run code in a fresh interpreter; return the src and heavy modules it loaded."""
+    script = (
+        "import sys, json; sys.path.insert(0, '.')\n" + code + "\n"
+        f"print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY!r} + ('src',))))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout.splitlines()[-1]))  # pygame prints a banner first
+
+
+def test_algorithms_import_is_headless():
+    """Importing and training Q-Learning never loads display or env libraries."""
+    modules = loaded_after(
+        "import src.algorithms\n"
+        "from src.algorithms import QLearning\n"
+        "from src.core import generate_maze\n"
+        "QLearning(generate_maze(11, 11, seed=0), seed=0).train(5, verbose=False)"
+    )
+    assert not {m for m in modules if m.split('.')[0] in HEAVY}
+    assert 'src.algorithms.q_learning' in modules
+    assert 'src.algorithms.mcts' not in modules and 'src.env' not in modules
+
+
+def test_package_import_loads_no_submodules():
+    """Importing a package alone loads none of its submodules."""
+    modules = loaded_after("import src.core, src.agents, src.algorithms, src.data, src.env, "
+                           "src.experiments, src.sim, src.ui")
+    assert modules <= {'src', 'src.core', 'src.core.lazy', 'src.agents', 'src.algorithms', 'src.data',
+                       'src.env', 'src.experiments', 'src.sim', 'src.ui'}
+
+
+def test_ui_helpers_without_pygame():
+    """The NumPy renderers load without pygame; the pygame renderer loads on use."""
+    assert not any(m.startswith('pygame') for m in loaded_after("from src.ui import ArrayRenderer, Camera"))
+    assert 'pygame' in loaded_after("from src.ui import Renderer")
+
+
+def test_lazy_names():
+    """Exports resolve on first use, show up in dir() and unknown names still fail."""
+    assert src.core.Grid is src.core.grid.Grid
+    assert 'generate_maze' in dir(src.core)
+    # A function sharing its submodule's name resolves to the function
+    assert callable(src.env.replay) and src.env.replay.__module__ == 'src.env.replay'
+    with pytest.raises(AttributeError):
+        src.core.not_a_name
+    for package in (src.core, src.env):
+        assert all(hasattr(package, name) for name in package.__all__)
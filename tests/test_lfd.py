@@ -0,0 +1,77 @@
+"""Test learning from demonstration."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file
+from src.agents import Agent, Action, ACTION_DELTAS
+from src.algorithms import (
+    QLearning, DistanceField, load_demonstrations, pretrain_from_demos, train_with_demos,
+)
+from src.data import TrajectoryRecorder
+
+
+MAZE = "assets/dungeons/level_03_maze.txt"
+
+
+def _record_expert(grid, directory, n_episodes=3):
+    """Record shortest-path episodes as a stand-in for human play."""
+    distances = DistanceField(grid).distances
+    with TrajectoryRecorder(directory, metadata={"dungeon": str(grid)}) as recorder:
+        for _ in range(n_episodes):
+            agent = Agent(*grid.start_pos)
+            done = False
+            while not done:
+                x, y = agent.x, agent.y
+                action = min(Action, key=lambda a: distances[y + ACTION_DELTAS[a][1], x + ACTION_DELTAS[a][0]])
+                reward, done, _ = agent.move(action, grid)
+                recorder.append(x, y, action.value, reward, done, agent.hp, agent.x, agent.y)
+            recorder.end_episode()
+
+
+def test_batch_update_matches_single_update():
+    """Test that a batch of distinct transitions equals sequential updates."""
+    grid = load_grid_from_file(MAZE)
+    a, b = QLearning(grid), QLearning(grid)
+    a.q_table[:] = b.q_table[:] = np.random.default_rng(0).normal(size=a.q_table.shape)
+
+    a.update(1, 1, Action.DOWN, -0.1, 1, 2, False)
+    a.update(4, 4, Action.UP, 100.0, 4, 3, True)
+    b.batch_update(np.array([1, 4]), np.array([1, 4]), np.array([1, 0]), np.array([-0.1, 100.0]),
+                   np.array([1, 4]), np.array([2, 3]), np.array([False, True]))
+    np.testing.assert_allclose(a.q_table, b.q_table)
+
+
+def test_pretraining_clears_maze_greedily(tmp_path):
+    """Test that demo pretraining alone yields a working greedy policy."""
+    grid = load_grid_from_file(MAZE)
+    _record_expert(grid, tmp_path)
+    demos = load_demonstrations(tmp_path, grid=grid)
+    assert len(demos) > 0
+
+    ql = QLearning(grid, seed=0)
+    history = pretrain_from_demos(ql, demos, n_passes=100, seed=0)
+    assert history[-1] < history[0]
+    assert ql.test(n_episodes=1)["success_rate"] == 1.0
+
+
+def test_demos_speed_up_training(tmp_path):
+    """Test that demo pretraining and mixed replay beat learning from scratch."""
+    grid = load_grid_from_file(MAZE)
+    _record_expert(grid, tmp_path)
+    demos = load_demonstrations(tmp_path, grid=grid)
+
+    with_demos = train_with_demos(QLearning(grid, seed=1), demos, n_episodes=100, verbose=False, seed=1)
+    scratch = QLearning(grid, seed=1).train(n_episodes=100, verbose=False)
+
+    assert with_demos["first_success"] is not None
+    assert with_demos["total_successes"] > 2 * scratch["total_successes"]
+
+
+def test_rejects_demos_from_other_dungeon(tmp_path):
+    """Test that mismatched recordings are refused."""
+    _record_expert(load_grid_from_file(MAZE), tmp_path, n_episodes=1)
+    with pytest.raises(ValueError):
+        load_demonstrations(tmp_path, grid=load_grid_from_file("assets/dungeons/level_01_easy.txt"))
@@ -0,0 +1,112 @@
+"""Test the live training publisher and view."""
+import os
+import sys
+import time
+sys.path.insert(0, '.')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+
+from src.core.generator import generate_maze
+from src.algorithms.q_learning import QLearning
+from src.ui.live import SnapshotBoard, LiveTrainer, LiveView
+from src.ui.overlay import heat_tiles, value_levels
+
+
+def collect(trainer, timeout=60.0):
+    """Poll a trainer until it finishes, returning every snapshot seen."""
+    snapshots = []
+    deadline = time.monotonic() + timeout
+    while trainer.running and time.monotonic() < deadline:
+        snapshot = trainer.poll()
+        if snapshot is not None:
+            snapshots.append(snapshot)
+        time.sleep(0.01)
+    snapshot = trainer.poll()
+    if snapshot is not None:
+        snapshots.append(snapshot)
+    return snapshots
+
+
+class TestSnapshotBoard:
+    """Test suite for SnapshotBoard."""
+
+    def test_publish_and_read(self):
+        """Readers see the latest snapshot once, by version."""
+        board = SnapshotBoard(n_states=6, max_steps=10)
+        assert board.read() is None
+
+        q = np.arange(24, dtype=np.float64).reshape(6, 4)
+        trace = np.array([[1, 1, 100], [2, 1, 100]], dtype=np.int32)
+        board.publish(q, trace, {'episode': 3, 'epsilon': 0.5, 'done': False})
+        snapshot = board.read()
+        assert snapshot.version == 1
+        np.testing.assert_array_equal(snapshot.q_table, q)
+        np.testing.assert_array_equal(snapshot.trace, trace)
+        assert snapshot.episode == 3 and snapshot.epsilon == 0.5 and not snapshot.done
+        assert board.read(since=1) is None
+
+        # Snapshots are copies
+        q[:] = 0
+        assert snapshot.q_table.any()
+
+
+class TestLiveTrainer:
+    """Test suite for LiveTrainer."""
+
+    def test_trains_and_publishes(self):
+        """Training runs in the background and snapshots arrive at a bounded rate."""
+        ql = QLearning(generate_maze(11, 11, seed=0), seed=0)
+        trainer = LiveTrainer(ql, n_episodes=300, max_steps=200, publish_hz=20, seed=0)
+        trainer.start()
+        snapshots = collect(trainer)
+        stats = trainer.join()
+
+        assert len(stats['episode_rewards']) == 300
+        assert ql.test(n_episodes=1)['success_rate'] == 1.0
+        assert stats['snapshots'] <= 20 * stats['wall_time'] + 2
+        assert snapshots and snapshots[-1].done and snapshots[-1].episode == 300
+        assert [s.version for s in snapshots] == sorted({s.version for s in snapshots})
+
+        # Traces are real episodes: from the start, one tile per step
+        trace = snapshots[0].trace
+        assert tuple(trace[0, :2]) == ql.grid.start_pos
+        assert np.abs(np.diff(trace[:, :2], axis=0)).sum(axis=1).max() <= 1
+
+    def test_stop_early(self):
+        """stop() ends training after the current episode with a usable result."""
+        ql = QLearning(generate_maze(11, 11, seed=0), seed=0)
+        trainer = LiveTrainer(ql, n_episodes=1_000_000, publish_hz=100, seed=0)
+        trainer.start()
+        while trainer.poll() is None:
+            time.sleep(0.01)
+        trainer.stop()
+        stats = trainer.join()
+        assert 0 < len(stats['episode_rewards']) < 1_000_000
+        assert ql.q_table.any()
+
+
+class TestLiveView:
+    """Test suite for the pygame view (headless)."""
+
+    def test_draw_snapshot(self):
+        """The view draws the heatmap of the latest snapshot."""
+        grid = generate_maze(11, 11, seed=0)
+        board = SnapshotBoard(grid.width * grid.height, max_steps=5)
+        q = np.zeros((grid.width * grid.height, 4))
+        x, y = grid.start_pos
+        q[y * grid.width + x] = [1.0, 0.0, 0.0, 0.0]
+        board.publish(q, np.array([[x, y, 100]], dtype=np.int32), {'episode': 1, 'n_episodes': 10, 'max_hp': 100})
+
+        view = LiveView(grid)
+        try:
+            view.draw()
+            view.update(board.read())
+            view.draw()
+            camera = view.renderer.camera
+            left, top = camera.tile_to_screen(x, y)
+            corner = tuple(view.renderer.screen.get_at((left + 2, top + 2)))[:3]
+            level = value_levels(np.array([0.0, 1.0]))[1]
+            assert corner == tuple(heat_tiles(camera.tile_size)[level, 2, 2])
+        finally:
+            view.close()
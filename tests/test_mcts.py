@@ -0,0 +1,80 @@
+"""Test the MCTS planner."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from src.core import TileType, load_grid_from_string
+from src.env import DungeonEnv
+from src.algorithms import MCTS
+
+
+def test_mcts_clears_easy_and_trap_levels():
+    """Test that planning reaches the goal."""
+    for dungeon in ("assets/dungeons/level_01_easy.txt", "assets/dungeons/level_02_trap.txt"):
+        env = DungeonEnv(dungeon_file=dungeon, max_steps=60)
+        planner = MCTS(env, seed=0, rollout_depth=30)
+        _, _, success = planner.run_episode(n_simulations=300)
+        assert success, dungeon
+
+
+def test_search_restores_env_state():
+    """Test that searching does not move the real agent."""
+    env = DungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt")
+    env.reset()
+    before = env.get_state()
+    MCTS(env, seed=1).search(n_simulations=50)
+    assert env.get_state() == before
+
+
+def test_tree_reuse_and_compaction():
+    """Test that advancing keeps the chosen subtree and compacting preserves it."""
+    env = DungeonEnv(dungeon_file="assets/dungeons/level_03_maze.txt")
+    env.reset()
+    planner = MCTS(env, seed=2, max_nodes=400)
+    action = planner.search(n_simulations=150)
+    child = planner.children[planner.root, action]
+    kept_visits = planner.visits[child]
+
+    env.advance(action)
+    planner.advance(action, env.get_state(include_rng=False))
+    assert planner.visits[planner.root] == kept_visits
+
+    planner._compact()
+    assert planner.root == 0 and planner.visits[0] == kept_visits
+    assert planner.n_nodes <= 400
+    planner.search(n_simulations=500)  # fills capacity and compacts again
+    assert planner.n_nodes <= 400
+
+
+def test_search_with_time_budget():
+    """Test that a time budget alone bounds the search."""
+    env = DungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt")
+    env.reset()
+    planner = MCTS(env, seed=3)
+    planner.search(n_simulations=None, time_budget=0.05)
+    assert planner.visits[planner.root] > 0
+
+
+def test_root_parallel_search():
+    """Test root-parallel search across worker processes."""
+    env = DungeonEnv(dungeon_file="assets/dungeons/level_01_easy.txt")
+    env.reset()
+    planner = MCTS(env, seed=4)
+    try:
+        action = planner.search_parallel(n_workers=2, n_simulations=100)
+    finally:
+        planner.close()
+    assert action in (1, 3)  # DOWN or RIGHT lead toward the goal
+
+
+def test_root_parallel_search_follows_grid_edits():
+    """Test that workers plan on the edited grid and the pool closes on exit."""
+    grid = load_grid_from_string("#######\n#S...G#\n#.###.#\n#.....#\n#######")
+    env = DungeonEnv(grid=grid)
+    env.reset()
+    with MCTS(env, seed=0) as planner:
+        assert planner.search_parallel(n_workers=2, n_simulations=200) == 3  # RIGHT
+        grid.set_tile(2, 1, TileType.WALL)
+        assert planner.search_parallel(n_workers=2, n_simulations=200) != 3
+    assert planner._pool is None
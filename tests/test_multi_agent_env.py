@@ -0,0 +1,89 @@
+"""Test the multi-agent shared-dungeon environment."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from src.core import TileType, chunked_from_grid, load_grid_from_string
+from src.env import MultiAgentDungeonEnv
+
+
+CORRIDOR = """
+#######
+#S...G#
+#######
+"""
+
+
+def _env(**kwargs):
+    return MultiAgentDungeonEnv(grid=load_grid_from_string(CORRIDOR), **kwargs)
+
+
+def test_parallel_api_shapes():
+    """Test reset/step dicts keyed by agent name."""
+    env = MultiAgentDungeonEnv(dungeon_file="assets/dungeons/level_02_trap.txt", n_agents=3)
+    obs, infos = env.reset(seed=0)
+    assert set(obs) == set(env.possible_agents) == set(infos)
+    assert obs["adventurer_0"].shape == env.observation_space("adventurer_0").shape
+
+    actions = {name: env.action_space(name).sample() for name in env.agents}
+    obs, rewards, terms, truncs, infos = env.step(actions)
+    assert set(rewards) == set(terms) == set(truncs) == set(env.possible_agents)
+    assert all(isinstance(r, float) for r in rewards.values())
+
+
+def test_same_target_has_single_winner():
+    """Test that stacked agents moving into one cell are resolved to one mover."""
+    env = _env(n_agents=4)
+    env.reset_arrays(seed=1)
+    _, reward, _, _ = env.step_arrays(np.full(4, 3))  # all RIGHT
+
+    moved = env.batch.x == 2
+    assert moved.sum() == 1
+    np.testing.assert_allclose(reward[~moved], -1.1)
+
+
+def test_blocked_by_staying_agent_and_swaps():
+    """Test that agents cannot walk into a held cell or swap places."""
+    env = _env(n_agents=2)
+    env.reset_arrays(seed=0)
+    env.batch.x[:] = [2, 3]
+
+    env.step_arrays(np.array([3, 2]))  # face each other: swap refused
+    assert env.batch.x.tolist() == [2, 3]
+
+    env.step_arrays(np.array([3, 0]))  # second agent bumps the wall and stays
+    assert env.batch.x.tolist() == [2, 3]
+
+    env.step_arrays(np.array([3, 3]))  # follow the leader
+    assert env.batch.x.tolist() == [3, 4]
+
+
+def test_finished_agents_leave_the_board():
+    """Test termination and removal from the live agent list."""
+    env = _env(n_agents=2)
+    env.reset(seed=0)
+    env.batch.x[:] = [4, 1]
+    _, rewards, terms, _, _ = env.step({"adventurer_0": 3, "adventurer_1": 3})
+
+    assert terms == {"adventurer_0": True, "adventurer_1": False}
+    assert rewards["adventurer_0"] > 90
+    assert env.agents == ["adventurer_1"]
+
+
+def test_no_collisions_allows_overlap():
+    """Test that collision resolution can be disabled."""
+    env = _env(n_agents=5, collisions=False)
+    env.reset_arrays()
+    env.step_arrays(np.full(5, 3))
+    assert (env.batch.x == 2).all()
+
+
+def test_grid_observation_on_chunked_grid():
+    """Grid observations work on a ChunkedGrid and follow edits."""
+    env = MultiAgentDungeonEnv(grid=chunked_from_grid(load_grid_from_string(CORRIDOR), chunk_size=2),
+                               n_agents=2, obs_type="grid")
+    obs = env.reset_arrays(seed=0)
+    assert obs.shape == (2, 3, 7) and obs[0, 1, 1] == -1 and obs[0, 1, 5] == TileType.GOAL.value
+    env.grid.set_tile(3, 1, TileType.TRAP)
+    assert env.step_arrays(np.zeros(2, dtype=np.int64))[0][1, 1, 3] == TileType.TRAP.value
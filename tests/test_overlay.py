@@ -0,0 +1,176 @@
+"""Test the Q-value heatmap and policy arrow overlay."""
+import os
+import struct
+import sys
+import time
+import zlib
+sys.path.insert(0, '.')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file
+from src.core.generator import generate_maze
+from src.core.tiles import TILES, TileType
+from src.ui.atlas import GRID_LINE_COLOR, tile_atlas
+from src.ui.camera import Camera
+from src.ui.overlay import (
+    ARROW_COLOR, COLORMAP, PolicyOverlay, arrow_sprites, heat_tiles, render_overlay,
+    save_overlay_png, value_colors,
+)
+
+
+@pytest.fixture
+def grid():
+    """The 5x5 easy level."""
+    return load_grid_from_file("assets/dungeons/level_01_easy.txt")
+
+
+def policy_q(grid, action):
+    """Q-table that prefers one action everywhere, with values rising along x."""
+    q = np.zeros((grid.width * grid.height, 4))
+    xs = np.tile(np.arange(grid.width), grid.height)
+    q[:, action] = xs + 1.0
+    return q
+
+
+def tile_at(image, x, y, tile_size):
+    """Pixels of one tile in a full-map image."""
+    return image[y * tile_size:(y + 1) * tile_size, x * tile_size:(x + 1) * tile_size]
+
+
+class TestColors:
+    """Test suite for the colormap lookup."""
+
+    def test_value_colors(self):
+        """Low values are red, high values green, the middle yellowish."""
+        colors = value_colors(np.array([-1.0, 0.0, 1.0]))
+        assert colors[0, 0] > colors[0, 1] and colors[2, 1] > colors[2, 0]
+        assert tuple(colors[0]) == tuple(COLORMAP[0]) and tuple(colors[2]) == tuple(COLORMAP[-1])
+        assert value_colors(np.zeros(3)).shape == (3, 3)
+
+    def test_heat_tiles_keep_grid_line(self):
+        """Heat tiles use the colormap inside the atlas's grid line."""
+        tiles = heat_tiles(16)
+        assert tiles.shape == (len(COLORMAP), 16, 16, 3)
+        np.testing.assert_array_equal(tiles[:, 8, 8], COLORMAP)
+        np.testing.assert_array_equal(heat_tiles(48)[:, 0, 0], np.broadcast_to(GRID_LINE_COLOR, (len(COLORMAP), 3)))
+
+
+def test_arrow_sprites_are_rotations():
+    """Sprites for the four actions are rotations of one arrow."""
+    up, down, left, right = arrow_sprites(24)
+    assert up.any() and not up.all()
+    np.testing.assert_array_equal(down, np.rot90(up, 2))
+    np.testing.assert_array_equal(left, np.rot90(up, 1))
+    np.testing.assert_array_equal(right, np.rot90(up, -1))
+    # The tip points the right way
+    rows = np.nonzero(up.any(axis=1))[0]
+    assert rows[0] < 12 - 4 and rows[-1] > 12
+
+
+class TestPolicyOverlay:
+    """Test suite for PolicyOverlay and the full-map export."""
+
+    def test_render_overlay(self, grid):
+        """Passable tiles are heat colored with arrows; walls and the goal have no arrows."""
+        ts = 16
+        image = render_overlay(grid, policy_q(grid, action=3), tile_size=ts)
+        assert image.shape == (grid.height * ts, grid.width * ts, 3)
+
+        # Walls keep their tile image
+        np.testing.assert_array_equal(tile_at(image, 0, 0, ts), tile_atlas(ts)[TileType.WALL.value])
+
+        # Values rise left to right: red on the left, green on the right
+        left, right = tile_at(image, 1, 2, ts)[2, 2], tile_at(image, 3, 2, ts)[2, 2]
+        assert left[0] > left[1] and right[1] > right[0]
+
+        # RIGHT arrows on open tiles, none on the (terminal) goal
+        expected = arrow_sprites(ts)[3]
+        np.testing.assert_array_equal((tile_at(image, 2, 2, ts) == ARROW_COLOR).all(axis=2), expected)
+        assert not (tile_at(image, 3, 3, ts) == ARROW_COLOR).all(axis=2).any()
+
+    def test_unlearned_and_small_tiles_have_no_arrows(self, grid):
+        """Zero Q-values and tiny tiles draw no arrows."""
+        image = render_overlay(grid, np.zeros((grid.width * grid.height, 4)), tile_size=16)
+        assert not (image == ARROW_COLOR).all(axis=2).any()
+        image = render_overlay(grid, policy_q(grid, action=0), tile_size=4)
+        assert not (image == ARROW_COLOR).all(axis=2).any()
+
+    def test_camera_render_matches_full_map(self):
+        """Through a scrolled camera the overlay crops like the plain map."""
+        grid = generate_maze(31, 31, seed=0)
+        overlay = PolicyOverlay(grid, policy_q(grid, action=1))
+        full = render_overlay(grid, policy_q(grid, action=1), tile_size=12)
+        camera = Camera(grid.width, grid.height, 100, 90, tile_size=12)
+        camera.look_at(20, 9)
+        view = camera.render(grid, draw=overlay)
+        ox, oy = camera.origin
+        np.testing.assert_array_equal(view, full[oy:oy + 90, ox:ox + 100])
+
+    def test_large_map_is_fast(self):
+        """A 50x50 map renders well within a frame budget."""
+        grid = generate_maze(51, 51, seed=0)
+        q = np.random.default_rng(0).random((grid.width * grid.height, 4))
+        render_overlay(grid, q, tile_size=16)
+        started = time.perf_counter()
+        render_overlay(grid, q, tile_size=16)
+        assert time.perf_counter() - started < 0.5
+
+
+def test_save_overlay_png(grid, tmp_path):
+    """The PNG export holds exactly the rendered overlay."""
+    q = policy_q(grid, action=2)
+    save_overlay_png(tmp_path / "q.png", grid, q, tile_size=8)
+    data = (tmp_path / "q.png").read_bytes()
+    width, height = struct.unpack('>II', data[16:24])
+    assert (width, height) == (grid.width * 8, grid.height * 8)
+    idat = data.index(b'IDAT')
+    length = struct.unpack('>I', data[idat - 4:idat])[0]
+    rows = np.frombuffer(zlib.decompress(data[idat + 4:idat + 4 + length]), dtype=np.uint8).reshape(height, -1)
+    np.testing.assert_array_equal(rows[:, 1:].reshape(height, width, 3), render_overlay(grid, q, tile_size=8))
+
+
+class TestRendererOverlay:
+    """Test suite for the overlay in the pygame renderer (headless)."""
+
+    def test_set_values_and_toggle(self, grid):
+        """set_values draws the heatmap; toggling restores the plain map."""
+        from src.ui.renderer import Renderer
+
+        renderer = Renderer(grid)
+        try:
+            ts = renderer.camera.tile_size
+            left, top = renderer.camera.tile_to_screen(2, 2)
+            plain = tuple(TILES.color[TileType.EMPTY.value])
+
+            renderer.render_grid()
+            assert tuple(renderer.screen.get_at((left + 2, top + 2)))[:3] == plain
+
+            q = policy_q(grid, action=3)
+            renderer.set_values(q)
+            renderer.render_grid()
+            pixels = render_overlay(grid, q, tile_size=ts)
+            assert tuple(renderer.screen.get_at((left + 2, top + 2)))[:3] == tuple(tile_at(pixels, 2, 2, ts)[2, 2])
+
+            renderer.toggle_overlay()
+            renderer.render_grid()
+            assert tuple(renderer.screen.get_at((left + 2, top + 2)))[:3] == plain
+        finally:
+            renderer.close()
+
+    def test_edits_keep_overlay(self, grid):
+        """Tiles edited under an overlay are repainted through it."""
+        from src.ui.renderer import Renderer
+
+        renderer = Renderer(grid)
+        try:
+            renderer.set_values(policy_q(grid, action=3))
+            renderer.render_grid()
+            grid.set_tile(2, 2, TileType.WALL)
+            renderer.render_grid()
+            left, top = renderer.camera.tile_to_screen(2, 2)
+            assert tuple(renderer.screen.get_at((left + 2, top + 2)))[:3] == tuple(TILES.color[TileType.WALL.value])
+        finally:
+            renderer.close()
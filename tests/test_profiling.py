@@ -0,0 +1,107 @@
+"""Test the hot-path profiler and the CLI's --profile mode."""
+import sys
+sys.path.insert(0, '.')
+
+import pstats
+
+from src.cli import main
+from src.core import load_grid_from_file
+from src.core.generator import generate_maze
+from src.core.profiling import Profiler, profile_call, subsystem, subsystem_report
+from src.algorithms.q_learning import QLearning
+from src.env.dungeon_env import DungeonEnv
+
+
+EASY = "assets/dungeons/level_01_easy.txt"
+
+
+class TestProfiler:
+    """Test suite for Profiler bookkeeping."""
+
+    def test_sampling_and_estimates(self):
+        """One pass in sample_every is timed and totals are extrapolated."""
+        profiler = Profiler(sample_every=4)
+        timed = [profiler.sample('loop') for _ in range(12)]
+        assert timed.count(True) == 3 and timed[3] and not timed[0]
+        for _ in range(3):
+            profiler.record('loop', fast=0.001, slow=0.003)
+        profiler.count('events', 5)
+
+        summary = profiler.summary()
+        assert summary['counters'] == {'events': 5}
+        slow, fast = summary['phases']
+        assert (slow['phase'], fast['phase']) == ('slow', 'fast')
+        assert abs(slow['mean_us'] - 3000) < 1e-6
+        assert abs(slow['total_s'] - 0.036) < 1e-9
+        assert abs(slow['share'] - 0.75) < 1e-9
+        assert 'loop/slow' in profiler.report()
+
+        profiler.reset()
+        assert profiler.summary() == {'counters': {}, 'phases': []}
+
+
+class TestInstrumentation:
+    """Test suite for the QLearning and DungeonEnv hooks."""
+
+    def test_q_learning_counters(self):
+        """Steps, episodes and wall bumps are counted exactly."""
+        ql = QLearning(generate_maze(11, 11, seed=0), seed=0)
+        ql.profiler = Profiler(sample_every=1)
+        stats = ql.train(n_episodes=20, max_steps=100, verbose=False)
+        counters = ql.profiler.summary()['counters']
+        assert counters['q_learning.episodes'] == 20
+        assert counters['q_learning.steps'] == sum(stats['episode_steps'])
+        assert 0 < counters['q_learning.wall_bumps'] < counters['q_learning.steps']
+        phases = {p['phase'] for p in ql.profiler.summary()['phases']}
+        assert phases == {'select_action', 'move', 'callbacks', 'update'}
+
+    def test_profiler_does_not_change_training(self):
+        """An attached profiler leaves the learned values unchanged."""
+        grid = generate_maze(11, 11, seed=0)
+        plain = QLearning(grid, seed=0)
+        plain.train(n_episodes=30, max_steps=100, verbose=False)
+        profiled = QLearning(grid, seed=0)
+        profiled.profiler = Profiler()
+        profiled.train(n_episodes=30, max_steps=100, verbose=False)
+        assert (plain.q_table == profiled.q_table).all()
+
+    def test_env_counters(self):
+        """The environment counts steps, bumps and resets and times step phases."""
+        env = DungeonEnv(EASY)
+        env.profiler = Profiler(sample_every=2)
+        env.reset(seed=0)
+        for action in (0, 2, 1, 3):  # UP and LEFT bump the wall at the start
+            env.step(action)
+        env.reset()
+        summary = env.profiler.summary()
+        assert summary['counters'] == {'env.resets': 2, 'env.steps': 4, 'env.wall_bumps': 2}
+        assert {p['phase'] for p in summary['phases']} == {'move', 'get_obs', 'get_info'}
+        assert all(p['samples'] == 2 for p in summary['phases'])
+
+
+def test_subsystem_report():
+    """cProfile output is grouped by package."""
+    assert subsystem('/repo/src/algorithms/q_learning.py') == 'src.algorithms'
+    assert subsystem('/usr/lib/python3/site-packages/numpy/core/fromnumeric.py') == 'numpy'
+    assert subsystem('~') == 'builtins'
+    assert subsystem('/usr/lib/python3.11/random.py') == 'stdlib'
+
+    ql = QLearning(load_grid_from_file(EASY), seed=0)
+    stats, profile = profile_call(ql.train, n_episodes=20, verbose=False)
+    assert len(stats['episode_rewards']) == 20
+    assert isinstance(profile, pstats.Stats)
+    report = subsystem_report(profile, top=5)
+    assert 'src.algorithms' in report
+    assert len(report.split('\n\n')[1].splitlines()) == 6
+    assert 'run_episode' in subsystem_report(profile, top=1000)
+
+
+def test_cli_profile(tmp_path):
+    """train --profile writes the phase and subsystem report and raw stats."""
+    code = main(["train", EASY, "--out", str(tmp_path), "--episodes", "20", "--test-episodes", "1",
+                 "--seed", "0", "--workers", "1", "--profile", "--quiet"])
+    assert code == 0
+    target = tmp_path / "level_01_easy"
+    text = (target / "profile.txt").read_text()
+    assert "q_learning.step/update" in text and "q_learning.steps" in text and "src.algorithms" in text
+    assert pstats.Stats(str(target / "profile.pstats")).total_calls > 0
@@ -0,0 +1,78 @@
+"""Test the cached-background pygame renderer (headless)."""
+import os
+import sys
+sys.path.insert(0, '.')
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+import pytest
+
+from src.core import load_grid_from_file, TileType, TILES
+from src.ui.renderer import Renderer, TILE_SIZE
+
+
+@pytest.fixture
+def renderer():
+    """Renderer on the easy level with the agent at the start."""
+    grid = load_grid_from_file("assets/dungeons/level_01_easy.txt")
+    renderer = Renderer(grid)
+    renderer.set_agent(*grid.start_pos)
+    yield renderer
+    renderer.close()
+
+
+def tile_pixel(surface, x, y):
+    """Color at the center of a tile."""
+    return tuple(surface.get_at((x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2)))[:3]
+
+
+class TestRenderer:
+    """Test suite for background caching and dirty rectangles."""
+
+    def test_background_matches_tiles(self, renderer):
+        """Every tile center has its color and tile corners have the grid line."""
+        grid = renderer.grid
+        background = renderer.background
+        for y in range(grid.height):
+            for x in range(grid.width):
+                assert tile_pixel(background, x, y) == tuple(TILES.color[grid.tile_id(x, y)])
+        assert tuple(background.get_at((0, 0)))[:3] == (200, 200, 200)
+
+    def test_background_is_cached(self, renderer):
+        """The background is built once and reused."""
+        assert renderer.background is renderer.background
+
+    def test_first_frame_is_full(self, renderer):
+        """The first frame and frames after invalidate() cover the whole map."""
+        rects = renderer.render_dirty()
+        assert rects == [pygame.Rect(0, 0, renderer.window_width, renderer.window_height)]
+        renderer.invalidate()
+        assert len(renderer.render_dirty()) == 1
+
+    def test_move_updates_two_tiles(self, renderer):
+        """Moving the agent redraws only the tile it left and the one it entered."""
+        renderer.render_dirty()
+        x, y = renderer.agent_pos
+        renderer.set_agent(x + 1, y)
+        rects = renderer.render_dirty()
+        assert sorted(r.topleft for r in rects) == sorted(
+            [(x * TILE_SIZE, y * TILE_SIZE), ((x + 1) * TILE_SIZE, y * TILE_SIZE)])
+        assert tile_pixel(renderer.screen, x, y) == tuple(TILES.color[renderer.grid.tile_id(x, y)])
+
+    def test_edit_patches_background(self, renderer):
+        """A tile edit is painted into the background and reported as dirty."""
+        renderer.render_dirty()
+        background = renderer.background
+        renderer.grid.set_tile(2, 2, TileType.TRAP)
+        rects = renderer.render_dirty()
+        assert renderer.background is background
+        assert tile_pixel(background, 2, 2) == tuple(TILES.color[TileType.TRAP.value])
+        assert tile_pixel(renderer.screen, 2, 2) == tuple(TILES.color[TileType.TRAP.value])
+        assert pygame.Rect(2 * TILE_SIZE, 2 * TILE_SIZE, TILE_SIZE, TILE_SIZE) in rects
+
+    def test_render(self, renderer):
+        """The full render path runs headless."""
+        renderer.render()
+        renderer.render()
+        assert np.any(pygame.surfarray.pixels3d(renderer.screen))
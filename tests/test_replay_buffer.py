@@ -0,0 +1,174 @@
+"""Test uniform and prioritized replay buffers."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file
+from src.agents import Action
+from src.algorithms import (
+    QLearning, ReplayBuffer, PrioritizedReplayBuffer, SumTree, tabular_replay,
+)
+
+
+SIMPLE = "assets/dungeons/level_01_easy.txt"
+
+
+class TestReplayBuffer:
+    """Uniform ring buffer."""
+
+    def test_add_and_wraparound(self):
+        """Oldest transitions are overwritten once full."""
+        buffer = ReplayBuffer(4)
+        for i in range(6):
+            buffer.add(i, 0, float(i), i + 1, False)
+        assert len(buffer) == 4
+        assert sorted(buffer.obs.tolist()) == [2, 3, 4, 5]
+
+    def test_add_batch_matches_add(self):
+        """Batch insertion lays out slots like repeated add()."""
+        a, b = ReplayBuffer(5, obs_shape=(2,)), ReplayBuffer(5, obs_shape=(2,))
+        obs = np.arange(14).reshape(7, 2)
+        for i in range(7):
+            a.add(obs[i], i % 4, float(i), obs[i] + 1, i == 6)
+        b.add_batch(obs[:3], np.arange(3) % 4, np.arange(3.0), obs[:3] + 1, np.zeros(3, bool))
+        b.add_batch(obs[3:], np.arange(3, 7) % 4, np.arange(3.0, 7.0), obs[3:] + 1, np.arange(3, 7) == 6)
+        for name in ('obs', 'action', 'reward', 'next_obs', 'done'):
+            assert np.array_equal(getattr(a, name), getattr(b, name))
+
+    def test_sample_only_filled_slots(self):
+        """Sampling never returns unfilled slots."""
+        buffer = ReplayBuffer(100, seed=0)
+        buffer.add_batch(np.arange(10), np.zeros(10), np.ones(10), np.arange(10), np.zeros(10, bool))
+        batch = buffer.sample(500)
+        assert batch.indices.max() < 10
+        assert np.all(batch.weights == 1.0)
+
+    def test_empty_sample_raises(self):
+        """Sampling an empty buffer is an error."""
+        with pytest.raises(ValueError):
+            ReplayBuffer(8).sample(1)
+
+
+class TestSumTree:
+    """Sum tree priorities and lookups."""
+
+    def test_total_and_find(self):
+        """Prefix-sum lookups land in the right leaf."""
+        tree = SumTree(5)
+        tree.update(np.arange(5), np.array([1.0, 2.0, 0.0, 3.0, 4.0]))
+        assert tree.total == pytest.approx(10.0)
+        leaves = tree.find(np.array([0.5, 1.5, 2.9, 3.0, 5.9, 6.0, 9.99]))
+        assert leaves.tolist() == [0, 1, 1, 3, 3, 4, 4]
+
+    def test_find_near_total_skips_empty_leaves(self):
+        """Rounding near the total never lands past the filled leaves."""
+        rng = np.random.default_rng(0)
+        for _ in range(2000):
+            capacity = int(rng.integers(2, 300))
+            size = int(rng.integers(1, capacity + 1))
+            tree = SumTree(capacity)
+            tree.update(np.arange(size), rng.random(size) + 1e-6)
+            assert tree.find([np.nextafter(tree.total, 0)])[0] < size
+
+    def test_repeated_updates(self):
+        """Duplicate indices in one update keep the tree consistent."""
+        tree = SumTree(8)
+        tree.update(np.array([1, 1, 6]), np.array([5.0, 2.0, 3.0]))
+        assert tree.total == pytest.approx(tree.get(np.arange(8)).sum())
+
+
+class TestPrioritizedReplay:
+    """Proportional prioritized replay."""
+
+    def test_sampling_follows_priorities(self):
+        """High-priority transitions are drawn more often."""
+        buffer = PrioritizedReplayBuffer(4, alpha=1.0, seed=0)
+        buffer.add_batch(np.arange(4), np.zeros(4), np.zeros(4), np.arange(4), np.zeros(4, bool))
+        buffer.update_priorities(np.arange(4), np.array([1.0, 1.0, 1.0, 7.0]))
+        counts = np.bincount(buffer.sample_indices(10_000), minlength=4)
+        assert counts[3] / counts.sum() == pytest.approx(0.7, abs=0.02)
+
+    def test_weights_correct_bias(self):
+        """Rarely sampled transitions get the largest IS weights."""
+        buffer = PrioritizedReplayBuffer(4, alpha=1.0, beta=1.0, seed=0)
+        buffer.add_batch(np.arange(4), np.zeros(4), np.zeros(4), np.arange(4), np.zeros(4, bool))
+        buffer.update_priorities(np.arange(4), np.array([1.0, 1.0, 1.0, 7.0]))
+        batch = buffer.sample(64)
+        assert batch.weights.max() == pytest.approx(1.0)
+        assert np.all(batch.weights[batch.indices == 3] < batch.weights[batch.indices == 0].min())
+
+    def test_sample_near_total_stays_in_filled_slots(self):
+        """A draw at the top of the last stratum keeps weights finite."""
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            buffer = PrioritizedReplayBuffer(300, seed=0)
+            size = int(rng.integers(1, 300))
+            buffer.add_batch(np.arange(size), np.zeros(size), np.zeros(size), np.arange(size), np.zeros(size, bool))
+            buffer.update_priorities(np.arange(size), rng.random(size) * 10)
+            buffer.rng = _TopOfStratum()
+            batch = buffer.sample(8)
+            assert batch.indices.max() < len(buffer)
+            assert np.isfinite(batch.weights).all()
+
+    def test_new_transitions_get_max_priority(self):
+        """Fresh transitions are sampled at least once before decaying."""
+        buffer = PrioritizedReplayBuffer(8, seed=0)
+        buffer.add(0, 0, 0.0, 0, False)
+        buffer.update_priorities(np.array([0]), np.array([10.0]))
+        i = buffer.add(1, 0, 0.0, 1, False)
+        assert buffer.tree.get([i])[0] == pytest.approx(buffer.max_priority)
+
+
+class TestTabularReplay:
+    """Replayed TD updates for Q-Learning."""
+
+    def _fill(self, buffer, grid):
+        ql = QLearning(grid, seed=0)
+        ql.train(n_episodes=20, max_steps=50, verbose=False, recorder=_Collector(buffer))
+        return ql
+
+    def test_state_index_and_position_obs(self):
+        """Both observation layouts replay into the same Q-table cells."""
+        grid = load_grid_from_file(SIMPLE)
+        x, y = grid.start_pos
+        by_index = ReplayBuffer(8, seed=0)
+        by_pos = ReplayBuffer(8, obs_shape=(2,), seed=0)
+        by_index.add(y * grid.width + x, Action.RIGHT.value, 5.0, y * grid.width + x + 1, True)
+        by_pos.add((x, y), Action.RIGHT.value, 5.0, (x + 1, y), True)
+        a, b = QLearning(grid, seed=0), QLearning(grid, seed=0)
+        tabular_replay(a, by_index, batch_size=4)
+        tabular_replay(b, by_pos, batch_size=4)
+        assert np.array_equal(a.q_table, b.q_table)
+        assert a.q_table[a.state_to_index(x, y), Action.RIGHT.value] > 0
+
+    def test_prioritized_updates_priorities(self):
+        """Replaying from a prioritized buffer refreshes sampled priorities."""
+        grid = load_grid_from_file(SIMPLE)
+        buffer = PrioritizedReplayBuffer(5000, obs_shape=(2,), seed=0)
+        ql = self._fill(buffer, grid)
+        before = buffer.tree.total
+        tabular_replay(ql, buffer, batch_size=64, n_batches=10)
+        assert buffer.tree.total != before
+        assert buffer.tree.total == pytest.approx(buffer.tree.get(np.arange(len(buffer))).sum())
+
+
+class _TopOfStratum:
+    """RNG stand-in whose draws sit just below the top of every stratum."""
+
+    def random(self, n):
+        return np.full(n, np.nextafter(1.0, 0))
+
+
+class _Collector:
+    """Recorder adapter that feeds a replay buffer."""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def append(self, x, y, action, reward, done, hp, next_x, next_y):
+        self.buffer.add((x, y), action, reward, (next_x, next_y), done)
+
+    def end_episode(self):
+        pass
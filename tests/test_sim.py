@@ -0,0 +1,185 @@
+"""Test the headless balance simulator and the Monte Carlo runner."""
+import json
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.cli import main
+from src.core import TILES, load_grid_from_string, register_browser_tiles
+from src.sim.balance import run_balance, summarize
+from src.sim.config import DUNGEON_ORDER, load_dungeon, operating_cost
+from src.sim.run_state import RunState
+from src.sim.simulator import (
+    Decision, GameSimulator, HpQLearning, estimate_manual_cost, find_path, manual_success_rate,
+)
+from src.sim.strategies import STRATEGIES, HybridPlayer, StraightForward
+
+
+SHORT = DUNGEON_ORDER[:3]
+
+
+class TestRules:
+    """Test suite for the economy rules ported from the browser game."""
+
+    def test_browser_dungeons(self):
+        """Every dungeon in the unlock order loads from the game's source."""
+        for dungeon in DUNGEON_ORDER:
+            grid = load_dungeon(dungeon)
+            assert grid.start_pos is not None and grid.goal_pos is not None
+        with pytest.raises(KeyError):
+            load_dungeon('level_99_missing')
+
+    def test_operating_cost(self):
+        """Base cost scaled by the square root of the level, rounded up."""
+        assert operating_cost('qkun', 'level_01_easy') == 3
+        assert operating_cost('qkun', 'level_04_pit') == 6
+        assert operating_cost('ensemble', 'level_10_final') == 26
+        assert operating_cost('unknown', 'level_01_easy') == 10
+
+    def test_characters_and_upgrades(self):
+        """Story characters join with their chapter; upgrades cost gold and raise stats."""
+        run = RunState()
+        assert run.is_character_available('qkun') and not run.is_character_available('sarsa')
+        assert run.is_character_locked('sarsa') and not run.is_character_locked('scout')
+        run.unlocked.add('level_04_pit')
+        assert run.current_chapter() == 2 and run.is_character_available('sarsa')
+
+        assert run.upgrade('sarsa') and run.upgrade('sarsa') and not run.upgrade('sarsa')
+        assert run.gold == 800 - 300
+        assert (run.strength('sarsa'), run.max_hp('sarsa')) == (120, 120)
+        assert run.hire('gradi') and run.gold == 300 and not run.hire('gradi')
+
+    def test_farming_and_maps(self):
+        """Kept maps pay triple for a few runs; sold maps pay a tenth up front."""
+        run = RunState()
+        assert not run.assign_farming('qkun', 'level_01_easy')
+        assert run.record_clear('level_01_easy') and 'level_02_trap' in run.unlocked
+        assert not run.record_clear('level_01_easy')
+        assert run.gold == 800 + 100 + 10
+
+        run.record_answer_path('level_01_easy', [1, 1, 3, 3], 4, 'qkun')
+        assert not run.record_answer_path('level_01_easy', [1] * 6, 6, 'qkun')
+        run.keep_map('level_01_easy')
+        assert run.assign_farming('qkun', 'level_01_easy')
+        earned = [run.execute_farming('qkun') for _ in range(6)]
+        assert earned == [30, 30, 30, 30, 10, 10]
+        assert run.map_status['level_01_easy'].status == 'normal'
+        assert run.sell_map('level_02_trap') == 3 * 15 * 4 // 10
+
+
+class TestManualPlay:
+    """Test suite for the HP-aware path search and the manual play model."""
+
+    def test_find_path_avoids_pits_and_death(self):
+        """The path detours around pits and refuses deadly monster gauntlets."""
+        register_browser_tiles()
+        path, hp = find_path(load_grid_from_string("#####\n#SPG#\n#...#\n#####"), 100)
+        assert len(path) - 1 == 4 and hp == 100 and path[0] == (1, 1) and path[-1] == (3, 1)
+        assert find_path(load_grid_from_string("#######\n#SMMMMG\n#######"), 100) is None
+        path, hp = find_path(load_grid_from_string("######\n#SMMMG\n######"), 100)
+        assert hp == 10
+
+    def test_success_rate(self):
+        """Long, damaging and slippery paths are harder; odds stay in [5%, 95%]."""
+        assert manual_success_rate(10, 0, False) == 0.95
+        assert manual_success_rate(30, 20, False) == pytest.approx(0.95 - 0.02 - 0.06)
+        assert manual_success_rate(30, 20, True) == pytest.approx((0.95 - 0.08) * 0.4)
+        assert manual_success_rate(500, 90, True) == 0.05
+
+        cost = estimate_manual_cost(load_dungeon('level_01_easy'))
+        assert (cost.steps, cost.human_steps, cost.gold_cost) == (4, 6, 6)
+
+
+class TestSimulator:
+    """Test suite for GameSimulator playthroughs."""
+
+    def test_playthrough_is_seeded(self):
+        """The same seed replays the same game; training leaves the grids intact."""
+        sim = GameSimulator(StraightForward(), seed=3, dungeons=SHORT)
+        before = {d: (sim.grid(d).tiles.copy(), sim.grid(d).version) for d in SHORT}
+        stats = sim.run_playthrough()
+        assert stats['cleared'] == 3 and stats['training_cost'] > 0
+        assert [c['dungeon'] for c in stats['cleared_order']] == list(SHORT)
+        assert all((sim.grid(d).tiles == before[d][0]).all() and sim.grid(d).version == before[d][1]
+                   for d in SHORT)
+        assert GameSimulator(StraightForward(), seed=3, dungeons=SHORT).run_playthrough() == stats
+
+    def test_hybrid_plays_by_hand(self):
+        """HybridPlayer buys food and clears the small dungeons manually."""
+        sim = GameSimulator(HybridPlayer(), seed=0, dungeons=SHORT)
+        stats = sim.run_playthrough()
+        assert stats['cleared'] == 3 and stats['manual_clears'] == 3 and stats['training_cost'] == 0
+        assert [e['type'] for e in sim.log[:3]] == ['buy_food', 'manual', 'map_keep']
+        assert sim.run_state.answer_paths['level_01_easy'].character == 'player'
+
+    def test_hp_state_training(self):
+        """HP dungeons train on (position, HP bucket) states."""
+        grid = load_dungeon('level_12_hp_gauntlet')
+        ql = HpQLearning(grid, seed=0)
+        assert ql.q_table.shape == (grid.width * grid.height * 5, 4)
+        assert ql.hp_state_index(1, 1, 100) == ql.hp_state_index(1, 1, 80) == 4 * ql.n_states + 4
+        assert ql.hp_state_index(1, 1, 19) == 4 and ql.hp_state_index(1, 1, 20) == ql.n_states + 4
+        ql.run_episode(50)
+        assert ql.q_table[4 * ql.n_states:].any()
+
+        sim = GameSimulator(StraightForward(), seed=0, dungeons=('level_12_hp_gauntlet',))
+        sim.run_state.unlocked.add('level_12_hp_gauntlet')
+        assert sim.train_dungeon('level_12_hp_gauntlet', 'qkun')['episodes'] > 0
+
+    def test_hp_dungeon_converges(self):
+        """Heal tiles pay nothing, as in the browser, so an HP dungeon trains to convergence."""
+        grid = load_dungeon('level_11_hp_test')
+        heal = grid.get_tile(1, 2)
+        assert heal == register_browser_tiles()['BROWSER_HEAL'] and TILES.rows[heal.value][1:3] == (0.0, 10)
+
+        sim = GameSimulator(StraightForward(), seed=0, dungeons=('level_22_arena',))
+        stats = sim.run_playthrough()
+        assert stats['cleared'] == 1 and not stats['bottlenecks']
+        assert sim.log[0]['type'] == 'train' and sim.log[0]['converged']
+
+    def test_unknown_decision(self):
+        """A decision the simulator does not know is an error."""
+        class Broken:
+            def decide(self, state):
+                return Decision('teleport')
+        with pytest.raises(ValueError):
+            GameSimulator(Broken(), seed=0, dungeons=SHORT).execute_turn()
+
+
+def test_balance_pool_matches_serial():
+    """Runs are seeded per index, so the pool returns the serial results in order."""
+    serial = run_balance('StraightForward', 3, seed=5, workers=1, dungeons=DUNGEON_ORDER[:2])
+    pooled = run_balance('StraightForward', 3, seed=5, workers=2, dungeons=DUNGEON_ORDER[:2])
+    assert pooled == serial
+    with pytest.raises(ValueError):
+        run_balance('Nobody', 1)
+
+
+def test_summarize():
+    """Means, percentiles, chapter progression, bottlenecks and the gold curve."""
+    def result(turns, gold):
+        return {'cleared': 2, 'total_dungeons': 3 if turns > 20 else 2, 'total_turns': turns, 'total_steps': 0,
+                'final_gold': gold, 'training_cost': 0, 'farming_income': 0, 'manual_attempts': 0,
+                'manual_clears': 0, 'manual_failures': 0, 'food_used': 0, 'chapter_turns': {1: turns // 2},
+                'bottlenecks': [{'dungeon': 'level_02_trap', 'reason': 'never_converged'}],
+                'gold_history': [(t, gold) for t in range(1, turns + 1)]}
+
+    results = [result(turns, gold) for turns, gold in ((10, 100), (20, 200), (30, 300), (40, 400))]
+    summary = summarize(results)
+    assert summary['clear_rate'] == 0.5
+    turns = summary['metrics']['total_turns']
+    assert turns['mean'] == 25 and turns['p50'] == 25 and turns['p10'] == np.percentile([10, 20, 30, 40], 10)
+    assert summary['chapters'] == {1: {'reached': 4, 'median_turn': 12.5}}
+    assert summary['bottlenecks'] == [{'dungeon': 'level_02_trap', 'reason': 'never_converged', 'runs': 4}]
+    assert summary['gold_curve'] == {10: 250.0}
+
+
+def test_cli_balance(tmp_path):
+    """balance runs every strategy and writes the summaries as JSON."""
+    out = tmp_path / "balance.json"
+    assert main(["balance", "--runs", "2", "--dungeons", "2", "--workers", "1", "--out", str(out), "--quiet"]) == 0
+    data = json.loads(out.read_text())
+    assert set(data['strategies']) == set(STRATEGIES)
+    assert data['dungeons'] == list(DUNGEON_ORDER[:2])
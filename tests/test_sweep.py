@@ -0,0 +1,100 @@
+"""Test hyperparameter sweeps and the result store."""
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+import pytest
+
+from src.experiments import SweepSpec, ResultStore, run_sweep, aggregate, format_table, config_key
+
+
+EASY = "assets/dungeons/level_01_easy.txt"
+
+
+def _spec(**kwargs):
+    defaults = dict(
+        dungeons=[EASY],
+        params={"alpha": [0.1, 0.5], "epsilon_decay": [0.9]},
+        seeds=[0, 1],
+        fixed={"n_episodes": 40, "max_steps": 50},
+    )
+    defaults.update(kwargs)
+    return SweepSpec(**defaults)
+
+
+class TestSweepSpec:
+    """Expanding specs into run configurations."""
+
+    def test_grid_product(self):
+        """Grid search crosses params, dungeons and seeds."""
+        configs = list(_spec().configs())
+        assert len(configs) == 4
+        assert {(c['alpha'], c['seed']) for c in configs} == {(0.1, 0), (0.1, 1), (0.5, 0), (0.5, 1)}
+        assert all(c['n_episodes'] == 40 and c['dungeon'] == EASY for c in configs)
+
+    def test_random_is_reproducible(self):
+        """Random search samples the same configs for the same seed."""
+        params = {"alpha": {"low": 0.01, "high": 1.0, "log": True}, "max_steps": {"low": 50, "high": 300, "int": True}}
+        a = _spec(mode="random", params=params, n_samples=5).param_sets()
+        b = _spec(mode="random", params=params, n_samples=5).param_sets()
+        assert a == b
+        assert all(0.01 <= p['alpha'] <= 1.0 and isinstance(p['max_steps'], int) for p in a)
+
+    def test_load_expands_directories(self, tmp_path):
+        """Dungeon directories in a JSON spec expand to their files."""
+        path = tmp_path / "spec.json"
+        path.write_text(json.dumps({"dungeons": ["assets/dungeons"], "params": {"alpha": [0.1]}}))
+        spec = SweepSpec.load(path)
+        assert EASY in spec.dungeons and len(spec.dungeons) >= 3
+
+
+class TestResultStore:
+    """Append-only JSON Lines store."""
+
+    def test_ignores_partial_line(self, tmp_path):
+        """A run cut off mid-write does not break reloading."""
+        store = ResultStore(tmp_path / "runs.jsonl")
+        store.append({"key": "a"})
+        with open(store.path, "a") as f:
+            f.write('{"key": "b", "succ')
+        assert store.completed() == {"a"}
+        store.append({"key": "c"})
+        assert store.completed() == {"a", "c"}
+        assert store.path.read_text().count('\n') == 2
+
+
+class TestRunSweep:
+    """Running sweeps on a process pool."""
+
+    def test_resume_skips_completed(self, tmp_path):
+        """Restarting a sweep only runs missing configurations."""
+        spec = _spec()
+        store = ResultStore(tmp_path / "runs.jsonl")
+        first = run_sweep(spec, store, n_workers=2, verbose=False)
+        assert len(first) == 4
+        assert store.completed() == {config_key(c) for c in spec.configs()}
+
+        spec.seeds = [0, 1, 2]
+        second = run_sweep(spec, store, n_workers=2, verbose=False)
+        assert {r['config']['seed'] for r in second} == {2}
+        assert len(store.records()) == 6
+
+    def test_failed_run_keeps_the_rest(self, tmp_path):
+        """A run that raises is skipped; every other result is stored."""
+        spec = _spec(dungeons=[EASY, str(tmp_path / "missing.txt")])
+        store = ResultStore(tmp_path / "runs.jsonl")
+        records = run_sweep(spec, store, n_workers=2, verbose=False)
+        assert len(records) == 4 and all(r['config']['dungeon'] == EASY for r in records)
+        assert len(store.records()) == 4
+
+    def test_aggregate_table(self, tmp_path):
+        """Aggregates group runs across seeds."""
+        store = ResultStore(tmp_path / "runs.jsonl")
+        run_sweep(_spec(), store, n_workers=2, verbose=False)
+        rows = aggregate(store.records())
+        assert len(rows) == 2
+        assert all(row['runs'] == 2 for row in rows)
+        assert rows[0]['success_rate'] == pytest.approx(1.0)
+        table = format_table(rows)
+        assert 'success_rate' in table and len(table.splitlines()) == 4
@@ -0,0 +1,59 @@
+"""Test the tile registry and its compiled lookup tables."""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import (
+    TileType, TileRegistry, TILES, char_to_tile, tile_to_char,
+    register_browser_tiles, load_grid_from_string,
+)
+from src.agents import Agent, Action
+
+
+def test_builtin_tables_match_tile_types():
+    """Test that built-in tiles keep their ids and properties."""
+    for tile in TileType:
+        assert TILES.tile(tile.value) is tile
+        assert char_to_tile(tile_to_char(tile)) is tile
+    assert not TILES.passable[TileType.WALL.value]
+    assert TILES.reward[TileType.GOAL.value] == 100
+    assert TILES.terminal[TileType.GOAL.value]
+    assert TILES.hp_delta[TileType.TRAP.value] == -10
+
+
+def test_register_compiles_tables():
+    """Test runtime registration on a private registry."""
+    registry = TileRegistry()
+    floor = registry.register('FLOOR', '.')
+    lava = registry.register('LAVA', '~', reward=-50, lethal=True, terminal=True, color=(255, 80, 0))
+
+    assert lava.value == 1
+    assert registry.lethal.tolist() == [False, True]
+    assert registry.color[lava.value].tolist() == [255, 80, 0]
+    np.testing.assert_array_equal(registry.decode('.~?'), [floor.value, lava.value, -1])
+
+    with pytest.raises(ValueError):
+        registry.register('OTHER', '~')
+    with pytest.raises(ValueError):
+        registry.register('LAVA', '!')
+
+
+def test_loader_and_agent_use_registered_tiles():
+    """Test that custom tiles load from text and apply their effects."""
+    tiles = register_browser_tiles()
+    grid = load_grid_from_string("#####\n#S$P#\n#M..#\n####G")
+
+    assert grid.get_tile(2, 1) == tiles['GOLD']
+    assert str(grid) == "#####\n#S$P#\n#M..#\n####G"
+
+    agent = Agent(*grid.start_pos)
+    reward, done, _ = agent.move(Action.DOWN, grid)  # monster
+    assert (reward, done, agent.hp) == (pytest.approx(4.9), False, 70)
+
+    agent.reset(*grid.start_pos)
+    agent.move(Action.RIGHT, grid)  # gold
+    reward, done, _ = agent.move(Action.RIGHT, grid)  # pit
+    assert done and agent.hp == 0
+    assert reward == pytest.approx(-100.1)
@@ -0,0 +1,169 @@
+"""Test the streaming GIF/PNG recorders."""
+import struct
+import sys
+import zlib
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.core import load_grid_from_file
+from src.core.generator import generate_maze
+from src.algorithms.q_learning import QLearning
+from src.ui.array_renderer import ArrayRenderer
+from src.ui.video import GifWriter, VideoRecorder, write_png, record_greedy_rollout
+
+
+def decode_gif(path):
+    """Minimal GIF decoder: composited frames and their delays."""
+    data = open(path, 'rb').read()
+    assert data[:6] == b'GIF89a'
+    width, height, packed = struct.unpack('<HHB', data[6:11])
+    assert not packed & 0x80
+    pos, delay = 13, 0
+    canvas = np.zeros((height, width, 3), dtype=np.uint8)
+    frames, delays = [], []
+    while data[pos] != 0x3B:
+        if data[pos] == 0x21:
+            label, size = data[pos + 1], data[pos + 2]
+            if label == 0xF9:
+                delay = struct.unpack('<H', data[pos + 4:pos + 6])[0]
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+            continue
+        assert data[pos] == 0x2C
+        left, top, w, h, flags = struct.unpack('<HHHHB', data[pos + 1:pos + 10])
+        n_colors = 2 << (flags & 7)
+        palette = np.frombuffer(data[pos + 10:pos + 10 + 3 * n_colors], dtype=np.uint8).reshape(-1, 3)
+        pos += 10 + 3 * n_colors
+        min_code_size = data[pos]
+        pos += 1
+        stream = bytearray()
+        while data[pos]:
+            stream += data[pos + 1:pos + 1 + data[pos]]
+            pos += data[pos] + 1
+        pos += 1
+        indices = lzw_decode(bytes(stream), min_code_size)[:w * h]
+        canvas[top:top + h, left:left + w] = palette[np.array(indices)].reshape(h, w, 3)
+        frames.append(canvas.copy())
+        delays.append(delay)
+    return frames, delays
+
+
+def lzw_decode(data, min_code_size):
+    """Reference GIF LZW decoder."""
+    clear, end = 1 << min_code_size, (1 << min_code_size) + 1
+    bits = int.from_bytes(data, 'little')
+    pos, size, out = 0, min_code_size + 1, []
+    table, prev = None, None
+    while True:
+        code = (bits >> pos) & ((1 << size) - 1)
+        pos += size
+        if code == clear:
+            table = [[i] for i in range(clear)] + [None, None]
+            size, prev = min_code_size + 1, None
+            continue
+        if code == end:
+            return out
+        if prev is None:
+            entry = table[code]
+        else:
+            entry = table[code] if code < len(table) else prev + [prev[0]]
+            table.append(prev + [entry[0]])
+            if len(table) == 1 << size and size < 12:
+                size += 1
+        out += entry
+        prev = entry
+
+
+@pytest.fixture
+def renderer():
+    """Array renderer on the maze level."""
+    return ArrayRenderer(load_grid_from_file("assets/dungeons/level_03_maze.txt"))
+
+
+class TestGifWriter:
+    """Test suite for GifWriter."""
+
+    def test_roundtrip(self, renderer, tmp_path):
+        """Every frame decodes back exactly, stored as changed rectangles."""
+        frames = [renderer.render(x, 1, hp=100 - 10 * x) for x in range(1, 6)]
+        with GifWriter(tmp_path / "a.gif", fps=20) as writer:
+            for frame in frames:
+                writer.write(frame)
+        decoded, delays = decode_gif(tmp_path / "a.gif")
+        assert len(decoded) == len(frames)
+        for got, want in zip(decoded, frames):
+            np.testing.assert_array_equal(got, want)
+        assert delays == [5] * 5
+
+        # Later frames only store the agent's neighbourhood
+        with GifWriter(tmp_path / "one.gif") as writer:
+            writer.write(frames[0])
+        assert (tmp_path / "a.gif").stat().st_size < 1.5 * (tmp_path / "one.gif").stat().st_size
+
+    def test_repeated_frames_extend_delay(self, renderer, tmp_path):
+        """Identical frames are merged into one longer frame."""
+        frame = renderer.render(1, 1)
+        with GifWriter(tmp_path / "a.gif", fps=10) as writer:
+            for _ in range(3):
+                writer.write(frame)
+            writer.write(renderer.render(2, 1))
+        decoded, delays = decode_gif(tmp_path / "a.gif")
+        assert len(decoded) == 2
+        assert delays == [30, 10]
+
+    def test_many_colors(self, tmp_path):
+        """Images with more than 256 colors fall back to a fixed palette."""
+        noise = np.random.default_rng(0).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+        with GifWriter(tmp_path / "n.gif") as writer:
+            writer.write(noise)
+        (decoded,), _ = decode_gif(tmp_path / "n.gif")
+        assert decoded.shape == noise.shape
+        assert np.abs(decoded.astype(int) - noise).max() < 64
+
+
+def test_write_png(tmp_path):
+    """PNG files hold the image rows zlib-compressed."""
+    image = np.random.default_rng(0).integers(0, 256, (7, 5, 3), dtype=np.uint8)
+    write_png(tmp_path / "a.png", image)
+    data = (tmp_path / "a.png").read_bytes()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    assert (width, height) == (5, 7)
+    idat = data.index(b'IDAT')
+    length = struct.unpack('>I', data[idat - 4:idat])[0]
+    rows = np.frombuffer(zlib.decompress(data[idat + 4:idat + 4 + length]), dtype=np.uint8).reshape(7, -1)
+    np.testing.assert_array_equal(rows[:, 1:].reshape(7, 5, 3), image)
+
+
+class TestVideoRecorder:
+    """Test suite for VideoRecorder and rollout recording."""
+
+    def test_frame_skip_keeps_last(self, renderer, tmp_path):
+        """Every k-th frame is written, plus the final frame."""
+        with VideoRecorder(tmp_path / "frames", frame_skip=3) as recorder:
+            for x in range(1, 9):
+                recorder.capture(renderer.render(x, 1))
+        assert sorted(p.name for p in (tmp_path / "frames").iterdir()) == [
+            f"frame_{i:05d}.png" for i in range(4)]
+
+    def test_frame_skip_timing(self, renderer, tmp_path):
+        """Skipped frames lengthen the kept ones so playback speed is unchanged."""
+        with VideoRecorder(tmp_path / "a.gif", fps=10, frame_skip=2) as recorder:
+            for x in range(1, 6):
+                recorder.capture(renderer.render(x, 1))
+        _, delays = decode_gif(tmp_path / "a.gif")
+        assert delays == [20, 20, 20]
+
+    def test_greedy_rollout(self, tmp_path):
+        """A trained agent's greedy episode is recorded to the goal."""
+        ql = QLearning(generate_maze(11, 11, seed=0), seed=0)
+        ql.train(n_episodes=300, max_steps=200, verbose=False)
+        result = record_greedy_rollout(ql, tmp_path / "run.gif", tile_size=8)
+        assert result['success']
+        decoded, _ = decode_gif(tmp_path / "run.gif")
+        assert len(decoded) == result['frames'] <= result['steps'] + 1
+        assert result['frames'] > 1
@@ -1,16 +1,25 @@
-"""Train an agent using Q-Learning and visualize results."""
+"""Train an agent using Q-Learning and visualize results.
+
+Usage:
+    python train_agent.py [dungeon] [episodes] [--live]
+
+With --live, training runs in a background process shown in a live
+pygame view (value heatmap, policy arrows, recent episode).
+"""
 import sys
 import time
 import numpy as np
-import matplotlib.pyplot as plt
 sys.path.insert(0, '.')
 
 from src.core import load_grid_from_file
 from src.algorithms import QLearning
+from src.ui.overlay import save_overlay_png
 
 
 def plot_training(rewards: list, steps: list, window: int = 50):
     """Plot training progress."""
+    import matplotlib.pyplot as plt
+
     fig, axes = plt.subplots(2, 1, figsize=(10, 8))
 
     episodes = range(len(rewards))
@@ -54,44 +63,9 @@ def plot_training(rewards: list, steps: list, window: int = 50):
 
 
 def plot_q_values(ql: QLearning):
-    """Plot Q-value heatmap."""
-    values = ql.get_value_grid()
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-
-    im = ax.imshow(values, cmap='RdYlGn', aspect='equal')
-    plt.colorbar(im, ax=ax, label='Max Q-Value')
-
-    # Add policy arrows
-    arrows = {0: (0, -0.3), 1: (0, 0.3), 2: (-0.3, 0), 3: (0.3, 0)}  # UP, DOWN, LEFT, RIGHT
-
-    for y in range(ql.grid.height):
-        for x in range(ql.grid.width):
-            tile = ql.grid.get_tile(x, y)
-            if tile.name == 'Wall':
-                ax.add_patch(plt.Rectangle((x-0.5, y-0.5), 1, 1, color='black'))
-            elif tile.name == 'Goal':
-                ax.add_patch(plt.Rectangle((x-0.5, y-0.5), 1, 1, color='green', alpha=0.5))
-                ax.text(x, y, 'G', ha='center', va='center', fontsize=12, fontweight='bold')
-            elif tile.name == 'Start':
-                ax.text(x, y, 'S', ha='center', va='center', fontsize=10, color='blue')
-                best = ql.get_best_action(x, y)
-                dx, dy = arrows[best.value]
-                ax.arrow(x, y, dx, dy, head_width=0.15, head_length=0.1, fc='blue', ec='blue')
-            else:
-                best = ql.get_best_action(x, y)
-                dx, dy = arrows[best.value]
-                ax.arrow(x, y, dx, dy, head_width=0.15, head_length=0.1, fc='black', ec='black')
-
-    ax.set_xticks(range(ql.grid.width))
-    ax.set_yticks(range(ql.grid.height))
-    ax.set_title('Learned Q-Values and Policy')
-    ax.grid(True, alpha=0.3)
-
-    plt.tight_layout()
-    plt.savefig('q_values.png', dpi=100)
+    """Save the Q-value heatmap with policy arrows."""
+    save_overlay_png('q_values.png', ql.grid, ql.q_table)
     print("Saved q_values.png")
-    plt.show()
 
 
 def run_demo(ql: QLearning, delay: float = 0.3):
@@ -106,6 +80,7 @@ def run_demo(ql: QLearning, delay: float = 0.3):
     ui_height = 60
     new_height = renderer.window_height + ui_height
     renderer.screen = pygame.display.set_mode((renderer.window_width, new_height))
+    renderer.invalidate()
 
     font = pygame.font.Font(None, 28)
 
@@ -141,14 +116,12 @@ def run_demo(ql: QLearning, delay: float = 0.3):
             step += 1
             time.sleep(delay)
 
-        # Render
-        renderer.screen.fill((0, 0, 0))
-        renderer.render_grid()
+        # Render only the cells that changed, plus the UI panel
         renderer.set_agent(agent.x, agent.y, agent.hp, agent.max_hp)
-        renderer.render_agent()
+        dirty = renderer.render_dirty()
 
         # UI
-        ui_rect = pygame.Rect(0, renderer.window_height - ui_height + 60, renderer.window_width, ui_height)
+        ui_rect = pygame.Rect(0, renderer.window_height, renderer.window_width, ui_height)
         pygame.draw.rect(renderer.screen, (30, 30, 40), ui_rect)
 
         status = "GOAL!" if done and total_reward > 50 else ("FAILED" if done else "Running...")
@@ -156,9 +129,10 @@ def run_demo(ql: QLearning, delay: float = 0.3):
 
         text = font.render(f"Step: {step} | Reward: {total_reward:.1f} | {status} | [SPACE: pause] [R: reset]",
                           True, color)
-        renderer.screen.blit(text, (10, renderer.window_height - ui_height + 70))
+        renderer.screen.blit(text, (10, renderer.window_height + 10))
+        dirty.append(ui_rect)
 
-        pygame.display.flip()
+        pygame.display.update(dirty)
         renderer.tick(60)
 
     renderer.close()
@@ -168,10 +142,14 @@ if __name__ == "__main__":
     dungeon_file = "assets/dungeons/level_01_easy.txt"
     n_episodes = 500
 
-    if len(sys.argv) > 1:
-        dungeon_file = sys.argv[1]
-    if len(sys.argv) > 2:
-        n_episodes = int(sys.argv[2])
+    args = sys.argv[1:]
+    live = "--live" in args
+    if live:
+        args.remove("--live")
+    if len(args) > 0:
+        dungeon_file = args[0]
+    if len(args) > 1:
+        n_episodes = int(args[1])
 
     print(f"Loading dungeon: {dungeon_file}")
     grid = load_grid_from_file(dungeon_file)
@@ -200,7 +178,12 @@ if __name__ == "__main__":
     # Train
     print("Training started...")
     start_time = time.time()
-    stats = ql.train(n_episodes=n_episodes, max_steps=200, verbose=True)
+    if live:
+        # Train in a background process and watch it in a pygame window
+        from src.ui.live import run_live
+        stats = run_live(ql, n_episodes=n_episodes, max_steps=200)
+    else:
+        stats = ql.train(n_episodes=n_episodes, max_steps=200, verbose=True)
     elapsed = time.time() - start_time
     print(f"\nTraining completed in {elapsed:.1f} seconds")
     print()